@@ -5,18 +5,18 @@ Thin HTTP client to the gateway server (server.py).
 All Claude Code interaction flows through the gateway — no SDK dependency.
 """
 
-import asyncio
 import contextlib
 import logging
 import os
 import sys
-import tempfile
 import time
+from typing import AsyncIterator
 
 import aiohttp
 import discord
 from discord import app_commands
 
+from bots.discord_playback import GuildPlayer
 from config import config
 from core.gateway_client import GatewayClient, get_lock, get_skills, time_ago
 
@@ -37,8 +37,9 @@ VOICE_SERVER_URL = os.environ.get("VOICE_SERVER_URL", "http://localhost:8422")
 http: aiohttp.ClientSession | None = None
 gateway: GatewayClient | None = None
 
-# Active voice clients keyed by guild ID
+# Active voice clients and their playback queues, keyed by guild ID
 _voice_clients: dict[int, discord.VoiceClient] = {}
+_players: dict[int, GuildPlayer] = {}
 
 
 # ---------------------------------------------------------------------------
@@ -60,23 +61,41 @@ def _is_allowed_channel(channel_id: int) -> bool:
 # Voice / TTS helpers
 # ---------------------------------------------------------------------------
 
-async def _tts(text: str, voice_id: str) -> bytes:
-    """POST text to voice-server /tts, return OGG audio bytes.
+async def _tts_stream(text: str, voice_id: str) -> AsyncIterator[bytes]:
+    """POST text to voice-server /tts/stream, yielding Ogg/Opus as it is synthesised.
 
     `voice_id` selects the per-mind reference clip on the voice server
-    (resolves to `minds/<voice_id>/voice_ref.wav`). Without it the voice
-    server falls back to chatterbox's built-in default voice.
+    (resolves to `minds/<voice_id>/voice_ref.wav`).
     """
     async with http.post(
-        f"{VOICE_SERVER_URL}/tts", json={"text": text, "voice_id": voice_id}
+        f"{VOICE_SERVER_URL}/tts/stream",
+        json={"text": text, "voice_id": voice_id, "format": "ogg"},
     ) as resp:
         if resp.status != 200:
             raise RuntimeError(f"TTS error {resp.status}: {await resp.text()}")
-        return await resp.read()
+        async for chunk in resp.content.iter_any():
+            yield chunk
+
+
+def _player_for(guild_id: int) -> GuildPlayer:
+    player = _players.get(guild_id)
+    if player is None:
+        player = GuildPlayer(
+            guild_id,
+            fetch=lambda text: _tts_stream(text, voice_id=gateway.mind_id),
+            voice_client=lambda: _voice_clients.get(guild_id),
+        )
+        _players[guild_id] = player
+    return player
 
 
 async def _play_tts_for_member(member: discord.Member | discord.User, text: str) -> None:
-    """Synthesise text and play it in the member's current voice channel (if any)."""
+    """Queue text to be spoken in the member's current voice channel (if any).
+
+    Replies play in order through the guild's GuildPlayer, streamed from the
+    voice server as they are synthesised; a new reply no longer cuts off
+    the one that is playing.
+    """
     if not isinstance(member, discord.Member):
         return  # DMs have no voice channel
     if not member.voice or not member.voice.channel:
@@ -96,37 +115,7 @@ async def _play_tts_for_member(member: discord.Member | discord.User, text: str)
         log.exception("Failed to connect to voice channel in guild %s", guild_id)
         return
 
-    try:
-        ogg_bytes = await _tts(text, voice_id=gateway.mind_id)
-    except Exception:
-        log.exception("TTS synthesis failed")
-        return
-
-    with tempfile.NamedTemporaryFile(suffix=".ogg", delete=False) as f:
-        f.write(ogg_bytes)
-        tmp_path = f.name
-
-    try:
-        if vc.is_playing():
-            vc.stop()
-
-        loop = asyncio.get_event_loop()
-        done = asyncio.Event()
-
-        def _after(error):
-            if error:
-                log.warning("Voice playback error: %s", error)
-            loop.call_soon_threadsafe(done.set)
-
-        vc.play(discord.FFmpegPCMAudio(tmp_path), after=_after)
-        await asyncio.wait_for(done.wait(), timeout=120.0)
-    except asyncio.TimeoutError:
-        log.warning("Voice playback timed out in guild %s", guild_id)
-        vc.stop()
-    except Exception:
-        log.exception("Voice playback failed in guild %s", guild_id)
-    finally:
-        os.unlink(tmp_path)
+    _player_for(guild_id).enqueue(text)
 
 
 # ---------------------------------------------------------------------------
@@ -522,6 +511,9 @@ async def cmd_leave(interaction: discord.Interaction):
         await interaction.response.send_message("Not in a server.", ephemeral=True)
         return
     guild_id = interaction.guild.id
+    player = _players.pop(guild_id, None)
+    if player:
+        player.stop()
     vc = _voice_clients.pop(guild_id, None)
     if vc and vc.is_connected():
         await vc.disconnect()
@@ -530,6 +522,28 @@ async def cmd_leave(interaction: discord.Interaction):
         await interaction.response.send_message("Not currently in a voice channel.", ephemeral=True)
 
 
+# ---------------------------------------------------------------------------
+# /voicestats — playback queue metrics for this server
+# ---------------------------------------------------------------------------
+@bot.tree.command(name="voicestats", description="Show voice playback queue and underrun stats")
+async def cmd_voicestats(interaction: discord.Interaction):
+    if not _is_allowed_user(interaction.user.id):
+        await interaction.response.send_message("Not authorized.", ephemeral=True)
+        return
+    player = _players.get(interaction.guild.id) if interaction.guild else None
+    if player is None:
+        await interaction.response.send_message("No voice playback in this server yet.", ephemeral=True)
+        return
+    s = player.snapshot()
+    await interaction.response.send_message(
+        f"Queue: **{s['queue_depth']}** (max {s['max_queue_depth']}) | "
+        f"played {s['played']}, failed {s['failed']}, dropped {s['dropped']}\n"
+        f"Underruns: **{s['underruns']}** ({s['underrun_ms']:.0f} ms) | "
+        f"last time to first audio: {s['last_first_audio_ms'] or 0:.0f} ms",
+        ephemeral=True,
+    )
+
+
 # ---------------------------------------------------------------------------
 # Message handler
 # ---------------------------------------------------------------------------
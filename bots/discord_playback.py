@@ -0,0 +1,261 @@
+"""Per-guild voice playback for the Discord bot -- streamed, queued, no disk.
+
+Each guild gets one :class:`GuildPlayer`. Replies are queued in order and
+played one after another instead of the newest cutting off whatever is
+playing. A reply's audio is streamed from the voice server (``/tts/stream``)
+into a :class:`ByteStream` as it is synthesised; ffmpeg reads from that
+in-memory pipe, so playback starts on the first sentence while later ones
+are still being generated, and nothing is written to disk.
+
+Synthesis for queued replies starts as soon as they are queued, so the next
+reply is usually buffered by the time the current one finishes.
+
+Per-guild metrics (queue depth, time from queueing to first audio, and
+underruns -- a 20 ms frame that could not be produced on time because
+synthesis fell behind playback) are available from
+:meth:`GuildPlayer.snapshot`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable
+
+import discord
+
+log = logging.getLogger("hive-mind-discord.playback")
+
+FRAME_S = 0.020  # discord.py sends one 20 ms Opus frame per read()
+PLAYBACK_TIMEOUT_S = 300.0
+
+
+class ByteStream:
+    """A thread-safe in-memory pipe: the event loop writes, ffmpeg's feeder reads.
+
+    ``read`` blocks until data arrives or the writer closes the stream, and
+    returns ``b""`` at end of stream, which is what discord.py's pipe writer
+    takes as EOF.
+    """
+
+    def __init__(self) -> None:
+        self._buf = bytearray()
+        self._cond = threading.Condition()
+        self._closed = False
+        self.bytes_in = 0
+
+    def write(self, data: bytes) -> None:
+        with self._cond:
+            self._buf += data
+            self.bytes_in += len(data)
+            self._cond.notify_all()
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def read(self, n: int = -1) -> bytes:
+        with self._cond:
+            while not self._buf and not self._closed:
+                self._cond.wait()
+            if n < 0:
+                n = len(self._buf)
+            data = bytes(self._buf[:n])
+            del self._buf[:n]
+            return data
+
+
+class _MeteredSource(discord.AudioSource):
+    """Wraps a playing source: times the first frame and counts late ones.
+
+    discord.py reads one frame every 20 ms; a read that takes longer than
+    that (ffmpeg starved because synthesis is behind) is an audible gap.
+    """
+
+    def __init__(self, inner: discord.AudioSource, stats: "GuildStats", queued_at: float) -> None:
+        self._inner = inner
+        self._stats = stats
+        self._queued_at = queued_at
+        self._started = False
+
+    def read(self) -> bytes:
+        start = time.perf_counter()
+        frame = self._inner.read()
+        now = time.perf_counter()
+        if frame and not self._started:
+            self._started = True
+            self._stats.last_first_audio_ms = (now - self._queued_at) * 1000
+        elif frame and now - start > FRAME_S:
+            self._stats.underruns += 1
+            self._stats.underrun_ms += (now - start) * 1000
+        return frame
+
+    def is_opus(self) -> bool:
+        return self._inner.is_opus()
+
+    def cleanup(self) -> None:
+        self._inner.cleanup()
+
+
+@dataclass
+class _Utterance:
+    text: str
+    stream: ByteStream = field(default_factory=ByteStream)
+    fetcher: asyncio.Task | None = None
+    queued_at: float = field(default_factory=time.perf_counter)
+
+
+@dataclass
+class GuildStats:
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    queued: int = 0
+    played: int = 0
+    failed: int = 0
+    dropped: int = 0
+    underruns: int = 0
+    underrun_ms: float = 0.0
+    last_first_audio_ms: float | None = None
+
+    def summary(self) -> dict:
+        return {
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "queued": self.queued,
+            "played": self.played,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "underruns": self.underruns,
+            "underrun_ms": round(self.underrun_ms, 1),
+            "last_first_audio_ms": (
+                round(self.last_first_audio_ms, 1) if self.last_first_audio_ms is not None else None
+            ),
+        }
+
+
+def _ffmpeg_source(stream: ByteStream) -> discord.AudioSource:
+    return discord.FFmpegPCMAudio(stream, pipe=True)
+
+
+class GuildPlayer:
+    """Ordered, streamed playback queue for one guild's voice client.
+
+    ``fetch(text)`` is an async iterator of encoded audio chunks for one
+    reply; ``voice_client()`` returns the guild's current voice client (or
+    None when disconnected). Replies beyond ``max_queue`` are dropped.
+    """
+
+    def __init__(
+        self,
+        guild_id: int,
+        fetch: Callable[[str], AsyncIterator[bytes]],
+        voice_client: Callable[[], discord.VoiceClient | None],
+        max_queue: int = 8,
+        source_factory: Callable[[ByteStream], discord.AudioSource] = _ffmpeg_source,
+    ) -> None:
+        self.guild_id = guild_id
+        self._fetch = fetch
+        self._voice_client = voice_client
+        self._max_queue = max_queue
+        self._source_factory = source_factory
+        self._queue: asyncio.Queue[_Utterance] = asyncio.Queue()
+        self._current: _Utterance | None = None
+        self._worker: asyncio.Task | None = None
+        self.stats = GuildStats()
+
+    def enqueue(self, text: str) -> bool:
+        """Queue *text* for playback; synthesis starts immediately."""
+        if self._queue.qsize() >= self._max_queue:
+            self.stats.dropped += 1
+            log.warning("Voice queue full in guild %s; dropping reply", self.guild_id)
+            return False
+        utterance = _Utterance(text)
+        utterance.fetcher = asyncio.create_task(self._stream_into(utterance))
+        self._queue.put_nowait(utterance)
+        self.stats.queued += 1
+        self._update_depth()
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._play_queue())
+        return True
+
+    def stop(self) -> None:
+        """Drop everything queued and stop the reply that is playing."""
+        while not self._queue.empty():
+            self._discard(self._queue.get_nowait())
+        if self._current is not None:
+            self._discard(self._current)
+        vc = self._voice_client()
+        if vc is not None and vc.is_playing():
+            vc.stop()
+        self._update_depth()
+
+    def snapshot(self) -> dict:
+        return {"guild_id": self.guild_id, **self.stats.summary()}
+
+    def _update_depth(self) -> None:
+        depth = self._queue.qsize() + (1 if self._current is not None else 0)
+        self.stats.queue_depth = depth
+        self.stats.max_queue_depth = max(self.stats.max_queue_depth, depth)
+
+    @staticmethod
+    def _discard(utterance: _Utterance) -> None:
+        if utterance.fetcher is not None:
+            utterance.fetcher.cancel()
+        utterance.stream.close()
+
+    async def _stream_into(self, utterance: _Utterance) -> None:
+        try:
+            async for chunk in self._fetch(utterance.text):
+                utterance.stream.write(chunk)
+        except Exception:
+            log.exception("TTS stream failed in guild %s", self.guild_id)
+        finally:
+            utterance.stream.close()
+
+    async def _play_queue(self) -> None:
+        while not self._queue.empty():
+            self._current = self._queue.get_nowait()
+            self._update_depth()
+            try:
+                await self._play(self._current)
+            finally:
+                self._current = None
+                self._update_depth()
+
+    async def _play(self, utterance: _Utterance) -> None:
+        vc = self._voice_client()
+        if vc is None or not vc.is_connected():
+            self._discard(utterance)
+            self.stats.failed += 1
+            return
+
+        loop = asyncio.get_running_loop()
+        done = asyncio.Event()
+
+        def _after(error: Exception | None) -> None:
+            if error:
+                log.warning("Voice playback error in guild %s: %s", self.guild_id, error)
+            loop.call_soon_threadsafe(done.set)
+
+        try:
+            source = _MeteredSource(self._source_factory(utterance.stream), self.stats, utterance.queued_at)
+            vc.play(source, after=_after)
+            await asyncio.wait_for(done.wait(), timeout=PLAYBACK_TIMEOUT_S)
+            self.stats.played += 1
+        except asyncio.TimeoutError:
+            log.warning("Voice playback timed out in guild %s", self.guild_id)
+            vc.stop()
+            self.stats.failed += 1
+        except Exception:
+            log.exception("Voice playback failed in guild %s", self.guild_id)
+            self.stats.failed += 1
+        finally:
+            self._discard(utterance)
+        log.info(
+            "Voice reply done in guild %s: %d bytes streamed | %s",
+            self.guild_id, utterance.stream.bytes_in, self.stats.summary(),
+        )
@@ -27,7 +27,8 @@ from telegram.ext import (
 )
 
 from config import config
-from core.gateway_client import get_lock, get_queue
+from core.gateway_client import get_lock, get_queue, iter_sse_events
+from core.mind_registry import mind_registry
 
 logging.basicConfig(
     level=logging.INFO,
@@ -38,6 +39,9 @@ log = logging.getLogger("hive-mind-hivemind-bot")
 TELEGRAM_MSG_LIMIT = 4096
 SERVER_URL = os.environ.get("HIVE_MIND_SERVER_URL", f"http://localhost:{config.server_port}")
 VOICE_SERVER_URL = os.environ.get("VOICE_SERVER_URL", "http://localhost:8422")
+MINDS_ROOT = os.environ.get(
+    "MINDS_ROOT", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "minds"),
+)
 
 # Surface prompt: tells the minds they're in a Telegram group chat.
 GROUP_SURFACE_PROMPT = (
@@ -193,10 +197,16 @@ def _parse_mind_sections(text: str) -> dict[str, str]:
     return result or {"ada": text}
 
 
+def _mind_label(mind_id: str) -> str:
+    """Display name for a streamed event's mind_id (UUID or short name)."""
+    mind = mind_registry(MINDS_ROOT).by_id(mind_id)
+    return (mind.name if mind else mind_id).capitalize()
+
+
 def _build_preview(accumulated: dict[str, str]) -> str:
     parts = []
     for mind_id, text in accumulated.items():
-        parts.append(f"{mind_id.capitalize()}:\n{text}")
+        parts.append(f"{_mind_label(mind_id)}:\n{text}")
     return "\n\n---\n\n".join(parts)
 
 
@@ -238,40 +248,33 @@ async def _stream_group_response(
                 await placeholder.edit_text(f"Server error {resp.status}: {body[:200]}")
                 return None
 
-            buf = ""
-            async for chunk in resp.content.iter_any():
-                buf += chunk.decode()
-                while "\n" in buf:
-                    raw_line, buf = buf.split("\n", 1)
-                    raw_line = raw_line.strip()
-                    if not raw_line or not raw_line.startswith("data: "):
-                        continue
-                    try:
-                        event = json.loads(raw_line.removeprefix("data: "))
-                    except json.JSONDecodeError:
-                        continue
-                    if not isinstance(event, dict):
-                        continue
-
-                    if event.get("type") == "assistant":
-                        mind_id = event.get("mind_id", "unknown")
-                        content_blocks = event.get("message", {}).get("content", [])
-                        text = ""
-                        if isinstance(content_blocks, list):
-                            text = "".join(
-                                b.get("text", "") for b in content_blocks
-                                if isinstance(b, dict) and b.get("type") == "text"
-                            )
-                        if text:
-                            accumulated[mind_id] = accumulated.get(mind_id, "") + text
-                            now = time.monotonic()
-                            if now - last_edit >= 2.0:
-                                preview = _build_preview(accumulated)
-                                try:
-                                    await placeholder.edit_text(preview[:TELEGRAM_MSG_LIMIT])
-                                except Exception:
-                                    pass
-                                last_edit = now
+            async for sse in iter_sse_events(resp):
+                try:
+                    event = json.loads(sse.data)
+                except json.JSONDecodeError:
+                    continue
+                if not isinstance(event, dict):
+                    continue
+
+                if event.get("type") == "assistant":
+                    mind_id = event.get("mind_id", "unknown")
+                    content_blocks = event.get("message", {}).get("content", [])
+                    text = ""
+                    if isinstance(content_blocks, list):
+                        text = "".join(
+                            b.get("text", "") for b in content_blocks
+                            if isinstance(b, dict) and b.get("type") == "text"
+                        )
+                    if text:
+                        accumulated[mind_id] = accumulated.get(mind_id, "") + text
+                        now = time.monotonic()
+                        if now - last_edit >= 2.0:
+                            preview = _build_preview(accumulated)
+                            try:
+                                await placeholder.edit_text(preview[:TELEGRAM_MSG_LIMIT])
+                            except Exception:
+                                pass
+                            last_edit = now
 
     except Exception as exc:
         log.exception("Error streaming group message")
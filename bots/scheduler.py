@@ -9,12 +9,17 @@ Each fire creates a fresh session, sends the skill invocation, reads the
 response, and kills the session. Sessions are not resumed across fires —
 cross-day continuity comes from the mind's persistent memory layer
 (knowledge graph, vector store), not from chat history.
+
+Fires pass through an admission controller (bots/scheduler_admission.py)
+that caps global and per-mind concurrency and admits voice briefings
+ahead of background work; jobs sharing a cron minute are spread out.
 """
 
 import asyncio
 import json
 import logging
 import os
+import time
 import uuid
 from pathlib import Path
 
@@ -23,11 +28,16 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 
 from config import config
+from bots.scheduler_admission import AdmissionController, cron_offsets, priority_for
+from bots.telegram_delivery import TelegramDelivery
+from core.gateway_client import iter_sse_events
 from core.scheduled_skills import (
     ScheduledSkill,
     discover_scheduled_skills,
     discover_scheduler_tasks,
 )
+from core.mind_registry import mind_registry
+from core.skill_index import minds_index
 
 # ---------------------------------------------------------------------------
 # Keyring → env bridge: the scheduler needs TELEGRAM_BOT_TOKEN in os.environ
@@ -64,6 +74,20 @@ SCHEDULER_TASKS_YAML = Path(os.environ.get(
     "SCHEDULER_TASKS_YAML",
     "/usr/src/app/bots/scheduled_tasks/tasks.yaml",
 ))
+# Undelivered Telegram messages are spooled here and resumed on restart.
+TELEGRAM_OUTBOX_DIR = Path(os.environ.get(
+    "TELEGRAM_OUTBOX_DIR",
+    "/usr/src/app/data/telegram_outbox",
+))
+# Admission control: how many fires may run at once, overall and per mind,
+# and the window over which jobs sharing a cron expression are spread.
+SCHEDULER_MAX_CONCURRENT = int(os.environ.get("SCHEDULER_MAX_CONCURRENT", "3"))
+SCHEDULER_MAX_PER_MIND = int(os.environ.get("SCHEDULER_MAX_PER_MIND", "1"))
+SCHEDULER_CRON_SPREAD_SECONDS = float(os.environ.get("SCHEDULER_CRON_SPREAD_SECONDS", "90"))
+SCHEDULER_METRICS_PATH = Path(os.environ.get(
+    "SCHEDULER_METRICS_PATH",
+    "/usr/src/app/data/scheduler_metrics.json",
+))
 COMMS_BEARER_TOKEN = os.environ.get("COMMS_BEARER_TOKEN", "")
 GATEWAY_AUTH_HEADERS = (
     {"Authorization": f"Bearer {COMMS_BEARER_TOKEN}"} if COMMS_BEARER_TOKEN else {}
@@ -84,11 +108,51 @@ DEV_SURFACE_PROMPT = (
 )
 
 
+_http_sessions: dict[str, aiohttp.ClientSession] = {}
+_delivery: TelegramDelivery | None = None
+_admission = AdmissionController(SCHEDULER_MAX_CONCURRENT, SCHEDULER_MAX_PER_MIND)
+_fire_offsets: dict[str, float] = {}
+
+
+def _shared_http(name: str, **kwargs) -> aiohttp.ClientSession:
+    """Keep-alive session per upstream, created lazily and reused across fires."""
+    sess = _http_sessions.get(name)
+    if sess is None or sess.closed:
+        sess = _http_sessions[name] = aiohttp.ClientSession(**kwargs)
+    return sess
+
+
+def _gateway_http() -> aiohttp.ClientSession:
+    """Shared keep-alive session for gateway calls, reused across fires.
+
+    Per-request timeouts still apply: the 840s ceiling covers session
+    create/delete, and the SSE message call overrides it with no total.
+    """
+    return _shared_http(
+        "gateway",
+        timeout=aiohttp.ClientTimeout(total=840),
+        headers=GATEWAY_AUTH_HEADERS,
+    )
+
+
+async def _telegram(bot_token: str) -> TelegramDelivery:
+    """The process-wide Telegram sender; resumes the outbox on first use."""
+    global _delivery
+    if _delivery is None or _delivery.bot_token != bot_token:
+        if _delivery is not None:
+            await _delivery.close()
+        _delivery = TelegramDelivery(bot_token, TELEGRAM_OUTBOX_DIR)
+        await _delivery.start()
+    return _delivery
+
+
 async def _tts(http: aiohttp.ClientSession, text: str, voice_id: str) -> bytes:
     timeout = aiohttp.ClientTimeout(total=VOICE_TTS_TIMEOUT_SECONDS)
     async with http.post(
         f"{VOICE_SERVER_URL}/tts",
         json={"text": text, "voice_id": voice_id},
+        # Briefings yield the voice server to interactive replies.
+        headers={"X-Voice-Priority": "background"},
         timeout=timeout,
     ) as resp:
         if resp.status != 200:
@@ -97,35 +161,21 @@ async def _tts(http: aiohttp.ClientSession, text: str, voice_id: str) -> bytes:
 
 
 async def _try_send_voice(bot_token: str, chat_id: int, text: str, voice_id: str, label: str) -> None:
-    """Fire-and-forget: synthesise TTS and send voice note. Logs but never raises."""
+    """Fire-and-forget: synthesise TTS and queue the voice note. Logs but never raises."""
     try:
-        async with aiohttp.ClientSession() as http:
-            audio = await _tts(http, text, voice_id)
-        await _send_voice(bot_token, chat_id, audio)
-        log.info("Voice delivery complete for %s", label)
+        audio = await _tts(_shared_http("voice"), text, voice_id)
+        await _send_voice(bot_token, chat_id, audio, job=label)
+        log.info("Voice note queued for %s", label)
     except Exception:
         log.exception("Voice delivery failed for %s (text already sent)", label)
 
 
-async def _send_voice(bot_token: str, chat_id: int, audio: bytes) -> None:
-    form = aiohttp.FormData()
-    form.add_field("voice", audio, filename="response.ogg", content_type="audio/ogg")
-    async with aiohttp.ClientSession() as s:
-        await s.post(
-            f"https://api.telegram.org/bot{bot_token}/sendVoice",
-            params={"chat_id": str(chat_id)},
-            data=form,
-        )
+async def _send_voice(bot_token: str, chat_id: int, audio: bytes, job: str = "") -> None:
+    (await _telegram(bot_token)).send_voice(chat_id, audio, job=job)
 
 
-async def _send_text(bot_token: str, chat_id: int, text: str) -> None:
-    limit = 4096
-    for i in range(0, max(len(text), 1), limit):
-        async with aiohttp.ClientSession() as s:
-            await s.post(
-                f"https://api.telegram.org/bot{bot_token}/sendMessage",
-                json={"chat_id": str(chat_id), "text": text[i : i + limit]},
-            )
+async def _send_text(bot_token: str, chat_id: int, text: str, job: str = "") -> None:
+    (await _telegram(bot_token)).send_text(chat_id, text, job=job)
 
 
 async def _create_session(http: aiohttp.ClientSession, skill: ScheduledSkill, surface_prompt: str) -> str:
@@ -161,29 +211,22 @@ async def _send_message(http: aiohttp.ClientSession, session_id: str, content: s
     ) as resp:
         if resp.status != 200:
             raise RuntimeError(f"Gateway message failed for {session_id}: HTTP {resp.status}")
-        buf = ""
-        async for chunk in resp.content.iter_any():
-            buf += chunk.decode()
-            while "\n" in buf:
-                raw_line, buf = buf.split("\n", 1)
-                raw_line = raw_line.strip()
-                if not raw_line.startswith("data: "):
-                    continue
-                try:
-                    event = json.loads(raw_line.removeprefix("data: "))
-                except json.JSONDecodeError:
-                    json_decode_errors += 1
-                    continue
-                events_seen += 1
-                etype = event.get("type") or "<no-type>"
-                event_type_counts[etype] = event_type_counts.get(etype, 0) + 1
-                last_event_type = etype
-                if etype == "assistant":
-                    for block in event.get("message", {}).get("content", []):
-                        if block.get("type") == "text" and block.get("text"):
-                            texts.append(block["text"])
-                elif etype == "result":
-                    result_fallback = event.get("result", "")
+        async for sse in iter_sse_events(resp):
+            try:
+                event = json.loads(sse.data)
+            except json.JSONDecodeError:
+                json_decode_errors += 1
+                continue
+            events_seen += 1
+            etype = event.get("type") or "<no-type>"
+            event_type_counts[etype] = event_type_counts.get(etype, 0) + 1
+            last_event_type = etype
+            if etype == "assistant":
+                for block in event.get("message", {}).get("content", []):
+                    if block.get("type") == "text" and block.get("text"):
+                        texts.append(block["text"])
+            elif etype == "result":
+                result_fallback = event.get("result", "")
     combined = "\n\n".join(texts) or result_fallback
     if not combined:
         raise RuntimeError(
@@ -250,56 +293,89 @@ async def fire_skill(skill: ScheduledSkill) -> None:
     log.info("Firing %s", label)
     surface_prompt = VOICE_SURFACE_PROMPT if skill.voice else DEV_SURFACE_PROMPT
 
-    timeout = aiohttp.ClientTimeout(total=840)
-    async with aiohttp.ClientSession(timeout=timeout, headers=GATEWAY_AUTH_HEADERS) as http:
-        session_id: str | None = None
-        try:
-            session_id = await _create_session(http, skill, surface_prompt)
-            instructions_text: str | None = None
-            if skill.instructions_path:
-                try:
-                    instructions_text = Path(skill.instructions_path).read_text()
-                except OSError as exc:
-                    log.warning(
-                        "Could not read instructions for %s at %s: %s — "
-                        "falling back to path-reference dispatch",
-                        label, skill.instructions_path, exc,
-                    )
-            if instructions_text:
-                dispatch_msg = (
-                    f"You are running the scheduled task '{skill.skill_name}'. "
-                    "Execute the following instructions exactly. Do not search "
-                    "for a skill file — the instructions are embedded below.\n\n"
-                    f"{instructions_text}"
-                )
-            else:
-                dispatch_msg = (
-                    f"Run the {skill.skill_name} skill. "
-                    f"Read its instructions from {skill.skill_path} and follow them exactly."
-                )
-            response = await _send_message(http, session_id, dispatch_msg)
-        except Exception:
-            log.exception("Gateway failure for %s", label)
-            if skill.notify:
-                await _send_text(
-                    bot_token, chat_id,
-                    f"Scheduled task {label} failed to get a response.",
+    http = _gateway_http()
+    session_id: str | None = None
+    try:
+        session_id = await _create_session(http, skill, surface_prompt)
+        instructions_text: str | None = None
+        if skill.instructions_path:
+            try:
+                instructions_text = Path(skill.instructions_path).read_text()
+            except OSError as exc:
+                log.warning(
+                    "Could not read instructions for %s at %s: %s — "
+                    "falling back to path-reference dispatch",
+                    label, skill.instructions_path, exc,
                 )
-            return
-        finally:
-            if session_id:
-                await _kill_session(http, session_id)
+        if instructions_text:
+            dispatch_msg = (
+                f"You are running the scheduled task '{skill.skill_name}'. "
+                "Execute the following instructions exactly. Do not search "
+                "for a skill file — the instructions are embedded below.\n\n"
+                f"{instructions_text}"
+            )
+        else:
+            dispatch_msg = (
+                f"Run the {skill.skill_name} skill. "
+                f"Read its instructions from {skill.skill_path} and follow them exactly."
+            )
+        response = await _send_message(http, session_id, dispatch_msg)
+    except Exception:
+        log.exception("Gateway failure for %s", label)
+        if skill.notify:
+            await _send_text(
+                bot_token, chat_id,
+                f"Scheduled task {label} failed to get a response.",
+                job=label,
+            )
+        return
+    finally:
+        if session_id:
+            await _kill_session(http, session_id)
 
     if not skill.notify:
         log.info("%s complete (notify=false, no delivery)", label)
         log.info("%s response (first 4000 chars): %s", label, (response or "")[:4000])
         return
 
-    await _send_text(bot_token, chat_id, response)
+    await _send_text(bot_token, chat_id, response, job=label)
     if skill.voice:
         asyncio.create_task(_try_send_voice(bot_token, chat_id, response, skill.mind_id, label))
 
 
+def _write_metrics() -> None:
+    """Dump admission histograms + delivery counters for inspection."""
+    snapshot = {
+        "updated_at": time.time(),
+        "admission": _admission.snapshot(),
+        "delivery": _delivery.stats() if _delivery is not None else {},
+    }
+    try:
+        SCHEDULER_METRICS_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp = SCHEDULER_METRICS_PATH.with_suffix(".tmp")
+        tmp.write_text(json.dumps(snapshot, indent=2))
+        os.replace(tmp, SCHEDULER_METRICS_PATH)
+    except OSError as exc:
+        log.warning("Could not write scheduler metrics to %s: %s", SCHEDULER_METRICS_PATH, exc)
+
+
+def _priority(skill: ScheduledSkill) -> int:
+    return priority_for(skill.voice, skill.notify, bool(skill.command))
+
+
+async def run_scheduled(skill: ScheduledSkill) -> None:
+    """APScheduler entry point: spread, admit, fire, record."""
+    label = f"{skill.mind_name}/{skill.skill_name}"
+    offset = _fire_offsets.get(_skill_job_id(skill), 0.0)
+    if offset:
+        await asyncio.sleep(offset)
+    try:
+        async with _admission.slot(skill.mind_name, _priority(skill), label):
+            await fire_skill(skill)
+    finally:
+        _write_metrics()
+
+
 RECONCILE_INTERVAL_SEC = 30
 SKILL_JOB_PREFIX = "skill:"
 
@@ -311,6 +387,23 @@ def _skill_job_id(skill: ScheduledSkill) -> str:
     return f"{SKILL_JOB_PREFIX}{skill.mind_name}/{skill.skill_name}|{skill.cron}|{skill.timezone}|v={skill.voice}|n={skill.notify}"
 
 
+def _inputs_signature() -> tuple:
+    """Stat signature of the scheduler-owned discovery inputs: tasks.yaml and
+    its instructions dir."""
+    sig = []
+    for path in (SCHEDULER_TASKS_YAML, SCHEDULER_TASKS_YAML.parent / "instructions"):
+        try:
+            st = path.stat()
+        except OSError:
+            sig.append((str(path), None))
+            continue
+        sig.append((str(path), st.st_ino, st.st_size, st.st_mtime_ns))
+    return tuple(sig)
+
+
+_reconciled_inputs: tuple | None = None
+
+
 def _reconcile_skill_jobs(scheduler: AsyncIOScheduler) -> tuple[int, int, int]:
     """Sync APScheduler's skill-job set to the current on-disk discovery.
 
@@ -320,7 +413,9 @@ def _reconcile_skill_jobs(scheduler: AsyncIOScheduler) -> tuple[int, int, int]:
     SKILL.md during transition. Returns (added, removed, total) for
     logging. Sweep jobs are never touched.
     """
-    skill_md_tasks = discover_scheduled_skills(MINDS_ROOT)
+    global _reconciled_inputs
+    _reconciled_inputs = _inputs_signature()
+    skill_md_tasks = discover_scheduled_skills(MINDS_ROOT, minds_index(MINDS_ROOT))
     yaml_tasks = discover_scheduler_tasks(SCHEDULER_TASKS_YAML, MINDS_ROOT)
 
     by_identity: dict[tuple[str, str], ScheduledSkill] = {}
@@ -340,6 +435,12 @@ def _reconcile_skill_jobs(scheduler: AsyncIOScheduler) -> tuple[int, int, int]:
     to_remove = existing_ids - desired_ids.keys()
     to_add = [s for jid, s in desired_ids.items() if jid not in existing_ids]
 
+    _fire_offsets.clear()
+    _fire_offsets.update(cron_offsets(
+        ((jid, s.cron, s.timezone, _priority(s)) for jid, s in desired_ids.items()),
+        SCHEDULER_CRON_SPREAD_SECONDS,
+    ))
+
     for jid in to_remove:
         scheduler.remove_job(jid)
         log.info("Unscheduled %s", jid.removeprefix(SKILL_JOB_PREFIX))
@@ -355,7 +456,7 @@ def _reconcile_skill_jobs(scheduler: AsyncIOScheduler) -> tuple[int, int, int]:
             timezone=skill.timezone,
         )
         scheduler.add_job(
-            fire_skill, trigger, args=[skill],
+            run_scheduled, trigger, args=[skill],
             id=_skill_job_id(skill),
         )
         log.info(
@@ -366,11 +467,28 @@ def _reconcile_skill_jobs(scheduler: AsyncIOScheduler) -> tuple[int, int, int]:
     return len(to_add), len(to_remove), len(desired_ids)
 
 
+def _inputs_changed() -> bool:
+    """True if any SKILL.md, runtime.yaml or scheduler input changed since
+    the last reconcile.
+
+    SKILL.md and runtime.yaml go through the shared SkillIndex and
+    MindRegistry stat passes — no file is re-read unless its signature moved.
+    """
+    changes = minds_index(MINDS_ROOT).refresh()
+    if changes:
+        log.info("Skill change detected (%s)", changes.summary())
+    minds_changed = mind_registry(MINDS_ROOT).refresh()
+    return bool(changes) or minds_changed or _inputs_signature() != _reconciled_inputs
+
+
 async def _reconcile_loop(scheduler: AsyncIOScheduler) -> None:
-    """Re-sync skill jobs to disk every RECONCILE_INTERVAL_SEC seconds."""
+    """Re-sync skill jobs to disk every RECONCILE_INTERVAL_SEC seconds,
+    when something on disk actually changed."""
     while True:
         await asyncio.sleep(RECONCILE_INTERVAL_SEC)
         try:
+            if not _inputs_changed():
+                continue
             added, removed, _total = _reconcile_skill_jobs(scheduler)
             if added or removed:
                 log.info("Reconcile: +%d / -%d skill job(s)", added, removed)
@@ -390,12 +508,18 @@ async def main() -> None:
 
     scheduler.start()
     log.info(
-        "Scheduler running — %d skill job(s) (reconcile every %ds)",
-        total, RECONCILE_INTERVAL_SEC,
+        "Scheduler running — %d skill job(s) (reconcile every %ds, "
+        "max %d concurrent / %d per mind)",
+        total, RECONCILE_INTERVAL_SEC, SCHEDULER_MAX_CONCURRENT, SCHEDULER_MAX_PER_MIND,
     )
 
     asyncio.create_task(_reconcile_loop(scheduler))
 
+    # Resume anything a previous run left in the Telegram outbox.
+    bot_token = os.environ.get("TELEGRAM_BOT_TOKEN", "")
+    if bot_token:
+        await _telegram(bot_token)
+
     await asyncio.Event().wait()
 
 
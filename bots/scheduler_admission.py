@@ -0,0 +1,294 @@
+"""Admission control for scheduled fires.
+
+APScheduler triggers every due job at once; several briefings share the
+6:30am minute, and each fire creates a gateway session, spawns a CLI and
+later queues TTS. The controller here caps how many fires run at a time —
+globally and per mind — and admits waiters by priority class, so a voice
+briefing queued behind a burst of background command tasks still goes
+first. Within a class, waiters are served in arrival order.
+
+`cron_offsets` spreads jobs that fire in the same minute across a short
+window (highest priority first, evenly spaced) so they don't all hit the
+gateway in the same second even before admission. Two jobs collide if
+their expanded fields put them in the same UTC minute on some day, so
+`*/30 * * * *` and `30 6 * * *` collide at 06:30, `Europe/London` and
+`GB` are one zone, and `0 7 * * 1` and `0 7 * * 2` never collide.
+
+Queue-wait and run-time are recorded per job in fixed-bucket histograms;
+`snapshot()` returns them alongside current slot usage.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import functools
+import itertools
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from datetime import time as dt_time
+from typing import AsyncIterator, Iterable
+from zoneinfo import ZoneInfo
+
+from apscheduler.triggers.cron import CronTrigger
+
+# Priority classes — lower is admitted first.
+PRIORITY_VOICE = 0       # spoken briefings: someone is waiting to hear these
+PRIORITY_NOTIFY = 1      # text-delivered reports
+PRIORITY_SILENT = 2      # notify=false mind turns (results only logged)
+PRIORITY_COMMAND = 3     # background subprocess tasks
+
+PRIORITY_NAMES = {
+    PRIORITY_VOICE: "voice",
+    PRIORITY_NOTIFY: "notify",
+    PRIORITY_SILENT: "silent",
+    PRIORITY_COMMAND: "command",
+}
+
+# Histogram bucket upper bounds, seconds. Fires range from sub-second
+# commands to multi-minute agent turns.
+BUCKETS_S = (0.1, 0.5, 1, 5, 10, 30, 60, 120, 300, 600, 1200)
+
+
+def priority_for(voice: bool, notify: bool, command: bool) -> int:
+    if command:
+        return PRIORITY_COMMAND
+    if voice and notify:
+        return PRIORITY_VOICE
+    if notify:
+        return PRIORITY_NOTIFY
+    return PRIORITY_SILENT
+
+
+@dataclass
+class Histogram:
+    counts: list[int] = field(default_factory=lambda: [0] * (len(BUCKETS_S) + 1))
+    total: int = 0
+    sum_s: float = 0.0
+    max_s: float = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS_S, seconds)] += 1
+        self.total += 1
+        self.sum_s += seconds
+        self.max_s = max(self.max_s, seconds)
+
+    def summary(self) -> dict:
+        buckets = {f"le_{b:g}s": c for b, c in zip(BUCKETS_S, self.counts)}
+        buckets["gt_{:g}s".format(BUCKETS_S[-1])] = self.counts[-1]
+        return {
+            "count": self.total,
+            "mean_s": round(self.sum_s / self.total, 3) if self.total else 0.0,
+            "max_s": round(self.max_s, 3),
+            "buckets": buckets,
+        }
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    mind: str = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+
+
+class AdmissionController:
+    """Global + per-mind concurrency slots with priority admission."""
+
+    def __init__(self, global_slots: int, per_mind_slots: int) -> None:
+        self.global_slots = max(1, global_slots)
+        self.per_mind_slots = max(1, per_mind_slots)
+        self._running = 0
+        self._running_by_mind: dict[str, int] = {}
+        self._waiters: list[_Waiter] = []  # kept sorted by (priority, seq)
+        self._seq = itertools.count()
+        self._wait_hist: dict[str, Histogram] = {}
+        self._run_hist: dict[str, Histogram] = {}
+
+    def _can_run(self, mind: str) -> bool:
+        return (
+            self._running < self.global_slots
+            and self._running_by_mind.get(mind, 0) < self.per_mind_slots
+        )
+
+    def _take(self, mind: str) -> None:
+        self._running += 1
+        self._running_by_mind[mind] = self._running_by_mind.get(mind, 0) + 1
+
+    def _release(self, mind: str) -> None:
+        self._running -= 1
+        self._running_by_mind[mind] -= 1
+        if not self._running_by_mind[mind]:
+            del self._running_by_mind[mind]
+        self._grant()
+
+    def _grant(self) -> None:
+        """Admit waiters in priority order; a waiter whose mind is full is
+        skipped so it can't block other minds behind it."""
+        for waiter in list(self._waiters):
+            if self._running >= self.global_slots:
+                break
+            if waiter.future.done() or not self._can_run(waiter.mind):
+                continue
+            self._waiters.remove(waiter)
+            self._take(waiter.mind)
+            waiter.future.set_result(None)
+
+    @asynccontextmanager
+    async def slot(self, mind: str, priority: int, job: str) -> AsyncIterator[None]:
+        """Hold a run slot for ``job`` for the duration of the block."""
+        queued_at = time.monotonic()
+        if not self._waiters and self._can_run(mind):
+            self._take(mind)
+        else:
+            waiter = _Waiter(priority, next(self._seq), mind,
+                             asyncio.get_running_loop().create_future())
+            bisect.insort(self._waiters, waiter)
+            self._grant()
+            try:
+                await waiter.future
+            except asyncio.CancelledError:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                elif waiter.future.done() and not waiter.future.cancelled():
+                    self._release(mind)
+                raise
+        started = time.monotonic()
+        self._wait_hist.setdefault(job, Histogram()).observe(started - queued_at)
+        try:
+            yield
+        finally:
+            self._run_hist.setdefault(job, Histogram()).observe(time.monotonic() - started)
+            self._release(mind)
+
+    def snapshot(self) -> dict:
+        jobs = sorted(self._wait_hist.keys() | self._run_hist.keys())
+        return {
+            "running": self._running,
+            "running_by_mind": dict(self._running_by_mind),
+            "waiting": [
+                {"mind": w.mind, "priority": PRIORITY_NAMES.get(w.priority, w.priority)}
+                for w in self._waiters
+            ],
+            "limits": {"global": self.global_slots, "per_mind": self.per_mind_slots},
+            "jobs": {
+                job: {
+                    "queue_wait": self._wait_hist.get(job, Histogram()).summary(),
+                    "run_time": self._run_hist.get(job, Histogram()).summary(),
+                }
+                for job in jobs
+            },
+        }
+
+
+_UTC_ALIASES = frozenset({
+    "utc", "gmt", "z", "zulu", "universal", "etc/utc", "etc/gmt", "etc/zulu", "etc/universal",
+})
+# Day patterns are expanded over this many years from Jan 1 of the current
+# year: long enough for every day-of-month to meet every weekday.
+_HORIZON_YEARS = 2
+
+# One fire pattern: (UTC day ordinals, UTC minutes of day), fired at every
+# minute on every day. A cron expression is a handful of these.
+FirePattern = tuple[tuple[frozenset[int], frozenset[int]], ...]
+
+
+def _zone(timezone: str) -> ZoneInfo:
+    tz = (timezone or "UTC").strip()
+    return ZoneInfo("UTC" if tz.lower() in _UTC_ALIASES else tz)
+
+
+def _cron_values(field: str, low: int, high: int) -> frozenset[int]:
+    """Expand one numeric cron field (``*``, ``a-b``, ``*/n``, lists) to its values."""
+    values: set[int] = set()
+    for part in field.split(","):
+        span, _, step = part.partition("/")
+        if span == "*":
+            start, end = low, high
+        elif "-" in span:
+            start, end = (int(x) for x in span.split("-", 1))
+        else:
+            start = int(span)
+            end = high if step else start
+        values.update(range(start, end + 1, int(step) if step else 1))
+    return frozenset(values)
+
+
+@functools.lru_cache(maxsize=256)
+def _fire_days(day: str, month: str, day_of_week: str, timezone: str, year: int) -> tuple:
+    """``(local day ordinal, UTC offset in minutes)`` for each day the fields match.
+
+    The days come from APScheduler itself, so weekday numbering and the
+    day-of-month/weekday combination match what the scheduler fires. The
+    offset is taken at local noon; a DST change shifts times from then on.
+    """
+    zone = _zone(timezone)
+    trigger = CronTrigger(day=day, month=month, day_of_week=day_of_week, hour=0, minute=0, timezone=zone)
+    end = datetime(year + _HORIZON_YEARS, 1, 1, tzinfo=zone)
+    days = []
+    fire = trigger.get_next_fire_time(None, datetime(year, 1, 1, tzinfo=zone))
+    while fire is not None and fire < end:
+        noon = datetime.combine(fire.date(), dt_time(12), zone)
+        days.append((fire.toordinal(), int(noon.utcoffset().total_seconds()) // 60))
+        fire = trigger.get_next_fire_time(fire, fire + timedelta(seconds=1))
+    return tuple(days)
+
+
+def fire_pattern(cron: str, timezone: str, year: int | None = None) -> FirePattern:
+    """When a five-field cron expression fires, as UTC (days, minutes) pairs.
+
+    Raises ``ValueError`` (or ``KeyError`` for an unknown zone) on an
+    expression the scheduler could not run either.
+    """
+    parts = cron.split()
+    if len(parts) != 5:
+        raise ValueError(f"expected five cron fields, got {cron!r}")
+    local = [h * 60 + m for h in _cron_values(parts[1], 0, 23) for m in _cron_values(parts[0], 0, 59)]
+    by_offset: dict[int, list[int]] = {}
+    days = _fire_days(parts[2], parts[3], parts[4], timezone, year or datetime.now().year)
+    for ordinal, offset in days:
+        by_offset.setdefault(offset, []).append(ordinal)
+    pattern = []
+    for offset, ordinals in by_offset.items():
+        shifted: dict[int, set[int]] = {}
+        for minute in local:
+            shift, utc_minute = divmod(minute - offset, 24 * 60)
+            shifted.setdefault(shift, set()).add(utc_minute)
+        for shift, minutes in shifted.items():
+            pattern.append((frozenset(o + shift for o in ordinals), frozenset(minutes)))
+    return tuple(pattern)
+
+
+def collide(a: FirePattern, b: FirePattern) -> bool:
+    """Whether two patterns share at least one fire minute."""
+    return any(
+        not days_a.isdisjoint(days_b) and not mins_a.isdisjoint(mins_b)
+        for days_a, mins_a in a
+        for days_b, mins_b in b
+    )
+
+
+def cron_offsets(
+    jobs: Iterable[tuple[str, str, str, int]], spread_s: float
+) -> dict[str, float]:
+    """Start offsets that keep jobs firing in the same minute apart.
+
+    ``jobs`` yields (job_id, cron, timezone, priority). Two jobs collide if
+    :func:`fire_pattern` puts them in the same UTC minute on some day. Jobs
+    are placed highest priority (then job id) first, each in the lowest
+    slot no job it collides with holds. Slots are evenly spaced over
+    ``spread_s`` seconds; a job that collides with nothing stays at 0. An
+    expression that fails to parse collides with nothing.
+    """
+    placed: list[tuple[str, FirePattern, int]] = []
+    for priority, job_id, cron, timezone in sorted((p, j, c, tz) for j, c, tz, p in jobs):
+        try:
+            pattern = fire_pattern(cron, timezone)
+        except (ValueError, KeyError):
+            pattern = ()
+        taken = {slot for _, other, slot in placed if collide(pattern, other)}
+        placed.append((job_id, pattern, min(set(range(len(taken) + 1)) - taken)))
+    width = max((slot for _, _, slot in placed), default=0) + 1
+    return {job_id: round(slot * spread_s / width, 3) for job_id, _, slot in placed}
@@ -26,6 +26,7 @@ from telegram.ext import (
     filters,
 )
 
+from bots.voice_stream import VoiceReplyPipeline
 from config import config
 from core.gateway_client import GatewayClient, get_lock, get_queue, get_skills, time_ago
 
@@ -41,6 +42,11 @@ log = logging.getLogger("hive-mind-telegram")
 TELEGRAM_MSG_LIMIT = 4096
 SERVER_URL = os.environ.get("HIVE_MIND_SERVER_URL", f"http://localhost:{config.server_port}")
 VOICE_SERVER_URL = os.environ.get("VOICE_SERVER_URL", "http://localhost:8422")
+# "sentences" (default): voice notes start while the reply is still streaming,
+# one per segment of up to TELEGRAM_VOICE_SEGMENT_CHARS. "whole": one voice
+# note for the complete reply, sent after the text.
+VOICE_MODE = os.environ.get("TELEGRAM_VOICE_MODE", "sentences").lower()
+VOICE_SEGMENT_CHARS = int(os.environ.get("TELEGRAM_VOICE_SEGMENT_CHARS", "400"))
 
 # Surface-specific system prompt appended when spawning Telegram sessions.
 # Telegram renders plain text only; voice output is spoken aloud.
@@ -61,6 +67,9 @@ TELEGRAM_SURFACE_PROMPT = (
 http: aiohttp.ClientSession | None = None
 gateway: GatewayClient | None = None
 
+# Detached voice-delivery tasks, held so they aren't garbage-collected mid-send.
+_voice_tasks: set[asyncio.Task] = set()
+
 
 # ---------------------------------------------------------------------------
 # Auth helpers
@@ -149,32 +158,58 @@ async def _stream_to_message(
 
     Returns the final list of message chunks.
 
-    When voice=True, the full response is converted to a single voice message
-    after streaming completes, so text arrives progressively and voice follows.
+    When voice=True, the reply is also spoken. In the default "sentences"
+    mode, sentences are cut out of the stream as they arrive and synthesised
+    concurrently, so the first voice note lands after one sentence instead
+    of after the whole reply; segments are sent in order. In "whole" mode
+    the full response becomes a single voice message after streaming
+    completes. Either way the time to first audio is logged.
     """
     accumulated = ""
     last_edit = 0.0
+    started = time.perf_counter()
 
-    async for text_chunk in gateway.query_stream(user_id, chat_id, prompt, images=images):
-        # Concatenate without separator. Per-token deltas (when the mind has
-        # --include-partial-messages enabled) include their own whitespace;
-        # buffered assistant text already has its own paragraph breaks.
-        accumulated += text_chunk
-        now = time.monotonic()
-        if now - last_edit >= edit_interval:
-            preview = _chunk_message(accumulated)[0]
-            try:
-                await sent.edit_text(preview)
-            except Exception:
-                pass  # MessageNotModified or rate limit — skip this update
-            last_edit = now
+    pipeline = None
+    if voice and chat and VOICE_MODE == "sentences":
+        async def _send_segment(ogg: bytes) -> None:
+            await chat.send_voice(voice=io.BytesIO(ogg))
 
-    if not accumulated:
-        accumulated = (
-            "ERROR: mind stream closed with no text output. "
-            "Check the mind container logs for the real failure."
+        pipeline = VoiceReplyPipeline(
+            _tts, _send_segment, segment_chars=VOICE_SEGMENT_CHARS, started=started,
         )
 
+    try:
+        async for text_chunk in gateway.query_stream(user_id, chat_id, prompt, images=images):
+            # Concatenate without separator. Per-token deltas (when the mind has
+            # --include-partial-messages enabled) include their own whitespace;
+            # buffered assistant text already has its own paragraph breaks.
+            accumulated += text_chunk
+            if pipeline:
+                pipeline.feed(text_chunk)
+            now = time.monotonic()
+            if now - last_edit >= edit_interval:
+                preview = _chunk_message(accumulated)[0]
+                try:
+                    await sent.edit_text(preview)
+                except Exception:
+                    pass  # MessageNotModified or rate limit — skip this update
+                last_edit = now
+
+        if not accumulated:
+            accumulated = (
+                "ERROR: mind stream closed with no text output. "
+                "Check the mind container logs for the real failure."
+            )
+            if pipeline:
+                pipeline.feed(accumulated)
+    finally:
+        # Whatever arrived is spoken, even if the stream broke off. The
+        # remaining segments drain detached, like the "whole" voice note.
+        if pipeline:
+            task = pipeline.finish()
+            _voice_tasks.add(task)
+            task.add_done_callback(_voice_tasks.discard)
+
     final_chunks = [_sanitize_response(c) for c in _chunk_message(accumulated)]
     try:
         await sent.edit_text(final_chunks[0])
@@ -187,16 +222,19 @@ async def _stream_to_message(
     # done. Without this, holding the lock through TTS makes follow-up
     # messages queue up and creates the "response held until next message"
     # n+1 sync glitch.
-    if voice and chat:
+    if voice and chat and not pipeline:
         full_text = accumulated.strip()
         if full_text:
             async def _send_voice_bg() -> None:
                 try:
                     ogg = await _tts(full_text)
                     await chat.send_voice(voice=io.BytesIO(ogg))
+                    log.info("Voice reply: first audio after %.2fs", time.perf_counter() - started)
                 except Exception:
                     log.warning("Final voice TTS/send failed", exc_info=True)
-            asyncio.create_task(_send_voice_bg())
+            task = asyncio.create_task(_send_voice_bg())
+            _voice_tasks.add(task)
+            task.add_done_callback(_voice_tasks.discard)
 
     return final_chunks
 
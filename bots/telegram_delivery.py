@@ -0,0 +1,383 @@
+"""Telegram delivery for the scheduler — one pooled client, paced and durable.
+
+Every outgoing message (text slice or voice note) becomes a spool record
+under ``spool_dir`` before the first send attempt and is deleted once
+Telegram accepts it or rejects it for good, so a scheduler restart
+resumes undelivered reports instead of dropping them. Records are sent
+per chat in FIFO order — a chat whose head message is backing off holds
+the rest of its queue, so a report's slices and its voice note never
+arrive out of order.
+
+Pacing follows Telegram's published bot limits: about one message per
+second to a private chat, twenty per minute to a group (negative chat
+ids), and thirty per second across the whole bot. A 429 honours the
+``retry_after`` Telegram returns; 5xx and network errors back off
+exponentially; other 4xx responses are logged and dropped.
+
+Each message is tagged with the job that produced it. Per-job counters
+(sent, failed, retries, bytes, enqueue-to-delivery latency, throughput)
+are available from :meth:`TelegramDelivery.stats` and logged when a job's
+last pending message settles.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+import uuid
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+import aiohttp
+
+log = logging.getLogger("hive-mind-scheduler.delivery")
+
+TELEGRAM_API = "https://api.telegram.org"
+TELEGRAM_MSG_LIMIT = 4096
+
+PRIVATE_CHAT_INTERVAL_S = 1.0
+GROUP_CHAT_INTERVAL_S = 60.0 / 20
+GLOBAL_INTERVAL_S = 1.0 / 30
+MAX_BACKOFF_S = 300.0
+
+
+# ---------------------------------------------------------------------------
+# Splitting
+# ---------------------------------------------------------------------------
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def _pack(pieces: list[str], sep: str, limit: int) -> list[str]:
+    """Greedily join ``pieces`` with ``sep`` into chunks of at most ``limit``."""
+    chunks: list[str] = []
+    current = ""
+    for piece in pieces:
+        candidate = f"{current}{sep}{piece}" if current else piece
+        if len(candidate) <= limit:
+            current = candidate
+            continue
+        if current:
+            chunks.append(current)
+        current = piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def split_message(text: str, limit: int = TELEGRAM_MSG_LIMIT) -> list[str]:
+    """Split ``text`` into Telegram-sized chunks along natural boundaries.
+
+    Paragraphs are kept whole where they fit; an oversized paragraph is
+    split on lines, then sentences, then words, and only a single word
+    longer than ``limit`` is cut mid-token.
+    """
+    if len(text) <= limit:
+        return [text]
+
+    def _split(block: str, level: int) -> list[str]:
+        if len(block) <= limit:
+            return [block]
+        if level == 0:
+            parts, sep = block.split("\n\n"), "\n\n"
+        elif level == 1:
+            parts, sep = block.split("\n"), "\n"
+        elif level == 2:
+            parts, sep = _SENTENCE_END.split(block), " "
+        elif level == 3:
+            parts, sep = block.split(" "), " "
+        else:
+            return [block[i:i + limit] for i in range(0, len(block), limit)]
+        pieces: list[str] = []
+        for part in parts:
+            pieces.extend(_split(part, level + 1) if len(part) > limit else [part])
+        return _pack(pieces, sep, limit)
+
+    return [chunk for chunk in _split(text, 0) if chunk.strip()]
+
+
+# ---------------------------------------------------------------------------
+# Pacing + stats
+# ---------------------------------------------------------------------------
+
+class _Spacer:
+    """Hands out send slots at least ``interval`` seconds apart."""
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._next = 0.0
+
+    async def wait(self) -> None:
+        now = time.monotonic()
+        slot = max(now, self._next)
+        self._next = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+@dataclass
+class JobStats:
+    enqueued: int = 0
+    sent: int = 0
+    failed: int = 0
+    retries: int = 0
+    bytes_sent: int = 0
+    first_enqueued_at: float | None = None
+    last_settled_at: float | None = None
+    latencies_ms: deque = field(default_factory=lambda: deque(maxlen=200))
+
+    def summary(self) -> dict:
+        out = {
+            "enqueued": self.enqueued,
+            "sent": self.sent,
+            "failed": self.failed,
+            "retries": self.retries,
+            "bytes_sent": self.bytes_sent,
+        }
+        if self.latencies_ms:
+            ordered = sorted(self.latencies_ms)
+            last = len(ordered) - 1
+            out["latency_p50_ms"] = round(ordered[last // 2], 1)
+            out["latency_p95_ms"] = round(ordered[int(last * 0.95)], 1)
+        if self.first_enqueued_at and self.last_settled_at:
+            span = max(self.last_settled_at - self.first_enqueued_at, 1e-6)
+            out["messages_per_s"] = round(self.sent / span, 3)
+        return out
+
+
+# ---------------------------------------------------------------------------
+# Spool records
+# ---------------------------------------------------------------------------
+
+@dataclass
+class _Delivery:
+    id: str
+    job: str
+    chat_id: int
+    method: str  # "sendMessage" | "sendVoice"
+    text: str = ""
+    audio_bytes: int = 0  # length of the spooled .ogg for sendVoice
+    attempts: int = 0
+    next_at: float = 0.0  # wall clock, so it survives a restart
+    created_at: float = 0.0
+
+    @property
+    def size(self) -> int:
+        return len(self.text.encode()) + self.audio_bytes
+
+
+class TelegramDelivery:
+    """Durable, rate-limited Telegram sender shared by every scheduler job."""
+
+    def __init__(
+        self,
+        bot_token: str,
+        spool_dir: Path,
+        *,
+        api_base: str = TELEGRAM_API,
+        max_attempts: int = 8,
+        http: aiohttp.ClientSession | None = None,
+    ) -> None:
+        self.bot_token = bot_token
+        self.spool_dir = Path(spool_dir)
+        self.api_base = api_base.rstrip("/")
+        self.max_attempts = max_attempts
+        self._http = http
+        self._owns_http = http is None
+        self._queues: dict[int, deque[_Delivery]] = {}
+        self._workers: dict[int, asyncio.Task] = {}
+        self._chat_spacers: dict[int, _Spacer] = {}
+        self._global = _Spacer(GLOBAL_INTERVAL_S)
+        self._jobs: dict[str, JobStats] = {}
+        self._pending_by_job: dict[str, int] = {}
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    # -- lifecycle ---------------------------------------------------------
+
+    async def start(self) -> None:
+        """Open the pooled client and resume anything left in the spool."""
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        if self._http is None or self._http.closed:
+            self._http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=8, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=60),
+            )
+            self._owns_http = True
+        resumed = 0
+        for path in sorted(self.spool_dir.glob("*.json")):
+            try:
+                item = _Delivery(**json.loads(path.read_text()))
+            except (OSError, ValueError, TypeError):
+                log.warning("Discarding unreadable spool record %s", path.name)
+                path.unlink(missing_ok=True)
+                continue
+            self._enqueue(item, persist=False)
+            resumed += 1
+        if resumed:
+            log.info("Resumed %d undelivered Telegram message(s) from %s", resumed, self.spool_dir)
+
+    async def close(self) -> None:
+        for task in self._workers.values():
+            task.cancel()
+        self._workers.clear()
+        if self._owns_http and self._http is not None:
+            await self._http.close()
+
+    async def drain(self) -> None:
+        """Wait until every queued message has settled (tests, shutdown)."""
+        await self._idle.wait()
+
+    # -- public API --------------------------------------------------------
+
+    def send_text(self, chat_id: int, text: str, job: str = "") -> int:
+        """Queue ``text`` (split on paragraph boundaries); returns slice count."""
+        chunks = split_message(text) if text else [""]
+        for chunk in chunks:
+            self._enqueue(self._new(job, chat_id, "sendMessage", text=chunk))
+        return len(chunks)
+
+    def send_voice(self, chat_id: int, audio: bytes, job: str = "") -> None:
+        item = self._new(job, chat_id, "sendVoice")
+        item.audio_bytes = len(audio)
+        self._audio_path(item).write_bytes(audio)
+        self._enqueue(item)
+
+    def stats(self, job: str | None = None) -> dict:
+        if job is not None:
+            return self._jobs[job].summary() if job in self._jobs else {}
+        return {name: s.summary() for name, s in self._jobs.items()}
+
+    # -- internals ---------------------------------------------------------
+
+    def _new(self, job: str, chat_id: int, method: str, text: str = "") -> _Delivery:
+        now = time.time()
+        return _Delivery(
+            id=f"{time.time_ns():020d}-{uuid.uuid4().hex[:8]}",
+            job=job,
+            chat_id=int(chat_id),
+            method=method,
+            text=text,
+            next_at=now,
+            created_at=now,
+        )
+
+    def _record_path(self, item: _Delivery) -> Path:
+        return self.spool_dir / f"{item.id}.json"
+
+    def _audio_path(self, item: _Delivery) -> Path:
+        return self.spool_dir / f"{item.id}.ogg"
+
+    def _persist(self, item: _Delivery) -> None:
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.spool_dir / f".{item.id}.tmp"
+        tmp.write_text(json.dumps(asdict(item)))
+        os.replace(tmp, self._record_path(item))
+
+    def _forget(self, item: _Delivery) -> None:
+        self._record_path(item).unlink(missing_ok=True)
+        self._audio_path(item).unlink(missing_ok=True)
+
+    def _enqueue(self, item: _Delivery, persist: bool = True) -> None:
+        if persist:
+            self._persist(item)
+        stats = self._jobs.setdefault(item.job, JobStats())
+        stats.enqueued += 1
+        if stats.first_enqueued_at is None:
+            stats.first_enqueued_at = time.time()
+        self._pending_by_job[item.job] = self._pending_by_job.get(item.job, 0) + 1
+        self._queues.setdefault(item.chat_id, deque()).append(item)
+        self._idle.clear()
+        task = self._workers.get(item.chat_id)
+        if task is None or task.done():
+            self._workers[item.chat_id] = asyncio.create_task(self._chat_worker(item.chat_id))
+
+    def _chat_spacer(self, chat_id: int) -> _Spacer:
+        if chat_id not in self._chat_spacers:
+            interval = GROUP_CHAT_INTERVAL_S if chat_id < 0 else PRIVATE_CHAT_INTERVAL_S
+            self._chat_spacers[chat_id] = _Spacer(interval)
+        return self._chat_spacers[chat_id]
+
+    async def _chat_worker(self, chat_id: int) -> None:
+        queue = self._queues[chat_id]
+        while queue:
+            item = queue[0]
+            delay = item.next_at - time.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await self._chat_spacer(chat_id).wait()
+            await self._global.wait()
+            outcome, retry_after = await self._attempt(item)
+            stats = self._jobs[item.job]
+            if outcome == "retry" and item.attempts + 1 < self.max_attempts:
+                item.attempts += 1
+                stats.retries += 1
+                backoff = retry_after if retry_after is not None else min(2 ** item.attempts, MAX_BACKOFF_S)
+                item.next_at = time.time() + backoff
+                self._persist(item)
+                log.warning(
+                    "Telegram %s for job %s failed (attempt %d), retrying in %.1fs",
+                    item.method, item.job or "-", item.attempts, backoff,
+                )
+                continue
+            queue.popleft()
+            self._forget(item)
+            self._settle(item, sent=outcome == "sent")
+        self._queues.pop(chat_id, None)
+        self._workers.pop(chat_id, None)
+        if not self._queues:
+            self._idle.set()
+
+    def _settle(self, item: _Delivery, sent: bool) -> None:
+        stats = self._jobs[item.job]
+        now = time.time()
+        stats.last_settled_at = now
+        if sent:
+            stats.sent += 1
+            stats.bytes_sent += item.size
+            stats.latencies_ms.append((now - item.created_at) * 1000)
+        else:
+            stats.failed += 1
+            log.error("Dropping Telegram %s for job %s after %d attempt(s)",
+                      item.method, item.job or "-", item.attempts + 1)
+        self._pending_by_job[item.job] -= 1
+        if self._pending_by_job[item.job] == 0:
+            log.info("Delivery for %s settled: %s", item.job or "-", json.dumps(stats.summary()))
+
+    async def _attempt(self, item: _Delivery) -> tuple[str, float | None]:
+        """One send. Returns ("sent" | "retry" | "dropped", retry_after)."""
+        url = f"{self.api_base}/bot{self.bot_token}/{item.method}"
+        try:
+            if item.method == "sendVoice":
+                audio = self._audio_path(item).read_bytes()
+                form = aiohttp.FormData()
+                form.add_field("chat_id", str(item.chat_id))
+                form.add_field("voice", audio, filename="response.ogg", content_type="audio/ogg")
+                request = self._http.post(url, data=form)
+            else:
+                request = self._http.post(url, json={"chat_id": str(item.chat_id), "text": item.text})
+            async with request as resp:
+                try:
+                    body = await resp.json(content_type=None)
+                except (ValueError, aiohttp.ContentTypeError):
+                    body = {}
+                if resp.status == 200:
+                    return "sent", None
+                if resp.status == 429:
+                    params = (body or {}).get("parameters") or {}
+                    return "retry", params.get("retry_after")
+                if resp.status >= 500:
+                    return "retry", None
+                log.error("Telegram %s rejected (HTTP %d): %s",
+                          item.method, resp.status, (body or {}).get("description", ""))
+                return "dropped", None
+        except FileNotFoundError:
+            log.error("Voice payload for spool record %s is missing", item.id)
+            return "dropped", None
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return "retry", None
@@ -0,0 +1,168 @@
+"""Sentence-pipelined voice replies for the chat bots.
+
+A reply streams out of the gateway as text deltas. Rather than wait for the
+whole reply and synthesise it in one call, :class:`SentenceCutter` cuts
+complete sentences out of the deltas as they arrive and
+:class:`VoiceReplyPipeline` synthesises each segment as soon as it is cut
+-- while the model is still writing the rest -- and delivers the audio
+strictly in order.
+
+The first segment is a single sentence, so the first audio is ready after
+one sentence of generation and one sentence of synthesis. Later segments
+pack several sentences (up to ``segment_chars``) so a long reply becomes a
+handful of voice notes, not one per sentence.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import time
+from typing import Awaitable, Callable
+
+log = logging.getLogger("hive-mind.voice-stream")
+
+# Punctuation that ends a sentence, any closing quote/bracket, then
+# whitespace -- or a line break. The trailing whitespace is what tells a
+# finished sentence apart from one whose next delta hasn't arrived yet.
+_BOUNDARY = re.compile(r"[.!?]+[\"')\]]*\s+|\n+")
+_ABBREVIATIONS = frozenset({
+    "mr", "mrs", "ms", "dr", "st", "jr", "sr", "vs", "etc", "prof",
+    "e.g", "i.e", "approx", "inc", "ltd", "co",
+})
+
+
+class SentenceCutter:
+    """Cut speakable segments out of a stream of text deltas.
+
+    ``feed`` returns the segments completed by a delta; ``flush`` returns
+    whatever is left once the stream ends.
+    """
+
+    def __init__(self, segment_chars: int = 400):
+        self.segment_chars = segment_chars
+        self._pending = ""                 # text not yet ending in a boundary
+        self._sentences: list[str] = []    # complete sentences not yet emitted
+        self._emitted = 0
+
+    def feed(self, delta: str) -> list[str]:
+        self._pending += delta
+        cut = 0
+        for match in _BOUNDARY.finditer(self._pending):
+            words = self._pending[cut:match.start()].rsplit(None, 1)
+            if words and words[-1].rstrip(".").lower() in _ABBREVIATIONS and match.group().startswith("."):
+                continue  # "Dr. Smith" -- not a sentence end
+            sentence = self._pending[cut:match.end()].strip()
+            if sentence:
+                self._sentences.append(sentence)
+            cut = match.end()
+        self._pending = self._pending[cut:]
+
+        out = []
+        # First segment: one sentence, as early as possible. After that,
+        # batch sentences so a long reply isn't dozens of voice notes.
+        if self._emitted == 0 and self._sentences:
+            out.append(self._take(1))
+        while sum(len(s) + 1 for s in self._sentences) > self.segment_chars:
+            out.append(self._take(self._fits()))
+        return out
+
+    def flush(self) -> list[str]:
+        if self._pending.strip():
+            self._sentences.append(self._pending.strip())
+        self._pending = ""
+        return [self._take(len(self._sentences))] if self._sentences else []
+
+    def _fits(self) -> int:
+        """How many leading sentences fit in one segment (at least one)."""
+        size = 0
+        for n, sentence in enumerate(self._sentences):
+            size += len(sentence) + 1
+            if size > self.segment_chars + 1:
+                return max(n, 1)
+        return len(self._sentences)
+
+    def _take(self, n: int) -> str:
+        segment = " ".join(self._sentences[:n])
+        del self._sentences[:n]
+        self._emitted += 1
+        return segment
+
+
+class VoiceReplyPipeline:
+    """Synthesise a streaming reply segment by segment; deliver audio in order.
+
+    ``synth(text)`` returns encoded audio for one segment; ``deliver(audio)``
+    sends it. Up to ``max_in_flight`` segments synthesise concurrently;
+    delivery always follows reply order. Call :meth:`feed` with each delta
+    and :meth:`finish` when the stream ends; ``finish`` returns the task
+    that drains the remaining segments.
+    """
+
+    def __init__(
+        self,
+        synth: Callable[[str], Awaitable[bytes]],
+        deliver: Callable[[bytes], Awaitable[None]],
+        segment_chars: int = 400,
+        max_in_flight: int = 2,
+        started: float | None = None,
+    ):
+        self._synth = synth
+        self._deliver = deliver
+        self._cutter = SentenceCutter(segment_chars)
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._order: asyncio.Queue[asyncio.Task | None] = asyncio.Queue()
+        self._started = started if started is not None else time.perf_counter()
+        self._finished = False
+        self.segments = 0
+        self.delivered = 0
+        self.failed = 0
+        self.first_audio_s: float | None = None
+        self._sender = asyncio.create_task(self._send_in_order())
+
+    def feed(self, delta: str) -> None:
+        for segment in self._cutter.feed(delta):
+            self._submit(segment)
+
+    def finish(self) -> asyncio.Task:
+        if not self._finished:
+            self._finished = True
+            for segment in self._cutter.flush():
+                self._submit(segment)
+            self._order.put_nowait(None)
+        return self._sender
+
+    def _submit(self, segment: str) -> None:
+        self.segments += 1
+        self._order.put_nowait(asyncio.create_task(self._synthesise(segment)))
+
+    async def _synthesise(self, segment: str) -> bytes:
+        async with self._slots:
+            return await self._synth(segment)
+
+    async def _send_in_order(self) -> None:
+        while (task := await self._order.get()) is not None:
+            try:
+                await self._deliver(await task)
+            except Exception:
+                self.failed += 1
+                log.warning("Voice segment %d TTS/send failed", self.delivered + self.failed, exc_info=True)
+                continue
+            self.delivered += 1
+            if self.first_audio_s is None:
+                self.first_audio_s = time.perf_counter() - self._started
+                log.info("Voice reply: first audio after %.2fs", self.first_audio_s)
+        log.info(
+            "Voice reply: %d/%d segments delivered (first audio %s)",
+            self.delivered, self.segments,
+            f"{self.first_audio_s:.2f}s" if self.first_audio_s is not None else "never",
+        )
+
+    def stats(self) -> dict:
+        return {
+            "segments": self.segments,
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "first_audio_s": self.first_audio_s,
+        }
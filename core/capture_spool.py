@@ -0,0 +1,338 @@
+"""Capture spool: Stop hooks enqueue, a background worker ingests.
+
+Parsing a transcript and upserting its turns inline keeps the harness turn
+open until capture finishes, so a locked training DB or a huge transcript
+adds latency to every turn. With a spool configured, the Stop hook
+(:mod:`core.stop_hook`) only drops a small JSON record::
+
+    {"transcript_path": ..., "session_id": ..., "harness": ...,
+     "mind_id": ..., "config_dir": ..., "enqueued_at": ..., "attempts": 0}
+
+into ``spool_dir`` (tmp file + ``os.replace``, so a reader never sees half
+a record) and returns. File names start with ``time.time_ns()``, so a
+sorted listing is FIFO and the oldest record's age is known without
+reading it.
+
+:class:`IngestWorker` drains the spool in batches:
+
+- **Dedupe.** Repeated fires for the same transcript collapse to the latest
+  record. One capture of the transcript covers every fire before it.
+- **Batch.** Every capture in a batch is parsed first, then committed in
+  one ``BEGIN IMMEDIATE`` transaction through
+  :meth:`core.training_capture.TrainingStore.batch`.
+- **At-least-once.** Records are deleted only after the commit, and only
+  for transcripts that captured. A failed commit leaves the whole batch for
+  the next poll. A capture that raises leaves its transcript's latest
+  record in place with ``attempts`` bumped. After ``max_attempts`` the
+  record moves to ``spool_dir/dead`` for inspection. Skill telemetry is
+  bumped after the commit, so a retried batch never counts a skill twice.
+
+Backpressure: :func:`enqueue` refuses once ``max_pending`` records are
+waiting. The hook then captures inline, which slows the producers down
+until the worker catches up, and no fire is lost. The worker's
+:meth:`IngestWorker.stats` reports spool depth, oldest-record age (spool
+lag), enqueue-to-commit lag percentiles, and batch and dedupe counters.
+With ``metrics_path`` set, they are also written as JSON after every
+batch.
+
+Run the worker with::
+
+    python -m core.capture_spool --spool data/capture_spool
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from core import stop_hook
+from core.training_capture import get_store
+from core.training_capture_claude import default_db_path
+
+log = logging.getLogger("hive-mind.capture-spool")
+
+DEFAULT_MAX_PENDING = 10_000
+DEFAULT_BATCH_MAX = 500
+DEFAULT_POLL_S = 1.0
+DEFAULT_MAX_ATTEMPTS = 5
+DEAD_LETTER_DIR = "dead"
+
+
+@dataclass
+class SpoolRecord:
+    """One Stop-hook fire waiting to be ingested."""
+
+    transcript_path: str
+    session_id: str
+    harness: str
+    mind_id: str | None = None
+    config_dir: str | None = None
+    enqueued_at: float = 0.0
+    attempts: int = 0       # captures of this record that raised
+
+    @property
+    def key(self) -> tuple[str, str]:
+        return (self.harness, self.transcript_path)
+
+
+def _listing(spool_dir: Path) -> list[str]:
+    """Record file names in FIFO order (tmp files start with a dot)."""
+    try:
+        names = os.listdir(spool_dir)
+    except OSError:
+        return []
+    return sorted(n for n in names if n.endswith(".json") and not n.startswith("."))
+
+
+def pending_count(spool_dir: str | Path) -> int:
+    return len(_listing(Path(spool_dir)))
+
+
+def _write_record(path: Path, record: SpoolRecord) -> None:
+    tmp = path.with_name(f".{path.stem}.tmp")
+    tmp.write_text(json.dumps(asdict(record)))
+    os.replace(tmp, path)
+
+
+def enqueue(
+    spool_dir: str | Path,
+    record: SpoolRecord,
+    *,
+    max_pending: int = DEFAULT_MAX_PENDING,
+) -> bool:
+    """Write ``record`` into the spool; ``False`` if the spool is full."""
+    spool = Path(spool_dir)
+    spool.mkdir(parents=True, exist_ok=True)
+    if pending_count(spool) >= max_pending:
+        return False
+    if not record.enqueued_at:
+        record.enqueued_at = time.time()
+    rid = f"{time.time_ns():020d}-{uuid.uuid4().hex[:8]}"
+    _write_record(spool / f"{rid}.json", record)
+    return True
+
+
+@dataclass
+class IngestStats:
+    consumed: int = 0       # spool records removed
+    deduped: int = 0        # records folded into a later fire for the same transcript
+    captures: int = 0       # transcripts captured
+    failed: int = 0         # unreadable records and captures that raised
+    retried: int = 0        # failed captures left in the spool for another attempt
+    dead_lettered: int = 0  # records moved to the dead-letter directory
+    batches: int = 0        # committed transactions
+    commit_errors: int = 0  # batches left in the spool for a retry
+    last_batch_ms: float = 0.0
+    lags_s: deque = field(default_factory=lambda: deque(maxlen=1000))
+
+    def summary(self) -> dict:
+        out = {
+            "consumed": self.consumed,
+            "deduped": self.deduped,
+            "captures": self.captures,
+            "failed": self.failed,
+            "retried": self.retried,
+            "dead_lettered": self.dead_lettered,
+            "batches": self.batches,
+            "commit_errors": self.commit_errors,
+            "last_batch_ms": round(self.last_batch_ms, 1),
+        }
+        if self.lags_s:
+            ordered = sorted(self.lags_s)
+            last = len(ordered) - 1
+            out["lag_p50_s"] = round(ordered[last // 2], 3)
+            out["lag_p95_s"] = round(ordered[int(last * 0.95)], 3)
+        return out
+
+
+class IngestWorker:
+    """Drains a capture spool into the training DB."""
+
+    def __init__(
+        self,
+        spool_dir: str | Path,
+        db_path: str | Path | None = None,
+        *,
+        batch_max: int = DEFAULT_BATCH_MAX,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        poll_s: float = DEFAULT_POLL_S,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        metrics_path: str | Path | None = None,
+    ) -> None:
+        self.spool_dir = Path(spool_dir)
+        self.db_path = Path(db_path) if db_path is not None else default_db_path()
+        self.batch_max = batch_max
+        self.max_pending = max_pending
+        self.poll_s = poll_s
+        self.max_attempts = max_attempts
+        self.metrics_path = Path(metrics_path) if metrics_path else None
+        self._stats = IngestStats()
+
+    def _load(self, names: list[str]) -> list[tuple[Path, SpoolRecord | None]]:
+        loaded = []
+        for name in names:
+            path = self.spool_dir / name
+            try:
+                record = SpoolRecord(**json.loads(path.read_text()))
+            except (OSError, ValueError, TypeError):
+                log.warning("Discarding unreadable spool record %s", name)
+                record = None
+            loaded.append((path, record))
+        return loaded
+
+    def _retry(self, path: Path, record: SpoolRecord) -> None:
+        """Keep a failed record for the next poll, or dead-letter it."""
+        record.attempts += 1
+        try:
+            if record.attempts < self.max_attempts:
+                _write_record(path, record)
+                self._stats.retried += 1
+                return
+            dead = self.spool_dir / DEAD_LETTER_DIR
+            dead.mkdir(exist_ok=True)
+            _write_record(dead / path.name, record)
+            path.unlink(missing_ok=True)
+        except OSError as exc:
+            log.warning("Could not update failed spool record %s: %s", path.name, exc)
+            return
+        log.error("Giving up on %s after %d attempts; moved to %s",
+                  record.transcript_path, record.attempts, dead)
+        self._stats.dead_lettered += 1
+
+    def drain_once(self) -> int:
+        """Ingest up to ``batch_max`` records; return how many were consumed."""
+        loaded = self._load(_listing(self.spool_dir)[: self.batch_max])
+        if not loaded:
+            return 0
+        latest: dict[tuple[str, str], tuple[Path, SpoolRecord]] = {}
+        for path, record in loaded:
+            if record is not None:
+                latest.pop(record.key, None)  # re-insert: keep FIFO by latest fire
+                latest[record.key] = (path, record)
+        records = [r for _p, r in loaded if r is not None]
+
+        start = time.perf_counter()
+        fired: list[tuple[SpoolRecord, set[str]]] = []
+        failed_keys: set[tuple[str, str]] = set()
+        failed = len(loaded) - len(records)
+        try:
+            with get_store(self.db_path).batch():
+                for _path, record in latest.values():
+                    try:
+                        _written, names = stop_hook.capture_transcript(
+                            record.transcript_path, harness=record.harness,
+                            session_id=record.session_id, mind_id=record.mind_id,
+                            db_path=self.db_path,
+                        )
+                    except Exception:
+                        log.exception("Capture failed for %s", record.transcript_path)
+                        failed += 1
+                        failed_keys.add(record.key)
+                        continue
+                    fired.append((record, names))
+        except Exception:
+            log.exception("Ingest batch of %d record(s) failed; leaving it in the spool", len(loaded))
+            self._stats.commit_errors += 1
+            return 0
+
+        consumed = 0
+        for path, record in loaded:
+            if record is not None and record.key in failed_keys:
+                if path == latest[record.key][0]:
+                    self._retry(path, record)
+                    continue
+            path.unlink(missing_ok=True)  # captured, or folded into the latest fire
+            consumed += 1
+        for record, names in fired:
+            stop_hook.bump_fired_skills(record.config_dir, names)
+
+        now = time.time()
+        stats = self._stats
+        stats.consumed += consumed
+        stats.deduped += len(records) - len(latest)
+        stats.captures += len(fired)
+        stats.failed += failed
+        stats.batches += 1
+        stats.last_batch_ms = (time.perf_counter() - start) * 1000
+        stats.lags_s.extend(now - r.enqueued_at for r in records if r.enqueued_at)
+        self._write_metrics()
+        return consumed
+
+    def stats(self) -> dict:
+        """Counters plus current spool depth and lag."""
+        names = _listing(self.spool_dir)
+        out = self._stats.summary()
+        out["pending"] = len(names)
+        out["max_pending"] = self.max_pending
+        out["backpressure"] = len(names) >= self.max_pending
+        oldest = 0.0
+        if names:
+            try:
+                oldest = max(time.time() - int(names[0].split("-", 1)[0]) / 1e9, 0.0)
+            except ValueError:
+                pass
+        out["oldest_age_s"] = round(oldest, 3)
+        return out
+
+    def _write_metrics(self) -> None:
+        if self.metrics_path is None:
+            return
+        snapshot = {"updated_at": time.time(), **self.stats()}
+        try:
+            self.metrics_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.metrics_path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(snapshot, indent=2))
+            os.replace(tmp, self.metrics_path)
+        except OSError as exc:
+            log.warning("Could not write ingest metrics to %s: %s", self.metrics_path, exc)
+
+    def run(self, stop: threading.Event | None = None) -> None:
+        """Drain until ``stop`` is set; sleep ``poll_s`` when the spool is empty."""
+        stop = stop or threading.Event()
+        log.info("Ingesting %s into %s", self.spool_dir, self.db_path)
+        while not stop.is_set():
+            if self.drain_once() < self.batch_max:
+                stop.wait(self.poll_s)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Drain the training-capture spool into the training DB.")
+    parser.add_argument("--spool", default=os.environ.get("CAPTURE_SPOOL_DIR"), required="CAPTURE_SPOOL_DIR" not in os.environ)
+    parser.add_argument("--db", default=None, help="training DB (default: runtime DB / $TRAINING_DB_PATH)")
+    parser.add_argument("--batch-max", type=int, default=DEFAULT_BATCH_MAX)
+    parser.add_argument("--max-pending", type=int, default=DEFAULT_MAX_PENDING)
+    parser.add_argument("--poll", type=float, default=DEFAULT_POLL_S, help="seconds between polls when idle")
+    parser.add_argument("--max-attempts", type=int, default=DEFAULT_MAX_ATTEMPTS,
+                        help="failed captures of a record before it is dead-lettered")
+    parser.add_argument("--metrics", help="write stats JSON here after every batch")
+    parser.add_argument("--once", action="store_true", help="drain what is there, print stats, exit")
+    args = parser.parse_args(argv)
+
+    worker = IngestWorker(
+        args.spool, args.db, batch_max=args.batch_max, max_pending=args.max_pending,
+        poll_s=args.poll, max_attempts=args.max_attempts, metrics_path=args.metrics,
+    )
+    if args.once:
+        while worker.drain_once():
+            pass
+        print(json.dumps(worker.stats(), indent=2))
+        return 0
+    try:
+        worker.run()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    sys.exit(main())
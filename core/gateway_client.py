@@ -6,15 +6,18 @@ stay thin and don't duplicate code.
 """
 
 import asyncio
-import glob
+import codecs
 import json
 import os
-import re
+import time
+from dataclasses import dataclass
 from datetime import datetime
-from typing import AsyncGenerator
+from typing import AsyncGenerator, AsyncIterator
 
 import aiohttp
 
+from core.skill_index import skills_dir_index
+
 _locks: dict[int, asyncio.Lock] = {}
 _chat_queues: dict[int, asyncio.Queue] = {}
 
@@ -40,32 +43,24 @@ def _resolve_skills_dir() -> str:
     return os.path.expanduser("~/.claude/skills")
 
 
+# Autocomplete calls get_skills() on every keystroke; a second of staleness
+# is fine there and saves a stat pass per key.
+SKILLS_REFRESH_S = 1.0
+
+
 def get_skills() -> list[dict]:
-    """Read all user-invocable skills from SKILL.md files."""
-    skills = []
-    skills_dir = _resolve_skills_dir()
-    for path in sorted(glob.glob(os.path.join(skills_dir, "*/SKILL.md"))):
-        try:
-            with open(path) as f:
-                content = f.read()
-            m = re.match(r"^---\n(.*?)\n---", content, re.DOTALL)
-            if not m:
-                continue
-            fm: dict[str, str] = {}
-            for line in m.group(1).split("\n"):
-                if ":" in line:
-                    k, _, v = line.partition(":")
-                    fm[k.strip()] = v.strip().strip('"').strip("'")
-            invocable = fm.get("user-invocable", fm.get("user_invocable", "")).lower()
-            if invocable == "true" and (name := fm.get("name", "")):
-                skills.append({
-                    "name": name,
-                    "description": fm.get("description", "")[:100],
-                    "argument_hint": fm.get("argument-hint", ""),
-                })
-        except Exception:
-            pass
-    return skills
+    """Read all user-invocable skills from SKILL.md files (via the shared SkillIndex)."""
+    index = skills_dir_index(_resolve_skills_dir())
+    index.refresh(max_age_s=SKILLS_REFRESH_S)
+    return [
+        {
+            "name": rec.name,
+            "description": rec.frontmatter.get("description", "")[:100],
+            "argument_hint": rec.frontmatter.get("argument-hint", ""),
+        }
+        for rec in index.user_invocable()
+        if rec.name
+    ]
 
 
 def get_lock(chat_id: int) -> asyncio.Lock:
@@ -91,6 +86,123 @@ def time_ago(ts: float) -> str:
     return f"{int(delta / 86400)}d ago"
 
 
+# ---------------------------------------------------------------------------
+# Server-sent events
+# ---------------------------------------------------------------------------
+
+@dataclass(slots=True)
+class SSEEvent:
+    """One dispatched server-sent event."""
+
+    data: str
+    event: str = "message"
+    id: str | None = None
+
+
+class SSEDecoder:
+    """Incremental ``text/event-stream`` decoder.
+
+    Feed it raw byte chunks as they arrive; it returns the events completed
+    by each chunk. Bytes go through an incremental UTF-8 decoder, so a
+    multibyte character split across two chunks is reassembled rather than
+    mangled, and a line that spans many chunks is kept as a list of
+    fragments joined once, so total work stays linear in the stream length.
+    ``last_event_id`` follows the most recent ``id:`` field, per the spec.
+    """
+
+    def __init__(self) -> None:
+        self._utf8 = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._partial: list[str] = []
+        self._data: list[str] = []
+        self._event = ""
+        self.last_event_id: str | None = None
+
+    def feed(self, chunk: bytes) -> list[SSEEvent]:
+        return self._feed_text(self._utf8.decode(chunk))
+
+    def flush(self) -> list[SSEEvent]:
+        """End of stream: process any unterminated line and pending event."""
+        events = self._feed_text(self._utf8.decode(b"", final=True))
+        if self._partial:
+            line = "".join(self._partial)
+            self._partial = []
+            self._process_line(line, events)
+        self._dispatch(events)
+        return events
+
+    def _feed_text(self, text: str) -> list[SSEEvent]:
+        events: list[SSEEvent] = []
+        if not text:
+            return events
+        pieces = text.split("\n")
+        if len(pieces) == 1:
+            self._partial.append(text)
+            return events
+        if self._partial:
+            self._partial.append(pieces[0])
+            pieces[0] = "".join(self._partial)
+        tail = pieces.pop()
+        self._partial = [tail] if tail else []
+        process = self._process_line
+        data = self._data
+        for line in pieces:
+            # Fast paths for the overwhelmingly common "data: ..." line and
+            # the blank line that ends its event.
+            if not line:
+                if data:
+                    events.append(SSEEvent(
+                        "\n".join(data), self._event or "message", self.last_event_id,
+                    ))
+                    data = self._data = []
+                    self._event = ""
+            elif line.startswith("data: ") and line[-1] != "\r":
+                data.append(line[6:])
+            else:
+                process(line, events)
+                data = self._data
+        return events
+
+    def _process_line(self, line: str, events: list[SSEEvent]) -> None:
+        if line.endswith("\r"):
+            line = line[:-1]
+        if not line:
+            self._dispatch(events)
+            return
+        if line.startswith(":"):
+            return
+        field, _, value = line.partition(":")
+        if value.startswith(" "):
+            value = value[1:]
+        if field == "data":
+            self._data.append(value)
+        elif field == "event":
+            self._event = value
+        elif field == "id" and "\0" not in value:
+            self.last_event_id = value
+
+    def _dispatch(self, events: list[SSEEvent]) -> None:
+        if self._data:
+            events.append(SSEEvent(
+                data="\n".join(self._data),
+                event=self._event or "message",
+                id=self.last_event_id,
+            ))
+        self._data = []
+        self._event = ""
+
+
+async def iter_sse_events(
+    resp: aiohttp.ClientResponse, decoder: SSEDecoder | None = None,
+) -> AsyncIterator[SSEEvent]:
+    """Yield events from an SSE response body as chunks arrive."""
+    decoder = decoder or SSEDecoder()
+    async for chunk in resp.content.iter_any():
+        for event in decoder.feed(chunk):
+            yield event
+    for event in decoder.flush():
+        yield event
+
+
 # ---------------------------------------------------------------------------
 # Gateway client
 # ---------------------------------------------------------------------------
@@ -105,25 +217,53 @@ class GatewayClient:
         owner_type: str,
         surface_prompt: str | None = None,
         mind_id: str = "ada",
+        session_ttl: float = 60.0,
     ):
         self.http = http
         self.server_url = server_url
         self.owner_type = owner_type
         self.surface_prompt = surface_prompt
         self.mind_id = mind_id
+        # client_ref -> (session_id, expires_at). Saves the GET /sessions
+        # round trip for messages sent while a turn is running; dropped on
+        # a 404 from the session, on every server command (/new, /clear,
+        # ... may swap it) and when a turn ends, because the Stop hook's
+        # rotation_check may then rotate the session behind our back.
+        self.session_ttl = session_ttl
+        self._session_cache: dict[str, tuple[str, float]] = {}
         # Bearer auth: set when the bot talks to hive-comms (which requires
         # it). Legacy `server.py` ignores the header, so attaching it
         # unconditionally is safe and avoids a forked code path.
         token = os.environ.get("COMMS_BEARER_TOKEN", "").strip()
         self._headers = {"Authorization": f"Bearer {token}"} if token else {}
 
+    def _cache_session(self, client_ref: int | str, session_id: str) -> None:
+        self._session_cache[str(client_ref)] = (
+            session_id, time.monotonic() + self.session_ttl,
+        )
+
+    def _cached_session(self, client_ref: int | str) -> str | None:
+        entry = self._session_cache.get(str(client_ref))
+        if entry is None:
+            return None
+        session_id, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._session_cache[str(client_ref)]
+            return None
+        return session_id
+
+    def invalidate_session(self, client_ref: int | str) -> None:
+        """Forget the cached session for this client."""
+        self._session_cache.pop(str(client_ref), None)
+
     async def find_active_session(
         self, user_id: int, client_ref: int | str
     ) -> str | None:
         """Look up an active session for this client. Returns the session ID
         if one exists, or ``None`` if there is no active session.
 
-        Unlike :meth:`ensure_session`, this never creates a new session.
+        Unlike :meth:`ensure_session`, this never creates a new session and
+        always asks the gateway rather than trusting the cache.
         """
         async with self.http.get(
             f"{self.server_url}/sessions",
@@ -133,11 +273,16 @@ class GatewayClient:
             data = await resp.json()
             for s in data:
                 if s.get("is_active"):
+                    self._cache_session(client_ref, s["id"])
                     return s["id"]
+        self.invalidate_session(client_ref)
         return None
 
     async def ensure_session(self, user_id: int, client_ref: int | str) -> str:
         """Get active session for this client, or create one."""
+        cached = self._cached_session(client_ref)
+        if cached is not None:
+            return cached
         async with self.http.get(
             f"{self.server_url}/sessions",
             params={"client_type": self.owner_type, "client_ref": str(client_ref)},
@@ -146,6 +291,7 @@ class GatewayClient:
             data = await resp.json()
             for s in data:
                 if s.get("is_active"):
+                    self._cache_session(client_ref, s["id"])
                     return s["id"]
 
         payload: dict = {
@@ -159,12 +305,16 @@ class GatewayClient:
         async with self.http.post(
             f"{self.server_url}/sessions", json=payload, headers=self._headers
         ) as resp:
-            return (await resp.json())["id"]
+            session_id = (await resp.json())["id"]
+        self._cache_session(client_ref, session_id)
+        return session_id
 
     async def server_command(
         self, user_id: int, client_ref: int | str, content: str
     ) -> dict:
         """Send a server command and return the JSON response."""
+        # Commands like /new and /clear replace the client's session.
+        self.invalidate_session(client_ref)
         async with self.http.post(
             f"{self.server_url}/command",
             json={
@@ -197,7 +347,6 @@ class GatewayClient:
         response.  Falls back to the result event text if no assistant blocks
         were received (e.g. tool-only turns).
         """
-        session_id = await self.ensure_session(user_id, client_ref)
         yielded_any = False
         result_fallback = ""
 
@@ -207,44 +356,46 @@ class GatewayClient:
         payload = {"content": prompt}
         if images:
             payload["images"] = images
-        async with self.http.post(
-            f"{self.server_url}/sessions/{session_id}/message",
-            json=payload,
-            timeout=sse_timeout,
-            headers=self._headers,
-        ) as resp:
-            if resp.status != 200:
-                error_text = ""
-                try:
-                    data = await resp.json()
-                    if isinstance(data, dict):
-                        error_text = str(data.get("error", ""))
-                    else:
-                        error_text = str(data)
-                except Exception:
-                    error_text = await resp.text()
-                error_text = error_text or f"HTTP {resp.status}"
-                raise RuntimeError(
-                    f"Gateway message request failed for session {session_id}: {error_text}"
-                )
-            buf = ""
-            # When a mind spawns claude with --include-partial-messages, we
-            # receive stream_event events containing per-token text_delta
-            # payloads in addition to the buffered `assistant` event at the
-            # end of each content block. Prefer the deltas when present and
-            # suppress the buffered text to avoid duplication.
-            saw_partial_text = False
-            async for chunk in resp.content.iter_any():
-                buf += chunk.decode()
-                while "\n" in buf:
-                    raw_line, buf = buf.split("\n", 1)
-                    raw_line = raw_line.strip()
-                    if not raw_line or not raw_line.startswith("data: "):
-                        continue
+        for attempt in range(2):
+            session_id = await self.ensure_session(user_id, client_ref)
+            async with self.http.post(
+                f"{self.server_url}/sessions/{session_id}/message",
+                json=payload,
+                timeout=sse_timeout,
+                headers=self._headers,
+            ) as resp:
+                if resp.status == 404 and attempt == 0:
+                    # Cached session went away (rotated, reaped); look it
+                    # up again and retry once.
+                    self.invalidate_session(client_ref)
+                    continue
+                if resp.status != 200:
+                    error_text = ""
                     try:
-                        event = json.loads(raw_line.removeprefix("data: "))
+                        data = await resp.json()
+                        if isinstance(data, dict):
+                            error_text = str(data.get("error", ""))
+                        else:
+                            error_text = str(data)
+                    except Exception:
+                        error_text = await resp.text()
+                    error_text = error_text or f"HTTP {resp.status}"
+                    raise RuntimeError(
+                        f"Gateway message request failed for session {session_id}: {error_text}"
+                    )
+                # When a mind spawns claude with --include-partial-messages, we
+                # receive stream_event events containing per-token text_delta
+                # payloads in addition to the buffered `assistant` event at the
+                # end of each content block. Prefer the deltas when present and
+                # suppress the buffered text to avoid duplication.
+                saw_partial_text = False
+                async for sse in iter_sse_events(resp):
+                    try:
+                        event = json.loads(sse.data)
                     except json.JSONDecodeError:
                         continue
+                    if not isinstance(event, dict):
+                        continue
                     etype = event.get("type")
                     if etype == "stream_event":
                         # Anthropic-shaped partial event. We care about
@@ -267,6 +418,9 @@ class GatewayClient:
                                 yielded_any = True
                     elif etype == "result":
                         result_fallback = event.get("result", "")
+                        # The turn is over; a rotation would happen now.
+                        self.invalidate_session(client_ref)
+            break
 
         if not yielded_any and result_fallback:
             yield result_fallback
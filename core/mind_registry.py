@@ -0,0 +1,220 @@
+"""Registry of minds: an indexed, cached view of `minds/*/runtime.yaml`.
+
+Resolving a mind reference — the canonical UUID, the folder short name, or
+a voice_id a caller hands the voice server — used to mean reading every
+runtime.yaml under `minds/`. `MindRegistry` reads each runtime.yaml once,
+keeps it until the file's (inode, size, mtime) signature changes, and
+answers lookups from in-memory maps:
+
+    registry = mind_registry(MINDS_ROOT)
+    registry.by_id("565e5a66-…")    # -> MindInfo | None
+    registry.by_name("ada")
+    registry.by_voice("ada")         # name, UUID, or a `voice_id:` alias
+
+`refresh()` is a stat pass over `minds/*/runtime.yaml` that re-reads only
+changed files and returns True when anything changed. A lookup that misses
+refreshes at most once per `miss_refresh_s`, so a mind added after startup
+is found without every unknown reference costing a directory rescan.
+
+Only top-level scalar keys are indexed (`name`, `mind_id`, `harness`,
+`default_model`, `gateway_url`, `voice_id`, …), parsed without PyYAML so
+the voice server image can use it. Nested config stays with the mind's own
+process, which loads its full runtime.yaml itself.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+DEFAULT_MISS_REFRESH_S = 5.0
+
+
+def parse_runtime_scalars(text: str) -> dict[str, str]:
+    """Top-level `key: value` pairs of a runtime.yaml, quotes stripped.
+
+    Indented lines (nested mappings, list items), comments and keys without
+    an inline value are skipped.
+    """
+    out: dict[str, str] = {}
+    for line in text.splitlines():
+        if not line or line[0] in " \t#-":
+            continue
+        key, sep, value = line.partition(":")
+        if not sep:
+            continue
+        value = value.split(" #", 1)[0].strip().strip('"').strip("'")
+        if value:
+            out[key.strip()] = value
+    return out
+
+
+@dataclass(frozen=True)
+class MindInfo:
+    """One mind folder with a runtime.yaml."""
+
+    name: str                  # folder short name
+    path: str                  # absolute mind folder
+    runtime: dict[str, str] = field(hash=False)
+
+    @property
+    def mind_id(self) -> str | None:
+        return self.runtime.get("mind_id")
+
+    @property
+    def harness(self) -> str | None:
+        return self.runtime.get("harness")
+
+    @property
+    def voice_id(self) -> str | None:
+        """Optional `voice_id:` alias the voice server also accepts."""
+        return self.runtime.get("voice_id")
+
+
+class MindRegistry:
+    """Cached index of the minds under `minds_root`."""
+
+    def __init__(
+        self,
+        minds_root: str | Path,
+        miss_refresh_s: float = DEFAULT_MISS_REFRESH_S,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.minds_root = os.path.abspath(str(minds_root))
+        self.miss_refresh_s = miss_refresh_s
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._files: dict[str, tuple[tuple[int, int, int], MindInfo]] = {}
+        self._by_id: dict[str, MindInfo] = {}
+        self._by_name: dict[str, MindInfo] = {}
+        self._by_voice: dict[str, MindInfo] = {}
+        self._checked_at: float | None = None
+        self.version = 0
+        self.reads = 0
+
+    def refresh(self, max_age_s: float = 0.0) -> bool:
+        """Re-stat every runtime.yaml; re-read only what changed.
+
+        Returns True if a mind was added, changed or removed. A refresh
+        younger than `max_age_s` is skipped.
+        """
+        with self._lock:
+            now = self._clock()
+            if self._checked_at is not None and now - self._checked_at < max_age_s:
+                return False
+            self._checked_at = now
+
+            seen: dict[str, tuple[tuple[int, int, int], MindInfo]] = {}
+            dirty = False
+            for name, sig in _scan(self.minds_root):
+                old = self._files.get(name)
+                if old is not None and old[0] == sig:
+                    seen[name] = old
+                    continue
+                info = self._read(name)
+                if info is None:
+                    continue
+                seen[name] = (sig, info)
+                dirty = True
+            dirty = dirty or seen.keys() != self._files.keys()
+            if dirty:
+                self._files = seen
+                self._reindex()
+                self.version += 1
+            return dirty
+
+    def _read(self, name: str) -> MindInfo | None:
+        path = os.path.join(self.minds_root, name)
+        try:
+            with open(os.path.join(path, "runtime.yaml"), encoding="utf-8") as f:
+                text = f.read()
+        except (OSError, UnicodeDecodeError):
+            return None
+        self.reads += 1
+        return MindInfo(name=name, path=path, runtime=parse_runtime_scalars(text))
+
+    def _reindex(self) -> None:
+        by_id: dict[str, MindInfo] = {}
+        by_name: dict[str, MindInfo] = {}
+        by_voice: dict[str, MindInfo] = {}
+        for name in sorted(self._files):
+            info = self._files[name][1]
+            by_name[name] = info
+            by_voice[name] = info
+            if info.mind_id:
+                by_id[info.mind_id] = info
+                by_voice[info.mind_id] = info
+        # Declared aliases never shadow a real name or UUID.
+        for name in sorted(self._files):
+            info = self._files[name][1]
+            if info.voice_id:
+                by_voice.setdefault(info.voice_id, info)
+        self._by_id, self._by_name, self._by_voice = by_id, by_name, by_voice
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def _lookup(self, table: str, key: str) -> MindInfo | None:
+        if self._checked_at is None:
+            self.refresh()
+        info = getattr(self, table).get(key)
+        if info is None and self.refresh(max_age_s=self.miss_refresh_s):
+            info = getattr(self, table).get(key)
+        return info
+
+    def by_id(self, mind_id: str) -> MindInfo | None:
+        return self._lookup("_by_id", mind_id)
+
+    def by_name(self, name: str) -> MindInfo | None:
+        return self._lookup("_by_name", name)
+
+    def by_voice(self, voice_id: str) -> MindInfo | None:
+        """Resolve a voice_id: a short name, a mind UUID, or a `voice_id:` alias."""
+        return self._lookup("_by_voice", voice_id)
+
+    def canonical_id(self, ref: str) -> str | None:
+        """The UUID for a mind reference (UUID or short name), if known."""
+        info = self.by_id(ref) or self.by_name(ref)
+        return info.mind_id if info else None
+
+    def minds(self) -> list[MindInfo]:
+        """Every mind with a readable runtime.yaml, by name."""
+        if self._checked_at is None:
+            self.refresh()
+        return list(self._by_name.values())
+
+
+def _scan(minds_root: str):
+    """Yield (mind folder name, runtime.yaml signature)."""
+    try:
+        it = os.scandir(minds_root)
+    except OSError:
+        return
+    with it:
+        for entry in it:
+            if entry.name.startswith("."):
+                continue
+            try:
+                st = os.stat(os.path.join(entry.path, "runtime.yaml"))
+            except OSError:
+                continue
+            yield entry.name, (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+_shared: dict[str, MindRegistry] = {}
+_shared_lock = threading.Lock()
+
+
+def mind_registry(minds_root: str | Path) -> MindRegistry:
+    """Process-wide shared registry for `minds_root`."""
+    path = os.path.abspath(str(minds_root))
+    with _shared_lock:
+        registry = _shared.get(path)
+        if registry is None:
+            registry = _shared[path] = MindRegistry(path)
+        return registry
@@ -11,12 +11,14 @@ scheduled task is the same operation as adding or removing a skill.
 from __future__ import annotations
 
 import logging
-import re
 from dataclasses import dataclass
 from pathlib import Path
 
 import yaml
 
+from core.mind_registry import mind_registry
+from core.skill_index import SkillIndex, minds_index
+
 log = logging.getLogger(__name__)
 
 DEFAULT_TIMEZONE = "America/Chicago"
@@ -52,27 +54,6 @@ class ScheduledSkill:
                           # with `command` set ignore mind / instructions_file.
 
 
-_FRONTMATTER_RE = re.compile(r"\A---\n(.*?)\n---", re.DOTALL)
-
-
-def _parse_frontmatter(text: str) -> dict[str, str] | None:
-    """Return frontmatter as a flat str→str dict, or None if absent.
-
-    Only handles the simple key: value forms our skills use today. Quoted
-    values have surrounding quotes stripped. Unparseable lines are ignored.
-    """
-    m = _FRONTMATTER_RE.search(text)
-    if not m:
-        return None
-    out: dict[str, str] = {}
-    for line in m.group(1).splitlines():
-        if ":" not in line:
-            continue
-        k, _, v = line.partition(":")
-        out[k.strip()] = v.strip().strip('"').strip("'")
-    return out
-
-
 def _coerce_bool(value: str | None, default: bool) -> bool:
     if value is None:
         return default
@@ -84,7 +65,7 @@ def _validate_cron(cron: str) -> bool:
     return len(cron.split()) == 5
 
 
-def discover_scheduled_skills(minds_root: Path) -> list[ScheduledSkill]:
+def discover_scheduled_skills(minds_root: Path, index: SkillIndex | None = None) -> list[ScheduledSkill]:
     """Discover all scheduled skills across every mind under `minds_root`.
 
     A skill is considered scheduled if its frontmatter contains a `schedule`
@@ -93,24 +74,25 @@ def discover_scheduled_skills(minds_root: Path) -> list[ScheduledSkill]:
 
     Skills with malformed cron expressions are logged and skipped — one bad
     skill must not take down the scheduler.
+
+    Frontmatter comes from the shared `SkillIndex` for `minds_root`, which
+    is refreshed here (a stat pass; only changed SKILL.md files are re-read).
     """
     found: list[ScheduledSkill] = []
     if not minds_root.is_dir():
         return found
 
-    skill_files = sorted(
-        list(minds_root.glob("*/.claude/skills/*/SKILL.md"))
-        + list(minds_root.glob("*/.codex/skills/*/SKILL.md"))
-    )
-    for skill_md in skill_files:
-        # minds_root/<mind_name>/(.claude|.codex)/skills/<skill_name>/SKILL.md
-        try:
-            mind_name = skill_md.relative_to(minds_root).parts[0]
-            skill_name = skill_md.parent.name
-        except (ValueError, IndexError):
+    index = index or minds_index(minds_root)
+    index.refresh()
+    minds = mind_registry(minds_root)
+    minds.refresh()
+    for rec in index.scheduled():
+        mind_name, skill_name = rec.mind, rec.dir_name
+        if mind_name is None:
             continue
 
-        mind_id = _load_mind_uuid(minds_root / mind_name)
+        mind = minds.by_name(mind_name)
+        mind_id = mind.mind_id if mind else None
         if not mind_id:
             log.warning(
                 "Skipping %s/%s — no mind_id in %s/runtime.yaml",
@@ -118,21 +100,7 @@ def discover_scheduled_skills(minds_root: Path) -> list[ScheduledSkill]:
             )
             continue
 
-        try:
-            text = skill_md.read_text()
-        except OSError as exc:
-            log.warning("Could not read %s: %s", skill_md, exc)
-            continue
-
-        fm = _parse_frontmatter(text)
-        if not fm or "schedule" not in fm:
-            continue
-
-        cron = fm["schedule"].strip()
-        if cron.lower() in {"", "null", "none"}:
-            # Explicit opt-out — author wrote `schedule: null` or similar.
-            # Silent skip; only real cron strings deserve a warning.
-            continue
+        cron = rec.schedule
         if not _validate_cron(cron):
             log.warning(
                 "Skipping %s/%s — invalid cron %r (need 5 fields)",
@@ -140,11 +108,12 @@ def discover_scheduled_skills(minds_root: Path) -> list[ScheduledSkill]:
             )
             continue
 
+        fm = rec.frontmatter
         found.append(ScheduledSkill(
             mind_id=mind_id,
             mind_name=mind_name,
             skill_name=skill_name,
-            skill_path=str(skill_md),
+            skill_path=rec.path,
             cron=cron,
             timezone=fm.get("schedule_timezone", DEFAULT_TIMEZONE),
             voice=_coerce_bool(fm.get("voice"), default=True),
@@ -174,6 +143,8 @@ def discover_scheduler_tasks(tasks_yaml: Path, minds_root: Path) -> list[Schedul
         return found
 
     entries = data.get("tasks") or []
+    minds = mind_registry(minds_root)
+    minds.refresh()
     instructions_root = tasks_yaml.parent / "instructions"
 
     for entry in entries:
@@ -220,7 +191,8 @@ def discover_scheduler_tasks(tasks_yaml: Path, minds_root: Path) -> list[Schedul
             log.warning("Skipping malformed scheduler task entry: %r", entry)
             continue
 
-        mind_id = _load_mind_uuid(minds_root / mind_name)
+        mind = minds.by_name(mind_name)
+        mind_id = mind.mind_id if mind else None
         if not mind_id:
             log.warning(
                 "Skipping scheduler task %s — no mind_id in %s/runtime.yaml",
@@ -249,19 +221,3 @@ def discover_scheduler_tasks(tasks_yaml: Path, minds_root: Path) -> list[Schedul
         ))
 
     return found
-
-
-_MIND_ID_RE = re.compile(r"^\s*mind_id\s*:\s*(.+?)\s*$", re.MULTILINE)
-
-
-def _load_mind_uuid(mind_dir: Path) -> str | None:
-    """Read `mind_id:` out of a mind's runtime.yaml. Returns None if absent."""
-    runtime = mind_dir / "runtime.yaml"
-    try:
-        text = runtime.read_text()
-    except OSError:
-        return None
-    m = _MIND_ID_RE.search(text)
-    if not m:
-        return None
-    return m.group(1).strip().strip('"').strip("'") or None
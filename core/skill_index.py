@@ -0,0 +1,301 @@
+"""Cached, change-aware index of SKILL.md files.
+
+Several consumers need the same facts about skills: the bots list
+user-invocable ones (and Discord autocompletes them on every keystroke),
+the scheduler wants the ones with a `schedule:` cron, and the skill
+proposer/curator want the skill directories of one mind. Each of them used
+to glob and re-read every SKILL.md on every call.
+
+A `SkillIndex` parses each SKILL.md once and keeps the result until the
+file's (inode, size, mtime) signature changes. `refresh()` is a stat pass —
+one `scandir` per skills directory and one `stat` per skill — that re-reads
+only new or changed files, drops deleted ones, and reports what changed as a
+`SkillChanges` (also pushed to subscribers). Callers that poll, like the
+scheduler's reconcile loop, can skip all downstream work when nothing moved.
+
+Two layouts are indexed:
+
+  - a single skills directory (`<config-dir>/skills/<skill>/SKILL.md`), used
+    by the bots, proposer and curator — see `skills_dir_index()`;
+  - every mind under a minds root
+    (`<minds_root>/<mind>/(.claude|.codex)/skills/<skill>/SKILL.md`), used by
+    the scheduler — see `minds_index()`.
+
+Both return a process-wide shared instance per path, so repeated callers
+share one cache. Dot-directories (e.g. `.archive`) are never indexed.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import stat
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+log = logging.getLogger(__name__)
+
+_FRONTMATTER_RE = re.compile(r"\A---\n(.*?)\n---", re.DOTALL)
+_HARNESS_DIRS = {".claude": "claude", ".codex": "codex"}
+_SCHEDULE_OPT_OUT = {"", "null", "none"}
+
+
+def parse_frontmatter(text: str) -> dict[str, str] | None:
+    """Return frontmatter as a flat str→str dict, or None if absent.
+
+    Only handles the simple key: value forms our skills use today. Quoted
+    values have surrounding quotes stripped. Unparseable lines are ignored.
+    """
+    m = _FRONTMATTER_RE.search(text)
+    if not m:
+        return None
+    out: dict[str, str] = {}
+    for line in m.group(1).splitlines():
+        if ":" not in line:
+            continue
+        k, _, v = line.partition(":")
+        out[k.strip()] = v.strip().strip('"').strip("'")
+    return out
+
+
+def harness_of(config_dir: str | Path) -> str:
+    """Best-effort harness name for a config dir (`.codex`, `nagatha-codex`, …)."""
+    name = Path(config_dir).name.lower()
+    return "codex" if "codex" in name else "claude"
+
+
+@dataclass(frozen=True)
+class SkillRecord:
+    """One parsed SKILL.md."""
+
+    path: str                 # absolute path to SKILL.md
+    dir_name: str             # the skill's directory name
+    mind: str | None          # mind folder name; None for a bare skills dir
+    harness: str              # "claude" or "codex"
+    frontmatter: dict[str, str] = field(hash=False)  # {} when absent
+    symlink: bool = False     # skill dir is a symlink (plugin skill)
+
+    @property
+    def name(self) -> str:
+        return self.frontmatter.get("name", "")
+
+    @property
+    def user_invocable(self) -> bool:
+        fm = self.frontmatter
+        return fm.get("user-invocable", fm.get("user_invocable", "")).lower() == "true"
+
+    @property
+    def schedule(self) -> str | None:
+        """The `schedule:` cron string, or None when absent or opted out."""
+        cron = self.frontmatter.get("schedule")
+        if cron is None or cron.strip().lower() in _SCHEDULE_OPT_OUT:
+            return None
+        return cron.strip()
+
+
+@dataclass(frozen=True)
+class SkillChanges:
+    """What one `refresh()` found. Falsy when nothing changed."""
+
+    added: tuple[SkillRecord, ...] = ()
+    changed: tuple[SkillRecord, ...] = ()
+    removed: tuple[SkillRecord, ...] = ()
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+    def summary(self) -> str:
+        return f"+{len(self.added)} ~{len(self.changed)} -{len(self.removed)}"
+
+
+# (skills_dir, mind, harness)
+_Root = tuple[str, str | None, str]
+
+
+class SkillIndex:
+    """Parse-once index over the skills directories yielded by `roots()`.
+
+    `roots` is called on every refresh, so minds or harness directories that
+    appear later are picked up. Queries use the last refresh; a query on an
+    index that has never been refreshed refreshes it first.
+    """
+
+    def __init__(self, roots: Callable[[], Iterable[_Root]], clock: Callable[[], float] = time.monotonic):
+        self.roots = roots
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: dict[str, tuple[tuple[int, int, int], SkillRecord]] = {}
+        self._subscribers: list[Callable[[SkillChanges], None]] = []
+        self._checked_at: float | None = None
+        self.version = 0
+        self.parses = 0
+
+    # ------------------------------------------------------------------
+    # Refresh
+    # ------------------------------------------------------------------
+
+    def refresh(self, max_age_s: float = 0.0) -> SkillChanges:
+        """Re-stat every skill; re-parse only what changed.
+
+        With `max_age_s`, a refresh younger than that is skipped — for hot
+        paths (autocomplete) that can tolerate a second of staleness.
+        """
+        with self._lock:
+            now = self._clock()
+            if self._checked_at is not None and now - self._checked_at < max_age_s:
+                return SkillChanges()
+            self._checked_at = now
+
+            added: list[SkillRecord] = []
+            changed: list[SkillRecord] = []
+            seen: dict[str, tuple[tuple[int, int, int], SkillRecord]] = {}
+            for skills_dir, mind, harness in self.roots():
+                for entry, sig in _scan(skills_dir):
+                    path = os.path.join(entry.path, "SKILL.md")
+                    symlink = entry.is_symlink()
+                    old = self._entries.get(path)
+                    if old is not None and old[0] == sig and old[1].symlink == symlink:
+                        seen[path] = old
+                        continue
+                    record = self._parse(path, entry.name, mind, harness, symlink)
+                    if record is None:
+                        continue
+                    seen[path] = (sig, record)
+                    (changed if old is not None else added).append(record)
+
+            removed = [rec for path, (_sig, rec) in self._entries.items() if path not in seen]
+            self._entries = dict(sorted(seen.items()))
+            changes = SkillChanges(tuple(added), tuple(changed), tuple(removed))
+            if changes:
+                self.version += 1
+            subscribers = list(self._subscribers)
+
+        if changes:
+            for callback in subscribers:
+                try:
+                    callback(changes)
+                except Exception:
+                    log.exception("Skill index subscriber failed")
+        return changes
+
+    def subscribe(self, callback: Callable[[SkillChanges], None]) -> Callable[[], None]:
+        """Call `callback(changes)` after every refresh that changed something.
+
+        Returns a function that unsubscribes.
+        """
+        self._subscribers.append(callback)
+        return lambda: self._subscribers.remove(callback)
+
+    def _parse(self, path: str, dir_name: str, mind: str | None, harness: str, symlink: bool) -> SkillRecord | None:
+        try:
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+        except UnicodeDecodeError as exc:
+            # Still a skill directory; it just has no usable frontmatter.
+            log.warning("Could not decode %s: %s", path, exc)
+            text = ""
+        except OSError as exc:
+            log.warning("Could not read %s: %s", path, exc)
+            return None
+        self.parses += 1
+        return SkillRecord(
+            path=path,
+            dir_name=dir_name,
+            mind=mind,
+            harness=harness,
+            frontmatter=parse_frontmatter(text) or {},
+            symlink=symlink,
+        )
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def records(self, mind: str | None = None, harness: str | None = None) -> list[SkillRecord]:
+        """Every indexed skill, in path order, optionally filtered."""
+        if self._checked_at is None:
+            self.refresh()
+        return [
+            rec for _sig, rec in self._entries.values()
+            if (mind is None or rec.mind == mind) and (harness is None or rec.harness == harness)
+        ]
+
+    def by_mind(self, mind: str) -> list[SkillRecord]:
+        return self.records(mind=mind)
+
+    def by_harness(self, harness: str) -> list[SkillRecord]:
+        return self.records(harness=harness)
+
+    def user_invocable(self, mind: str | None = None, harness: str | None = None) -> list[SkillRecord]:
+        return [rec for rec in self.records(mind, harness) if rec.user_invocable]
+
+    def scheduled(self, mind: str | None = None, harness: str | None = None) -> list[SkillRecord]:
+        return [rec for rec in self.records(mind, harness) if rec.schedule is not None]
+
+    def names(self, mind: str | None = None, harness: str | None = None) -> set[str]:
+        """Skill directory names."""
+        return {rec.dir_name for rec in self.records(mind, harness)}
+
+    def minds(self) -> set[str]:
+        return {rec.mind for rec in self.records() if rec.mind is not None}
+
+
+def _scan(skills_dir: str) -> Iterator[tuple[os.DirEntry, tuple[int, int, int]]]:
+    """Yield (skill dir entry, SKILL.md signature) for every skill in `skills_dir`."""
+    try:
+        it = os.scandir(skills_dir)
+    except OSError:
+        return
+    with it:
+        for entry in it:
+            if entry.name.startswith("."):
+                continue
+            try:
+                st = os.stat(os.path.join(entry.path, "SKILL.md"))
+            except OSError:
+                continue
+            if stat.S_ISREG(st.st_mode):
+                yield entry, (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+# ---------------------------------------------------------------------------
+# Shared instances
+# ---------------------------------------------------------------------------
+
+_shared: dict[tuple[str, str], SkillIndex] = {}
+_shared_lock = threading.Lock()
+
+
+def _shared_index(kind: str, path: str, roots: Callable[[], Iterable[_Root]]) -> SkillIndex:
+    with _shared_lock:
+        index = _shared.get((kind, path))
+        if index is None:
+            index = _shared[(kind, path)] = SkillIndex(roots)
+        return index
+
+
+def skills_dir_index(skills_dir: str | Path, harness: str | None = None) -> SkillIndex:
+    """Shared index over one `<config-dir>/skills` directory."""
+    path = os.path.abspath(os.path.expanduser(str(skills_dir)))
+    root: _Root = (path, None, harness or harness_of(os.path.dirname(path)))
+    return _shared_index("skills", path, lambda: (root,))
+
+
+def minds_index(minds_root: str | Path) -> SkillIndex:
+    """Shared index over every mind's `.claude/skills` and `.codex/skills`."""
+    path = os.path.abspath(str(minds_root))
+
+    def roots() -> Iterator[_Root]:
+        try:
+            minds = sorted(e.name for e in os.scandir(path) if e.is_dir() and not e.name.startswith("."))
+        except OSError:
+            return
+        for mind in minds:
+            for dirname, harness in _HARNESS_DIRS.items():
+                yield os.path.join(path, mind, dirname, "skills"), mind, harness
+
+    return _shared_index("minds", path, roots)
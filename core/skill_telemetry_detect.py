@@ -1,12 +1,14 @@
 """Per-harness skill-fire detectors for the usage telemetry sidecar.
 
 Pure transcript→``set[str]`` detection that turns a parsed session into the
-set of bare skill names that fired in it. Both detectors reuse the
-already-tested transcript parsers — ``core.training_capture_claude._parse_grouped``
-and ``core.training_capture_codex._parse_grouped`` — so there is no new hook
-event and no second parse path to keep in sync. They take a transcript path and
-return a plain ``set[str]`` of bare skill names; the shared
-``skill_telemetry.bump_skills`` consumes that set, bumping ``use_count`` once
+set of bare skill names that fired in it. Detection is an *observer* on the
+already-tested transcript parsers (``core.training_capture_claude`` /
+``core.training_capture_codex``): ``ClaudeSkillDetector`` and
+``CodexSkillDetector`` see each turn and block as the parser folds it, so the
+Stop hook (``core.stop_hook``) captures turns and detects skills in the same
+pass, and there is no second parse path to keep in sync. ``detect_*_skills``
+wrap a standalone pass for callers that only want the names. The shared
+``skill_telemetry.bump_skills`` consumes the set, bumping ``use_count`` once
 per distinct name.
 
 Detection rules
@@ -19,19 +21,19 @@ the bare name is whatever follows the last ``:``.
 
 **Codex (codex).** Codex loads a skill by reading its ``SKILL.md`` through an
 ``exec_command`` tool call, so the skill name appears inside the call's
-``input`` (and may echo back in the ``tool_result``). Scanning the serialized
-block text for ``skills/<name>/SKILL.md`` recovers the bare name regardless of
-which arg value carries the path.
+``input`` (and may echo back in the ``tool_result``). Scanning every string
+in the call's ``input`` (walked in place, not re-serialized) and the result
+text for ``skills/<name>/SKILL.md`` recovers the bare name regardless of which
+arg value carries the path.
 """
 
 from __future__ import annotations
 
-import json
 import re
 from pathlib import Path
 
-from core.training_capture_claude import _parse_grouped as _parse_claude
-from core.training_capture_codex import _parse_grouped as _parse_codex
+from core.training_capture_claude import _parse_transcript as _parse_claude
+from core.training_capture_codex import _parse_transcript as _parse_codex
 
 # A leading ``/skill-name`` token at the very start of a user turn.
 _SLASH_RE = re.compile(r"^/([a-z0-9][a-z0-9._-]*)")
@@ -44,63 +46,83 @@ def _bare_name(raw: str) -> str:
     return raw.rsplit(":", 1)[-1]
 
 
-def detect_claude_skills(transcript_path: str | Path) -> set[str]:
-    """Return the set of bare skill names that fired in a Claude transcript.
+class ClaudeSkillDetector:
+    """Parser observer: collects ``Skill`` tool uses and leading ``/slash`` turns.
 
-    Scans every ``Skill`` tool-use block's ``input.skill`` (namespace-stripped)
-    and every user turn for a leading ``/slash`` command. Empty/None names are
-    ignored.
+    ``input.skill`` is namespace-stripped; empty/None names are ignored.
     """
-    names: set[str] = set()
-    for user_content, blocks in _parse_claude(transcript_path):
+
+    def __init__(self) -> None:
+        self.names: set[str] = set()
+
+    def turn(self, user_content) -> None:
         if isinstance(user_content, str):
             m = _SLASH_RE.match(user_content.strip())
             if m:
-                names.add(m.group(1))
-        for block in blocks:
-            if not isinstance(block, dict):
-                continue
-            if block.get("type") != "tool_use" or block.get("name") != "Skill":
-                continue
-            skill = (block.get("input") or {}).get("skill")
-            if isinstance(skill, str) and skill:
-                bare = _bare_name(skill)
-                if bare:
-                    names.add(bare)
-    return names
-
-
-def _block_text(block: dict) -> str:
-    """Flatten a Codex block's searchable text (input dict + tool_result)."""
-    parts: list[str] = []
-    inp = block.get("input")
-    if inp is not None:
-        try:
-            parts.append(json.dumps(inp, ensure_ascii=False))
-        except (TypeError, ValueError):
-            parts.append(str(inp))
-    content = block.get("content")
-    if isinstance(content, str):
-        parts.append(content)
-    elif content is not None:
-        parts.append(str(content))
-    return "\n".join(parts)
+                self.names.add(m.group(1))
+
+    def block(self, block) -> None:
+        if not isinstance(block, dict):
+            return
+        if block.get("type") != "tool_use" or block.get("name") != "Skill":
+            return
+        skill = (block.get("input") or {}).get("skill")
+        if isinstance(skill, str) and skill:
+            bare = _bare_name(skill)
+            if bare:
+                self.names.add(bare)
+
+
+def _scan_codex_text(text: str, names: set[str]) -> None:
+    if "SKILL.md" in text:
+        names.update(m.group(1) for m in _CODEX_SKILL_RE.finditer(text))
+
+
+def _scan_codex_value(value, names: set[str]) -> None:
+    """Scan every string inside a tool input (dicts/lists walked in place)."""
+    if isinstance(value, str):
+        _scan_codex_text(value, names)
+    elif isinstance(value, dict):
+        for v in value.values():
+            _scan_codex_value(v, names)
+    elif isinstance(value, (list, tuple)):
+        for v in value:
+            _scan_codex_value(v, names)
+
+
+class CodexSkillDetector:
+    """Parser observer: collects ``skills/<name>/SKILL.md`` references from
+    ``tool_use`` inputs and ``tool_result`` content. Non-skill paths (e.g.
+    ``/etc/hosts``) yield nothing."""
+
+    def __init__(self) -> None:
+        self.names: set[str] = set()
+
+    def turn(self, user_content) -> None:
+        pass
+
+    def block(self, block) -> None:
+        if not isinstance(block, dict):
+            return
+        inp = block.get("input")
+        if inp is not None:
+            _scan_codex_value(inp, self.names)
+        content = block.get("content")
+        if isinstance(content, str):
+            _scan_codex_text(content, self.names)
+        elif content is not None:
+            _scan_codex_text(str(content), self.names)
 
 
-def detect_codex_skills(transcript_path: str | Path) -> set[str]:
-    """Return the set of bare skill names that fired in a Codex rollout.
+def detect_claude_skills(transcript_path: str | Path) -> set[str]:
+    """Return the set of bare skill names that fired in a Claude transcript."""
+    detector = ClaudeSkillDetector()
+    _parse_claude(transcript_path, detector)
+    return detector.names
 
-    A Codex skill load reads ``skills/<name>/SKILL.md`` via an ``exec_command``
-    tool call, so the name is recovered from the serialized block text of each
-    ``tool_use`` ``input`` and any ``tool_result`` ``content``. Non-skill paths
-    (e.g. ``/etc/hosts``) yield nothing.
-    """
-    names: set[str] = set()
-    for _user_content, blocks in _parse_codex(transcript_path):
-        for block in blocks:
-            if not isinstance(block, dict):
-                continue
-            text = _block_text(block)
-            for m in _CODEX_SKILL_RE.finditer(text):
-                names.add(m.group(1))
-    return names
+
+def detect_codex_skills(transcript_path: str | Path) -> set[str]:
+    """Return the set of bare skill names that fired in a Codex rollout."""
+    detector = CodexSkillDetector()
+    _parse_codex(transcript_path, detector)
+    return detector.names
@@ -0,0 +1,202 @@
+"""Single Stop-hook entry point: training capture and skill telemetry in one pass.
+
+Each mind's Stop hook used to run two adapters over the same transcript —
+training capture (``training_capture.sh``) and skill telemetry
+(``skill_telemetry_capture.sh``) — each parsing it from scratch. This
+module runs the harness's transcript parser once with the matching skill
+detector attached as an observer (see :mod:`core.skill_telemetry_detect`),
+upserts the turns via :func:`core.training_capture.upsert_turns`, and hands
+the detected names to ``skill_telemetry.bump_skills``.
+
+For Claude Code transcripts capture is incremental, so a fire parses only
+the lines appended since the last one and bumps only the skills that fired
+in them. Codex rollouts are re-parsed whole (the Codex consumer has no
+checkpoint), as before.
+
+Usage from a hook wrapper, with the Stop payload on stdin::
+
+    python -m core.stop_hook --harness claude_code --config-dir "$CLAUDE_CONFIG_DIR"
+
+The payload's ``transcript_path`` and ``session_id`` are used; ``mind_id``
+comes from ``--mind-id`` or ``$MIND_ID`` and is resolved to the canonical
+UUID through the mind registry when a short name is given. The hook never
+fails the harness: errors are logged and the exit status is 0.
+
+With ``--spool DIR`` (or ``$CAPTURE_SPOOL_DIR``) the hook only enqueues the
+fire for the ingest worker in :mod:`core.capture_spool` and returns at once;
+when the spool is full it captures inline instead.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+from core import training_capture_claude, training_capture_codex
+from core.mind_registry import mind_registry
+from core.skill_telemetry_detect import ClaudeSkillDetector, CodexSkillDetector
+from core.training_capture import HARNESS_CLAUDE_CODE, HARNESS_CODEX
+
+log = logging.getLogger("hive-mind.stop-hook")
+
+_REPO_ROOT = Path(__file__).resolve().parent.parent
+_TELEMETRY_PATH = _REPO_ROOT / "tools" / "stateless" / "skill_telemetry" / "skill_telemetry.py"
+MINDS_ROOT = os.environ.get("MINDS_ROOT", str(_REPO_ROOT / "minds"))
+
+_telemetry = None
+
+
+def _load_telemetry():
+    """Load the standalone skill_telemetry tool by path (once)."""
+    global _telemetry
+    if _telemetry is None:
+        spec = importlib.util.spec_from_file_location("skill_telemetry", str(_TELEMETRY_PATH))
+        if spec is None or spec.loader is None:  # pragma: no cover - import guard
+            raise ImportError(f"cannot load telemetry module from {_TELEMETRY_PATH}")
+        mod = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(mod)
+        _telemetry = mod
+    return _telemetry
+
+
+def capture_transcript(
+    transcript_path: str | Path,
+    *,
+    harness: str,
+    session_id: str,
+    mind_id: str | None = None,
+    db_path: str | Path | None = None,
+) -> tuple[bool, set[str]]:
+    """Capture a transcript's turns; return (rows written, skill names fired).
+
+    The skill names come from the same parse as the turns.
+    """
+    if harness == HARNESS_CLAUDE_CODE:
+        detector = ClaudeSkillDetector()
+        written = training_capture_claude.capture_session(
+            transcript_path, session_id=session_id, mind_id=mind_id,
+            db_path=db_path, observer=detector,
+        )
+    elif harness == HARNESS_CODEX:
+        detector = CodexSkillDetector()
+        written = training_capture_codex.capture_session(
+            transcript_path, session_id=session_id, mind_id=mind_id,
+            db_path=db_path, observer=detector,
+        )
+    else:
+        raise ValueError(f"unknown harness {harness!r}")
+    return written, detector.names
+
+
+def bump_fired_skills(config_dir: str | Path | None, names: set[str]) -> list[str]:
+    """Best-effort ``bump_skills`` into a mind's sidecar; returns what was bumped.
+
+    A no-op without a ``config_dir``; a telemetry failure is logged, never raised.
+    """
+    if config_dir is None or not names:
+        return []
+    try:
+        return _load_telemetry().bump_skills(Path(config_dir), names)
+    except Exception:
+        log.exception("Skill telemetry bump failed under %s", config_dir)
+        return []
+
+
+def run_stop_hook(
+    transcript_path: str | Path,
+    *,
+    harness: str,
+    session_id: str,
+    mind_id: str | None = None,
+    config_dir: str | Path | None = None,
+    db_path: str | Path | None = None,
+) -> dict:
+    """Capture turns and bump fired skills from one transcript pass.
+
+    Skill telemetry is skipped when ``config_dir`` is None, and is
+    best-effort: a telemetry failure never undoes the capture. Returns
+    ``{"turns_written", "skills", "elapsed_ms"}``.
+    """
+    start = time.perf_counter()
+    written, names = capture_transcript(
+        transcript_path, harness=harness, session_id=session_id,
+        mind_id=mind_id, db_path=db_path,
+    )
+    return {
+        "turns_written": written,
+        "skills": bump_fired_skills(config_dir, names),
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+    }
+
+
+def _resolve_mind_id(ref: str | None) -> str | None:
+    if not ref:
+        return None
+    return mind_registry(MINDS_ROOT).canonical_id(ref) or ref
+
+
+def _enqueue(args, transcript: str, session_id: str, mind_id: str | None) -> bool:
+    from core import capture_spool  # the worker imports this module
+
+    record = capture_spool.SpoolRecord(
+        transcript_path=str(transcript),
+        session_id=session_id,
+        harness=args.harness,
+        mind_id=mind_id,
+        config_dir=str(Path(args.config_dir).resolve()) if args.config_dir else None,
+    )
+    limit = args.max_pending if args.max_pending is not None else capture_spool.DEFAULT_MAX_PENDING
+    if capture_spool.enqueue(args.spool, record, max_pending=limit):
+        return True
+    log.warning("Capture spool %s is full (%d pending); capturing inline", args.spool, limit)
+    return False
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Stop hook: training capture + skill telemetry.")
+    parser.add_argument("--harness", required=True, choices=(HARNESS_CLAUDE_CODE, HARNESS_CODEX))
+    parser.add_argument("--config-dir", help="the mind's .claude / .codex dir (enables skill telemetry)")
+    parser.add_argument("--mind-id", default=os.environ.get("MIND_ID"))
+    parser.add_argument("--db", default=None, help="training DB (default: runtime DB / $TRAINING_DB_PATH)")
+    parser.add_argument("--transcript", help="transcript path (default: from the Stop payload on stdin)")
+    parser.add_argument("--session-id", help="session id (default: from the Stop payload on stdin)")
+    parser.add_argument("--spool", default=os.environ.get("CAPTURE_SPOOL_DIR"),
+                        help="enqueue for the ingest worker instead of capturing inline")
+    parser.add_argument("--max-pending", type=int, default=None, help="spool depth at which to capture inline")
+    args = parser.parse_args(argv)
+
+    try:
+        payload = {} if args.transcript and args.session_id else json.loads(sys.stdin.read() or "{}")
+        transcript = args.transcript or payload.get("transcript_path")
+        session_id = args.session_id or payload.get("session_id")
+        if not (transcript and session_id):
+            log.warning("Stop hook: no transcript_path/session_id; nothing to capture")
+            return 0
+        mind_id = _resolve_mind_id(args.mind_id)
+        if args.spool and _enqueue(args, transcript, session_id, mind_id):
+            return 0
+        result = run_stop_hook(
+            transcript,
+            harness=args.harness,
+            session_id=session_id,
+            mind_id=mind_id,
+            config_dir=args.config_dir,
+            db_path=args.db,
+        )
+    except Exception:
+        log.exception("Stop hook failed")
+        return 0
+    # stdout belongs to the harness's hook protocol; report on stderr.
+    log.info("Stop hook %s: %s", session_id, json.dumps(result))
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    sys.exit(main())
@@ -18,9 +18,24 @@ Two properties define this layer:
   stores exactly what the harness emitted, in order, with real tool names
   kept verbatim. Filtering, anonymization, and reasoning-stripping are
   deferred to optional export-time passes over this immutable store.
-- **Upsert by ``(session_id, turn_index)``.** Each Stop-hook fire re-reads
-  the full transcript and upserts every turn row. A transcript only ever
-  grows, so turn rows are added or overwritten, never deleted.
+- **Upsert by ``(session_id, turn_index)``.** A transcript only ever
+  grows, so turn rows are added or overwritten, never deleted. A consumer
+  may re-read the full transcript on every Stop-hook fire, or keep a
+  ``capture_checkpoints`` row (byte offset, open turn index, accumulator
+  state) and upsert only the tail that changed since the last fire.
+
+System prompts are stored once, in ``system_prompts`` keyed by the sha256
+of their text; a turn row references its prompt by ``system_prompt_hash``
+and readers (:func:`get_turns`, the export) join it back in. The legacy
+inline ``system_prompt`` column is still read when no hash is set, until
+``scripts/migrations/2026-10-18-system-prompts-table.py`` moves it out.
+
+``assistant_blocks`` is JSON text unless the store was opened with block
+compression (see :mod:`core.training_codec`); ``blocks_codec`` records the
+encoding of each row and :func:`get_turns` decodes either transparently.
+
+Every row the store writes is also indexed in ``turns_fts`` for full-text
+search (see :mod:`core.training_search`).
 
 This module is intentionally dumb: it persists what it is given. Transcript
 parsing and turn grouping live in the per-harness consumers that call
@@ -29,11 +44,18 @@ parsing and turn grouping live in the per-harness consumers that call
 
 from __future__ import annotations
 
+import hashlib
 import json
+import os
 import sqlite3
+import threading
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from pathlib import Path
 
+from core.training_codec import CODEC_JSON, codec_for
+from core.training_search import create_index, has_index, index_turns
+
 # Harness identifiers stored in the ``harness`` column.
 HARNESS_CLAUDE_CODE = "claude_code"
 HARNESS_CODEX = "codex"
@@ -50,6 +72,7 @@ CREATE TABLE IF NOT EXISTS training_turns (
     harness_version   TEXT,
     captured_at       INTEGER,
     system_prompt     TEXT,
+    system_prompt_hash TEXT,
     user_content      TEXT,
     assistant_blocks  TEXT,
     has_reasoning     INTEGER NOT NULL DEFAULT 0,
@@ -59,6 +82,8 @@ CREATE TABLE IF NOT EXISTS training_turns (
     judge_verdict     TEXT,
     judge_confidence  REAL,
     exclusion_reason  TEXT,
+    content_hash      TEXT,
+    blocks_codec      INTEGER NOT NULL DEFAULT 0,
     UNIQUE(session_id, turn_index)
 );
 CREATE INDEX IF NOT EXISTS idx_training_turns_harness
@@ -67,11 +92,34 @@ CREATE INDEX IF NOT EXISTS idx_training_turns_source_model
     ON training_turns (source_model);
 CREATE INDEX IF NOT EXISTS idx_training_turns_has_reasoning
     ON training_turns (has_reasoning);
+CREATE TABLE IF NOT EXISTS system_prompts (
+    hash  TEXT PRIMARY KEY,
+    text  TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS block_dictionaries (
+    id          INTEGER PRIMARY KEY,
+    level       INTEGER NOT NULL,
+    dictionary  BLOB NOT NULL,
+    trained_on  INTEGER,
+    created_at  INTEGER
+);
+CREATE TABLE IF NOT EXISTS capture_checkpoints (
+    transcript_path  TEXT PRIMARY KEY,
+    session_id       TEXT NOT NULL,
+    harness          TEXT NOT NULL,
+    inode            INTEGER,
+    byte_offset      INTEGER NOT NULL,
+    turn_index       INTEGER NOT NULL,
+    state            TEXT,
+    updated_at       INTEGER
+);
 """
 
 # Columns written on upsert. ``id`` is autoincrement; the judge/exclusion
 # columns are populated by later curation passes, not at capture time, and
-# are preserved across re-capture.
+# are preserved across re-capture. ``content_hash`` lets an unchanged
+# re-capture skip the write. ``system_prompt`` is always written NULL: the
+# text lives in ``system_prompts``, referenced by ``system_prompt_hash``.
 _UPSERT_COLUMNS = (
     "session_id",
     "turn_index",
@@ -81,11 +129,14 @@ _UPSERT_COLUMNS = (
     "harness_version",
     "captured_at",
     "system_prompt",
+    "system_prompt_hash",
     "user_content",
     "assistant_blocks",
     "has_reasoning",
     "tool_call_count",
     "length_tokens",
+    "content_hash",
+    "blocks_codec",
 )
 
 
@@ -158,7 +209,7 @@ class TrainingTurn:
         )
 
     def _row_values(self) -> tuple:
-        return (
+        values = (
             self.session_id,
             self.turn_index,
             self.mind_id,
@@ -173,6 +224,61 @@ class TrainingTurn:
             self.tool_call_count,
             self.length_tokens,
         )
+        # ``captured_at`` (index 6) changes on every fire; leave it out so a
+        # re-capture of identical content hashes the same. The prompt text
+        # (index 7) is hashed in, so moving it out of the row changes nothing.
+        digest = hashlib.sha256(
+            json.dumps(values[:6] + values[7:], ensure_ascii=False).encode()
+        ).hexdigest()
+        return values[:7] + (None, self.system_prompt_hash) + values[8:] + (digest, CODEC_JSON)
+
+    @property
+    def system_prompt_hash(self) -> str | None:
+        return prompt_hash(self.system_prompt) if self.system_prompt is not None else None
+
+
+@dataclass
+class CaptureCheckpoint:
+    """Where an incremental capture of one transcript left off.
+
+    ``byte_offset`` is the end of the last complete line consumed;
+    ``turn_index`` is the index of the turn still open at that point (it
+    may keep growing, so it is re-upserted when new blocks land in it);
+    ``state`` is the consumer's JSON-able accumulator state — the open
+    turn plus whatever session metadata it tracks.
+    """
+
+    transcript_path: str
+    session_id: str
+    harness: str
+    byte_offset: int
+    turn_index: int
+    inode: int | None = None
+    state: dict = field(default_factory=dict)
+    updated_at: int | None = None
+
+
+def prompt_hash(text: str) -> str:
+    """The ``system_prompts`` key for a prompt: sha256 of its UTF-8 text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+_PROMPT_SQL = "INSERT OR IGNORE INTO system_prompts (hash, text) VALUES (?, ?)"
+
+
+def store_prompts(conn: sqlite3.Connection, turns: list[TrainingTurn]) -> None:
+    """Insert the distinct system prompts of ``turns`` (existing ones kept)."""
+    prompts = {t.system_prompt_hash: t.system_prompt for t in turns if t.system_prompt is not None}
+    if prompts:
+        conn.executemany(_PROMPT_SQL, prompts.items())
+
+
+# Joined into every read so rows come back with their prompt text. Rows
+# written before the prompt table existed still carry it inline.
+TURNS_FROM = (
+    "training_turns t LEFT JOIN system_prompts p ON p.hash = t.system_prompt_hash"
+)
+PROMPT_EXPR = "COALESCE(p.text, t.system_prompt)"
 
 
 def _block_text_len(block: dict) -> int:
@@ -196,24 +302,43 @@ def connect(db_path: str | Path) -> sqlite3.Connection:
     return conn
 
 
+# Columns added to ``training_turns`` after its first release.
+_ADDED_COLUMNS = (
+    ("content_hash", "TEXT"),
+    ("system_prompt_hash", "TEXT"),
+    ("blocks_codec", "INTEGER NOT NULL DEFAULT 0"),
+)
+
+
+def _migrate(conn: sqlite3.Connection) -> None:
+    """Bring a DB created by an older SCHEMA up to date."""
+    columns = {r[1] for r in conn.execute("PRAGMA table_info(training_turns)")}
+    for column, decl in _ADDED_COLUMNS:
+        if column in columns:
+            continue
+        try:
+            conn.execute(f"ALTER TABLE training_turns ADD COLUMN {column} {decl}")
+        except sqlite3.OperationalError as exc:
+            # Another process's hook migrated it first.
+            if "duplicate column" not in str(exc):
+                raise
+
+
 def init_db(db_path: str | Path) -> None:
     """Create the table and indexes if they do not already exist."""
     path = Path(db_path)
     path.parent.mkdir(parents=True, exist_ok=True)
     with connect(path) as conn:
         conn.executescript(SCHEMA)
+        _migrate(conn)
+        create_index(conn)
 
 
-def upsert_turn(db_path: str | Path, turn: TrainingTurn) -> None:
-    """Insert or replace one row keyed by ``(session_id, turn_index)``.
+_BLOCKS_AT = _UPSERT_COLUMNS.index("assistant_blocks")
+_CODEC_AT = _UPSERT_COLUMNS.index("blocks_codec")
 
-    On conflict the capture-time columns are overwritten with the latest
-    transcript shape while ``id`` is preserved. The curation columns
-    (``quality_flag``, ``judge_*``, ``exclusion_reason``) are left untouched
-    so a re-capture of a turn does not clobber a verdict already assigned by
-    a later pass.
-    """
-    init_db(db_path)
+
+def _upsert_sql() -> str:
     placeholders = ", ".join("?" for _ in _UPSERT_COLUMNS)
     columns = ", ".join(_UPSERT_COLUMNS)
     updates = ", ".join(
@@ -221,54 +346,349 @@ def upsert_turn(db_path: str | Path, turn: TrainingTurn) -> None:
         for col in _UPSERT_COLUMNS
         if col not in ("session_id", "turn_index")
     )
-    sql = (
+    # Unchanged content (same hash) is skipped: no row rewrite, no WAL page.
+    return (
         f"INSERT INTO training_turns ({columns}) VALUES ({placeholders}) "
-        f"ON CONFLICT(session_id, turn_index) DO UPDATE SET {updates}"
+        f"ON CONFLICT(session_id, turn_index) DO UPDATE SET {updates} "
+        f"WHERE training_turns.content_hash IS NOT excluded.content_hash"
     )
-    with connect(db_path) as conn:
-        conn.execute(sql, turn._row_values())
+
+
+_CHECKPOINT_SQL = (
+    "INSERT INTO capture_checkpoints (transcript_path, session_id, "
+    "harness, inode, byte_offset, turn_index, state, updated_at) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT(transcript_path) DO UPDATE SET "
+    "session_id = excluded.session_id, harness = excluded.harness, "
+    "inode = excluded.inode, byte_offset = excluded.byte_offset, "
+    "turn_index = excluded.turn_index, state = excluded.state, "
+    "updated_at = excluded.updated_at"
+)
+
+# Paths whose schema has been initialised by this process.
+_SCHEMA_READY: set[str] = set()
+_SCHEMA_LOCK = threading.Lock()
+
+
+class TrainingStore:
+    """A long-lived writer connection to the training DB.
+
+    Several minds' Stop hooks (Claude and Codex) write the same file
+    concurrently, so the connection runs in WAL mode (readers never block
+    the writer) with ``synchronous=NORMAL`` and a busy timeout, and every
+    batch is one ``BEGIN IMMEDIATE`` transaction — the write lock is taken
+    up front and waited on, instead of a deferred read upgrading mid-way
+    and failing with ``SQLITE_BUSY``. The schema script runs once per path
+    per process.
+
+    Rows carry a ``content_hash`` over their capture columns (everything
+    but ``captured_at``); a re-capture with an unchanged hash is skipped.
+    Inside :meth:`batch` writes are deferred and committed together, so a
+    caller capturing many sessions pays for one transaction.
+
+    With ``compress_blocks`` (default: ``TRAINING_BLOCKS_CODEC=zstd``) new
+    rows' ``assistant_blocks`` are zstd-compressed with the newest trained
+    dictionary (see :mod:`core.training_codec`); until one is trained they
+    are written as JSON. Each written row is (re)indexed in ``turns_fts`` in
+    the same transaction (see :mod:`core.training_search`). Module-level
+    :func:`upsert_turns` and friends go through :func:`get_store`, so
+    existing callers get all of this unchanged.
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path,
+        *,
+        busy_timeout_s: float = 30.0,
+        compress_blocks: bool | None = None,
+    ) -> None:
+        self.db_path = Path(db_path)
+        self.busy_timeout_s = busy_timeout_s
+        if compress_blocks is None:
+            compress_blocks = os.environ.get("TRAINING_BLOCKS_CODEC", "").lower() == "zstd"
+        self.compress_blocks = compress_blocks
+        self._conn: sqlite3.Connection | None = None
+        self._inode: int | None = None
+        self._lock = threading.RLock()
+        self._deferred: list | None = None
+        self._indexed = False
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._ensure_schema()
+            conn = sqlite3.connect(
+                str(self.db_path),
+                timeout=self.busy_timeout_s,
+                isolation_level=None,  # explicit BEGIN/COMMIT below
+                check_same_thread=False,
+            )
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_s * 1000)}")
+            conn.execute("PRAGMA foreign_keys = ON")
+            self._conn = conn
+            self._inode = self.db_path.stat().st_ino
+            self._indexed = has_index(conn)
+        return self._conn
+
+    def _ensure_schema(self) -> None:
+        key = str(self.db_path.resolve())
+        with _SCHEMA_LOCK:
+            if key in _SCHEMA_READY and self.db_path.exists():
+                return
+            init_db(self.db_path)
+            _SCHEMA_READY.add(key)
+
+    def is_stale(self) -> bool:
+        """True if the DB file was removed or replaced under this connection."""
+        if self._conn is None:
+            return False
+        try:
+            return self.db_path.stat().st_ino != self._inode
+        except OSError:
+            return True
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self) -> "TrainingStore":
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.close()
+
+    def _write(self, fn) -> None:
+        with self._lock:
+            if self._deferred is not None:
+                self._deferred.append(fn)
+                return
+            self._commit([fn])
+
+    def _commit(self, fns: list) -> None:
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for fn in fns:
+                fn(conn)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    @contextmanager
+    def batch(self):
+        """Defer the writes made inside the block to one transaction at exit.
+
+        Parsing done inside the block runs before the write lock is taken.
+        Row counts returned by deferred :meth:`upsert_turns` calls are 0.
+        If the block raises, nothing is written; if the commit fails, the
+        error propagates and nothing is written either. The store's lock is
+        held for the whole block, so other threads using this store wait.
+        A nested ``batch()`` joins the outer one.
+        """
+        with self._lock:
+            if self._deferred is not None:
+                yield self
+                return
+            self._deferred = []
+            try:
+                yield self
+                fns = self._deferred
+                self._deferred = None
+                if fns:
+                    self._commit(fns)
+            finally:
+                self._deferred = None
+
+    def upsert_turns(
+        self,
+        turns: list[TrainingTurn],
+        *,
+        checkpoint: CaptureCheckpoint | None = None,
+        session_metadata: dict | None = None,
+    ) -> int:
+        """Upsert ``turns`` (and optionally a checkpoint) in one transaction.
+
+        ``session_metadata`` (``source_model`` / ``harness_version``) is
+        applied to every existing row of the checkpoint's session — a
+        tail-only capture passes it when the metadata changed since the
+        last fire. Returns the number of rows actually written; rows whose
+        content hash is unchanged are skipped.
+        """
+        written = 0
+
+        def _run(conn: sqlite3.Connection) -> None:
+            nonlocal written
+            before = conn.total_changes
+            if turns:
+                store_prompts(conn, turns)
+                rows = [t._row_values() for t in turns]
+                if self.compress_blocks:
+                    rows = self._compress(conn, rows)
+                if self._indexed:
+                    written = self._upsert_indexed(conn, turns, rows)
+                else:
+                    conn.executemany(_upsert_sql(), rows)
+                    written = conn.total_changes - before
+            if session_metadata is not None and checkpoint is not None:
+                conn.execute(
+                    "UPDATE training_turns SET source_model = ?, harness_version = ? "
+                    "WHERE session_id = ?",
+                    (
+                        session_metadata.get("source_model"),
+                        session_metadata.get("harness_version"),
+                        checkpoint.session_id,
+                    ),
+                )
+            if checkpoint is not None:
+                conn.execute(_CHECKPOINT_SQL, (
+                    checkpoint.transcript_path,
+                    checkpoint.session_id,
+                    checkpoint.harness,
+                    checkpoint.inode,
+                    checkpoint.byte_offset,
+                    checkpoint.turn_index,
+                    json.dumps(checkpoint.state, ensure_ascii=False),
+                    checkpoint.updated_at,
+                ))
+
+        self._write(_run)
+        return written
+
+    def _upsert_indexed(
+        self, conn: sqlite3.Connection, turns: list[TrainingTurn], rows: list[tuple],
+    ) -> int:
+        # RETURNING yields an id only for rows actually inserted or updated,
+        # so an unchanged re-capture leaves the index untouched too.
+        sql = _upsert_sql() + " RETURNING id"
+        written = []
+        for turn, row in zip(turns, rows):
+            hit = conn.execute(sql, row).fetchone()
+            if hit is not None:
+                written.append((hit[0], turn.user_content, turn.assistant_blocks))
+        index_turns(conn, written)
+        return len(written)
+
+    def _compress(self, conn: sqlite3.Connection, rows: list[tuple]) -> list[tuple]:
+        codec = codec_for(self.db_path)
+        dict_id = codec.latest(conn)
+        if dict_id is None:
+            return rows
+        out = []
+        for row in rows:
+            row = list(row)
+            row[_BLOCKS_AT] = codec.encode(conn, row[_BLOCKS_AT], dict_id)
+            row[_CODEC_AT] = dict_id
+            out.append(tuple(row))
+        return out
+
+    def get_checkpoint(self, transcript_path: str | Path) -> CaptureCheckpoint | None:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT * FROM capture_checkpoints WHERE transcript_path = ?",
+                (str(transcript_path),),
+            ).fetchone()
+        if row is None:
+            return None
+        record = dict(row)
+        record["state"] = json.loads(record["state"]) if record["state"] else {}
+        return CaptureCheckpoint(**record)
+
+
+_STORES: dict[str, TrainingStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def get_store(db_path: str | Path) -> TrainingStore:
+    """The process-wide :class:`TrainingStore` for ``db_path``."""
+    key = str(Path(db_path).resolve())
+    with _STORES_LOCK:
+        store = _STORES.get(key)
+        if store is not None and store.is_stale():
+            store.close()
+            _SCHEMA_READY.discard(key)
+            store = None
+        if store is None:
+            store = _STORES[key] = TrainingStore(db_path)
+        return store
+
+
+def upsert_turn(db_path: str | Path, turn: TrainingTurn) -> None:
+    """Insert or replace one row keyed by ``(session_id, turn_index)``.
+
+    On conflict the capture-time columns are overwritten with the latest
+    transcript shape while ``id`` is preserved. The curation columns
+    (``quality_flag``, ``judge_*``, ``exclusion_reason``) are left untouched
+    so a re-capture of a turn does not clobber a verdict already assigned by
+    a later pass.
+    """
+    get_store(db_path).upsert_turns([turn])
 
 
 def upsert_turns(db_path: str | Path, turns: list[TrainingTurn]) -> None:
-    """Upsert a list of turn rows in one connection."""
-    init_db(db_path)
-    placeholders = ", ".join("?" for _ in _UPSERT_COLUMNS)
-    columns = ", ".join(_UPSERT_COLUMNS)
-    updates = ", ".join(
-        f"{col} = excluded.{col}"
-        for col in _UPSERT_COLUMNS
-        if col not in ("session_id", "turn_index")
-    )
-    sql = (
-        f"INSERT INTO training_turns ({columns}) VALUES ({placeholders}) "
-        f"ON CONFLICT(session_id, turn_index) DO UPDATE SET {updates}"
+    """Upsert a list of turn rows in one transaction."""
+    get_store(db_path).upsert_turns(turns)
+
+
+def get_checkpoint(
+    db_path: str | Path, transcript_path: str | Path
+) -> CaptureCheckpoint | None:
+    """Return the stored checkpoint for a transcript, or ``None``."""
+    if not Path(db_path).exists():
+        return None
+    return get_store(db_path).get_checkpoint(transcript_path)
+
+
+def upsert_turns_incremental(
+    db_path: str | Path,
+    turns: list[TrainingTurn],
+    checkpoint: CaptureCheckpoint,
+    *,
+    session_metadata: dict | None = None,
+) -> None:
+    """Upsert a transcript's changed tail and advance its checkpoint.
+
+    Both writes share one transaction, so a crash can never leave the
+    checkpoint ahead of the rows it covers. ``session_metadata``
+    (``source_model`` / ``harness_version``) is passed only when it changed
+    since the last fire; it is then propagated to the session's earlier
+    rows, which a tail-only upsert would otherwise leave on the old value.
+    """
+    get_store(db_path).upsert_turns(
+        turns, checkpoint=checkpoint, session_metadata=session_metadata,
     )
-    with connect(db_path) as conn:
-        conn.executemany(sql, [t._row_values() for t in turns])
 
 
 def get_turns(db_path: str | Path, session_id: str) -> list[dict]:
     """Return a session's rows ordered by ``turn_index``.
 
-    Each row is a dict with ``assistant_blocks`` JSON-decoded and
-    ``has_reasoning`` coerced to a bool.
+    Each row is a dict with ``assistant_blocks`` decoded (whatever its
+    ``blocks_codec``) and JSON-parsed, ``has_reasoning`` coerced to a bool,
+    and ``system_prompt`` rehydrated from ``system_prompts``.
     """
+    codec = codec_for(db_path)
+    records: list[dict] = []
     with connect(db_path) as conn:
         rows = conn.execute(
-            "SELECT * FROM training_turns WHERE session_id = ? "
-            "ORDER BY turn_index",
+            f"SELECT t.*, {PROMPT_EXPR} AS prompt_text FROM {TURNS_FROM} "
+            "WHERE t.session_id = ? ORDER BY t.turn_index",
             (session_id,),
         ).fetchall()
-    records: list[dict] = []
-    for row in rows:
-        record = dict(row)
-        record["assistant_blocks"] = (
-            json.loads(record["assistant_blocks"])
-            if record["assistant_blocks"]
-            else []
-        )
-        record["has_reasoning"] = bool(record["has_reasoning"])
-        records.append(record)
+        for row in rows:
+            record = dict(row)
+            record["system_prompt"] = record.pop("prompt_text")
+            raw = record["assistant_blocks"]
+            record["assistant_blocks"] = (
+                json.loads(codec.decode(conn, raw, record["blocks_codec"]))
+                if raw
+                else []
+            )
+            record["has_reasoning"] = bool(record["has_reasoning"])
+            records.append(record)
     return records
 
 
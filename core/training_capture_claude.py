@@ -5,6 +5,11 @@ fine-tuning dataset. It reads a Claude Code session JSONL transcript off
 disk, groups it into per-turn rows defined by the data contract, and
 upserts one row per turn via :func:`core.training_capture.upsert_turns`.
 
+Capture is incremental by default: a per-transcript checkpoint (byte
+offset, index of the still-open turn, accumulator state) lets each fire
+parse only the newly appended lines and upsert only the turns they touch,
+so the cost of a fire stays flat as a long session grows.
+
 This module is pure transcript→rows logic. It does not fork, load ``.env``,
 or read a Stop payload — that orchestration lives in each mind's own
 Stop-hook wrapper (Skippy's lives under ``~/.claude/hooks/``). Keeping the
@@ -44,8 +49,11 @@ from pathlib import Path
 
 from core.training_capture import (
     HARNESS_CLAUDE_CODE,
+    CaptureCheckpoint,
     TrainingTurn,
+    get_checkpoint,
     upsert_turns,
+    upsert_turns_incremental,
 )
 
 # The training DB lives next to the other state databases in this repo.
@@ -85,10 +93,25 @@ class _TurnAccumulator:
     and tool results append to the current turn. Blocks that arrive before
     the first human message attach to a leading turn with empty
     ``user_content``.
+
+    An incremental capture seeds the accumulator with the turn that was
+    still open at the last checkpoint; ``first_changed`` is the position of
+    the earliest turn touched since, so only those turns are re-upserted.
+
+    An optional ``observer`` (anything with ``turn(user_content)`` and
+    ``block(block)``) sees every turn and block as it is folded — the skill
+    detectors ride the same pass this way. The seeded open turn is not
+    replayed to it.
     """
 
-    def __init__(self) -> None:
-        self._turns: list[tuple[str, list[dict]]] = []
+    def __init__(self, open_turn: tuple[str, list[dict]] | None = None, observer=None) -> None:
+        self._turns: list[tuple[str, list[dict]]] = [open_turn] if open_turn else []
+        self._observer = observer
+        self.first_changed: int | None = None
+
+    def _touch(self, pos: int) -> None:
+        if self.first_changed is None or pos < self.first_changed:
+            self.first_changed = pos
 
     def _ensure_current(self) -> list[dict]:
         if not self._turns:
@@ -97,111 +120,107 @@ class _TurnAccumulator:
 
     def start_turn(self, user_content: str) -> None:
         self._turns.append((user_content, []))
+        self._touch(len(self._turns) - 1)
+        if self._observer is not None:
+            self._observer.turn(user_content)
 
     def add_block(self, block: dict) -> None:
         self._ensure_current().append(block)
+        self._touch(len(self._turns) - 1)
+        if self._observer is not None:
+            self._observer.block(block)
 
     @property
     def turns(self) -> list[tuple[str, list[dict]]]:
         return self._turns
 
 
-def _parse_grouped(transcript_path: str | Path) -> list[tuple[str, list[dict]]]:
-    """Group a Claude Code JSONL transcript into per-turn rows.
+class _SessionMeta:
+    """Tracks ``source_model`` / ``harness_version`` across events.
 
-    Returns a list of ``(user_content, assistant_blocks)`` tuples in
-    transcript order. Sidechain events and non user/assistant events are
-    skipped. ``redacted_thinking`` blocks are dropped; readable ``thinking``
-    blocks are kept in position.
+    Keeps the last assistant event's model and the last seen version, so a
+    model swap mid-session records the model the session ended on.
     """
-    path = Path(transcript_path)
-    acc = _TurnAccumulator()
-    try:
-        raw = path.read_text()
-    except OSError:
-        return []
 
-    for line in raw.splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        try:
-            ev = json.loads(line)
-        except json.JSONDecodeError:
-            continue
-        if ev.get("type") not in ("user", "assistant"):
-            continue
-        if ev.get("isSidechain"):
-            continue
-        msg = ev.get("message") or {}
-        role = msg.get("role") or ev.get("type")
-        content = msg.get("content")
-
-        if role == "assistant":
-            if isinstance(content, str):
-                if content:
-                    acc.add_block({"type": "text", "text": content})
-                continue
-            if isinstance(content, list):
-                for c in content:
-                    if not isinstance(c, dict):
-                        continue
-                    ctype = c.get("type")
-                    if ctype == "thinking":
-                        text = c.get("thinking") or ""
-                        if text:
-                            acc.add_block({"type": "thinking", "text": text})
-                    elif ctype == "redacted_thinking":
-                        continue  # encrypted; no readable signal
-                    elif ctype == "text":
-                        if c.get("text"):
-                            acc.add_block({"type": "text", "text": c["text"]})
-                    elif ctype == "tool_use":
-                        acc.add_block({
-                            "type": "tool_use",
-                            "name": c.get("name", ""),
-                            "input": c.get("input") or {},
-                            "id": c.get("id", ""),
-                        })
-            continue
+    def __init__(self, source_model: str | None = None, harness_version: str | None = None) -> None:
+        self.source_model = source_model
+        self.harness_version = harness_version
+
+    def observe(self, ev: dict) -> None:
+        if ev.get("version"):
+            self.harness_version = ev["version"]
+        if ev.get("type") == "assistant":
+            m = (ev.get("message") or {}).get("model")
+            if m:
+                self.source_model = m
 
-        # role == "user": human text opens a new turn; tool_result blocks
-        # append to the current turn.
+    def as_dict(self) -> dict:
+        return {"source_model": self.source_model, "harness_version": self.harness_version}
+
+
+def _apply_event(acc: _TurnAccumulator, ev: dict) -> None:
+    """Fold one transcript event into the accumulator."""
+    if ev.get("type") not in ("user", "assistant"):
+        return
+    if ev.get("isSidechain"):
+        return
+    msg = ev.get("message") or {}
+    role = msg.get("role") or ev.get("type")
+    content = msg.get("content")
+
+    if role == "assistant":
         if isinstance(content, str):
             if content:
-                acc.start_turn(content)
-            continue
+                acc.add_block({"type": "text", "text": content})
+            return
         if isinstance(content, list):
             for c in content:
                 if not isinstance(c, dict):
                     continue
                 ctype = c.get("type")
-                if ctype == "tool_result":
+                if ctype == "thinking":
+                    text = c.get("thinking") or ""
+                    if text:
+                        acc.add_block({"type": "thinking", "text": text})
+                elif ctype == "redacted_thinking":
+                    continue  # encrypted; no readable signal
+                elif ctype == "text":
+                    if c.get("text"):
+                        acc.add_block({"type": "text", "text": c["text"]})
+                elif ctype == "tool_use":
                     acc.add_block({
-                        "type": "tool_result",
-                        "content": _tool_result_text(c.get("content")),
-                        "tool_call_id": c.get("tool_use_id", ""),
-                        "is_error": bool(c.get("is_error")),
+                        "type": "tool_use",
+                        "name": c.get("name", ""),
+                        "input": c.get("input") or {},
+                        "id": c.get("id", ""),
                     })
-                elif ctype == "text" and c.get("text"):
-                    acc.start_turn(c["text"])
-    return acc.turns
+        return
 
-
-def _session_metadata(transcript_path: str | Path) -> dict:
-    """Pull ``source_model`` and ``harness_version`` from assistant events.
-
-    Uses the last assistant event that carries each field, so a model swap
-    mid-session records the model the session ended on.
-    """
-    path = Path(transcript_path)
-    model = None
-    version = None
-    try:
-        raw = path.read_text()
-    except OSError:
-        return {"source_model": None, "harness_version": None}
-    for line in raw.splitlines():
+    # role == "user": human text opens a new turn; tool_result blocks
+    # append to the current turn.
+    if isinstance(content, str):
+        if content:
+            acc.start_turn(content)
+        return
+    if isinstance(content, list):
+        for c in content:
+            if not isinstance(c, dict):
+                continue
+            ctype = c.get("type")
+            if ctype == "tool_result":
+                acc.add_block({
+                    "type": "tool_result",
+                    "content": _tool_result_text(c.get("content")),
+                    "tool_call_id": c.get("tool_use_id", ""),
+                    "is_error": bool(c.get("is_error")),
+                })
+            elif ctype == "text" and c.get("text"):
+                acc.start_turn(c["text"])
+
+
+def _fold_lines(lines, acc: _TurnAccumulator, meta: _SessionMeta) -> None:
+    """One pass over raw JSONL lines, feeding both turns and metadata."""
+    for line in lines:
         line = line.strip()
         if not line:
             continue
@@ -209,13 +228,64 @@ def _session_metadata(transcript_path: str | Path) -> dict:
             ev = json.loads(line)
         except json.JSONDecodeError:
             continue
-        if ev.get("version"):
-            version = ev["version"]
-        if ev.get("type") == "assistant":
-            m = (ev.get("message") or {}).get("model")
-            if m:
-                model = m
-    return {"source_model": model, "harness_version": version}
+        meta.observe(ev)
+        _apply_event(acc, ev)
+
+
+def _parse_transcript(
+    transcript_path: str | Path,
+    observer=None,
+) -> tuple[list[tuple[str, list[dict]]], dict]:
+    """Stream a transcript once; return its grouped turns and session metadata.
+
+    Lines are folded as they are read, so the raw file is never held in
+    memory next to the parsed turns.
+    """
+    acc = _TurnAccumulator(observer=observer)
+    meta = _SessionMeta()
+    try:
+        with open(transcript_path, encoding="utf-8", errors="replace") as fh:
+            _fold_lines(fh, acc, meta)
+    except OSError:
+        return [], meta.as_dict()
+    return acc.turns, meta.as_dict()
+
+
+def _parse_grouped(transcript_path: str | Path) -> list[tuple[str, list[dict]]]:
+    """Group a Claude Code JSONL transcript into per-turn rows.
+
+    Returns a list of ``(user_content, assistant_blocks)`` tuples in
+    transcript order. Sidechain events and non user/assistant events are
+    skipped. ``redacted_thinking`` blocks are dropped; readable ``thinking``
+    blocks are kept in position.
+    """
+    return _parse_transcript(transcript_path)[0]
+
+
+def _rows(
+    grouped: list[tuple[str, list[dict]]],
+    meta: dict,
+    *,
+    first_index: int,
+    session_id: str,
+    mind_id: str | None,
+    captured_at: int,
+) -> list[TrainingTurn]:
+    return [
+        TrainingTurn.from_blocks(
+            session_id=session_id,
+            turn_index=first_index + offset,
+            harness=HARNESS_CLAUDE_CODE,
+            user_content=user_content,
+            assistant_blocks=blocks,
+            mind_id=mind_id,
+            source_model=meta["source_model"],
+            harness_version=meta["harness_version"],
+            captured_at=captured_at,
+            system_prompt=None,
+        )
+        for offset, (user_content, blocks) in enumerate(grouped)
+    ]
 
 
 def build_turns(
@@ -224,6 +294,7 @@ def build_turns(
     session_id: str,
     mind_id: str | None = None,
     captured_at: int | None = None,
+    observer=None,
 ) -> list[TrainingTurn]:
     """Build the list of :class:`TrainingTurn` rows from a transcript.
 
@@ -231,26 +302,118 @@ def build_turns(
     store). The ``system_prompt`` (Claude transcripts carry none here) is
     denormalized onto every row of the session.
     """
-    grouped = _parse_grouped(transcript_path)
+    grouped, meta = _parse_transcript(transcript_path, observer)
     if not grouped:
         return []
-    meta = _session_metadata(transcript_path)
     stamp = captured_at if captured_at is not None else int(time.time())
-    return [
-        TrainingTurn.from_blocks(
-            session_id=session_id,
-            turn_index=idx,
-            harness=HARNESS_CLAUDE_CODE,
-            user_content=user_content,
-            assistant_blocks=blocks,
-            mind_id=mind_id,
-            source_model=meta["source_model"],
-            harness_version=meta["harness_version"],
-            captured_at=stamp,
-            system_prompt=None,
+    return _rows(
+        grouped, meta,
+        first_index=0, session_id=session_id, mind_id=mind_id, captured_at=stamp,
+    )
+
+
+def _read_new_lines(path: Path, offset: int) -> tuple[list[str], int]:
+    """Read complete lines appended after ``offset``.
+
+    Returns the decoded lines and the byte offset just past the last
+    newline. A trailing partial line (the harness mid-write) is left for
+    the next fire.
+    """
+    with path.open("rb") as fh:
+        fh.seek(offset)
+        data = fh.read()
+    end = data.rfind(b"\n")
+    if end < 0:
+        return [], offset
+    return data[: end + 1].decode("utf-8", errors="replace").splitlines(), offset + end + 1
+
+
+def capture_incremental(
+    transcript_path: str | Path,
+    *,
+    session_id: str,
+    mind_id: str | None = None,
+    db_path: str | Path | None = None,
+    observer=None,
+) -> bool:
+    """Upsert only the turns changed since this transcript's last checkpoint.
+
+    Parses the bytes appended since the stored offset in one pass, seeded
+    with the turn that was still open last time, and upserts that turn and
+    any new ones. The checkpoint is discarded (full re-parse) when the
+    transcript was replaced, truncated, or belongs to another session.
+    ``observer`` sees only the newly parsed turns and blocks.
+    ``True`` if any rows were written.
+    """
+    path = Path(transcript_path)
+    db = db_path if db_path is not None else default_db_path()
+    try:
+        st = path.stat()
+    except OSError:
+        return False
+
+    cp = get_checkpoint(db, str(path))
+    if cp is not None and (
+        cp.session_id != session_id
+        or cp.inode != st.st_ino
+        or st.st_size < cp.byte_offset
+    ):
+        cp = None
+    if cp is not None and st.st_size == cp.byte_offset:
+        return False
+
+    start = cp.byte_offset if cp else 0
+    base = cp.turn_index if cp else 0
+    state = cp.state if cp else {}
+    open_turn = state.get("open_turn")
+    prev_meta = state.get("meta") or {}
+    acc = _TurnAccumulator(tuple(open_turn) if open_turn else None, observer)
+    meta = _SessionMeta(prev_meta.get("source_model"), prev_meta.get("harness_version"))
+
+    try:
+        lines, end = _read_new_lines(path, start)
+    except OSError:
+        return False
+    if end == start:
+        return False
+    _fold_lines(lines, acc, meta)
+
+    grouped = acc.turns
+    if cp is None and not grouped:
+        return False  # nothing captured yet; don't start a checkpoint
+
+    meta_now = meta.as_dict()
+    meta_changed = cp is not None and meta_now != {
+        "source_model": prev_meta.get("source_model"),
+        "harness_version": prev_meta.get("harness_version"),
+    }
+    first = acc.first_changed
+    stamp = int(time.time())
+    rows = (
+        _rows(
+            grouped[first:], meta_now,
+            first_index=base + first, session_id=session_id,
+            mind_id=mind_id, captured_at=stamp,
         )
-        for idx, (user_content, blocks) in enumerate(grouped)
-    ]
+        if first is not None
+        else []
+    )
+    last = len(grouped) - 1
+    checkpoint = CaptureCheckpoint(
+        transcript_path=str(path),
+        session_id=session_id,
+        harness=HARNESS_CLAUDE_CODE,
+        inode=st.st_ino,
+        byte_offset=end,
+        turn_index=base + max(last, 0),
+        state={"open_turn": list(grouped[-1]) if grouped else None, "meta": meta_now},
+        updated_at=stamp,
+    )
+    upsert_turns_incremental(
+        db, rows, checkpoint,
+        session_metadata=meta_now if meta_changed else None,
+    )
+    return bool(rows)
 
 
 def capture_session(
@@ -259,12 +422,23 @@ def capture_session(
     session_id: str,
     mind_id: str | None = None,
     db_path: str | Path | None = None,
+    incremental: bool = True,
+    observer=None,
 ) -> bool:
     """Parse a transcript and upsert its turn rows. ``True`` if any written.
 
+    By default capture is incremental (see :func:`capture_incremental`), so
+    a Stop-hook fire costs only the bytes appended since the last one.
+    ``incremental=False`` re-parses and re-upserts the whole transcript.
     No-op (returns ``False``) when the transcript has no usable turns.
+    ``observer`` is passed to the accumulator (see :class:`_TurnAccumulator`).
     """
-    turns = build_turns(transcript_path, session_id=session_id, mind_id=mind_id)
+    if incremental:
+        return capture_incremental(
+            transcript_path, session_id=session_id, mind_id=mind_id, db_path=db_path,
+            observer=observer,
+        )
+    turns = build_turns(transcript_path, session_id=session_id, mind_id=mind_id, observer=observer)
     if not turns:
         return False
     upsert_turns(db_path if db_path is not None else default_db_path(), turns)
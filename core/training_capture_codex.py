@@ -164,10 +164,14 @@ class _TurnAccumulator:
     A new turn opens only on a ``user`` message. Assistant text, tool calls,
     and tool results append to the current turn. Items that arrive before the
     first user message attach to a leading turn with empty ``user_content``.
+
+    An optional ``observer`` (``turn(user_content)`` / ``block(block)``) sees
+    every turn and block as it is folded, e.g. a skill detector.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, observer=None) -> None:
         self._turns: list[tuple[str, list[dict]]] = []
+        self._observer = observer
 
     def _ensure_current(self) -> list[dict]:
         if not self._turns:
@@ -176,120 +180,135 @@ class _TurnAccumulator:
 
     def start_turn(self, user_content: str) -> None:
         self._turns.append((user_content, []))
+        if self._observer is not None:
+            self._observer.turn(user_content)
 
     def add_block(self, block: dict) -> None:
         self._ensure_current().append(block)
+        if self._observer is not None:
+            self._observer.block(block)
 
     @property
     def turns(self) -> list[tuple[str, list[dict]]]:
         return self._turns
 
 
-def _parse_grouped(transcript_path: str | Path) -> list[tuple[str, list[dict]]]:
-    """Group a Codex rollout JSONL into per-turn rows.
-
-    Returns a list of ``(user_content, assistant_blocks)`` tuples in rollout
-    order. ``reasoning`` items and ``developer`` / ``system`` messages are
-    dropped; ``event_msg`` / ``session_meta`` / ``turn_context`` lines are
-    ignored here (metadata is read separately).
-    """
-    path = Path(transcript_path)
-    acc = _TurnAccumulator()
-    try:
-        raw = path.read_text()
-    except OSError:
-        return []
-
-    for line in raw.splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        try:
-            ev = json.loads(line)
-        except json.JSONDecodeError:
-            continue
-        if ev.get("type") != "response_item":
-            continue
-        payload = ev.get("payload") or {}
-        ptype = payload.get("type")
-
-        if ptype == "message":
-            role = payload.get("role")
-            if role not in _TURN_ROLES:
-                continue
-            text = _content_text(payload.get("content"))
-            if role == "user":
-                if text:
-                    acc.start_turn(text)
-            else:  # assistant
-                if text:
-                    acc.add_block({"type": "text", "text": text})
-            continue
-
-        if ptype == "function_call":
-            acc.add_block({
-                "type": "tool_use",
-                "name": payload.get("name", ""),
-                "input": _parse_arguments(payload.get("arguments")),
-                "id": payload.get("call_id", ""),
-            })
-            continue
-
-        if ptype == "function_call_output":
-            acc.add_block({
-                "type": "tool_result",
-                "content": _output_text(payload.get("output")),
-                "tool_call_id": payload.get("call_id", ""),
-                "is_error": _output_is_error(payload.get("output")),
-            })
-            continue
-
-        # reasoning and any other item types are intentionally dropped.
-    return acc.turns
-
-
-def _session_metadata(transcript_path: str | Path) -> dict:
-    """Pull ``source_model``, ``harness_version``, ``system_prompt``.
+class _SessionMeta:
+    """Tracks ``source_model``, ``harness_version``, ``system_prompt``.
 
     ``source_model`` is the last ``turn_context.model`` (the model the
     session ended on). ``harness_version`` and ``system_prompt`` come from
     the single ``session_meta`` line.
     """
-    path = Path(transcript_path)
-    model = None
-    version = None
-    system_prompt = None
-    try:
-        raw = path.read_text()
-    except OSError:
-        return {"source_model": None, "harness_version": None, "system_prompt": None}
-    for line in raw.splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        try:
-            ev = json.loads(line)
-        except json.JSONDecodeError:
-            continue
-        etype = ev.get("type")
-        payload = ev.get("payload") or {}
+
+    def __init__(self) -> None:
+        self.source_model: str | None = None
+        self.harness_version: str | None = None
+        self.system_prompt: str | None = None
+
+    def observe(self, etype: str | None, payload: dict) -> None:
         if etype == "turn_context":
             m = payload.get("model")
             if m:
-                model = m
+                self.source_model = m
         elif etype == "session_meta":
             if payload.get("cli_version"):
-                version = payload["cli_version"]
+                self.harness_version = payload["cli_version"]
             instr = payload.get("base_instructions")
             if isinstance(instr, dict):
-                system_prompt = instr.get("text")
+                self.system_prompt = instr.get("text")
             elif isinstance(instr, str):
-                system_prompt = instr
-    return {
-        "source_model": model,
-        "harness_version": version,
-        "system_prompt": system_prompt,
-    }
+                self.system_prompt = instr
+
+    def as_dict(self) -> dict:
+        return {
+            "source_model": self.source_model,
+            "harness_version": self.harness_version,
+            "system_prompt": self.system_prompt,
+        }
+
+
+def _apply_item(acc: _TurnAccumulator, payload: dict) -> None:
+    """Fold one ``response_item`` payload into the accumulator."""
+    ptype = payload.get("type")
+
+    if ptype == "message":
+        role = payload.get("role")
+        if role not in _TURN_ROLES:
+            return
+        text = _content_text(payload.get("content"))
+        if role == "user":
+            if text:
+                acc.start_turn(text)
+        else:  # assistant
+            if text:
+                acc.add_block({"type": "text", "text": text})
+        return
+
+    if ptype == "function_call":
+        acc.add_block({
+            "type": "tool_use",
+            "name": payload.get("name", ""),
+            "input": _parse_arguments(payload.get("arguments")),
+            "id": payload.get("call_id", ""),
+        })
+        return
+
+    if ptype == "function_call_output":
+        acc.add_block({
+            "type": "tool_result",
+            "content": _output_text(payload.get("output")),
+            "tool_call_id": payload.get("call_id", ""),
+            "is_error": _output_is_error(payload.get("output")),
+        })
+        return
+
+    # reasoning and any other item types are intentionally dropped.
+
+
+def _parse_transcript(
+    transcript_path: str | Path,
+    observer=None,
+) -> tuple[list[tuple[str, list[dict]]], dict]:
+    """Stream a rollout once; return its grouped turns and session metadata."""
+    acc = _TurnAccumulator(observer)
+    meta = _SessionMeta()
+    try:
+        fh = open(transcript_path, encoding="utf-8", errors="replace")
+    except OSError:
+        return [], meta.as_dict()
+    with fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                ev = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            etype = ev.get("type")
+            payload = ev.get("payload") or {}
+            if etype == "response_item":
+                _apply_item(acc, payload)
+            else:
+                meta.observe(etype, payload)
+    return acc.turns, meta.as_dict()
+
+
+def _parse_grouped(transcript_path: str | Path) -> list[tuple[str, list[dict]]]:
+    """Group a Codex rollout JSONL into per-turn rows.
+
+    Returns a list of ``(user_content, assistant_blocks)`` tuples in rollout
+    order. ``reasoning`` items and ``developer`` / ``system`` messages are
+    dropped; ``event_msg`` / ``session_meta`` / ``turn_context`` lines feed
+    only the metadata.
+    """
+    return _parse_transcript(transcript_path)[0]
+
+
+def _session_metadata(transcript_path: str | Path) -> dict:
+    """Pull ``source_model``, ``harness_version``, ``system_prompt``."""
+    return _parse_transcript(transcript_path)[1]
 
 
 def build_turns(
@@ -298,17 +317,17 @@ def build_turns(
     session_id: str,
     mind_id: str | None = None,
     captured_at: int | None = None,
+    observer=None,
 ) -> list[TrainingTurn]:
     """Build the list of :class:`TrainingTurn` rows from a rollout.
 
     Returns an empty list when the rollout yields no turns (nothing to
     store). The ``system_prompt`` from ``session_meta`` is denormalized onto
-    every row of the session.
+    every row of the session. Turns and metadata come from one pass.
     """
-    grouped = _parse_grouped(transcript_path)
+    grouped, meta = _parse_transcript(transcript_path, observer)
     if not grouped:
         return []
-    meta = _session_metadata(transcript_path)
     stamp = captured_at if captured_at is not None else int(time.time())
     return [
         TrainingTurn.from_blocks(
@@ -333,12 +352,14 @@ def capture_session(
     session_id: str,
     mind_id: str | None = None,
     db_path: str | Path | None = None,
+    observer=None,
 ) -> bool:
     """Parse a rollout and upsert its turn rows. ``True`` if any written.
 
     No-op (returns ``False``) when the rollout has no usable turns.
+    ``observer`` is passed to the accumulator (see :class:`_TurnAccumulator`).
     """
-    turns = build_turns(transcript_path, session_id=session_id, mind_id=mind_id)
+    turns = build_turns(transcript_path, session_id=session_id, mind_id=mind_id, observer=observer)
     if not turns:
         return False
     upsert_turns(db_path if db_path is not None else default_db_path(), turns)
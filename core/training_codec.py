@@ -0,0 +1,295 @@
+"""Opt-in compressed encoding for ``training_turns.assistant_blocks``.
+
+By default a row's ``assistant_blocks`` is its block array as ``json.dumps``
+text. Tool results and repeated tool-call JSON dominate the size of the
+training DB, and that text compresses very well against a dictionary
+trained on the corpus. This module provides that encoding.
+
+- ``block_dictionaries`` holds zstd dictionaries trained on the store's own
+  rows (``id``, ``level``, ``dictionary``, ``trained_on``, ``created_at``).
+- ``training_turns.blocks_codec`` is the codec version of each row.
+  ``0`` means plain JSON text. ``n > 0`` means a zstd frame compressed
+  with dictionary ``n``. A retrained dictionary gets a new id, so older
+  rows keep decoding with the dictionary they were written with.
+
+Encoding is opt-in: :class:`core.training_capture.TrainingStore` compresses
+new rows only with ``compress_blocks=True`` or ``TRAINING_BLOCKS_CODEC=zstd``,
+and only once a dictionary has been trained. Every reader decodes
+transparently through :func:`codec_for`, whatever the row's codec:
+:func:`core.training_capture.get_turns`, the export, and the skill
+proposer. Without the ``zstandard`` package, JSON rows still read and write
+normally. Only compressed rows raise :class:`CodecUnavailable`.
+
+CLI::
+
+    python -m core.training_codec train    --db data/training_turns.db
+    python -m core.training_codec reencode --db data/training_turns.db --to zstd
+    python -m core.training_codec reencode --db data/training_turns.db --to json
+    python -m core.training_codec stats    --db data/training_turns.db
+
+``reencode`` streams rows in ``id`` order in keyset batches. Each batch is
+its own ``BEGIN IMMEDIATE`` transaction, so Stop hooks keep writing, and
+an interrupted run can be re-run. ``content_hash`` is over the JSON text
+and does not change.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None  # type: ignore[assignment]
+
+CODEC_JSON = 0
+DEFAULT_LEVEL = 9
+DEFAULT_DICT_BYTES = 112 * 1024
+DEFAULT_SAMPLE_ROWS = 5000
+DEFAULT_BATCH_ROWS = 1000
+
+
+class CodecUnavailable(RuntimeError):
+    """A row is compressed but it cannot be decoded here."""
+
+
+class BlockCodec:
+    """The dictionaries of one training DB, with cached (de)compressors.
+
+    Dictionaries are immutable once stored, so entries are loaded on first
+    use and never invalidated. :func:`codec_for` drops the whole codec when
+    the DB file is replaced.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[int, tuple] = {}  # id -> (compressor, decompressor)
+        self._lock = threading.Lock()
+
+    def _load(self, conn: sqlite3.Connection, dict_id: int) -> None:
+        if zstandard is None:
+            raise CodecUnavailable("compressed assistant_blocks need the 'zstandard' package")
+        row = conn.execute(
+            "SELECT level, dictionary FROM block_dictionaries WHERE id = ?", (dict_id,)
+        ).fetchone()
+        if row is None:
+            return
+        zdict = zstandard.ZstdCompressionDict(bytes(row[1]))
+        self._entries[dict_id] = (
+            zstandard.ZstdCompressor(level=row[0], dict_data=zdict),
+            zstandard.ZstdDecompressor(dict_data=zdict),
+        )
+
+    def latest(self, conn: sqlite3.Connection) -> int | None:
+        """The newest dictionary id (``None`` until one is trained)."""
+        if zstandard is None:
+            return None
+        return conn.execute("SELECT MAX(id) FROM block_dictionaries").fetchone()[0]
+
+    def _entry(self, conn: sqlite3.Connection | None, dict_id: int) -> tuple:
+        entry = self._entries.get(dict_id)
+        if entry is None:
+            with self._lock:
+                if conn is not None and dict_id not in self._entries:
+                    self._load(conn, dict_id)
+                entry = self._entries.get(dict_id)
+            if entry is None:
+                raise CodecUnavailable(f"no block dictionary {dict_id}")
+        return entry
+
+    def encode(self, conn: sqlite3.Connection, text: str, dict_id: int) -> bytes:
+        return self._entry(conn, dict_id)[0].compress(text.encode("utf-8"))
+
+    def decode(self, conn: sqlite3.Connection | None, value, codec: int | None) -> str:
+        """The JSON text of a stored ``assistant_blocks`` value."""
+        if not codec:
+            if isinstance(value, bytes):
+                return value.decode("utf-8")
+            return value
+        return self._entry(conn, codec)[1].decompress(value).decode("utf-8")
+
+
+_CODECS: dict[str, tuple[int, BlockCodec]] = {}
+_CODECS_LOCK = threading.Lock()
+
+
+def codec_for(db_path: str | Path) -> BlockCodec:
+    """The process-wide :class:`BlockCodec` for ``db_path``."""
+    path = Path(db_path)
+    key = str(path.resolve())
+    try:
+        inode = path.stat().st_ino
+    except OSError:
+        inode = 0
+    with _CODECS_LOCK:
+        cached = _CODECS.get(key)
+        if cached is None or cached[0] != inode:
+            cached = _CODECS[key] = (inode, BlockCodec())
+        return cached[1]
+
+
+# ---------------------------------------------------------------------------
+# Training + re-encoding
+# ---------------------------------------------------------------------------
+
+def _connect(db_path: str | Path) -> sqlite3.Connection:
+    from core.training_capture import init_db  # the store imports this module
+
+    init_db(db_path)
+    conn = sqlite3.connect(str(db_path), timeout=30.0, isolation_level=None)
+    conn.execute("PRAGMA journal_mode = WAL")
+    return conn
+
+
+def train_dictionary(
+    db_path: str | Path,
+    *,
+    sample_rows: int = DEFAULT_SAMPLE_ROWS,
+    dict_bytes: int = DEFAULT_DICT_BYTES,
+    level: int = DEFAULT_LEVEL,
+) -> int:
+    """Train a dictionary on a sample of stored rows; return its new id."""
+    if zstandard is None:
+        raise CodecUnavailable("training a block dictionary needs the 'zstandard' package")
+    codec = codec_for(db_path)
+    conn = _connect(db_path)
+    try:
+        rows = conn.execute(
+            "SELECT assistant_blocks, blocks_codec FROM training_turns "
+            "WHERE assistant_blocks IS NOT NULL ORDER BY RANDOM() LIMIT ?",
+            (sample_rows,),
+        ).fetchall()
+        samples = [codec.decode(conn, value, c).encode("utf-8") for value, c in rows]
+        if len(samples) < 10:
+            raise ValueError(f"need at least 10 rows to train a dictionary, found {len(samples)}")
+        zdict = zstandard.train_dictionary(dict_bytes, samples, level=level)
+        cur = conn.execute(
+            "INSERT INTO block_dictionaries (level, dictionary, trained_on, created_at) "
+            "VALUES (?, ?, ?, ?)",
+            (level, zdict.as_bytes(), len(samples), int(time.time())),
+        )
+        return cur.lastrowid
+    finally:
+        conn.close()
+
+
+def reencode(
+    db_path: str | Path,
+    *,
+    to: str = "zstd",
+    dict_id: int | None = None,
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+) -> dict:
+    """Stream every row not already in the target codec into it.
+
+    ``to="zstd"`` uses ``dict_id`` (default: the newest dictionary);
+    ``to="json"`` decodes back to plain text. Returns row and byte counts.
+    """
+    codec = codec_for(db_path)
+    conn = _connect(db_path)
+    try:
+        if to == "zstd":
+            target = dict_id if dict_id is not None else codec.latest(conn)
+            if target is None:
+                raise ValueError("no block dictionary; run `train` first")
+        elif to == "json":
+            target = CODEC_JSON
+        else:
+            raise ValueError(f"unknown codec {to!r}; expected 'zstd' or 'json'")
+
+        stats = {"rows": 0, "bytes_before": 0, "bytes_after": 0, "codec": target}
+        cursor = 0
+        while True:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = conn.execute(
+                    "SELECT id, assistant_blocks, blocks_codec FROM training_turns "
+                    "WHERE id > ? AND blocks_codec IS NOT ? AND assistant_blocks IS NOT NULL "
+                    "ORDER BY id LIMIT ?",
+                    (cursor, target, batch_rows),
+                ).fetchall()
+                updates = []
+                for row_id, value, current in rows:
+                    text = codec.decode(conn, value, current)
+                    new = codec.encode(conn, text, target) if target else text
+                    stats["bytes_before"] += len(value)
+                    stats["bytes_after"] += len(new if isinstance(new, bytes) else new.encode("utf-8"))
+                    updates.append((new, target, row_id))
+                conn.executemany(
+                    "UPDATE training_turns SET assistant_blocks = ?, blocks_codec = ? WHERE id = ?",
+                    updates,
+                )
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            if not rows:
+                return stats
+            stats["rows"] += len(rows)
+            cursor = rows[-1][0]
+    finally:
+        conn.close()
+
+
+def codec_stats(db_path: str | Path) -> dict:
+    """Rows and stored bytes of ``assistant_blocks`` per codec."""
+    conn = _connect(db_path)
+    try:
+        rows = conn.execute(
+            "SELECT blocks_codec, COUNT(*), SUM(LENGTH(CAST(assistant_blocks AS BLOB))) "
+            "FROM training_turns GROUP BY blocks_codec ORDER BY blocks_codec"
+        ).fetchall()
+        dicts = conn.execute(
+            "SELECT id, level, LENGTH(dictionary), trained_on, created_at FROM block_dictionaries ORDER BY id"
+        ).fetchall()
+    finally:
+        conn.close()
+    return {
+        "codecs": {str(c): {"rows": n, "bytes": b or 0} for c, n, b in rows},
+        "dictionaries": [
+            {"id": i, "level": lv, "bytes": size, "trained_on": t, "created_at": at}
+            for i, lv, size, t, at in dicts
+        ],
+    }
+
+
+def _default_db() -> Path:
+    override = os.environ.get("TRAINING_DB_PATH")
+    return Path(override) if override else Path(__file__).resolve().parent.parent / "data" / "training_turns.db"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Train block dictionaries and re-encode assistant_blocks.")
+    parser.add_argument("command", choices=("train", "reencode", "stats"))
+    parser.add_argument("--db", default=None, help="training DB (default: runtime DB / $TRAINING_DB_PATH)")
+    parser.add_argument("--to", choices=("zstd", "json"), default="zstd", help="reencode target")
+    parser.add_argument("--dict-id", type=int, default=None, help="reencode with this dictionary")
+    parser.add_argument("--batch-rows", type=int, default=DEFAULT_BATCH_ROWS)
+    parser.add_argument("--sample-rows", type=int, default=DEFAULT_SAMPLE_ROWS)
+    parser.add_argument("--dict-bytes", type=int, default=DEFAULT_DICT_BYTES)
+    parser.add_argument("--level", type=int, default=DEFAULT_LEVEL)
+    args = parser.parse_args(argv)
+    db = args.db or _default_db()
+
+    if args.command == "train":
+        result: dict = {"dict_id": train_dictionary(
+            db, sample_rows=args.sample_rows, dict_bytes=args.dict_bytes, level=args.level,
+        )}
+    elif args.command == "reencode":
+        result = reencode(db, to=args.to, dict_id=args.dict_id, batch_rows=args.batch_rows)
+        if result["bytes_after"]:
+            result["ratio"] = round(result["bytes_before"] / result["bytes_after"], 2)
+    else:
+        result = codec_stats(db)
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,513 @@
+"""Training-turn export: stream ``training_turns`` into sharded files.
+
+The capture store (:mod:`core.training_capture`) is immutable and raw; this
+module is the export-time pass that turns it into training-set files. It
+never materialises the corpus: rows are read in ``id`` order in fixed-size
+batches (keyset pagination, ``WHERE id > ? ORDER BY id LIMIT ?``, so no
+read transaction is held open across the whole export) and written
+straight into size-bounded shards.
+
+Formats:
+
+- ``jsonl.zst`` — one JSON object per line, zstd-compressed (needs
+  ``zstandard``);
+- ``parquet`` — columnar, one row group per batch (needs ``pyarrow``);
+- ``jsonl`` — uncompressed, dependency-free.
+
+Each row is written with the data-contract columns; ``assistant_blocks``
+is the decoded block array in JSONL (spliced in as JSON text, never
+re-serialised) and its JSON text in Parquet. Rows stored compressed (see
+:mod:`core.training_codec`) are decompressed to that text on the way out.
+
+An export directory carries a ``manifest.json`` listing every shard (file,
+rows, bytes, id range, sha256), the filter and format it was made with,
+and a resume cursor: ``last_id``, and ``captured_through``, the time the
+run started. Re-running an export into the same directory appends the
+rows with ``id > last_id`` and re-exports those with ``id <= last_id``
+whose ``captured_at`` is at or past ``captured_through``. Those rows were
+re-captured in place and kept their ``id``. A row can therefore appear in
+more than one shard: dedupe on ``id`` and keep the shard listed last. A
+re-captured row that no longer matches the filter is not re-exported, so
+its earlier version stays.
+
+``quality_flag`` is set by curation after capture, so no cursor can tell
+which old rows have since started matching it. An export filtered on it
+is one-shot: resuming it raises ``ValueError``, so export into a fresh
+directory instead.
+
+The DB is opened read-only. A DB from before the ``system_prompts`` table
+or the ``blocks_codec`` column exports its inline prompts and JSON blocks.
+
+With ``workers > 1`` the pending id range is split into contiguous slices
+exported by a process pool; slices are committed to the manifest in id
+order, so an interrupted run resumes from the last fully committed slice
+and discards any shard files the manifest does not list.
+
+CLI::
+
+    python -m core.training_export OUT_DIR --format jsonl.zst \\
+        --harness claude_code --reasoning --quality-flag clean \\
+        --min-tokens 50 --max-tokens 8000 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from core.training_capture import PROMPT_EXPR, TURNS_FROM
+from core.training_codec import codec_for
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None  # type: ignore[assignment]
+
+try:
+    import pyarrow
+    import pyarrow.parquet as pq
+except ImportError:
+    pyarrow = None  # type: ignore[assignment]
+    pq = None  # type: ignore[assignment]
+
+FORMATS = ("jsonl.zst", "parquet", "jsonl")
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+DEFAULT_BATCH_ROWS = 1000
+DEFAULT_MAX_SHARD_BYTES = 256 * 1024 * 1024
+
+# Exported columns, in output order. ``assistant_blocks`` is handled
+# separately (spliced raw into JSONL).
+_META_COLUMNS = (
+    "id",
+    "session_id",
+    "turn_index",
+    "mind_id",
+    "harness",
+    "source_model",
+    "harness_version",
+    "captured_at",
+    "system_prompt",
+    "user_content",
+    "has_reasoning",
+    "tool_call_count",
+    "length_tokens",
+    "quality_flag",
+    "judge_verdict",
+    "judge_confidence",
+    "exclusion_reason",
+)
+# Filter fields on columns curation rewrites after capture (see module doc).
+_CURATION_FIELDS = ("quality_flag",)
+
+
+def _connect_ro(db_path: str | Path) -> sqlite3.Connection:
+    path = Path(db_path)
+    if not path.exists():
+        raise ValueError(f"no training DB at {path}")
+    conn = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def _select_sql(conn: sqlite3.Connection) -> str:
+    """``SELECT ... FROM`` for this DB's schema.
+
+    ``system_prompt`` is rehydrated from the ``system_prompts`` table and
+    ``blocks_codec`` says how to decode ``assistant_blocks``; a DB from
+    before either falls back to the inline prompt and plain JSON.
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(training_turns)")}
+    has_prompts = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'system_prompts'"
+    ).fetchone() is not None
+    pooled = has_prompts and "system_prompt_hash" in columns
+    select = []
+    for col in _META_COLUMNS + ("assistant_blocks", "blocks_codec"):
+        if col == "system_prompt" and pooled:
+            select.append(f"{PROMPT_EXPR} AS system_prompt")
+        elif col not in columns:
+            select.append(f"{'0' if col == 'blocks_codec' else 'NULL'} AS {col}")
+        else:
+            select.append(f"t.{col}")
+    return f"SELECT {', '.join(select)} FROM {TURNS_FROM if pooled else 'training_turns t'}"
+
+
+@dataclass
+class ExportFilter:
+    """Row selection for an export. ``None`` means "don't filter"."""
+
+    harness: str | None = None
+    source_model: str | None = None
+    has_reasoning: bool | None = None
+    quality_flag: str | None = None
+    min_tokens: int | None = None
+    max_tokens: int | None = None
+
+    def where(self) -> tuple[str, list]:
+        clauses: list[str] = []
+        params: list = []
+        if self.harness is not None:
+            clauses.append("harness = ?")
+            params.append(self.harness)
+        if self.source_model is not None:
+            clauses.append("source_model = ?")
+            params.append(self.source_model)
+        if self.has_reasoning is not None:
+            clauses.append("has_reasoning = ?")
+            params.append(1 if self.has_reasoning else 0)
+        if self.quality_flag is not None:
+            clauses.append("quality_flag = ?")
+            params.append(self.quality_flag)
+        if self.min_tokens is not None:
+            clauses.append("length_tokens >= ?")
+            params.append(self.min_tokens)
+        if self.max_tokens is not None:
+            clauses.append("length_tokens <= ?")
+            params.append(self.max_tokens)
+        return " AND ".join(clauses), params
+
+    def curated(self) -> list[str]:
+        """The set filter fields that curation can change after capture."""
+        return [name for name in _CURATION_FIELDS if getattr(self, name) is not None]
+
+
+def iter_batches(
+    db_path: str | Path,
+    flt: ExportFilter,
+    *,
+    after_id: int = 0,
+    upto_id: int | None = None,
+    captured_since: int | None = None,
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+):
+    """Yield lists of rows in ``id`` order, ``batch_rows`` at a time.
+
+    ``captured_since`` keeps only rows with ``captured_at`` at or past it.
+    Rows are ``sqlite3.Row``; a batch holding compressed rows is yielded as
+    dicts with ``assistant_blocks`` decoded to JSON text.
+    """
+    codec = codec_for(db_path)
+    extra, params = flt.where()
+    bounds, bound_args = "", []
+    if upto_id is not None:
+        bounds += " AND t.id <= ?"
+        bound_args.append(upto_id)
+    if captured_since is not None:
+        bounds += " AND t.captured_at >= ?"
+        bound_args.append(captured_since)
+    conn = _connect_ro(db_path)
+    try:
+        sql = (
+            f"{_select_sql(conn)} WHERE t.id > ?{bounds}"
+            f"{' AND ' + extra if extra else ''} ORDER BY t.id LIMIT ?"
+        )
+        cursor = after_id
+        while True:
+            args = [cursor] + bound_args + params + [batch_rows]
+            rows = conn.execute(sql, args).fetchall()
+            if not rows:
+                return
+            cursor = rows[-1]["id"]
+            if any(row["blocks_codec"] for row in rows):
+                rows = [_decoded(conn, codec, row) for row in rows]
+            yield rows
+    finally:
+        conn.close()
+
+
+def _decoded(conn, codec, row) -> dict:
+    record = dict(row)
+    if record["assistant_blocks"]:
+        record["assistant_blocks"] = codec.decode(conn, record["assistant_blocks"], record["blocks_codec"])
+    return record
+
+
+def _jsonl_line(row) -> bytes:
+    meta = {col: row[col] for col in _META_COLUMNS}
+    meta["has_reasoning"] = bool(meta["has_reasoning"])
+    head = json.dumps(meta, ensure_ascii=False)
+    blocks = row["assistant_blocks"] or "[]"
+    return f'{head[:-1]}, "assistant_blocks": {blocks}}}\n'.encode()
+
+
+class _ShardWriter:
+    """Writes one shard; tracks uncompressed bytes for the size bound."""
+
+    def __init__(self, path: Path, fmt: str) -> None:
+        self.path = path
+        self.fmt = fmt
+        self.rows = 0
+        self.raw_bytes = 0
+        self.first_id: int | None = None
+        self.last_id: int | None = None
+        self._fh = path.open("wb")
+        self._zst = None
+        self._pq = None
+        if fmt == "jsonl.zst":
+            self._zst = zstandard.ZstdCompressor(level=3).stream_writer(self._fh, closefd=False)
+
+    def write(self, rows) -> None:
+        if self.first_id is None:
+            self.first_id = rows[0]["id"]
+        self.last_id = rows[-1]["id"]
+        self.rows += len(rows)
+        if self.fmt == "parquet":
+            columns = {col: [r[col] for r in rows] for col in _META_COLUMNS}
+            columns["has_reasoning"] = [bool(v) for v in columns["has_reasoning"]]
+            columns["assistant_blocks"] = [r["assistant_blocks"] or "[]" for r in rows]
+            table = pyarrow.table(columns, schema=_parquet_schema())
+            self.raw_bytes += table.nbytes
+            if self._pq is None:
+                self._pq = pq.ParquetWriter(self._fh, table.schema, compression="zstd")
+            self._pq.write_table(table)
+            return
+        data = b"".join(_jsonl_line(r) for r in rows)
+        self.raw_bytes += len(data)
+        (self._zst or self._fh).write(data)
+
+    def close(self) -> dict:
+        if self._pq is not None:
+            self._pq.close()
+        if self._zst is not None:
+            self._zst.close()
+        self._fh.close()
+        digest = hashlib.sha256()
+        with self.path.open("rb") as fh:
+            for chunk in iter(lambda: fh.read(1 << 20), b""):
+                digest.update(chunk)
+        return {
+            "file": self.path.name,
+            "rows": self.rows,
+            "bytes": self.path.stat().st_size,
+            "raw_bytes": self.raw_bytes,
+            "first_id": self.first_id,
+            "last_id": self.last_id,
+            "sha256": digest.hexdigest(),
+        }
+
+
+def _parquet_schema():
+    return pyarrow.schema([
+        ("id", pyarrow.int64()),
+        ("session_id", pyarrow.string()),
+        ("turn_index", pyarrow.int64()),
+        ("mind_id", pyarrow.string()),
+        ("harness", pyarrow.string()),
+        ("source_model", pyarrow.string()),
+        ("harness_version", pyarrow.string()),
+        ("captured_at", pyarrow.int64()),
+        ("system_prompt", pyarrow.string()),
+        ("user_content", pyarrow.string()),
+        ("has_reasoning", pyarrow.bool_()),
+        ("tool_call_count", pyarrow.int64()),
+        ("length_tokens", pyarrow.int64()),
+        ("quality_flag", pyarrow.string()),
+        ("judge_verdict", pyarrow.string()),
+        ("judge_confidence", pyarrow.float64()),
+        ("exclusion_reason", pyarrow.string()),
+        ("assistant_blocks", pyarrow.string()),
+    ])
+
+
+def _check_format(fmt: str) -> None:
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown export format {fmt!r}; expected one of {FORMATS}")
+    if fmt == "jsonl.zst" and zstandard is None:
+        raise RuntimeError("jsonl.zst export needs the 'zstandard' package")
+    if fmt == "parquet" and pyarrow is None:
+        raise RuntimeError("parquet export needs the 'pyarrow' package")
+
+
+def _export_slice(job: tuple) -> list[dict]:
+    """Export ids in ``(lo, hi]`` to shards ``<name>-<seq>``; return their entries."""
+    db_path, out_dir, flt_dict, fmt, name, lo, hi, since, batch_rows, max_shard_bytes = job
+    flt = ExportFilter(**flt_dict)
+    out = Path(out_dir)
+    shards: list[dict] = []
+    writer: _ShardWriter | None = None
+    for rows in iter_batches(
+        db_path, flt, after_id=lo, upto_id=hi, captured_since=since, batch_rows=batch_rows,
+    ):
+        if writer is None:
+            writer = _ShardWriter(out / f"{name}-{len(shards):04d}.{fmt}", fmt)
+        writer.write(rows)
+        if writer.raw_bytes >= max_shard_bytes:
+            shards.append(writer.close())
+            writer = None
+    if writer is not None:
+        shards.append(writer.close())
+    return shards
+
+
+def _load_manifest(out_dir: Path) -> dict | None:
+    path = out_dir / MANIFEST_NAME
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def _save_manifest(out_dir: Path, manifest: dict) -> None:
+    manifest["updated_at"] = int(time.time())
+    tmp = out_dir / f".{MANIFEST_NAME}.tmp"
+    tmp.write_text(json.dumps(manifest, indent=2))
+    os.replace(tmp, out_dir / MANIFEST_NAME)
+
+
+def _slices(lo: int, hi: int, count: int) -> list[tuple[int, int]]:
+    """Split ``(lo, hi]`` into ``count`` contiguous id slices."""
+    if hi <= lo:
+        return []
+    count = max(1, min(count, hi - lo))
+    step = -(-(hi - lo) // count)
+    return [(start, min(start + step, hi)) for start in range(lo, hi, step)]
+
+
+def export(
+    db_path: str | Path,
+    out_dir: str | Path,
+    flt: ExportFilter | None = None,
+    *,
+    fmt: str = "jsonl.zst",
+    max_shard_bytes: int = DEFAULT_MAX_SHARD_BYTES,
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+    workers: int = 1,
+) -> dict:
+    """Export matching rows into ``out_dir``; resume if it has a manifest.
+
+    Returns the manifest. Raises ``ValueError`` when resuming into a
+    directory that was exported with a different filter or format, or
+    with a filter on a curation column.
+    """
+    _check_format(fmt)
+    flt = flt or ExportFilter()
+    out = Path(out_dir)
+    started = int(time.time())
+
+    manifest = _load_manifest(out)
+    if manifest is None:
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "format": fmt,
+            "filter": asdict(flt),
+            "created_at": started,
+            "last_id": 0,
+            "captured_through": None,
+            "total_rows": 0,
+            "shards": [],
+        }
+    elif manifest.get("format") != fmt or manifest.get("filter") != asdict(flt):
+        raise ValueError(
+            f"{out} was exported with format={manifest.get('format')!r} "
+            f"filter={manifest.get('filter')!r}; refusing to mix shards"
+        )
+    elif flt.curated():
+        raise ValueError(
+            f"{out} was exported filtered on {', '.join(flt.curated())}, which curation "
+            "changes after capture; a resume would miss rows that match it now. "
+            "Export into a fresh directory instead."
+        )
+    out.mkdir(parents=True, exist_ok=True)
+
+    # Drop shards an interrupted run wrote but never committed.
+    listed = {s["file"] for s in manifest["shards"]}
+    for stray in out.glob("part-*"):
+        if stray.name not in listed:
+            stray.unlink()
+
+    conn = _connect_ro(db_path)
+    try:
+        upper = conn.execute("SELECT COALESCE(MAX(id), 0) FROM training_turns").fetchone()[0]
+    finally:
+        conn.close()
+    last_id, since = manifest["last_id"], manifest.get("captured_through")
+
+    def _job(name: str, lo: int, hi: int, captured_since: int | None) -> tuple:
+        return (str(db_path), str(out), asdict(flt), fmt, name, lo, hi, captured_since,
+                batch_rows, max_shard_bytes)
+
+    def _commit(shards: list[dict], hi: int | None = None) -> None:
+        manifest["shards"].extend(shards)
+        manifest["total_rows"] += sum(s["rows"] for s in shards)
+        if hi is not None:
+            manifest["last_id"] = hi
+        _save_manifest(out, manifest)
+
+    # Rows already exported but re-captured since: written again, after the
+    # shards holding their older versions.
+    if since is not None and last_id:
+        _commit(_export_slice(_job(f"part-recaptured-{since}", 0, last_id, since)))
+
+    slices = _slices(last_id, upper, workers * 4 if workers > 1 else 1)
+    jobs = [_job(f"part-{lo:012d}", lo, hi, None) for lo, hi in slices]
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for (_, hi), shards in zip(slices, pool.map(_export_slice, jobs), strict=True):
+                _commit(shards, hi)
+    else:
+        for (_, hi), job in zip(slices, jobs, strict=True):
+            _commit(_export_slice(job), hi)
+    manifest["captured_through"] = started
+    _save_manifest(out, manifest)
+    return manifest
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Export training_turns into sharded files.")
+    parser.add_argument("out_dir", help="export directory (resumed if it has a manifest)")
+    parser.add_argument("--db", default=None, help="training DB (default: runtime DB / $TRAINING_DB_PATH)")
+    parser.add_argument("--format", default="jsonl.zst", choices=FORMATS)
+    parser.add_argument("--harness")
+    parser.add_argument("--source-model")
+    reasoning = parser.add_mutually_exclusive_group()
+    reasoning.add_argument("--reasoning", dest="has_reasoning", action="store_true", default=None)
+    reasoning.add_argument("--no-reasoning", dest="has_reasoning", action="store_false")
+    parser.add_argument("--quality-flag")
+    parser.add_argument("--min-tokens", type=int)
+    parser.add_argument("--max-tokens", type=int)
+    parser.add_argument("--max-shard-mb", type=float, default=DEFAULT_MAX_SHARD_BYTES / 2**20)
+    parser.add_argument("--batch-rows", type=int, default=DEFAULT_BATCH_ROWS)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    if args.db is None:
+        from core.training_capture_claude import default_db_path
+        args.db = default_db_path()
+    flt = ExportFilter(
+        harness=args.harness,
+        source_model=args.source_model,
+        has_reasoning=args.has_reasoning,
+        quality_flag=args.quality_flag,
+        min_tokens=args.min_tokens,
+        max_tokens=args.max_tokens,
+    )
+    try:
+        manifest = export(
+            args.db, args.out_dir, flt,
+            fmt=args.format,
+            max_shard_bytes=int(args.max_shard_mb * 2**20),
+            batch_rows=args.batch_rows,
+            workers=args.workers,
+        )
+    except (ValueError, RuntimeError) as exc:
+        print(f"export failed: {exc}", file=sys.stderr)
+        return 1
+    print(json.dumps({
+        "out_dir": str(args.out_dir),
+        "shards": len(manifest["shards"]),
+        "total_rows": manifest["total_rows"],
+        "last_id": manifest["last_id"],
+    }))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
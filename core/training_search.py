@@ -0,0 +1,367 @@
+"""Full-text search over captured turns.
+
+``turns_fts`` is an FTS5 table with one row per ``training_turns`` row
+(``rowid = training_turns.id``) and four columns:
+
+- ``user_content``: the human prompt;
+- ``text``: the assistant's ``text`` blocks;
+- ``tool_names``: the names of the turn's ``tool_use`` blocks;
+- ``tool_inputs``: their inputs, as JSON text.
+
+Tool results and thinking are not indexed: they are most of the corpus
+by size, and "which turns called X / said Y" is answered without them.
+
+``tool_names`` is tokenized like the rest, and ``_`` is a separator, so a
+phrase over it also matches longer names (``read`` hits
+``mcp__fs__read_file``). The ``tool`` filter therefore also checks
+``turn_tools``, one row per (exact tool name, turn). An index built before
+``turn_tools`` existed is dropped when the schema is next initialised;
+``index`` rebuilds it.
+
+The index is kept in sync on the write path. :class:`core.training_capture.TrainingStore`
+indexes each row its upsert actually wrote, and skips rows whose
+``content_hash`` is unchanged. A trigger drops a deleted row's entry.
+Rows written by other means (the 2026-06-18 migration, an older build,
+direct SQL) are picked up by ``index``, which also backfills an existing
+DB. SQLite builds without FTS5 still capture; search then raises
+:class:`SearchUnavailable`.
+
+CLI::
+
+    python -m core.training_search index  --db data/training_turns.db [--rebuild]
+    python -m core.training_search query  "KeyError" --harness codex --mind ada
+    python -m core.training_search query  rg --tool exec_command --page 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+FTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS turn_tools (
+    name     TEXT NOT NULL,
+    turn_id  INTEGER NOT NULL,
+    PRIMARY KEY (name, turn_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_turn_tools_turn ON turn_tools (turn_id);
+CREATE TRIGGER IF NOT EXISTS training_turns_tools_delete
+AFTER DELETE ON training_turns BEGIN
+    DELETE FROM turn_tools WHERE turn_id = old.id;
+END;
+CREATE VIRTUAL TABLE IF NOT EXISTS turns_fts USING fts5(
+    user_content, text, tool_names, tool_inputs
+);
+CREATE TRIGGER IF NOT EXISTS training_turns_fts_delete
+AFTER DELETE ON training_turns BEGIN
+    DELETE FROM turns_fts WHERE rowid = old.id;
+END;
+"""
+
+DEFAULT_BATCH_ROWS = 2000
+DEFAULT_LIMIT = 20
+
+_DELETE_SQL = "DELETE FROM turns_fts WHERE rowid = ?"
+_INSERT_SQL = (
+    "INSERT INTO turns_fts (rowid, user_content, text, tool_names, tool_inputs) "
+    "VALUES (?, ?, ?, ?, ?)"
+)
+_DELETE_TOOLS_SQL = "DELETE FROM turn_tools WHERE turn_id = ?"
+_INSERT_TOOL_SQL = "INSERT OR IGNORE INTO turn_tools (name, turn_id) VALUES (?, ?)"
+
+
+class SearchUnavailable(RuntimeError):
+    """The DB has no ``turns_fts`` table (SQLite built without FTS5)."""
+
+
+def _has_table(conn: sqlite3.Connection, name: str) -> bool:
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+    ).fetchone() is not None
+
+
+def create_index(conn: sqlite3.Connection) -> bool:
+    """Create ``turns_fts``, ``turn_tools`` and their triggers; False if FTS5 is missing."""
+    if _has_table(conn, "turns_fts") and not _has_table(conn, "turn_tools"):
+        # Built before exact tool names were kept: drop it so ``index``
+        # rebuilds both together.
+        conn.execute("DROP TABLE turns_fts")
+    try:
+        conn.executescript(FTS_SCHEMA)
+    except sqlite3.OperationalError as exc:
+        if "fts5" not in str(exc):
+            raise
+        return False
+    return True
+
+
+def has_index(conn: sqlite3.Connection) -> bool:
+    return _has_table(conn, "turns_fts") and _has_table(conn, "turn_tools")
+
+
+def tool_names(blocks: list[dict]) -> list[str]:
+    """The names of a turn's ``tool_use`` blocks, in order."""
+    return [block.get("name") or "" for block in blocks if block.get("type") == "tool_use"]
+
+
+def search_columns(user_content: str | None, blocks: list[dict]) -> tuple[str, str, str, str]:
+    """The indexed text of one turn, in ``turns_fts`` column order."""
+    texts, inputs = [], []
+    for block in blocks:
+        btype = block.get("type")
+        if btype == "text":
+            texts.append(block.get("text") or "")
+        elif btype == "tool_use":
+            value = block.get("input")
+            inputs.append(value if isinstance(value, str) else json.dumps(value or {}, ensure_ascii=False))
+    return user_content or "", "\n".join(texts), " ".join(tool_names(blocks)), "\n".join(inputs)
+
+
+def index_turns(conn: sqlite3.Connection, entries: list[tuple[int, str | None, list[dict]]]) -> None:
+    """(Re)index ``(id, user_content, assistant_blocks)`` rows."""
+    if not entries:
+        return
+    ids = [(row_id,) for row_id, _, _ in entries]
+    conn.executemany(_DELETE_SQL, ids)
+    conn.executemany(_DELETE_TOOLS_SQL, ids)
+    conn.executemany(
+        _INSERT_SQL,
+        [(row_id, *search_columns(user, blocks)) for row_id, user, blocks in entries],
+    )
+    conn.executemany(
+        _INSERT_TOOL_SQL,
+        [(name, row_id) for row_id, _, blocks in entries for name in tool_names(blocks) if name],
+    )
+
+
+# ---------------------------------------------------------------------------
+# Backfill
+# ---------------------------------------------------------------------------
+
+def _connect(db_path: str | Path) -> sqlite3.Connection:
+    from core.training_capture import init_db  # the store imports this module
+
+    init_db(db_path)
+    conn = sqlite3.connect(str(db_path), timeout=30.0, isolation_level=None)
+    conn.execute("PRAGMA journal_mode = WAL")
+    if not has_index(conn):
+        conn.close()
+        raise SearchUnavailable("this SQLite build has no FTS5; turn search is unavailable")
+    return conn
+
+
+def build_index(
+    db_path: str | Path,
+    *,
+    rebuild: bool = False,
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+) -> int:
+    """Index every row missing from ``turns_fts``; return how many.
+
+    ``rebuild`` empties the index first, for rows changed behind the
+    store's back. Batches are keyset-paginated on ``id``, each in its own
+    ``BEGIN IMMEDIATE`` transaction, so Stop hooks keep writing and an
+    interrupted run resumes where it stopped.
+    """
+    from core.training_codec import codec_for
+
+    codec = codec_for(db_path)
+    conn = _connect(db_path)
+    try:
+        if rebuild:
+            conn.execute("DELETE FROM turns_fts")
+            conn.execute("DELETE FROM turn_tools")
+        indexed, cursor = 0, 0
+        while True:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = conn.execute(
+                    "SELECT id, user_content, assistant_blocks, blocks_codec FROM training_turns t "
+                    "WHERE id > ? AND NOT EXISTS (SELECT 1 FROM turns_fts f WHERE f.rowid = t.id) "
+                    "ORDER BY id LIMIT ?",
+                    (cursor, batch_rows),
+                ).fetchall()
+                index_turns(conn, [
+                    (row_id, user, json.loads(codec.decode(conn, raw, c)) if raw else [])
+                    for row_id, user, raw, c in rows
+                ])
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            if not rows:
+                return indexed
+            indexed += len(rows)
+            cursor = rows[-1][0]
+    finally:
+        conn.close()
+
+
+# ---------------------------------------------------------------------------
+# Query
+# ---------------------------------------------------------------------------
+
+@dataclass
+class SearchHit:
+    """One matching turn, with a highlighted snippet of the best column."""
+
+    id: int
+    session_id: str
+    turn_index: int
+    harness: str
+    mind_id: str | None
+    source_model: str | None
+    captured_at: int | None
+    snippet: str
+    score: float
+
+
+@dataclass
+class SearchPage:
+    """One page of hits; ``next_offset`` is ``None`` on the last page."""
+
+    hits: list[SearchHit]
+    offset: int
+    next_offset: int | None
+
+
+def quote(text: str) -> str:
+    """``text`` as a single FTS5 phrase, with no query syntax."""
+    return '"' + text.replace('"', '""') + '"'
+
+
+def search(
+    db_path: str | Path,
+    query: str | None = None,
+    *,
+    harness: str | None = None,
+    mind_id: str | None = None,
+    source_model: str | None = None,
+    tool: str | None = None,
+    literal: bool = False,
+    order: str = "rank",
+    limit: int = DEFAULT_LIMIT,
+    offset: int = 0,
+    highlight: tuple[str, str] = ("[", "]"),
+    snippet_tokens: int = 16,
+) -> SearchPage:
+    """Search the indexed turns.
+
+    ``query`` is FTS5 query syntax (``foo AND "bar baz"``, ``tool_inputs: rg``,
+    ``pref*``); with ``literal`` it is matched as one phrase instead. ``tool``
+    restricts hits to turns that called a tool of exactly that name. ``harness``, ``mind_id``
+    and ``source_model`` filter on the row. ``order`` is ``"rank"`` (bm25)
+    or ``"recent"`` (``captured_at`` descending).
+    """
+    terms = []
+    if query:
+        terms.append(f"({quote(query) if literal else query})")
+    if tool:
+        terms.append(f"tool_names : {quote(tool)}")
+    if not terms:
+        raise ValueError("search needs a query or a tool")
+    if order not in ("rank", "recent"):
+        raise ValueError(f"unknown order {order!r}; expected 'rank' or 'recent'")
+
+    where = ["turns_fts MATCH ?"]
+    params: list = [highlight[0], highlight[1], snippet_tokens, " AND ".join(terms)]
+    if tool:
+        # The phrase above narrows the FTS scan; this keeps only exact names.
+        where.append("t.id IN (SELECT turn_id FROM turn_tools WHERE name = ?)")
+        params.append(tool)
+    for column, value in (("harness", harness), ("mind_id", mind_id), ("source_model", source_model)):
+        if value is not None:
+            where.append(f"t.{column} = ?")
+            params.append(value)
+    order_by = "f.rank" if order == "rank" else "t.captured_at DESC, t.id DESC"
+    params += [limit + 1, offset]
+
+    conn = sqlite3.connect(str(db_path))
+    try:
+        if not has_index(conn):
+            raise SearchUnavailable(f"{db_path} has no turns_fts index")
+        rows = conn.execute(
+            "SELECT t.id, t.session_id, t.turn_index, t.harness, t.mind_id, t.source_model, "
+            "t.captured_at, snippet(turns_fts, -1, ?, ?, '…', ?), f.rank "
+            "FROM turns_fts f JOIN training_turns t ON t.id = f.rowid "
+            f"WHERE {' AND '.join(where)} ORDER BY {order_by} LIMIT ? OFFSET ?",
+            params,
+        ).fetchall()
+    except sqlite3.OperationalError as exc:
+        if "fts5" in str(exc) or "no such column" in str(exc):
+            raise ValueError(f"bad search query {query!r}: {exc}") from exc
+        raise
+    finally:
+        conn.close()
+    hits = [SearchHit(*row) for row in rows[:limit]]
+    return SearchPage(hits, offset, offset + limit if len(rows) > limit else None)
+
+
+def _default_db() -> Path:
+    override = os.environ.get("TRAINING_DB_PATH")
+    return Path(override) if override else Path(__file__).resolve().parent.parent / "data" / "training_turns.db"
+
+
+def _print_hit(hit: SearchHit) -> None:
+    when = time.strftime("%Y-%m-%d %H:%M", time.localtime(hit.captured_at)) if hit.captured_at else "-"
+    print(f"{hit.session_id}#{hit.turn_index}  {hit.harness}  {hit.mind_id or '-'}  "
+          f"{hit.source_model or '-'}  {when}")
+    print(f"    {' '.join(hit.snippet.split())}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Full-text search over captured training turns.")
+    parser.add_argument("--db", default=None, help="training DB (default: runtime DB / $TRAINING_DB_PATH)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    index = commands.add_parser("index", help="index rows missing from turns_fts")
+    index.add_argument("--rebuild", action="store_true", help="drop and rebuild the whole index")
+    index.add_argument("--batch-rows", type=int, default=DEFAULT_BATCH_ROWS)
+
+    query = commands.add_parser("query", help="search the index")
+    query.add_argument("query", nargs="?", default=None, help="FTS5 query (see --literal)")
+    query.add_argument("--literal", action="store_true", help="match the query as one plain phrase")
+    query.add_argument("--tool", default=None, help="only turns that called this tool")
+    query.add_argument("--harness", default=None)
+    query.add_argument("--mind", dest="mind_id", default=None)
+    query.add_argument("--model", dest="source_model", default=None)
+    query.add_argument("--order", choices=("rank", "recent"), default="rank")
+    query.add_argument("--limit", type=int, default=DEFAULT_LIMIT)
+    query.add_argument("--page", type=int, default=1)
+    query.add_argument("--json", action="store_true", help="print hits as JSON lines")
+    args = parser.parse_args(argv)
+    db = args.db or _default_db()
+
+    if args.command == "index":
+        count = build_index(db, rebuild=args.rebuild, batch_rows=args.batch_rows)
+        print(f"indexed {count} turn rows")
+        return 0
+
+    try:
+        page = search(
+            db, args.query, harness=args.harness, mind_id=args.mind_id,
+            source_model=args.source_model, tool=args.tool, literal=args.literal,
+            order=args.order, limit=args.limit, offset=(max(args.page, 1) - 1) * args.limit,
+        )
+    except (ValueError, SearchUnavailable) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    for hit in page.hits:
+        if args.json:
+            print(json.dumps(asdict(hit), ensure_ascii=False))
+        else:
+            _print_hit(hit)
+    if not args.json:
+        more = f"; next: --page {args.page + 1}" if page.next_offset is not None else ""
+        print(f"-- page {args.page}, {len(page.hits)} hits{more}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,18 +13,29 @@ The system prompt is composed by hive-comms (soul, standing rules,
 decay-weighted recent memory, session-memory carry-forward) and shipped as
 ``system_prompt_blocks`` in the spawn payload — this module no longer
 composes anything locally.
+
+An optional warm pool (``warm_pool:`` in ``runtime.yaml``) keeps idle,
+already-booted ``claude`` processes for recently seen spawn shapes, so a
+new session whose command line and environment match one of them adopts
+it instead of paying CLI boot + MCP load on its first turn. Only shapes
+that recur are pooled: a spawn carrying a comms-composed prompt or a
+client/owner ref is unique to its session (the CLI takes both at exec),
+so it cold-spawns and is never pre-booted.
 """
 
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import json
 import logging
 import os
 import shutil
 import signal
+import time
+from collections import OrderedDict, deque
 from pathlib import Path
-from typing import Any
+from typing import Any, Awaitable, Callable
 from uuid import uuid4
 
 import aiohttp
@@ -47,6 +58,8 @@ MIND_ID: str = RUNTIME["mind_id"]
 DEFAULT_MODEL: str = RUNTIME["default_model"]
 PROVIDER: str = RUNTIME["provider"]
 RUNTIME_ENV: dict[str, Any] = RUNTIME.get("env", {}) or {}
+WARM_POOL_CFG: dict[str, Any] = RUNTIME.get("warm_pool", {}) or {}
+TURN_QUEUE_CFG: dict[str, Any] = RUNTIME.get("turn_queue", {}) or {}
 
 NS_URL = os.environ.get("HIVE_MIND_SERVER_URL", "http://server:8420")
 
@@ -70,9 +83,20 @@ else:
 
 app = FastAPI(title=f"Mind: {NAME}")
 
-# session_id -> {"proc": Process, "model": str, "resume_sid": str | None}
+# session_id -> {"proc": Process, "model": str, "resume_sid": str | None,
+#                "queue": _TurnQueue}
 SESSIONS: dict[str, dict] = {}
 
+# Idle processes per spawn key. Size 0 (the default) disables the pool.
+WARM_POOL_SIZE = int(os.environ.get("WARM_POOL_SIZE", WARM_POOL_CFG.get("size", 0)))
+WARM_POOL_MAX_KEYS = int(WARM_POOL_CFG.get("max_keys", 4))
+WARM_POOL_MAX_IDLE_S = float(WARM_POOL_CFG.get("max_idle_seconds", 900))
+
+# Messages that arrive mid-turn wait in a per-session FIFO (see _TurnQueue).
+TURN_QUEUE_DEPTH = int(TURN_QUEUE_CFG.get("depth", 8))
+TURN_QUEUE_DEADLINE_S = float(TURN_QUEUE_CFG.get("deadline_seconds", 600))
+TURN_QUEUE_COALESCE = bool(TURN_QUEUE_CFG.get("coalesce", False))
+
 
 # ---------------------------------------------------------------------------
 # Setup — config dir + host credential sync
@@ -171,11 +195,204 @@ async def _fetch_secrets_on_startup() -> None:
 # Harness — Claude CLI spawn / kill
 # ---------------------------------------------------------------------------
 
-async def _spawn_proc(
-    session_id: str,
+class _LatencyStats:
+    """Rolling window of latency samples, summarised for ``/health``."""
+
+    def __init__(self, window: int = 200) -> None:
+        self._samples: deque[float] = deque(maxlen=window)
+        self.count = 0
+
+    def record(self, ms: float) -> None:
+        self._samples.append(ms)
+        self.count += 1
+
+    def summary(self) -> dict:
+        if not self._samples:
+            return {"count": self.count}
+        ordered = sorted(self._samples)
+        last = len(ordered) - 1
+        return {
+            "count": self.count,
+            "p50_ms": round(ordered[last // 2], 1),
+            "p95_ms": round(ordered[int(last * 0.95)], 1),
+            "max_ms": round(ordered[-1], 1),
+        }
+
+
+def _spawn_key(cmd: list[str], env: dict[str, str]) -> str:
+    """Fingerprint a spawn by its full argv and environment.
+
+    Two spawns with the same key are interchangeable: same model, MCP
+    config, system prompt, directories and env (including the per-session
+    HIVEMIND_* metadata the Stop hooks read). Anything else is never
+    adopted, so a pooled process can't leak one caller's identity into
+    another's session.
+    """
+    h = hashlib.sha256()
+    for part in cmd:
+        h.update(part.encode())
+        h.update(b"\0")
+    for k in sorted(env):
+        h.update(f"{k}={env[k]}".encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _poolable(system_prompt_blocks: str | None, client_ref: str, owner_ref: str) -> bool:
+    """Whether a spawn's shape can recur, and so is worth pre-booting.
+
+    comms composes ``system_prompt_blocks`` per spawn (decay-weighted
+    memory, session carry-forward) and the refs name one client, so a
+    spawn with any of them never matches another session's key.
+    """
+    return not (system_prompt_blocks or client_ref or owner_ref)
+
+
+class _WarmPool:
+    """Idle, pre-booted processes keyed by spawn fingerprint.
+
+    ``adopt`` hands out a live idle process for a key (or ``None``);
+    ``schedule_refill`` remembers the spawn shape and tops the key back up
+    to ``size`` in the background. Only the ``max_keys`` most recently used
+    shapes are kept warm; older ones are drained. A reaper task kills
+    processes idle longer than ``max_idle_s`` and forgets shapes left
+    with none, so a shape that stops recurring stops holding processes.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        max_keys: int,
+        max_idle_s: float,
+        spawn: Callable[[list[str], dict[str, str]], Awaitable[Any]],
+        kill: Callable[[Any], Awaitable[None]],
+    ) -> None:
+        self.size = size
+        self.max_keys = max_keys
+        self.max_idle_s = max_idle_s
+        self._spawn = spawn
+        self._kill = kill
+        self._idle: dict[str, deque[tuple[float, Any]]] = {}
+        self._specs: OrderedDict[str, tuple[list[str], dict[str, str]]] = OrderedDict()
+        self._refilling: dict[str, asyncio.Task] = {}
+        self._reaper: asyncio.Task | None = None
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.discarded = 0
+        self.reaped = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0
+
+    def adopt(self, key: str) -> Any | None:
+        if not self.enabled:
+            return None
+        idle = self._idle.get(key)
+        now = time.monotonic()
+        while idle:
+            born, proc = idle.popleft()
+            if proc.returncode is None and now - born <= self.max_idle_s:
+                self.hits += 1
+                return proc
+            self.discarded += 1
+            asyncio.create_task(self._kill(proc))
+        self.misses += 1
+        return None
+
+    def schedule_refill(self, key: str, cmd: list[str], env: dict[str, str]) -> None:
+        if not self.enabled:
+            return
+        self._specs[key] = (cmd, env)
+        self._specs.move_to_end(key)
+        while len(self._specs) > self.max_keys:
+            stale, _ = self._specs.popitem(last=False)
+            for _, proc in self._idle.pop(stale, deque()):
+                asyncio.create_task(self._kill(proc))
+        task = self._refilling.get(key)
+        if task is None or task.done():
+            self._refilling[key] = asyncio.create_task(self._refill(key))
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.create_task(self._reap_loop())
+
+    def bypass(self) -> None:
+        """Count a spawn that could not use the pool (see ``_poolable``)."""
+        if self.enabled:
+            self.bypassed += 1
+
+    def reap(self) -> int:
+        """Kill idle processes past ``max_idle_s``; return how many."""
+        now = time.monotonic()
+        reaped = 0
+        for key, idle in list(self._idle.items()):
+            live: deque[tuple[float, Any]] = deque()
+            while idle:
+                born, proc = idle.popleft()
+                if proc.returncode is None and now - born <= self.max_idle_s:
+                    live.append((born, proc))
+                else:
+                    reaped += 1
+                    asyncio.create_task(self._kill(proc))
+            idle.extend(live)
+            task = self._refilling.get(key)
+            if not idle and (task is None or task.done()):
+                # Nobody has spawned this shape since its processes went
+                # stale; stop keeping it warm.
+                del self._idle[key]
+                self._specs.pop(key, None)
+        self.reaped += reaped
+        return reaped
+
+    async def _reap_loop(self) -> None:
+        interval = min(max(self.max_idle_s / 2, 1.0), 60.0)
+        while self._specs:
+            await asyncio.sleep(interval)
+            self.reap()
+
+    async def _refill(self, key: str) -> None:
+        idle = self._idle.setdefault(key, deque())
+        while key in self._specs and len(idle) < self.size:
+            cmd, env = self._specs[key]
+            try:
+                proc = await self._spawn(cmd, env)
+            except Exception:
+                log.exception("Warm pool spawn failed; leaving key %s cold", key[:12])
+                return
+            if key not in self._specs:
+                await self._kill(proc)
+                return
+            idle.append((time.monotonic(), proc))
+
+    async def close(self) -> None:
+        for task in self._refilling.values():
+            task.cancel()
+        if self._reaper is not None:
+            self._reaper.cancel()
+        self._specs.clear()
+        idle, self._idle = self._idle, {}
+        for procs in idle.values():
+            for _, proc in procs:
+                await self._kill(proc)
+
+    def stats(self) -> dict:
+        eligible = self.hits + self.misses
+        return {
+            "size": self.size,
+            "keys": len(self._specs),
+            "idle": sum(len(q) for q in self._idle.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "hit_rate": round(self.hits / eligible, 3) if eligible else None,
+            "discarded": self.discarded,
+            "reaped": self.reaped,
+        }
+
+
+def _build_spawn(
     *,
     model: str,
-    autopilot: bool,
     resume_sid: str | None,
     surface_prompt: str | None,
     allowed_directories: list[str] | None,
@@ -184,7 +401,7 @@ async def _spawn_proc(
     system_prompt_blocks: str | None = None,
     client_ref: str = "",
     owner_ref: str = "",
-) -> asyncio.subprocess.Process:
+) -> tuple[list[str], dict[str, str]]:
     blocks = system_prompt_blocks or ""
     if blocks and surface_prompt:
         full_prompt = f"{blocks}\n\n{surface_prompt}"
@@ -226,7 +443,12 @@ async def _spawn_proc(
         env["HIVEMIND_OWNER_TYPE"] = owner_type
     if owner_ref:
         env["HIVEMIND_OWNER_REF"] = owner_ref
+    return cmd, env
 
+
+async def _exec_proc(
+    cmd: list[str], env: dict[str, str], label: str = "warm-pool",
+) -> asyncio.subprocess.Process:
     proc = await asyncio.create_subprocess_exec(
         *cmd,
         stdin=asyncio.subprocess.PIPE,
@@ -236,11 +458,7 @@ async def _spawn_proc(
         env=env,
         cwd=str(PROJECT_DIR),
     )
-    asyncio.create_task(_drain_stderr(proc, session_id))
-    log.info(
-        "Spawned %s session=%s pid=%d model=%s resume=%s",
-        NAME, session_id, proc.pid, model, resume_sid or "new",
-    )
+    asyncio.create_task(_drain_stderr(proc, label))
     return proc
 
 
@@ -267,6 +485,228 @@ async def _kill_proc(proc: asyncio.subprocess.Process | None) -> None:
         pass
 
 
+WARM_POOL = _WarmPool(
+    WARM_POOL_SIZE,
+    WARM_POOL_MAX_KEYS,
+    WARM_POOL_MAX_IDLE_S,
+    spawn=_exec_proc,
+    kill=_kill_proc,
+)
+SPAWN_STATS = {"cold": _LatencyStats(), "warm": _LatencyStats()}
+FIRST_EVENT_STATS = {"cold": _LatencyStats(), "warm": _LatencyStats()}
+
+
+async def _spawn_proc(
+    session_id: str,
+    *,
+    model: str,
+    autopilot: bool,
+    resume_sid: str | None,
+    surface_prompt: str | None,
+    allowed_directories: list[str] | None,
+    is_group_session: bool,
+    owner_type: str | None = None,
+    system_prompt_blocks: str | None = None,
+    client_ref: str = "",
+    owner_ref: str = "",
+) -> tuple[asyncio.subprocess.Process, bool]:
+    """Return a process for this session and whether it came from the pool.
+
+    Resumed sessions always cold-spawn: ``--resume`` names one specific
+    thread, so there is nothing to pre-boot for it. Nor do spawns that
+    ``_poolable`` rejects; they are counted as ``bypassed``.
+    """
+    cmd, env = _build_spawn(
+        model=model,
+        resume_sid=resume_sid,
+        surface_prompt=surface_prompt,
+        allowed_directories=allowed_directories,
+        is_group_session=is_group_session,
+        owner_type=owner_type,
+        system_prompt_blocks=system_prompt_blocks,
+        client_ref=client_ref,
+        owner_ref=owner_ref,
+    )
+    key = _spawn_key(cmd, env)
+    pooled = not resume_sid and _poolable(system_prompt_blocks, client_ref, owner_ref)
+    started = time.monotonic()
+    proc = WARM_POOL.adopt(key) if pooled else None
+    warm = proc is not None
+    if proc is None:
+        proc = await _exec_proc(cmd, env, session_id)
+    SPAWN_STATS["warm" if warm else "cold"].record((time.monotonic() - started) * 1000)
+    if pooled:
+        WARM_POOL.schedule_refill(key, cmd, env)
+    else:
+        WARM_POOL.bypass()
+    log.info(
+        "%s %s session=%s pid=%d model=%s resume=%s",
+        "Adopted warm" if warm else "Spawned",
+        NAME, session_id, proc.pid, model, resume_sid or "new",
+    )
+    return proc, warm
+
+
+# ---------------------------------------------------------------------------
+# Turn queue
+# ---------------------------------------------------------------------------
+
+def _sse(event: dict) -> str:
+    return f"data: {json.dumps(event)}\n\n"
+
+
+class _QueuedTurn:
+    """One message waiting for (or running) its turn; ``out`` feeds its stream."""
+
+    def __init__(self, content: str, images: list[dict] | None, deadline: float) -> None:
+        self.content = content
+        self.images = images
+        self.deadline = deadline
+        self.state = "waiting"  # waiting -> running -> done
+        self.abandoned = False
+        self.out: asyncio.Queue[str | None] = asyncio.Queue()
+
+
+class _TurnQueue:
+    """Per-session FIFO of turns, run one at a time by a worker task.
+
+    A message that arrives while a turn is running waits here instead of
+    being bounced with a 409: up to ``depth`` deep, each for at most
+    ``deadline_s`` before its turn starts. Its stream gets a ``queued``
+    event with its position (1 = next) whenever that changes. With
+    ``coalesce`` set, everything waiting when a turn finishes is merged
+    into one user message and every merged stream receives that turn's
+    output.
+
+    ``run(content, images)`` yields SSE strings for one turn; ``abandon()``
+    is awaited when every stream attached to the running turn has gone.
+    ``cancel_waiting`` ends every waiting turn; an interrupt uses it, so
+    follow-ups queued behind the interrupted turn don't run after it.
+    """
+
+    def __init__(
+        self,
+        run: Callable[[str, list[dict] | None], Any],
+        abandon: Callable[[], Awaitable[None]],
+        depth: int,
+        deadline_s: float,
+        coalesce: bool,
+    ) -> None:
+        self._run = run
+        self._abandon = abandon
+        self.depth = depth
+        self.deadline_s = deadline_s
+        self.coalesce = coalesce
+        self._waiting: deque[_QueuedTurn] = deque()
+        self._running: list[_QueuedTurn] = []
+        self._worker: asyncio.Task | None = None
+
+    @property
+    def busy(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    def __len__(self) -> int:
+        return len(self._waiting)
+
+    def submit(self, content: str, images: list[dict] | None = None) -> _QueuedTurn | None:
+        """Enqueue a turn, or return ``None`` if the queue is full."""
+        if self.busy and len(self._waiting) >= self.depth:
+            return None
+        item = _QueuedTurn(content, images, time.monotonic() + self.deadline_s)
+        self._waiting.append(item)
+        if self.busy:
+            item.out.put_nowait(_sse({"type": "queued", "position": len(self._waiting)}))
+        else:
+            self._worker = asyncio.create_task(self._drain())
+        return item
+
+    async def stream(self, item: _QueuedTurn) -> Any:
+        """Yield the SSE strings for ``item``; detaches it on any exit."""
+        try:
+            while True:
+                if item.state == "waiting":
+                    remaining = max(item.deadline - time.monotonic(), 0.0)
+                    try:
+                        chunk = await asyncio.wait_for(item.out.get(), remaining)
+                    except asyncio.TimeoutError:
+                        if item.state != "waiting":
+                            continue
+                        yield _sse({
+                            "type": "result",
+                            "is_error": True,
+                            "error": "Queued turn expired before it could start",
+                        })
+                        return
+                else:
+                    chunk = await item.out.get()
+                if chunk is None:
+                    return
+                yield chunk
+        finally:
+            await self._detach(item)
+
+    async def _detach(self, item: _QueuedTurn) -> None:
+        item.abandoned = True
+        if item.state == "waiting":
+            item.state = "done"
+            try:
+                self._waiting.remove(item)
+            except ValueError:
+                pass
+            self._announce_positions()
+        elif item.state == "running" and all(i.abandoned for i in self._running):
+            await self._abandon()
+
+    def _announce_positions(self) -> None:
+        for pos, waiting in enumerate(self._waiting, start=1):
+            waiting.out.put_nowait(_sse({"type": "queued", "position": pos}))
+
+    async def _drain(self) -> None:
+        while self._waiting:
+            batch = [self._waiting.popleft()]
+            if self.coalesce:
+                batch.extend(self._waiting)
+                self._waiting.clear()
+            live = [i for i in batch if not i.abandoned]
+            if not live:
+                continue
+            for item in live:
+                item.state = "running"
+            self._running = live
+            self._announce_positions()
+            content = "\n\n".join(i.content for i in live)
+            images = [img for i in live for img in (i.images or [])] or None
+            try:
+                async for chunk in self._run(content, images):
+                    for item in live:
+                        if not item.abandoned:
+                            item.out.put_nowait(chunk)
+            except Exception as exc:
+                log.exception("%s turn failed", NAME)
+                for item in live:
+                    item.out.put_nowait(_sse({"type": "result", "is_error": True, "error": str(exc)}))
+            finally:
+                for item in live:
+                    item.state = "done"
+                    item.out.put_nowait(None)
+                self._running = []
+
+    def cancel_waiting(self, reason: str) -> int:
+        """End every waiting stream with an error ``result``; return how many."""
+        waiting, self._waiting = list(self._waiting), deque()
+        for item in waiting:
+            item.state = "done"
+            item.out.put_nowait(_sse({"type": "result", "is_error": True, "error": reason}))
+            item.out.put_nowait(None)
+        return len(waiting)
+
+    async def close(self) -> None:
+        """End every waiting stream and stop the worker (session teardown)."""
+        self.cancel_waiting("Session closed")
+        if self.busy:
+            self._worker.cancel()
+
+
 # ---------------------------------------------------------------------------
 # Routes
 # ---------------------------------------------------------------------------
@@ -274,12 +714,27 @@ async def _kill_proc(proc: asyncio.subprocess.Process | None) -> None:
 @app.on_event("startup")
 async def _startup() -> None:
     await _fetch_secrets_on_startup()
-    log.info("%s ready (mind_id=%s, default_model=%s)", NAME, MIND_ID, DEFAULT_MODEL)
+    log.info("%s ready (mind_id=%s, default_model=%s, warm_pool=%d)",
+             NAME, MIND_ID, DEFAULT_MODEL, WARM_POOL_SIZE)
+
+
+@app.on_event("shutdown")
+async def _shutdown() -> None:
+    await WARM_POOL.close()
 
 
 @app.get("/health")
 async def health() -> dict:
-    return {"name": NAME, "mind_id": MIND_ID, "ok": True, "sessions": len(SESSIONS)}
+    return {
+        "name": NAME,
+        "mind_id": MIND_ID,
+        "ok": True,
+        "sessions": len(SESSIONS),
+        "queued_turns": sum(len(s["queue"]) for s in SESSIONS.values()),
+        "warm_pool": WARM_POOL.stats(),
+        "spawn_latency": {k: v.summary() for k, v in SPAWN_STATS.items()},
+        "first_event_latency": {k: v.summary() for k, v in FIRST_EVENT_STATS.items()},
+    }
 
 
 @app.get("/sessions")
@@ -305,7 +760,7 @@ async def create_session(req: Request) -> Any:
     client_ref = body.get("client_ref") or ""
     owner_ref = body.get("owner_ref") or ""
     try:
-        proc = await _spawn_proc(
+        proc, warm = await _spawn_proc(
             sid,
             model=model,
             autopilot=autopilot,
@@ -318,71 +773,120 @@ async def create_session(req: Request) -> Any:
             client_ref=client_ref,
             owner_ref=owner_ref,
         )
-        SESSIONS[sid] = {"proc": proc, "model": model, "resume_sid": resume_sid}
-        log.info("%s session %s initialised (model=%s resume=%s prompt_source=%s)",
+        sess = {
+            "proc": proc,
+            "model": model,
+            "resume_sid": resume_sid,
+            "warm": warm,
+            "first_turn": True,
+        }
+        sess["queue"] = _TurnQueue(
+            lambda content, images: _claude_turn(sess, content),
+            lambda: _abandon_claude_turn(sess),
+            TURN_QUEUE_DEPTH,
+            TURN_QUEUE_DEADLINE_S,
+            TURN_QUEUE_COALESCE,
+        )
+        SESSIONS[sid] = sess
+        log.info("%s session %s initialised (model=%s resume=%s prompt_source=%s warm=%s)",
                  NAME, sid, model, resume_sid or "new",
-                 "comms" if system_prompt_blocks else "local")
+                 "comms" if system_prompt_blocks else "local", warm)
         return {"session_id": sid, "mind_id": MIND_ID, "name": NAME, "status": "running", "model": model}
     except Exception as exc:
         log.exception("Failed to create session for %s", NAME)
         return JSONResponse({"error": str(exc)}, status_code=500)
 
 
-@app.post("/sessions/{sid}/message")
-async def send_message(sid: str, req: Request) -> Any:
-    body = await req.json()
-    content = body.get("content", "")
-    sess = SESSIONS.get(sid)
-    if not sess:
-        return JSONResponse({"error": f"Session {sid} not found"}, status_code=404)
-
-    # Turn-bleed guard. If a previous turn's stream was abandoned mid-response
-    # (client disconnect, voice timeout, etc.), the underlying claude subprocess
-    # kept generating, and its output is still buffered in proc.stdout. A second
-    # message arriving now would write to stdin and immediately read the
-    # previous turn's queued result. Refuse to start a second turn while one is
-    # in flight; caller retries.
-    if sess.get("in_flight"):
-        return JSONResponse(
-            {"error": "Turn in progress, retry shortly"},
-            status_code=409,
-        )
+async def _claude_turn(sess: dict, content: str) -> Any:
+    """Write one user message to the session's CLI and relay its output.
 
+    Always reads through to the ``result`` event, even if every client
+    stream has gone: leaving a turn's output buffered in ``proc.stdout``
+    would make the next turn read the previous turn's answer.
+    """
     proc: asyncio.subprocess.Process = sess["proc"]
     if not proc or not proc.stdin or proc.returncode is not None:
-        return JSONResponse({"error": "Process not running"}, status_code=500)
+        yield _sse({"type": "result", "is_error": True, "error": "Process not running"})
+        return
 
     msg = json.dumps({
         "type": "user",
         "message": {"role": "user", "content": [{"type": "text", "text": content}]},
     })
-    sess["in_flight"] = True
+    # First-turn time-to-first-event is where CLI boot + MCP load shows up;
+    # recorded separately for warm-adopted and cold-spawned sessions.
+    first_turn = sess.pop("first_turn", False)
+    sent_at = time.monotonic()
     proc.stdin.write(msg.encode() + b"\n")
     await proc.stdin.drain()
 
-    async def stream() -> Any:
+    async for line in proc.stdout:
+        if first_turn:
+            first_turn = False
+            FIRST_EVENT_STATS["warm" if sess.get("warm") else "cold"].record(
+                (time.monotonic() - sent_at) * 1000
+            )
+        decoded = line.decode().strip()
+        if not decoded:
+            continue
+        yield f"data: {decoded}\n\n"
         try:
-            async for line in proc.stdout:
-                decoded = line.decode().strip()
-                if not decoded:
-                    continue
-                yield f"data: {decoded}\n\n"
-                try:
-                    event = json.loads(decoded)
-                    if event.get("type") == "result":
-                        cs = event.get("session_id")
-                        if cs:
-                            sess["resume_sid"] = cs
-                        break
-                except json.JSONDecodeError:
-                    continue
-        finally:
-            # Clear in_flight on every exit path: normal completion, generator
-            # cancellation (client disconnect), or exception. Without this, an
-            # abandoned stream would lock the session out of all future turns.
-            sess["in_flight"] = False
+            event = json.loads(decoded)
+            if event.get("type") == "result":
+                cs = event.get("session_id")
+                if cs:
+                    sess["resume_sid"] = cs
+                break
+        except json.JSONDecodeError:
+            continue
 
-    return StreamingResponse(stream(), media_type="text/event-stream")
+
+def _interrupt_proc(sess: dict) -> bool:
+    """SIGINT the session's CLI, stopping its turn; False if it isn't running."""
+    proc: asyncio.subprocess.Process | None = sess.get("proc")
+    if proc is None or proc.returncode is not None:
+        return False
+    try:
+        proc.send_signal(signal.SIGINT)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+async def _abandon_claude_turn(sess: dict) -> None:
+    """Stop a turn nobody is listening to any more.
+
+    Interrupted as ``/interrupt`` does it, so queued follow-ups don't wait
+    behind output nobody reads. The queue worker still drains the turn to
+    its end, so the CLI's stdout stays aligned with the turn boundaries.
+    """
+    if _interrupt_proc(sess):
+        log.info("Interrupted abandoned turn on %s pid=%d", NAME, sess["proc"].pid)
+
+
+@app.post("/sessions/{sid}/message")
+async def send_message(sid: str, req: Request) -> Any:
+    body = await req.json()
+    content = body.get("content", "")
+    sess = SESSIONS.get(sid)
+    if not sess:
+        return JSONResponse({"error": f"Session {sid} not found"}, status_code=404)
+
+    proc: asyncio.subprocess.Process = sess["proc"]
+    if not proc or not proc.stdin or proc.returncode is not None:
+        return JSONResponse({"error": "Process not running"}, status_code=500)
+
+    # Turns run one at a time per session. A message that arrives while one
+    # is in flight waits in the session's queue (its stream reports its
+    # position) rather than being rejected; only a full queue is refused.
+    queue: _TurnQueue = sess["queue"]
+    item = queue.submit(content)
+    if item is None:
+        return JSONResponse(
+            {"error": "Turn queue full, retry shortly"},
+            status_code=409,
+        )
+    return StreamingResponse(queue.stream(item), media_type="text/event-stream")
 
 
 @app.post("/sessions/{sid}/interrupt")
@@ -390,15 +894,13 @@ async def interrupt_session(sid: str) -> Any:
     sess = SESSIONS.get(sid)
     if not sess:
         return JSONResponse({"error": f"Session {sid} not found"}, status_code=404)
-    proc: asyncio.subprocess.Process = sess.get("proc")
-    if proc is None or proc.returncode is not None:
-        return {"ok": True, "session_id": sid, "message": "nothing_running"}
-    try:
-        proc.send_signal(signal.SIGINT)
-    except ProcessLookupError:
-        pass
-    log.info("Sent SIGINT to session %s", sid)
-    return {"ok": True, "session_id": sid}
+    # An interrupt stops the session, not just its current turn: messages
+    # queued behind it are dropped rather than run once it ends.
+    dropped = sess["queue"].cancel_waiting("Interrupted before it started")
+    if not _interrupt_proc(sess):
+        return {"ok": True, "session_id": sid, "message": "nothing_running", "dropped": dropped}
+    log.info("Sent SIGINT to session %s (dropped %d queued turns)", sid, dropped)
+    return {"ok": True, "session_id": sid, "dropped": dropped}
 
 
 @app.delete("/sessions/{sid}")
@@ -406,6 +908,7 @@ async def kill_session(sid: str) -> dict:
     sess = SESSIONS.pop(sid, None)
     if not sess:
         return {"session_id": sid, "status": "closed"}
+    await sess["queue"].close()
     await _kill_proc(sess.get("proc"))
     log.info("Killed %s session %s", NAME, sid)
     return {"session_id": sid, "status": "closed"}
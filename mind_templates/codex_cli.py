@@ -2,7 +2,14 @@
 
 Spawns one Codex subprocess per turn (`codex exec --json
 --dangerously-bypass-approvals-and-sandbox`) and stores the `thread_id`
-so subsequent turns resume the same Codex thread. The provider is chosen
+so subsequent turns resume the same Codex thread. With ``codex_mode:
+app_server`` in ``runtime.yaml`` (or per session in the spawn payload)
+each session instead keeps one long-lived ``codex app-server`` process
+and feeds it turns over stdin/stdout, skipping the per-turn process
+start, provider handshake and thread resume. Its notifications are mapped
+onto the ``exec --json`` event shape so both modes share one relay, and a
+session whose app-server dies falls back to the per-turn exec path on the
+same thread. The provider is chosen
 in ``runtime.yaml``: ``provider: openai`` (or any non-ollama value) runs
 Codex against its native backend, while ``provider: ollama`` injects a
 per-mind ``model_provider`` override pointing at the configured base URL.
@@ -29,8 +36,10 @@ import json
 import logging
 import os
 import signal
+import time
+from collections import deque
 from pathlib import Path
-from typing import Any
+from typing import Any, Awaitable, Callable
 from uuid import uuid4
 
 import aiohttp
@@ -87,6 +96,9 @@ MIND_ID: str = RUNTIME["mind_id"]
 DEFAULT_MODEL: str = RUNTIME["default_model"]
 PROVIDER: str = RUNTIME["provider"]
 RUNTIME_ENV: dict[str, Any] = RUNTIME.get("env", {}) or {}
+# "exec" (one process per turn) or "app_server" (one process per session).
+CODEX_MODE: str = RUNTIME.get("codex_mode", "exec")
+TURN_QUEUE_CFG: dict[str, Any] = RUNTIME.get("turn_queue", {}) or {}
 
 NS_URL = os.environ.get("HIVE_MIND_SERVER_URL", "http://server:8420")
 
@@ -94,9 +106,16 @@ CODEX_HOME = Path(RUNTIME.get("runtime_config_dir", f"/usr/src/app/minds/{NAME}/
 
 app = FastAPI(title=f"Mind: {NAME}")
 
-# session_id -> {"system_prompt": str, "thread_id": str | None, "model": str}
+# session_id -> {"system_prompt": str, "thread_id": str | None, "model": str,
+#                "mode": "exec" | "app_server", "app_server": _CodexAppServer | None,
+#                "queue": _TurnQueue}
 SESSIONS: dict[str, dict] = {}
 
+# Messages that arrive mid-turn wait in a per-session FIFO (see _TurnQueue).
+TURN_QUEUE_DEPTH = int(TURN_QUEUE_CFG.get("depth", 8))
+TURN_QUEUE_DEADLINE_S = float(TURN_QUEUE_CFG.get("deadline_seconds", 600))
+TURN_QUEUE_COALESCE = bool(TURN_QUEUE_CFG.get("coalesce", False))
+
 
 def _setup_codex_home() -> None:
     CODEX_HOME.mkdir(parents=True, exist_ok=True)
@@ -188,7 +207,18 @@ async def _startup() -> None:
 
 @app.get("/health")
 async def health() -> dict:
-    return {"name": NAME, "mind_id": MIND_ID, "ok": True, "sessions": len(SESSIONS)}
+    return {
+        "name": NAME,
+        "mind_id": MIND_ID,
+        "ok": True,
+        "sessions": len(SESSIONS),
+        "queued_turns": sum(len(s["queue"]) for s in SESSIONS.values()),
+        "codex_mode": CODEX_MODE,
+        "app_servers": sum(
+            1 for s in SESSIONS.values()
+            if s.get("app_server") is not None and s["app_server"].alive
+        ),
+    }
 
 
 @app.get("/sessions")
@@ -213,6 +243,9 @@ async def create_session(req: Request) -> Any:
     client_ref = body.get("client_ref") or ""
     owner_type = body.get("owner_type") or ""
     owner_ref = body.get("owner_ref") or ""
+    mode = body.get("codex_mode") or CODEX_MODE
+    if mode not in ("exec", "app_server"):
+        return JSONResponse({"error": f"Unknown codex_mode {mode!r}"}, status_code=400)
     try:
         if system_prompt_blocks and surface_prompt:
             full_prompt = f"{system_prompt_blocks}\n\n{surface_prompt}"
@@ -220,61 +253,32 @@ async def create_session(req: Request) -> Any:
             full_prompt = surface_prompt
         else:
             full_prompt = system_prompt_blocks
-        SESSIONS[sid] = {
+        SESSIONS[sid] = sess = {
             "system_prompt": full_prompt,
             "thread_id": resume_sid,
             "model": model,
             "client_ref": client_ref,
             "owner_type": owner_type,
             "owner_ref": owner_ref,
+            "mode": mode,
+            "app_server": None,
         }
-        log.info("%s session %s initialised (model=%s resume=%s)",
-                 NAME, sid, model, resume_sid or "new")
+        sess["queue"] = _TurnQueue(
+            lambda content, images: _codex_turn_sse(sid, content, images),
+            lambda: _abandon_codex_turn(sess),
+            TURN_QUEUE_DEPTH,
+            TURN_QUEUE_DEADLINE_S,
+            TURN_QUEUE_COALESCE,
+        )
+        log.info("%s session %s initialised (model=%s resume=%s mode=%s)",
+                 NAME, sid, model, resume_sid or "new", mode)
         return {"session_id": sid, "mind_id": MIND_ID, "name": NAME, "status": "running", "model": model}
     except Exception as exc:
         log.exception("Failed to create session for %s", NAME)
         return JSONResponse({"error": str(exc)}, status_code=500)
 
 
-async def _run_codex_turn(sid: str, content: str, images: list[dict] | None) -> Any:
-    state = SESSIONS.get(sid)
-    if state is None:
-        yield {"type": "result", "is_error": True}
-        return
-
-    thread_id = state.get("thread_id")
-    if thread_id:
-        cmd = [
-            "codex",
-            "exec",
-            "--json",
-            "--dangerously-bypass-approvals-and-sandbox",
-            "--model",
-            state["model"],
-            *_provider_args(),
-            "resume",
-            thread_id,
-            "-",
-        ]
-        stdin_content = content
-    else:
-        cmd = [
-            "codex",
-            "exec",
-            "--json",
-            "--dangerously-bypass-approvals-and-sandbox",
-            "--model",
-            state["model"],
-            *_provider_args(),
-            "-",
-        ]
-        stdin_content = f"{state['system_prompt']}\n\n---\n\n{content}"
-
-    if images:
-        log.warning("%s session %s: image input not supported, ignoring", NAME, sid)
-
-    log.info("%s session %s: spawning codex turn (thread=%s)", NAME, sid, thread_id or "new")
-
+def _codex_env(state: dict) -> dict[str, str]:
     env = os.environ.copy()
     env.update({k: str(v) for k, v in RUNTIME_ENV.items()})
     # Per-spawn metadata for the rotation_check Stop hook. The hook reads
@@ -288,6 +292,34 @@ async def _run_codex_turn(sid: str, content: str, images: list[dict] | None) ->
         env["OWNER_TYPE"] = state["owner_type"]
     if state.get("owner_ref"):
         env["OWNER_REF"] = state["owner_ref"]
+    return env
+
+
+def _turn_input(state: dict, content: str) -> str:
+    """First turn of a thread carries the system prompt; resumes don't."""
+    if state.get("thread_id"):
+        return content
+    return f"{state['system_prompt']}\n\n---\n\n{content}"
+
+
+async def _exec_turn_events(sid: str, state: dict, content: str) -> Any:
+    """Yield raw ``codex exec --json`` events for one turn, then reap."""
+    thread_id = state.get("thread_id")
+    cmd = [
+        "codex",
+        "exec",
+        "--json",
+        "--dangerously-bypass-approvals-and-sandbox",
+        "--model",
+        state["model"],
+        *_provider_args(),
+    ]
+    if thread_id:
+        cmd.extend(["resume", thread_id])
+    cmd.append("-")
+    stdin_content = _turn_input(state, content)
+
+    log.info("%s session %s: spawning codex turn (thread=%s)", NAME, sid, thread_id or "new")
 
     proc = await asyncio.create_subprocess_exec(
         *cmd,
@@ -295,16 +327,290 @@ async def _run_codex_turn(sid: str, content: str, images: list[dict] | None) ->
         stdout=asyncio.subprocess.PIPE,
         stderr=asyncio.subprocess.PIPE,
         limit=10 * 1024 * 1024,
-        env=env,
+        env=_codex_env(state),
         cwd=str(PROJECT_DIR),
         start_new_session=True,
     )
     state["proc"] = proc
-    proc.stdin.write(stdin_content.encode())
-    await proc.stdin.drain()
-    proc.stdin.close()
+    try:
+        proc.stdin.write(stdin_content.encode())
+        await proc.stdin.drain()
+        proc.stdin.close()
+
+        async for raw_line in proc.stdout:
+            line = raw_line.decode().strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+    finally:
+        await _reap_proc(proc)
+        state["proc"] = None
+
+
+def _snake_case(name: str) -> str:
+    return "".join(f"_{c.lower()}" if c.isupper() else c for c in name).lstrip("_")
+
+
+def _normalise_app_server_event(msg: dict) -> dict | None:
+    """Map an app-server notification onto the ``codex exec --json`` shape.
+
+    app-server speaks ``item/completed`` with camelCase item types
+    (``agentMessage``) and reports turn outcome as a status on
+    ``turn/completed``; exec emits ``item.completed`` with snake_case types
+    and separate ``turn.completed`` / ``turn.failed`` events. Returns
+    ``None`` for notifications the relay has no use for.
+    """
+    method = msg.get("method", "")
+    params = msg.get("params") or {}
+    if method in ("item/started", "item/completed"):
+        item = dict(params.get("item") or {})
+        item["type"] = _snake_case(item.get("type", ""))
+        if item["type"] == "reasoning" and not isinstance(item.get("text"), str):
+            parts = [*(item.get("summary") or []), *(item.get("content") or [])]
+            item["text"] = "\n".join(p for p in parts if isinstance(p, str))
+        return {"type": method.replace("/", "."), "item": item}
+    if method == "turn/completed":
+        turn = params.get("turn") or {}
+        if turn.get("status") == "failed":
+            return {
+                "type": "turn.failed",
+                "error": turn.get("error") or {"message": "Turn failed"},
+            }
+        return {"type": "turn.completed"}
+    return None
+
+
+class _AppServerDied(RuntimeError):
+    """The session's codex app-server exited or closed its stdout."""
+
+
+class _CodexAppServer:
+    """One long-lived ``codex app-server`` process for a session.
+
+    Requests are JSON-RPC over newline-delimited stdin/stdout. A reader
+    task resolves responses by id and routes notifications for the active
+    turn into a queue; notifications for an abandoned turn are dropped so
+    they can't bleed into the next one.
+    """
+
+    def __init__(self, proc: asyncio.subprocess.Process, sid: str) -> None:
+        self.proc = proc
+        self.sid = sid
+        self.loaded_thread: str | None = None
+        self._next_id = 0
+        self._pending: dict[int, asyncio.Future] = {}
+        self._events: asyncio.Queue | None = None
+        self._turn_id: str | None = None
+        self._dead_turns: set[str] = set()
+        self._reader = asyncio.create_task(self._read_loop())
+        self._stderr = asyncio.create_task(self._drain_stderr())
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.returncode is None and not self._reader.done()
+
+    @property
+    def turn_active(self) -> bool:
+        return self._events is not None
+
+    def _send(self, msg: dict) -> None:
+        self.proc.stdin.write(json.dumps(msg).encode() + b"\n")
+
+    async def request(self, method: str, params: dict, timeout: float = 60.0) -> dict:
+        if not self.alive:
+            raise _AppServerDied(f"app-server for session {self.sid} is not running")
+        self._next_id += 1
+        rid = self._next_id
+        fut = asyncio.get_running_loop().create_future()
+        self._pending[rid] = fut
+        try:
+            self._send({"id": rid, "method": method, "params": params})
+            await self.proc.stdin.drain()
+            msg = await asyncio.wait_for(fut, timeout)
+        except (BrokenPipeError, ConnectionResetError) as exc:
+            raise _AppServerDied(str(exc)) from exc
+        finally:
+            self._pending.pop(rid, None)
+        if "error" in msg:
+            raise RuntimeError(msg["error"].get("message", f"{method} failed"))
+        return msg.get("result") or {}
+
+    async def initialize(self) -> None:
+        await self.request(
+            "initialize",
+            {"clientInfo": {"name": "hive-mind", "title": NAME, "version": "1"}},
+        )
+        self._send({"method": "initialized"})
+        await self.proc.stdin.drain()
+
+    async def _read_loop(self) -> None:
+        try:
+            async for raw_line in self.proc.stdout:
+                line = raw_line.decode().strip()
+                if not line:
+                    continue
+                try:
+                    msg = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if "id" in msg and "method" not in msg:
+                    fut = self._pending.get(msg["id"])
+                    if fut is not None and not fut.done():
+                        fut.set_result(msg)
+                elif "id" in msg:
+                    # Server-initiated request (approval prompts). Threads are
+                    # started with approvalPolicy=never, so anything that still
+                    # arrives is answered with an error rather than left hanging.
+                    self._send({
+                        "id": msg["id"],
+                        "error": {"code": -32601, "message": "Not supported by harness"},
+                    })
+                else:
+                    self._route(msg)
+        finally:
+            for fut in self._pending.values():
+                if not fut.done():
+                    fut.set_exception(_AppServerDied("app-server closed stdout"))
+            if self._events is not None:
+                self._events.put_nowait(None)
+
+    async def _drain_stderr(self) -> None:
+        if self.proc.stderr is None:
+            return
+        async for line in self.proc.stderr:
+            text = line.decode().strip()
+            if text:
+                log.debug("codex app-server stderr: session=%s line=%s", self.sid, text[:200])
+
+    def _route(self, msg: dict) -> None:
+        if self._events is None:
+            return
+        params = msg.get("params") or {}
+        turn_id = params.get("turnId") or (params.get("turn") or {}).get("id")
+        if turn_id and (turn_id in self._dead_turns or (self._turn_id and turn_id != self._turn_id)):
+            return
+        self._events.put_nowait(msg)
+
+    async def run_turn(self, state: dict, content: str) -> Any:
+        """Yield exec-shaped events for one turn on the session's thread."""
+        events: asyncio.Queue = asyncio.Queue()
+        self._events = events
+        self._turn_id = None
+        try:
+            thread_id = state.get("thread_id")
+            text = _turn_input(state, content)
+            try:
+                if not thread_id:
+                    result = await self.request("thread/start", {
+                        "model": state["model"],
+                        "cwd": str(PROJECT_DIR),
+                        "approvalPolicy": "never",
+                        "sandbox": "danger-full-access",
+                    })
+                    thread_id = result["thread"]["id"]
+                    self.loaded_thread = thread_id
+                    yield {"type": "thread.started", "thread_id": thread_id}
+                elif thread_id != self.loaded_thread:
+                    await self.request("thread/resume", {"threadId": thread_id})
+                    self.loaded_thread = thread_id
+                result = await self.request("turn/start", {
+                    "threadId": thread_id,
+                    "input": [{"type": "text", "text": text}],
+                })
+            except _AppServerDied:
+                raise
+            except Exception as exc:
+                yield {"type": "turn.failed", "error": {"message": str(exc)}}
+                return
+            self._turn_id = (result.get("turn") or {}).get("id")
+            while True:
+                msg = await events.get()
+                if msg is None:
+                    raise _AppServerDied("app-server exited mid-turn")
+                event = _normalise_app_server_event(msg)
+                if event is None:
+                    continue
+                yield event
+                if event["type"] in ("turn.completed", "turn.failed"):
+                    return
+        finally:
+            # An abandoned generator may be finalised after the next turn
+            # has already started; only clear state that is still ours.
+            if self._events is events:
+                self._events = None
+                self._turn_id = None
+
+    async def interrupt(self, abandon: bool = False) -> None:
+        """Interrupt the active turn. ``abandon`` also drops its tail events."""
+        turn_id = self._turn_id
+        if not turn_id or not self.loaded_thread:
+            return
+        if abandon:
+            self._dead_turns.add(turn_id)
+            if self._events is not None:
+                # Close out the local turn now; its real tail is dropped.
+                self._events.put_nowait({
+                    "method": "turn/completed",
+                    "params": {"turn": {"id": turn_id, "status": "interrupted"}},
+                })
+        try:
+            await self.request(
+                "turn/interrupt",
+                {"threadId": self.loaded_thread, "turnId": turn_id},
+                timeout=5.0,
+            )
+        except Exception:
+            log.debug("turn/interrupt failed for session %s", self.sid, exc_info=True)
+
+    async def close(self) -> None:
+        self._reader.cancel()
+        self._stderr.cancel()
+        await _reap_proc(self.proc)
+
+
+async def _ensure_app_server(sid: str, state: dict) -> _CodexAppServer | None:
+    """Return the session's live app-server, starting one if needed.
+
+    Returns ``None`` (and drops the session to exec mode) if the process
+    can't be started or initialised.
+    """
+    server: _CodexAppServer | None = state.get("app_server")
+    if server is not None and server.alive:
+        return server
+    if server is not None:
+        await server.close()
+        state["app_server"] = None
+        server = None
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            "codex", "app-server", *_provider_args(),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=10 * 1024 * 1024,
+            env=_codex_env(state),
+            cwd=str(PROJECT_DIR),
+            start_new_session=True,
+        )
+        server = _CodexAppServer(proc, sid)
+        await server.initialize()
+    except Exception:
+        log.exception("%s session %s: codex app-server unavailable, using exec", NAME, sid)
+        if server is not None:
+            await server.close()
+        state["mode"] = "exec"
+        return None
+    log.info("%s session %s: started codex app-server pid=%d", NAME, sid, proc.pid)
+    state["app_server"] = server
+    return server
+
 
-    current_thread_id = thread_id
+async def _relay_turn(sid: str, state: dict, events: Any) -> Any:
+    """Translate raw exec-shaped events into the SSE frames the gateway reads."""
+    current_thread_id = state.get("thread_id")
 
     # Track whether the model produced any assistant text this turn, plus the
     # most recent reasoning text and the most recent non-agent_message item
@@ -331,15 +637,7 @@ async def _run_codex_turn(sid: str, content: str, images: list[dict] | None) ->
             },
         }
 
-    async for raw_line in proc.stdout:
-        line = raw_line.decode().strip()
-        if not line:
-            continue
-        try:
-            event = json.loads(line)
-        except json.JSONDecodeError:
-            continue
-
+    async for event in events:
         etype = event.get("type", "")
         yield {
             "type": "codex_event",
@@ -374,8 +672,7 @@ async def _run_codex_turn(sid: str, content: str, images: list[dict] | None) ->
         elif etype == "turn.completed":
             if not saw_agent_message:
                 yield _empty_turn_frame()
-            await _reap_proc(proc)
-            state["proc"] = None
+            await events.aclose()
             yield {
                 "type": "result",
                 "session_id": current_thread_id,
@@ -393,8 +690,7 @@ async def _run_codex_turn(sid: str, content: str, images: list[dict] | None) ->
             state["thread_id"] = None
             if not saw_agent_message:
                 yield _empty_turn_frame()
-            await _reap_proc(proc)
-            state["proc"] = None
+            await events.aclose()
             yield {"type": "result", "is_error": True}
             return
 
@@ -404,11 +700,229 @@ async def _run_codex_turn(sid: str, content: str, images: list[dict] | None) ->
     state["thread_id"] = None
     if not saw_agent_message:
         yield _empty_turn_frame()
-    await _reap_proc(proc)
-    state["proc"] = None
     yield {"type": "result", "session_id": current_thread_id, "is_error": False}
 
 
+async def _run_codex_turn(sid: str, content: str, images: list[dict] | None) -> Any:
+    state = SESSIONS.get(sid)
+    if state is None:
+        yield {"type": "result", "is_error": True}
+        return
+
+    if images:
+        log.warning("%s session %s: image input not supported, ignoring", NAME, sid)
+
+    if state.get("mode") == "app_server":
+        server = await _ensure_app_server(sid, state)
+        if server is not None:
+            resumed_thread = state.get("thread_id")
+            saw_text = False
+            try:
+                async for frame in _relay_turn(sid, state, server.run_turn(state, content)):
+                    saw_text = saw_text or frame.get("type") == "assistant"
+                    yield frame
+                return
+            except _AppServerDied:
+                log.warning(
+                    "%s session %s: codex app-server died, falling back to exec",
+                    NAME, sid,
+                )
+                await server.close()
+                state["app_server"] = None
+                state["mode"] = "exec"
+                if state.get("thread_id") != resumed_thread:
+                    # The thread was started this turn and never finished one,
+                    # so it never took the system prompt: resuming it through
+                    # exec would run the rest of the session without it.
+                    state["thread_id"] = None
+                if saw_text:
+                    # Part of the answer already reached the client; replaying
+                    # the turn through exec would duplicate it.
+                    yield {"type": "result", "is_error": True}
+                    return
+
+    async for frame in _relay_turn(sid, state, _exec_turn_events(sid, state, content)):
+        yield frame
+
+
+def _sse(event: dict) -> str:
+    return f"data: {json.dumps(event)}\n\n"
+
+
+class _QueuedTurn:
+    """One message waiting for (or running) its turn; ``out`` feeds its stream."""
+
+    def __init__(self, content: str, images: list[dict] | None, deadline: float) -> None:
+        self.content = content
+        self.images = images
+        self.deadline = deadline
+        self.state = "waiting"  # waiting -> running -> done
+        self.abandoned = False
+        self.out: asyncio.Queue[str | None] = asyncio.Queue()
+
+
+class _TurnQueue:
+    """Per-session FIFO of turns, run one at a time by a worker task.
+
+    A message that arrives while a turn is running waits here instead of
+    being bounced with a 409: up to ``depth`` deep, each for at most
+    ``deadline_s`` before its turn starts. Its stream gets a ``queued``
+    event with its position (1 = next) whenever that changes. With
+    ``coalesce`` set, everything waiting when a turn finishes is merged
+    into one user message and every merged stream receives that turn's
+    output.
+
+    ``run(content, images)`` yields SSE strings for one turn; ``abandon()``
+    is awaited when every stream attached to the running turn has gone.
+    ``cancel_waiting`` ends every waiting turn; an interrupt uses it, so
+    follow-ups queued behind the interrupted turn don't run after it.
+    """
+
+    def __init__(
+        self,
+        run: Callable[[str, list[dict] | None], Any],
+        abandon: Callable[[], Awaitable[None]],
+        depth: int,
+        deadline_s: float,
+        coalesce: bool,
+    ) -> None:
+        self._run = run
+        self._abandon = abandon
+        self.depth = depth
+        self.deadline_s = deadline_s
+        self.coalesce = coalesce
+        self._waiting: deque[_QueuedTurn] = deque()
+        self._running: list[_QueuedTurn] = []
+        self._worker: asyncio.Task | None = None
+
+    @property
+    def busy(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    def __len__(self) -> int:
+        return len(self._waiting)
+
+    def submit(self, content: str, images: list[dict] | None = None) -> _QueuedTurn | None:
+        """Enqueue a turn, or return ``None`` if the queue is full."""
+        if self.busy and len(self._waiting) >= self.depth:
+            return None
+        item = _QueuedTurn(content, images, time.monotonic() + self.deadline_s)
+        self._waiting.append(item)
+        if self.busy:
+            item.out.put_nowait(_sse({"type": "queued", "position": len(self._waiting)}))
+        else:
+            self._worker = asyncio.create_task(self._drain())
+        return item
+
+    async def stream(self, item: _QueuedTurn) -> Any:
+        """Yield the SSE strings for ``item``; detaches it on any exit."""
+        try:
+            while True:
+                if item.state == "waiting":
+                    remaining = max(item.deadline - time.monotonic(), 0.0)
+                    try:
+                        chunk = await asyncio.wait_for(item.out.get(), remaining)
+                    except asyncio.TimeoutError:
+                        if item.state != "waiting":
+                            continue
+                        yield _sse({
+                            "type": "result",
+                            "is_error": True,
+                            "error": "Queued turn expired before it could start",
+                        })
+                        return
+                else:
+                    chunk = await item.out.get()
+                if chunk is None:
+                    return
+                yield chunk
+        finally:
+            await self._detach(item)
+
+    async def _detach(self, item: _QueuedTurn) -> None:
+        item.abandoned = True
+        if item.state == "waiting":
+            item.state = "done"
+            try:
+                self._waiting.remove(item)
+            except ValueError:
+                pass
+            self._announce_positions()
+        elif item.state == "running" and all(i.abandoned for i in self._running):
+            await self._abandon()
+
+    def _announce_positions(self) -> None:
+        for pos, waiting in enumerate(self._waiting, start=1):
+            waiting.out.put_nowait(_sse({"type": "queued", "position": pos}))
+
+    async def _drain(self) -> None:
+        while self._waiting:
+            batch = [self._waiting.popleft()]
+            if self.coalesce:
+                batch.extend(self._waiting)
+                self._waiting.clear()
+            live = [i for i in batch if not i.abandoned]
+            if not live:
+                continue
+            for item in live:
+                item.state = "running"
+            self._running = live
+            self._announce_positions()
+            content = "\n\n".join(i.content for i in live)
+            images = [img for i in live for img in (i.images or [])] or None
+            try:
+                async for chunk in self._run(content, images):
+                    for item in live:
+                        if not item.abandoned:
+                            item.out.put_nowait(chunk)
+            except Exception as exc:
+                log.exception("%s turn failed", NAME)
+                for item in live:
+                    item.out.put_nowait(_sse({"type": "result", "is_error": True, "error": str(exc)}))
+            finally:
+                for item in live:
+                    item.state = "done"
+                    item.out.put_nowait(None)
+                self._running = []
+
+    def cancel_waiting(self, reason: str) -> int:
+        """End every waiting stream with an error ``result``; return how many."""
+        waiting, self._waiting = list(self._waiting), deque()
+        for item in waiting:
+            item.state = "done"
+            item.out.put_nowait(_sse({"type": "result", "is_error": True, "error": reason}))
+            item.out.put_nowait(None)
+        return len(waiting)
+
+    async def close(self) -> None:
+        """End every waiting stream and stop the worker (session teardown)."""
+        self.cancel_waiting("Session closed")
+        if self.busy:
+            self._worker.cancel()
+
+
+async def _codex_turn_sse(sid: str, content: str, images: list[dict] | None) -> Any:
+    async for event in _run_codex_turn(sid, content, images):
+        yield _sse(event)
+
+
+async def _abandon_codex_turn(sess: dict) -> None:
+    """Stop a turn nobody is listening to any more.
+
+    Reap the exec subprocess: without this, an SSE client disconnect
+    (broker timeout, etc.) leaves the codex node + rust child running until
+    they crash on their own, leaking file descriptors. The app-server
+    outlives the turn, so there the turn is interrupted rather than killed.
+    """
+    leftover = sess.get("proc")
+    if leftover is not None:
+        await _reap_proc(leftover)
+        sess["proc"] = None
+    server = sess.get("app_server")
+    if server is not None and server.turn_active:
+        await server.interrupt(abandon=True)
+
+
 @app.post("/sessions/{sid}/message")
 async def send_message(sid: str, req: Request) -> Any:
     body = await req.json()
@@ -417,53 +931,43 @@ async def send_message(sid: str, req: Request) -> Any:
     if sid not in SESSIONS:
         return JSONResponse({"error": f"Session {sid} not found"}, status_code=404)
 
-    # Turn-bleed guard. Codex CLI spawns a fresh subprocess per turn, but two
-    # concurrent calls would race against the same state["thread_id"] — both
-    # trying to resume the same Codex thread. Refuse to start a second turn
-    # while one is in flight; caller retries.
-    sess = SESSIONS[sid]
-    if sess.get("in_flight"):
+    # Turns run one at a time per session — two concurrent turns would race
+    # on the same state["thread_id"]. A message that arrives while one is in
+    # flight waits in the session's queue (its stream reports its position)
+    # rather than being rejected; only a full queue is refused.
+    queue: _TurnQueue = SESSIONS[sid]["queue"]
+    item = queue.submit(content, images)
+    if item is None:
         return JSONResponse(
-            {"error": "Turn in progress, retry shortly"},
+            {"error": "Turn queue full, retry shortly"},
             status_code=409,
         )
-    sess["in_flight"] = True
-
-    async def stream() -> Any:
-        try:
-            async for event in _run_codex_turn(sid, content, images):
-                yield f"data: {json.dumps(event)}\n\n"
-        finally:
-            # Clear in_flight on every exit path: normal completion, generator
-            # cancellation (client disconnect), or exception. Without this, an
-            # abandoned stream would lock the session out of all future turns.
-            sess["in_flight"] = False
-            # Reap the codex subprocess on cancellation. Without this, an SSE
-            # client disconnect (broker timeout, etc.) leaves the codex node +
-            # rust child running until they crash on their own, leaking file
-            # descriptors. The _run_codex_turn exit paths clear state["proc"]
-            # on normal completion, so this only fires when the generator was
-            # cancelled mid-stream.
-            leftover = sess.get("proc")
-            if leftover is not None:
-                await _reap_proc(leftover)
-                sess["proc"] = None
-
-    return StreamingResponse(stream(), media_type="text/event-stream")
+    return StreamingResponse(queue.stream(item), media_type="text/event-stream")
 
 
 @app.post("/sessions/{sid}/interrupt")
 async def interrupt_session(sid: str) -> Any:
-    if sid not in SESSIONS:
+    sess = SESSIONS.get(sid)
+    if sess is None:
         return JSONResponse({"error": f"Session {sid} not found"}, status_code=404)
-    return {"ok": True, "session_id": sid, "message": "codex_per_turn"}
+    # An interrupt stops the session, not just its current turn: messages
+    # queued behind it are dropped rather than run once it ends.
+    dropped = sess["queue"].cancel_waiting("Interrupted before it started")
+    server = sess.get("app_server")
+    if server is not None and server.turn_active:
+        await server.interrupt()
+        return {"ok": True, "session_id": sid, "dropped": dropped}
+    return {"ok": True, "session_id": sid, "message": "codex_per_turn", "dropped": dropped}
 
 
 @app.delete("/sessions/{sid}")
 async def kill_session(sid: str) -> dict:
     sess = SESSIONS.pop(sid, None)
     if sess is not None:
+        await sess["queue"].close()
         await _reap_proc(sess.get("proc"))
+        if sess.get("app_server") is not None:
+            await sess["app_server"].close()
     log.info("Killed %s session %s", NAME, sid)
     return {"session_id": sid, "status": "closed"}
 
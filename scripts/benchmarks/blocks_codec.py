@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""Benchmark: DB size and decode throughput, JSON vs zstd-dictionary ``assistant_blocks``.
+
+Builds a synthetic training DB of ``--sessions`` x ``--turns`` turns whose
+blocks look like real captures: a short text block, a handful of
+``exec_command`` / ``read_file`` tool calls, and their multi-line tool
+results. It then measures the DB with plain JSON blocks, trains a
+dictionary, runs ``reencode --to zstd``, vacuums, and measures again:
+
+- ``size``: the DB file after ``VACUUM`` (and the ``assistant_blocks`` bytes);
+- ``get_turns``: every session read back through ``get_turns``;
+- ``proposer``: ``read_recent_turn_records`` over the whole corpus;
+- ``export``: ``core.training_export.export`` to plain JSONL.
+
+Each read path reports rows/s and MB/s of decoded JSON.
+
+Usage::
+
+    python scripts/benchmarks/blocks_codec.py --sessions 200 --turns 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+_REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from core import training_codec  # noqa: E402
+from core.training_capture import HARNESS_CODEX, TrainingTurn, get_turns, upsert_turns  # noqa: E402
+from core.training_export import export  # noqa: E402
+
+_PROPOSER = _REPO_ROOT / "tools" / "stateless" / "skill_proposer" / "skill_proposer.py"
+
+
+def _load_proposer():
+    spec = importlib.util.spec_from_file_location("_bench_skill_proposer", _PROPOSER)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _blocks(rng: random.Random, i: int) -> list[dict]:
+    blocks: list[dict] = [{"type": "text", "text": f"Looking at step {i} of the change before editing."}]
+    for c in range(rng.randint(1, 6)):
+        call = f"call_{i}_{c}"
+        if rng.random() < 0.5:
+            path = f"src/pkg{rng.randint(0, 40)}/mod{rng.randint(0, 200)}.py"
+            blocks.append({"type": "tool_use", "id": call, "name": "read_file", "input": {"path": path}})
+            body = "".join(
+                f"{n:>5}  def handler_{rng.randint(0, 999)}(self, request):\n" for n in range(rng.randint(20, 80))
+            )
+        else:
+            cmd = f"rg -n 'pattern{rng.randint(0, 50)}' src/ tests/"
+            blocks.append({"type": "tool_use", "id": call, "name": "exec_command", "input": {"cmd": cmd}})
+            body = "".join(
+                f"src/pkg{rng.randint(0, 40)}/mod{rng.randint(0, 200)}.py:{rng.randint(1, 900)}: match\n"
+                for _ in range(rng.randint(5, 60))
+            )
+        blocks.append({"type": "tool_result", "tool_call_id": call, "content": body})
+    blocks.append({"type": "text", "text": "Done; the tests pass."})
+    return blocks
+
+
+def _build(db: Path, sessions: int, turns: int) -> None:
+    rng = random.Random(7)
+    for s in range(sessions):
+        upsert_turns(db, [
+            TrainingTurn.from_blocks(
+                session_id=f"s{s}", turn_index=i, harness=HARNESS_CODEX, mind_id="ada",
+                user_content=f"request {i}", captured_at=1000 + s * turns + i,
+                assistant_blocks=_blocks(rng, i),
+            )
+            for i in range(turns)
+        ])
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _measure(db: Path, out: Path, sessions: int, repeat: int, proposer) -> dict:
+    conn = sqlite3.connect(str(db))
+    rows, stored, json_bytes = conn.execute(
+        "SELECT COUNT(*), SUM(LENGTH(CAST(assistant_blocks AS BLOB))), "
+        "SUM(LENGTH(CAST(assistant_blocks AS BLOB)) * (blocks_codec = 0)) FROM training_turns"
+    ).fetchone()
+    conn.close()
+
+    def turns() -> None:
+        for s in range(sessions):
+            get_turns(db, f"s{s}")
+
+    def propose() -> None:
+        proposer.read_recent_turn_records(str(db), "ada", lookback_turns=rows)
+
+    def dump() -> None:
+        for f in out.glob("*"):
+            f.unlink()
+        export(db, out, fmt="jsonl")
+
+    return {
+        "rows": rows,
+        "db_bytes": db.stat().st_size,
+        "blocks_bytes": stored,
+        "json_bytes": json_bytes,
+        "get_turns": _best(turns, repeat),
+        "proposer": _best(propose, repeat),
+        "export": _best(dump, repeat),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=50, help="turns per session")
+    parser.add_argument("--dict-bytes", type=int, default=training_codec.DEFAULT_DICT_BYTES)
+    parser.add_argument("--level", type=int, default=training_codec.DEFAULT_LEVEL)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    proposer = _load_proposer()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        db = root / "turns.db"
+        _build(db, args.sessions, args.turns)
+        with sqlite3.connect(str(db)) as conn:
+            conn.execute("VACUUM")
+        before = _measure(db, root / "out", args.sessions, args.repeat, proposer)
+
+        start = time.perf_counter()
+        training_codec.train_dictionary(db, dict_bytes=args.dict_bytes, level=args.level)
+        train_s = time.perf_counter() - start
+        start = time.perf_counter()
+        training_codec.reencode(db, to="zstd")
+        reencode_s = time.perf_counter() - start
+        conn = sqlite3.connect(str(db))
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.execute("VACUUM")
+        conn.close()
+        after = _measure(db, root / "out", args.sessions, args.repeat, proposer)
+
+    rows, decoded = before["rows"], before["json_bytes"]
+    print(f"{rows} turns, {decoded / 1e6:.1f} MB of block JSON "
+          f"(train {train_s:.1f} s, reencode {reencode_s:.1f} s; best of {args.repeat})")
+    print(f"{'':<14} {'json':>12} {'zstd':>12} {'ratio':>7}")
+    for key, label in (("db_bytes", "db MB"), ("blocks_bytes", "blocks MB")):
+        print(f"{label:<14} {before[key] / 1e6:>12.1f} {after[key] / 1e6:>12.1f} "
+              f"{before[key] / after[key]:>6.1f}x")
+    for key in ("get_turns", "proposer", "export"):
+        b, a = before[key], after[key]
+        print(f"{key + ' ms':<14} {b * 1000:>12.0f} {a * 1000:>12.0f} {b / a:>6.2f}x")
+        print(f"{'  rows/s':<14} {rows / b:>12,.0f} {rows / a:>12,.0f}")
+        print(f"{'  MB/s':<14} {decoded / b / 1e6:>12.1f} {decoded / a / 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
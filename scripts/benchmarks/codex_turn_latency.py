@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Benchmark: time-to-first-``agent_message`` for the two codex_cli modes.
+
+Drives a running codex_cli mind over its HTTP API. For each mode it opens
+a fresh session (``codex_mode`` in the spawn payload), sends ``--turns``
+messages on it, and times each turn from request start to the first
+``assistant`` frame on the SSE stream — i.e. the relay of the first
+``agent_message`` item. The first turn of a session pays thread creation
+in both modes, so it is reported separately from the steady-state turns.
+
+Usage::
+
+    python scripts/benchmarks/codex_turn_latency.py \\
+        --mind-url http://localhost:8420 --turns 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+
+import aiohttp
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int((len(ordered) - 1) * pct))]
+
+
+async def _time_turn(http: aiohttp.ClientSession, url: str, sid: str, prompt: str) -> float | None:
+    started = time.perf_counter()
+    first: float | None = None
+    timeout = aiohttp.ClientTimeout(total=0, sock_read=0)
+    async with http.post(f"{url}/sessions/{sid}/message", json={"content": prompt}, timeout=timeout) as resp:
+        resp.raise_for_status()
+        async for raw in resp.content:
+            line = raw.decode().strip()
+            if not line.startswith("data: "):
+                continue
+            event = json.loads(line.removeprefix("data: "))
+            if first is None and event.get("type") == "assistant":
+                first = time.perf_counter() - started
+            if event.get("type") == "result":
+                break
+    return first
+
+
+async def _bench_mode(url: str, mode: str, turns: int, prompt: str) -> dict:
+    async with aiohttp.ClientSession() as http:
+        async with http.post(f"{url}/sessions", json={"codex_mode": mode}) as resp:
+            resp.raise_for_status()
+            sid = (await resp.json())["session_id"]
+        try:
+            samples = []
+            for _ in range(turns):
+                ttfm = await _time_turn(http, url, sid, prompt)
+                if ttfm is not None:
+                    samples.append(ttfm * 1000)
+        finally:
+            await http.delete(f"{url}/sessions/{sid}")
+    steady = samples[1:] or samples
+    return {
+        "mode": mode,
+        "turns": len(samples),
+        "first_turn_ms": round(samples[0], 1) if samples else None,
+        "p50_ms": round(statistics.median(steady), 1) if steady else None,
+        "p95_ms": round(_percentile(steady, 0.95), 1) if steady else None,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--mind-url", default="http://localhost:8420")
+    ap.add_argument("--turns", type=int, default=10)
+    ap.add_argument("--prompt", default="Reply with the single word: ok")
+    ap.add_argument("--modes", nargs="+", default=["exec", "app_server"])
+    args = ap.parse_args(argv)
+
+    url = args.mind_url.rstrip("/")
+    for mode in args.modes:
+        result = asyncio.run(_bench_mode(url, mode, args.turns, args.prompt))
+        print(json.dumps(result))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
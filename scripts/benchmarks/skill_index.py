@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Benchmark: SKILL.md discovery, full re-read vs the shared SkillIndex.
+
+Builds a synthetic minds tree (``--minds`` minds x ``--skills`` skills each,
+split between ``.claude`` and ``.codex``; every tenth skill is scheduled,
+every third user-invocable) in a temp dir and times:
+
+  - ``full scan``: glob + read + parse every SKILL.md, as discovery did on
+    every reconcile tick and every autocomplete keystroke;
+  - ``index cold``: the first ``SkillIndex.refresh()`` (same work plus stats);
+  - ``index warm``: a refresh with nothing changed (stat pass only);
+  - ``index 1 edit``: a refresh after one SKILL.md was edited;
+  - ``scheduled()``/``user_invocable()``: queries on a fresh index;
+  - ``discover``: ``discover_scheduled_skills`` on a warm index.
+
+Usage::
+
+    python scripts/benchmarks/skill_index.py --minds 10 --skills 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+_REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from core.scheduled_skills import discover_scheduled_skills  # noqa: E402
+from core.skill_index import SkillIndex, minds_index, parse_frontmatter  # noqa: E402
+
+_BODY = "## When to Use\n\n" + "Some instructions for the skill. " * 60 + "\n"
+
+
+def _build(root: Path, minds: int, skills: int) -> Path:
+    for m in range(minds):
+        mind = root / f"mind{m:02d}"
+        mind.mkdir()
+        (mind / "runtime.yaml").write_text(f"name: mind{m:02d}\nmind_id: 00000000-0000-0000-0000-{m:012d}\n")
+        for s in range(skills):
+            harness = ".claude" if s % 2 == 0 else ".codex"
+            skill = mind / harness / "skills" / f"skill-{s:04d}"
+            skill.mkdir(parents=True)
+            fm = [f"name: skill-{s:04d}", f"description: Synthetic skill {s}"]
+            if s % 3 == 0:
+                fm.append("user-invocable: true")
+            if s % 10 == 0:
+                fm.append(f'schedule: "{s % 60} 7 * * *"')
+            (skill / "SKILL.md").write_text("---\n" + "\n".join(fm) + "\n---\n\n" + _BODY)
+    return root
+
+
+def _full_scan(root: Path) -> int:
+    found = 0
+    for path in sorted(list(root.glob("*/.claude/skills/*/SKILL.md")) + list(root.glob("*/.codex/skills/*/SKILL.md"))):
+        fm = parse_frontmatter(path.read_text()) or {}
+        found += "schedule" in fm
+    return found
+
+
+def _time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--minds", type=int, default=10)
+    parser.add_argument("--skills", type=int, default=200, help="skills per mind")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = _build(Path(tmp), args.minds, args.skills)
+        total = args.minds * args.skills
+        roots = minds_index(root).roots  # same layout, fresh (unshared) indexes below
+
+        def cold() -> None:
+            SkillIndex(roots).refresh()
+
+        warm = SkillIndex(roots)
+        warm.refresh()
+        victim = root / "mind00" / ".claude" / "skills" / "skill-0000" / "SKILL.md"
+
+        def one_edit() -> None:
+            st = victim.stat()
+            os.utime(victim, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+            assert len(warm.refresh().changed) == 1
+
+        shared = minds_index(root)
+        shared.refresh()
+        rows = [
+            ("full scan", _time(lambda: _full_scan(root), args.repeat)),
+            ("index cold", _time(cold, args.repeat)),
+            ("index warm", _time(warm.refresh, args.repeat)),
+            ("index 1 edit", _time(one_edit, args.repeat)),
+            ("scheduled()", _time(warm.scheduled, args.repeat)),
+            ("user_invocable()", _time(warm.user_invocable, args.repeat)),
+            ("discover", _time(lambda: discover_scheduled_skills(root, shared), args.repeat)),
+        ]
+
+    print(f"{total} skills across {args.minds} minds (best of {args.repeat})")
+    print(f"{'operation':<18} {'ms':>9}")
+    for name, ms in rows:
+        print(f"{name:<18} {ms:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Benchmark: SSE parsing of a long partial-message stream.
+
+Builds a ~10 MB ``text/event-stream`` body of ``stream_event`` text deltas
+(the shape a claude mind emits with ``--include-partial-messages``), cuts
+it into network-sized chunks, and times two parsers over it:
+
+  - ``legacy``: the old ``buf += chunk.decode()`` / ``buf.split("\\n", 1)``
+    loop, which re-copies the buffer tail for every line;
+  - ``decoder``: ``core.gateway_client.SSEDecoder``.
+
+A ``--single-event`` run puts the whole payload in one ``data:`` line,
+the worst case for the legacy loop's repeated concatenation.
+
+Usage::
+
+    python scripts/benchmarks/sse_decoder.py --megabytes 10 --chunk 1024
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+_REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from core.gateway_client import SSEDecoder  # noqa: E402
+
+
+def _build_stream(megabytes: float, single_event: bool) -> bytes:
+    target = int(megabytes * 1024 * 1024)
+    if single_event:
+        text = "héllo wörld ☕ " * (target // 18)
+        return f"data: {json.dumps({'type': 'result', 'result': text})}\n\n".encode()
+    parts: list[bytes] = []
+    size = 0
+    i = 0
+    while size < target:
+        event = {
+            "type": "stream_event",
+            "event": {
+                "type": "content_block_delta",
+                "delta": {"type": "text_delta", "text": f"token {i} ☕ "},
+            },
+        }
+        line = f"data: {json.dumps(event)}\n\n".encode()
+        parts.append(line)
+        size += len(line)
+        i += 1
+    return b"".join(parts)
+
+
+def _legacy(chunks: list[bytes]) -> int:
+    count = 0
+    buf = ""
+    for chunk in chunks:
+        buf += chunk.decode(errors="replace")
+        while "\n" in buf:
+            raw_line, buf = buf.split("\n", 1)
+            raw_line = raw_line.strip()
+            if raw_line.startswith("data: "):
+                json.loads(raw_line.removeprefix("data: "))
+                count += 1
+    return count
+
+
+def _decoder(chunks: list[bytes]) -> int:
+    count = 0
+    decoder = SSEDecoder()
+    for chunk in chunks:
+        for event in decoder.feed(chunk):
+            json.loads(event.data)
+            count += 1
+    for event in decoder.flush():
+        json.loads(event.data)
+        count += 1
+    return count
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--megabytes", type=float, default=10.0)
+    ap.add_argument("--chunk", type=int, default=1024, help="bytes per network chunk")
+    ap.add_argument("--single-event", action="store_true")
+    args = ap.parse_args(argv)
+
+    stream = _build_stream(args.megabytes, args.single_event)
+    chunks = [stream[i:i + args.chunk] for i in range(0, len(stream), args.chunk)]
+    for name, parse in (("legacy", _legacy), ("decoder", _decoder)):
+        started = time.perf_counter()
+        events = parse(chunks)
+        elapsed = time.perf_counter() - started
+        print(json.dumps({
+            "parser": name,
+            "bytes": len(stream),
+            "chunks": len(chunks),
+            "events": events,
+            "seconds": round(elapsed, 3),
+            "mb_per_s": round(len(stream) / 1024 / 1024 / elapsed, 1),
+        }))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
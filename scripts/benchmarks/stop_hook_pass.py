@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""Benchmark: per-fire Stop-hook cost, separate adapters vs the single pass.
+
+Builds a synthetic Claude Code transcript and a Codex rollout of about
+``--mb`` MB each (every tenth turn fires a skill), then times one Stop-hook
+fire in two shapes against separate DBs:
+
+  - ``before``: the two adapters as wired until now — training capture,
+    then a second full parse for skill telemetry (Codex: a third parse for
+    session metadata, and a ``json.dumps`` + regex over every block);
+  - ``after``: ``core.stop_hook.run_stop_hook`` — one parse feeding both
+    ``upsert_turns`` and ``bump_skills``.
+
+Claude rows are timed on a cold fire (no checkpoint: the whole file) and a
+warm fire (one turn appended since the last fire). Codex rollouts have no
+checkpoint, so every fire is a whole-file parse.
+
+Usage::
+
+    python scripts/benchmarks/stop_hook_pass.py --mb 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+_REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from core import training_capture_claude, training_capture_codex  # noqa: E402
+from core.stop_hook import _load_telemetry, run_stop_hook  # noqa: E402
+from core.training_capture import upsert_turns  # noqa: E402
+
+_SLASH_RE = re.compile(r"^/([a-z0-9][a-z0-9._-]*)")
+_CODEX_SKILL_RE = re.compile(r"skills/([a-z0-9][a-z0-9._-]*)/SKILL\.md")
+
+
+def _claude_turn(i: int) -> list[str]:
+    meta = {"version": "2.1.179", "isSidechain": False}
+    tool = (
+        {"type": "tool_use", "id": f"t{i}", "name": "Skill", "input": {"skill": f"hivemind:skill-{i % 7}"}}
+        if i % 10 == 0
+        else {"type": "tool_use", "id": f"t{i}", "name": "Bash", "input": {"command": f"grep -rn thing{i} ."}}
+    )
+    return [
+        json.dumps({**meta, "type": "user", "message": {
+            "role": "user", "content": f"request {i}: " + "please look at this " * 10,
+        }}),
+        json.dumps({**meta, "type": "assistant", "message": {
+            "role": "assistant", "model": "claude-opus-4-8", "content": [
+                {"type": "text", "text": "Checking. " * 20}, tool,
+            ],
+        }}),
+        json.dumps({**meta, "type": "user", "message": {
+            "role": "user", "content": [
+                {"type": "tool_result", "tool_use_id": f"t{i}", "content": "match\n" * 40},
+            ],
+        }}),
+    ]
+
+
+def _codex_turn(i: int) -> list[str]:
+    cmd = (
+        ["bash", "-lc", f"cat /m/.codex/skills/skill-{i % 7}/SKILL.md"]
+        if i % 10 == 0
+        else ["bash", "-lc", f"grep -rn thing{i} ."]
+    )
+    items = [
+        {"type": "message", "role": "user", "content": [
+            {"type": "input_text", "text": f"request {i}: " + "please look at this " * 10}]},
+        {"type": "message", "role": "assistant", "content": [
+            {"type": "output_text", "text": "Checking. " * 20}]},
+        {"type": "function_call", "name": "exec_command", "call_id": f"c{i}",
+         "arguments": json.dumps({"cmd": cmd})},
+        {"type": "function_call_output", "call_id": f"c{i}", "output": "match\n" * 40},
+    ]
+    return [json.dumps({"type": "response_item", "payload": item}) for item in items]
+
+
+def _write(path: Path, header: list[str], turn, mb: float) -> int:
+    target = int(mb * 1e6)
+    turns = 0
+    with path.open("w") as fh:
+        fh.write("".join(line + "\n" for line in header))
+        while fh.tell() < target:
+            fh.write("\n".join(turn(turns)) + "\n")
+            turns += 1
+    return turns
+
+
+def _before_claude(path: Path, db: Path, config_dir: Path) -> None:
+    training_capture_claude.capture_session(path, session_id="bench", db_path=db)
+    names: set[str] = set()
+    for user_content, blocks in training_capture_claude._parse_grouped(path):
+        m = _SLASH_RE.match(user_content.strip()) if isinstance(user_content, str) else None
+        if m:
+            names.add(m.group(1))
+        for block in blocks:
+            if block.get("type") == "tool_use" and block.get("name") == "Skill":
+                names.add(str((block.get("input") or {}).get("skill", "")).rsplit(":", 1)[-1])
+    _load_telemetry().bump_skills(config_dir, names - {""})
+
+
+def _before_codex(path: Path, db: Path, config_dir: Path) -> None:
+    # build_turns used to parse twice: once for turns, once for metadata.
+    training_capture_codex._session_metadata(path)
+    upsert_turns(db, training_capture_codex.build_turns(path, session_id="bench"))
+    names: set[str] = set()
+    for _user, blocks in training_capture_codex._parse_grouped(path):
+        for block in blocks:
+            text = json.dumps(block.get("input"), ensure_ascii=False) + "\n" + str(block.get("content") or "")
+            names.update(m.group(1) for m in _CODEX_SKILL_RE.finditer(text))
+    _load_telemetry().bump_skills(config_dir, names)
+
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mb", type=float, default=50.0, help="transcript size per harness")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        config = {h: root / h / ".cfg" for h in ("before", "after")}
+        for d in config.values():
+            (d / "skills").mkdir(parents=True)
+
+        claude = root / "claude.jsonl"
+        codex = root / "codex.jsonl"
+        n_claude = _write(claude, [], _claude_turn, args.mb)
+        n_codex = _write(codex, [
+            json.dumps({"type": "session_meta", "payload": {"cli_version": "0.9.0", "base_instructions": {"text": "SYS"}}}),
+            json.dumps({"type": "turn_context", "payload": {"model": "gpt-5-codex"}}),
+        ], _codex_turn, args.mb)
+
+        rows = []
+        dbs = {h: root / f"{h}.db" for h in ("before", "after")}
+        rows.append(("claude cold", n_claude,
+                     _timed(lambda: _before_claude(claude, dbs["before"], config["before"])),
+                     _timed(lambda: run_stop_hook(claude, harness="claude_code", session_id="bench",
+                                                  config_dir=config["after"], db_path=dbs["after"]))))
+        with claude.open("a") as fh:
+            fh.write("\n".join(_claude_turn(n_claude)) + "\n")
+        rows.append(("claude +1 turn", n_claude + 1,
+                     _timed(lambda: _before_claude(claude, dbs["before"], config["before"])),
+                     _timed(lambda: run_stop_hook(claude, harness="claude_code", session_id="bench",
+                                                  config_dir=config["after"], db_path=dbs["after"]))))
+        dbs = {h: root / f"{h}-codex.db" for h in ("before", "after")}
+        rows.append(("codex", n_codex,
+                     _timed(lambda: _before_codex(codex, dbs["before"], config["before"])),
+                     _timed(lambda: run_stop_hook(codex, harness="codex", session_id="bench",
+                                                  config_dir=config["after"], db_path=dbs["after"]))))
+
+    print(f"~{args.mb:.0f} MB transcripts (one fire each)")
+    print(f"{'fire':<16} {'turns':>7} {'before ms':>10} {'after ms':>10} {'speedup':>8}")
+    for name, turns, before, after in rows:
+        print(f"{name:<16} {turns:>7} {before:>10.1f} {after:>10.1f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""Benchmark: DB size and full-scan time, inline system prompts vs ``system_prompts``.
+
+Builds a synthetic training DB in the pre-migration layout:
+
+- ``--sessions`` sessions of ``--turns`` turns each, with about 2 KB of
+  content per turn.
+- A ``--codex-share`` fraction of the sessions are Codex sessions. Each Codex
+  turn row carries one of ``--prompts`` distinct ~``--prompt-kb`` KB
+  ``base_instructions`` inline, as capture did before the prompt table.
+- The rest are Claude sessions, which carry no prompt.
+
+It then measures the DB, runs the migration, vacuums, and measures again:
+
+- ``size``: the DB file after ``VACUUM``;
+- ``scan``: ``COUNT(*) WHERE user_content LIKE ...`` over every row. This
+  column is stored after ``system_prompt``, so an inline prompt's overflow
+  pages are walked to reach it;
+- ``read``: every row with its prompt rehydrated, as ``get_turns`` reads;
+- ``export``: ``core.training_export.export`` to plain JSONL.
+
+Usage::
+
+    python scripts/benchmarks/system_prompt_table.py --sessions 400 --turns 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+_REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from core.training_capture import (  # noqa: E402
+    _UPSERT_COLUMNS,
+    HARNESS_CLAUDE_CODE,
+    HARNESS_CODEX,
+    PROMPT_EXPR,
+    TURNS_FROM,
+    TrainingTurn,
+    init_db,
+)
+from core.training_export import export  # noqa: E402
+
+_MIGRATION = _REPO_ROOT / "scripts" / "migrations" / "2026-10-18-system-prompts-table.py"
+
+
+def _load_migration():
+    spec = importlib.util.spec_from_file_location("_mig_system_prompts", _MIGRATION)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _build(db: Path, sessions: int, turns: int, codex_share: float, prompts: int, prompt_kb: int) -> None:
+    init_db(db)
+    texts = [
+        f"You are Codex, release {v}. " + "Follow the repository conventions and run the tests. " * (prompt_kb * 20)
+        for v in range(prompts)
+    ]
+    columns = ", ".join(_UPSERT_COLUMNS)
+    placeholders = ", ".join("?" for _ in _UPSERT_COLUMNS)
+    conn = sqlite3.connect(str(db))
+    codex_every = max(int(round(1 / codex_share)), 1) if codex_share else 0
+    for s in range(sessions):
+        codex = bool(codex_every) and s % codex_every == 0
+        prompt = texts[(s // codex_every) % prompts] if codex else None
+        rows = []
+        for i in range(turns):
+            turn = TrainingTurn.from_blocks(
+                session_id=f"s{s}", turn_index=i,
+                harness=HARNESS_CODEX if codex else HARNESS_CLAUDE_CODE,
+                user_content=f"request {i}: " + "please look at this " * 10,
+                assistant_blocks=[
+                    {"type": "text", "text": "Checking. " * 20},
+                    {"type": "tool_use", "id": f"c{i}", "name": "exec_command", "input": {"cmd": f"rg thing{i}"}},
+                    {"type": "tool_result", "tool_call_id": f"c{i}", "content": "match\n" * 200},
+                ],
+                system_prompt=prompt,
+            )
+            values = list(turn._row_values())
+            values[7], values[8] = prompt, None  # legacy layout: inline, no hash
+            rows.append(values)
+        conn.executemany(f"INSERT INTO training_turns ({columns}) VALUES ({placeholders})", rows)
+        conn.commit()
+    conn.execute("VACUUM")
+    conn.close()
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def _measure(db: Path, out: Path, repeat: int) -> dict:
+    conn = sqlite3.connect(str(db))
+
+    def scan() -> None:
+        conn.execute("SELECT COUNT(*) FROM training_turns WHERE user_content LIKE '%needle%'").fetchone()
+
+    def read() -> None:
+        for _ in conn.execute(f"SELECT t.*, {PROMPT_EXPR} AS prompt_text FROM {TURNS_FROM}"):
+            pass
+
+    def dump() -> None:
+        for f in out.glob("*"):
+            f.unlink()
+        export(db, out, fmt="jsonl")
+
+    result = {
+        "size MB": db.stat().st_size / 1e6,
+        "scan ms": _best(scan, repeat),
+        "read ms": _best(read, repeat),
+        "export ms": _best(dump, repeat),
+    }
+    conn.close()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=400)
+    parser.add_argument("--turns", type=int, default=50, help="turns per session")
+    parser.add_argument("--codex-share", type=float, default=0.5, help="fraction of sessions that are Codex")
+    parser.add_argument("--prompts", type=int, default=4, help="distinct Codex prompts in the corpus")
+    parser.add_argument("--prompt-kb", type=int, default=14)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        db = root / "turns.db"
+        _build(db, args.sessions, args.turns, args.codex_share, args.prompts, args.prompt_kb)
+        before = _measure(db, root / "out", args.repeat)
+        start = time.perf_counter()
+        _load_migration().migrate(db, vacuum=True)
+        migrate_s = time.perf_counter() - start
+        after = _measure(db, root / "out", args.repeat)
+
+    print(f"{args.sessions * args.turns} turns, {args.prompts} distinct ~{args.prompt_kb} KB prompts "
+          f"(migration + vacuum {migrate_s:.1f} s; best of {args.repeat})")
+    print(f"{'':<10} {'inline':>10} {'table':>10} {'ratio':>7}")
+    for key in before:
+        print(f"{key:<10} {before[key]:>10.1f} {after[key]:>10.1f} {before[key] / after[key]:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Benchmark: time to first audio for Telegram voice replies, whole vs sentences.
+
+Drives the real ``bots.telegram_bot._stream_to_message`` with a simulated
+gateway (a reply streamed as word deltas at ``--tokens-per-s``) and a
+simulated voice server (``--tts-base-ms`` per request plus ``--tts-ms-per-char``,
+at most ``--tts-workers`` requests synthesising at once, like the server's
+TTS lane). For each reply length it reports, per voice mode:
+
+  - ``first audio``: prompt sent -> first voice note handed to Telegram;
+  - ``last audio``:  prompt sent -> last voice note handed to Telegram;
+  - ``notes``:       voice notes sent.
+
+``whole`` is the old behaviour (one note after the full reply);
+``sentences`` is the pipelined mode.
+
+Usage::
+
+    python scripts/benchmarks/telegram_voice_ttfa.py --sentences 2 8 32
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+_REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+import bots.telegram_bot as tb  # noqa: E402
+
+_SENTENCE = "This is a fairly ordinary sentence of about twelve words in a reply."
+
+
+async def _run(mode: str, sentences: int, args) -> tuple[float, float, int]:
+    started = time.perf_counter()
+    sent_at: list[float] = []
+    lane = asyncio.Semaphore(args.tts_workers)
+
+    async def query_stream(*_a, **_kw):
+        delay = 1.0 / args.tokens_per_s
+        for _ in range(sentences):
+            for word in _SENTENCE.split(" "):
+                await asyncio.sleep(delay)
+                yield word + " "
+
+    async def tts(text: str) -> bytes:
+        async with lane:
+            await asyncio.sleep((args.tts_base_ms + args.tts_ms_per_char * len(text)) / 1000)
+        return b"OggS"
+
+    async def send_voice(voice) -> None:
+        sent_at.append(time.perf_counter() - started)
+
+    chat = MagicMock()
+    chat.send_voice = send_voice
+    gateway = MagicMock()
+    gateway.query_stream = query_stream
+    with (
+        patch.object(tb, "gateway", gateway),
+        patch.object(tb, "_tts", tts),
+        patch.object(tb, "VOICE_MODE", mode),
+    ):
+        await tb._stream_to_message(AsyncMock(), 1, 1, "prompt", voice=True, chat=chat)
+        await asyncio.gather(*tb._voice_tasks)
+    return sent_at[0], sent_at[-1], len(sent_at)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sentences", type=int, nargs="+", default=[2, 8, 32])
+    parser.add_argument("--tokens-per-s", type=float, default=40.0)
+    parser.add_argument("--tts-base-ms", type=float, default=300.0)
+    parser.add_argument("--tts-ms-per-char", type=float, default=8.0)
+    parser.add_argument("--tts-workers", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'sentences':>9} {'mode':<10} {'first audio':>12} {'last audio':>11} {'notes':>6}")
+    for n in args.sentences:
+        for mode in ("whole", "sentences"):
+            first, last, notes = asyncio.run(_run(mode, n, args))
+            print(f"{n:>9} {mode:<10} {first:>11.2f}s {last:>10.2f}s {notes:>6}")
+
+
+if __name__ == "__main__":
+    main()
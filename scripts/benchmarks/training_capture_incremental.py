@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Benchmark: Stop-hook capture cost as a Claude transcript grows.
+
+Grows a synthetic Claude Code transcript to ``--turns`` turns (each a
+human message, an assistant reply with a tool call, and its result),
+firing a capture every ``--every`` turns the way the Stop hook does, and
+times each fire in two modes against separate DBs:
+
+  - ``full``: ``capture_session(..., incremental=False)`` — re-parse the
+    whole transcript and re-upsert every turn;
+  - ``incremental``: the checkpointed default — parse only the appended
+    bytes and upsert only the open and new turns.
+
+Full-mode cost climbs with transcript length (O(n^2) over a session);
+incremental stays flat.
+
+Usage::
+
+    python scripts/benchmarks/training_capture_incremental.py --turns 5000 --every 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+_REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from core.training_capture_claude import capture_session  # noqa: E402
+
+
+def _turn_lines(i: int) -> list[str]:
+    meta = {"version": "2.1.179", "isSidechain": False}
+    return [
+        json.dumps({**meta, "type": "user", "message": {
+            "role": "user", "content": f"request {i}: " + "please look at this " * 10,
+        }}),
+        json.dumps({**meta, "type": "assistant", "message": {
+            "role": "assistant", "model": "claude-opus-4-8", "content": [
+                {"type": "text", "text": "Checking. " * 20},
+                {"type": "tool_use", "id": f"t{i}", "name": "Bash",
+                 "input": {"command": f"grep -rn thing{i} ."}},
+            ],
+        }}),
+        json.dumps({**meta, "type": "user", "message": {
+            "role": "user", "content": [
+                {"type": "tool_result", "tool_use_id": f"t{i}", "content": "match\n" * 40},
+            ],
+        }}),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=5000)
+    parser.add_argument("--every", type=int, default=50, help="turns between fires")
+    parser.add_argument("--report", type=int, default=500, help="turns between report rows")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        transcript = root / "session.jsonl"
+        transcript.touch()
+        dbs = {"full": root / "full.db", "incremental": root / "inc.db"}
+        window: dict[str, list[float]] = {mode: [] for mode in dbs}
+
+        print(f"{'turns':>7} {'MB':>7} {'full ms/fire':>13} {'incr ms/fire':>13}")
+        for i in range(args.turns):
+            with transcript.open("a") as fh:
+                fh.write("\n".join(_turn_lines(i)) + "\n")
+            done = i + 1
+            if done % args.every:
+                continue
+            for mode, db in dbs.items():
+                start = time.perf_counter()
+                capture_session(
+                    transcript, session_id="bench", db_path=db,
+                    incremental=(mode == "incremental"),
+                )
+                window[mode].append((time.perf_counter() - start) * 1000)
+            if done % args.report == 0:
+                mb = transcript.stat().st_size / 1e6
+                full = sum(window["full"]) / len(window["full"])
+                inc = sum(window["incremental"]) / len(window["incremental"])
+                print(f"{done:>7} {mb:>7.1f} {full:>13.1f} {inc:>13.2f}")
+                window = {mode: [] for mode in dbs}
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""Benchmark: concurrent Claude + Codex capture hooks on one training DB.
+
+Starts ``--claude`` + ``--codex`` writer processes, one per simulated mind.
+Each grows its own transcript by one turn per fire and captures it with a
+full re-parse (``capture_session`` for its harness), the way several minds'
+Stop hooks hit ``training_turns.db`` at once. Two storage modes, each on a
+fresh DB:
+
+  - ``legacy``: the old write path — ``init_db`` (full SCHEMA script) plus
+    a second default-journal connection per call, every row rewritten;
+  - ``store``: ``TrainingStore`` — one WAL connection per process, schema
+    init once, one ``BEGIN IMMEDIATE`` batch, unchanged rows skipped.
+
+Reports fires/s, per-fire latency percentiles and "database is locked"
+failures.
+
+Usage::
+
+    python scripts/benchmarks/training_store_writers.py --claude 3 --codex 3 --fires 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing as mp
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+_REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from core import training_capture as tc  # noqa: E402
+from core import training_capture_claude, training_capture_codex  # noqa: E402
+
+
+def _legacy_upsert_turns(db_path, turns) -> None:
+    tc.init_db(db_path)
+    sql = tc._upsert_sql().split(" WHERE training_turns.content_hash")[0]
+    with tc.connect(db_path) as conn:
+        conn.executemany(sql, [t._row_values() for t in turns])
+
+
+def _claude_lines(i: int) -> list[dict]:
+    return [
+        {"type": "user", "version": "2.1.179",
+         "message": {"role": "user", "content": f"task {i} " + "context " * 30}},
+        {"type": "assistant", "version": "2.1.179", "message": {
+            "role": "assistant", "model": "claude-opus-4-8", "content": [
+                {"type": "text", "text": "Working on it. " * 15},
+                {"type": "tool_use", "id": f"t{i}", "name": "Read", "input": {"path": f"f{i}.py"}},
+            ]}},
+        {"type": "user", "version": "2.1.179", "message": {"role": "user", "content": [
+            {"type": "tool_result", "tool_use_id": f"t{i}", "content": "line\n" * 60},
+        ]}},
+    ]
+
+
+def _codex_lines(i: int) -> list[dict]:
+    lines = []
+    if i == 0:
+        lines.append({"type": "session_meta", "payload": {"cli_version": "0.51.0",
+                                                          "base_instructions": "sys"}})
+    lines += [
+        {"type": "turn_context", "payload": {"model": "gpt-5-codex"}},
+        {"type": "response_item", "payload": {"type": "message", "role": "user",
+         "content": [{"type": "input_text", "text": f"task {i} " + "context " * 30}]}},
+        {"type": "response_item", "payload": {"type": "function_call", "name": "shell",
+         "call_id": f"c{i}", "arguments": json.dumps({"command": ["ls"]})}},
+        {"type": "response_item", "payload": {"type": "function_call_output",
+         "call_id": f"c{i}", "output": "file\n" * 60}},
+        {"type": "response_item", "payload": {"type": "message", "role": "assistant",
+         "content": [{"type": "output_text", "text": "Done. " * 20}]}},
+    ]
+    return lines
+
+
+def _writer(args: tuple) -> dict:
+    harness, idx, mode, db_path, workdir, fires = args
+    if mode == "legacy":
+        training_capture_claude.upsert_turns = _legacy_upsert_turns
+        training_capture_codex.upsert_turns = _legacy_upsert_turns
+    transcript = Path(workdir) / f"{harness}-{idx}.jsonl"
+    make_lines = _claude_lines if harness == "claude" else _codex_lines
+    latencies: list[float] = []
+    locked = 0
+    for i in range(fires):
+        with transcript.open("a") as fh:
+            fh.write("".join(json.dumps(line) + "\n" for line in make_lines(i)))
+        start = time.perf_counter()
+        try:
+            if harness == "claude":
+                training_capture_claude.capture_session(
+                    transcript, session_id=f"claude-{idx}", db_path=db_path,
+                    incremental=False,
+                )
+            else:
+                training_capture_codex.capture_session(
+                    transcript, session_id=f"codex-{idx}", db_path=db_path,
+                )
+        except sqlite3.OperationalError as exc:
+            if "locked" not in str(exc):
+                raise
+            locked += 1
+        latencies.append((time.perf_counter() - start) * 1000)
+    return {"latencies": latencies, "locked": locked}
+
+
+def _run(mode: str, claude: int, codex: int, fires: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / f"{mode}.db"
+        jobs = [("claude", i, mode, str(db), tmp, fires) for i in range(claude)]
+        jobs += [("codex", i, mode, str(db), tmp, fires) for i in range(codex)]
+        start = time.perf_counter()
+        with mp.get_context("spawn").Pool(len(jobs)) as pool:
+            results = pool.map(_writer, jobs)
+        wall = time.perf_counter() - start
+    lat = sorted(x for r in results for x in r["latencies"])
+    last = len(lat) - 1
+    return {
+        "fires": len(lat),
+        "fires_per_s": len(lat) / wall,
+        "p50_ms": lat[last // 2],
+        "p95_ms": lat[int(last * 0.95)],
+        "max_ms": lat[-1],
+        "locked": sum(r["locked"] for r in results),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--claude", type=int, default=3)
+    parser.add_argument("--codex", type=int, default=3)
+    parser.add_argument("--fires", type=int, default=200, help="fires per writer")
+    args = parser.parse_args()
+
+    print(f"{'mode':<8} {'fires':>6} {'fires/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8} {'locked':>7}")
+    for mode in ("legacy", "store"):
+        r = _run(mode, args.claude, args.codex, args.fires)
+        print(
+            f"{mode:<8} {r['fires']:>6} {r['fires_per_s']:>8.1f} {r['p50_ms']:>8.1f} "
+            f"{r['p95_ms']:>8.1f} {r['max_ms']:>8.1f} {r['locked']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Benchmark: time-to-first-byte of /tts vs /tts/stream against a voice server.
+
+Posts replies of 1, 2, 4, 8 and 16 sentences to a running voice server
+(Chatterbox or Kokoro, typically on CPU) and reports, per length:
+
+  - ``/tts``: TTFB and total — the whole reply is synthesised and encoded
+    before the first byte leaves the server, so TTFB ~= total;
+  - ``/tts/stream``: TTFB (one sentence of synthesis + encoder start-up)
+    and total time to the last byte.
+
+Each cell is the median of ``--repeats`` runs.
+
+Usage::
+
+    python scripts/benchmarks/tts_stream_ttfb.py --url http://localhost:8422 --voice-id ada
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import aiohttp
+
+_SENTENCE = "The scheduler finished the morning briefing and everything looks on track."
+_LENGTHS = (1, 2, 4, 8, 16)
+
+
+async def _timed_post(session: aiohttp.ClientSession, url: str, payload: dict) -> tuple[float, float, int]:
+    """Return (ttfb_s, total_s, bytes) for one POST, reading the body as it streams."""
+    start = time.perf_counter()
+    ttfb = None
+    size = 0
+    async with session.post(url, json=payload) as resp:
+        resp.raise_for_status()
+        async for chunk in resp.content.iter_any():
+            if ttfb is None:
+                ttfb = time.perf_counter() - start
+            size += len(chunk)
+    total = time.perf_counter() - start
+    return (ttfb if ttfb is not None else total), total, size
+
+
+async def _run(args: argparse.Namespace) -> None:
+    timeout = aiohttp.ClientTimeout(total=args.timeout)
+    async with aiohttp.ClientSession(timeout=timeout) as session:
+        print(f"{'sentences':>9} {'tts ttfb':>9} {'tts total':>10} "
+              f"{'stream ttfb':>12} {'stream total':>13} {'ttfb gain':>10}")
+        for n in _LENGTHS:
+            text = " ".join([_SENTENCE] * n)
+            payload = {"text": text, "voice_id": args.voice_id, "speed": args.speed}
+            whole = [await _timed_post(session, f"{args.url}/tts", payload)
+                     for _ in range(args.repeats)]
+            stream = [await _timed_post(session, f"{args.url}/tts/stream",
+                                        {**payload, "format": args.format})
+                      for _ in range(args.repeats)]
+            w_ttfb = statistics.median(r[0] for r in whole)
+            w_total = statistics.median(r[1] for r in whole)
+            s_ttfb = statistics.median(r[0] for r in stream)
+            s_total = statistics.median(r[1] for r in stream)
+            print(f"{n:>9} {w_ttfb:>8.2f}s {w_total:>9.2f}s "
+                  f"{s_ttfb:>11.2f}s {s_total:>12.2f}s {w_ttfb / s_ttfb:>9.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8422")
+    parser.add_argument("--voice-id", default="default")
+    parser.add_argument("--speed", type=float, default=0.9)
+    parser.add_argument("--format", choices=("ogg", "wav"), default="ogg")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=600)
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
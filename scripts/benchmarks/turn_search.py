@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""Benchmark: query latency, ``turns_fts`` index vs a full scan of ``training_turns``.
+
+Builds a synthetic training DB of ``--turns`` rows (default 1M) over a few
+minds, harnesses and models. Each turn has a prompt, one to four tool calls
+drawn from a small tool set, and a closing text block. A few marker strings
+are planted at known rates:
+
+- ``KeyError`` in about 1 turn in 1,000;
+- ``Zanzibar`` in about 1 turn in 100,000.
+
+Each query is answered two ways:
+
+- ``scan``: the only way before the index. Every row is read,
+  ``assistant_blocks`` is ``json.loads``-ed, and its text blocks and tool
+  calls are searched in Python.
+- ``fts``: :func:`core.training_search.search`, first page of 20.
+
+The index is built with ``build_index`` after the rows are loaded. Its
+build time and size are reported.
+
+Usage::
+
+    python scripts/benchmarks/turn_search.py --turns 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+_REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from core.training_capture import _UPSERT_COLUMNS, TrainingTurn, init_db  # noqa: E402
+from core.training_search import build_index, search  # noqa: E402
+
+_WORDS = (
+    "fix the failing test in the parser module then update docs check config "
+    "refactor handler add retry logic for network errors and log the result"
+).split()
+_TOOLS = {
+    "codex": ("exec_command", "apply_patch", "read_file"),
+    "claude_code": ("Bash", "Read", "Edit", "Grep", "Write"),
+}
+_MINDS = ("ada", "nagatha", "bob", "skippy")
+_MODELS = {"codex": ("gpt-5", "gpt-5-codex"), "claude_code": ("claude-sonnet", "claude-opus")}
+
+# (label, search kwargs, scan predicate over (user, texts, tool names, tool inputs, row))
+_QUERIES = (
+    ("rare term", {"query": "Zanzibar"}, lambda u, t, n, i, r: "Zanzibar" in u or "Zanzibar" in t),
+    ("error string", {"query": "KeyError"}, lambda u, t, n, i, r: "KeyError" in t or "KeyError" in u),
+    ("tool name", {"tool": "apply_patch"}, lambda u, t, n, i, r: "apply_patch" in n),
+    ("tool + mind", {"tool": "Grep", "mind_id": "bob"}, lambda u, t, n, i, r: "Grep" in n and r[3] == "bob"),
+    ("input + harness", {"query": "tool_inputs: pytest", "harness": "codex"},
+     lambda u, t, n, i, r: "pytest" in i and r[4] == "codex"),
+)
+
+
+def _build(db: Path, turns: int, session_turns: int) -> None:
+    init_db(db)
+    rng = random.Random(11)
+    columns = ", ".join(_UPSERT_COLUMNS)
+    sql = f"INSERT INTO training_turns ({columns}) VALUES ({', '.join('?' for _ in _UPSERT_COLUMNS)})"
+    conn = sqlite3.connect(str(db))
+    rows = []
+    for n in range(turns):
+        session, index = divmod(n, session_turns)
+        harness = "codex" if session % 2 else "claude_code"
+        blocks = []
+        for c in range(rng.randint(1, 4)):
+            tool = rng.choice(_TOOLS[harness])
+            arg = rng.choice(("pytest -q tests/unit", "rg handler src/", "src/app/module.py", "git status"))
+            blocks.append({"type": "tool_use", "id": f"c{c}", "name": tool, "input": {"arg": arg}})
+            blocks.append({"type": "tool_result", "tool_call_id": f"c{c}", "content": "ok\n" * rng.randint(1, 20)})
+        text = " ".join(rng.choices(_WORDS, k=20))
+        if n % 1000 == 7:
+            text += " KeyError: 'mind_id' in the handler"
+        if n % 100_000 == 99:
+            text += " shipping to Zanzibar"
+        blocks.append({"type": "text", "text": text})
+        turn = TrainingTurn.from_blocks(
+            session_id=f"s{session}", turn_index=index, harness=harness,
+            mind_id=_MINDS[session % len(_MINDS)], source_model=_MODELS[harness][session % 2],
+            user_content=" ".join(rng.choices(_WORDS, k=12)), captured_at=1_700_000_000 + n,
+            assistant_blocks=blocks,
+        )
+        rows.append(turn._row_values())
+        if len(rows) == 50_000:
+            conn.executemany(sql, rows)
+            conn.commit()
+            rows = []
+    conn.executemany(sql, rows)
+    conn.commit()
+    conn.close()
+
+
+def _scan(db: Path, predicate) -> int:
+    conn = sqlite3.connect(str(db))
+    found = 0
+    for row in conn.execute(
+        "SELECT id, user_content, assistant_blocks, mind_id, harness FROM training_turns"
+    ):
+        texts, names, inputs = [], [], []
+        for block in json.loads(row[2]):
+            if block["type"] == "text":
+                texts.append(block["text"])
+            elif block["type"] == "tool_use":
+                names.append(block["name"])
+                inputs.append(json.dumps(block["input"]))
+        if predicate(row[1], "\n".join(texts), names, "\n".join(inputs), row):
+            found += 1
+    conn.close()
+    return found
+
+
+def _best(fn, repeat: int) -> tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=1_000_000)
+    parser.add_argument("--session-turns", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3, help="best of N for the index queries")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / "turns.db"
+        start = time.perf_counter()
+        _build(db, args.turns, args.session_turns)
+        build_s = time.perf_counter() - start
+        size_before = db.stat().st_size
+        start = time.perf_counter()
+        build_index(db)
+        index_s = time.perf_counter() - start
+        with sqlite3.connect(str(db)) as conn:
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        size_after = db.stat().st_size
+
+        print(f"{args.turns:,} turns built in {build_s:.0f} s; index built in {index_s:.0f} s "
+              f"({args.turns / index_s:,.0f} rows/s), DB {size_before / 1e6:.0f} MB -> {size_after / 1e6:.0f} MB")
+        print(f"{'query':<16} {'matches':>8} {'scan ms':>10} {'fts ms':>9} {'speedup':>9}")
+        for label, kwargs, predicate in _QUERIES:
+            scan_ms, matches = _best(lambda: _scan(db, predicate), 1)
+            fts_ms, page = _best(lambda: search(db, limit=20, **kwargs), args.repeat)
+            assert len(page.hits) == min(matches, 20), (label, matches, len(page.hits))
+            print(f"{label:<16} {matches:>8,} {scan_ms:>10.0f} {fts_ms:>9.1f} {scan_ms / fts_ms:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Benchmark: per-request audio conversion overhead in the voice server.
+
+Times the two conversions every voice request pays -- STT's OGG/Opus ->
+16 kHz WAV and TTS's WAV -> OGG/Opus with ``atempo=0.9`` -- on 5 s and 60 s
+clips, three ways:
+
+  - ``spawn``: the old path, one ``subprocess.run(ffmpeg)`` per request;
+  - ``pool``:  ``FFmpegPool``, pre-spawned ffmpeg processes (fallback path);
+  - ``pyav``:  the in-process codec in ``voice/audio_codec.py``.
+
+Rows whose backend is unavailable (no ffmpeg binary, no PyAV) are skipped.
+Reports the median and p95 milliseconds per request over ``--repeats`` runs.
+
+Usage::
+
+    python scripts/benchmarks/voice_codec_overhead.py --repeats 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+_REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from voice import audio_codec  # noqa: E402
+
+_RATE = 24000
+_TO_WAV = ["ffmpeg", "-i", "pipe:0", "-f", "wav", "-ar", "16000", "-ac", "1", "pipe:1"]
+_TO_OGG = ["ffmpeg", "-i", "pipe:0", "-af", "atempo=0.900",
+           "-c:a", "libopus", "-b:a", "64k", "-f", "ogg", "pipe:1"]
+
+
+def _clip(seconds: int) -> np.ndarray:
+    t = np.arange(seconds * _RATE) / _RATE
+    rng = np.random.default_rng(0)
+    return (0.2 * np.sin(2 * np.pi * 220 * t) + 0.02 * rng.standard_normal(t.size)).astype(np.float32)
+
+
+def _spawn(cmd: list[str], data: bytes) -> bytes:
+    result = subprocess.run(cmd, input=data, capture_output=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.decode())
+    return result.stdout
+
+
+def _time(fn, data: bytes, repeats: int) -> tuple[float, float]:
+    fn(data)  # warm-up (and, for the pool, the first refill)
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(data)
+        samples.append((time.perf_counter() - start) * 1000)
+        time.sleep(0.05)  # give the pool's refill thread time, as real traffic would
+    samples.sort()
+    return samples[len(samples) // 2], samples[int((len(samples) - 1) * 0.95)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    have_ffmpeg = shutil.which("ffmpeg") is not None
+    have_native = audio_codec.native_available()
+    if not (have_ffmpeg or have_native):
+        sys.exit("neither ffmpeg nor PyAV is available")
+    pool = audio_codec.FFmpegPool()
+
+    print(f"{'clip':>5} {'conversion':<12} {'backend':<6} {'p50 ms':>8} {'p95 ms':>8}")
+    try:
+        for seconds in (5, 60):
+            clip = _clip(seconds)
+            wav = audio_codec.encode_wav(clip, _RATE)
+            ogg = audio_codec.encode_ogg(clip, _RATE) if have_native else _spawn(_TO_OGG, wav)
+            cases = [
+                ("ogg->wav16k", ogg, _TO_WAV, audio_codec.ogg_to_wav),
+                ("wav->ogg", wav, _TO_OGG, lambda d: audio_codec.wav_to_ogg(d, speed=0.9)),
+            ]
+            for label, data, cmd, native in cases:
+                backends = []
+                if have_ffmpeg:
+                    backends += [("spawn", lambda d, c=cmd: _spawn(c, d)),
+                                 ("pool", lambda d, c=cmd: pool.run(c, d))]
+                if have_native:
+                    backends.append(("pyav", native))
+                for name, fn in backends:
+                    p50, p95 = _time(fn, data, args.repeats)
+                    print(f"{seconds:>4}s {label:<12} {name:<6} {p50:>8.1f} {p95:>8.1f}")
+    finally:
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -52,9 +52,11 @@ if str(_REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(_REPO_ROOT))
 
 from core.training_capture import (  # noqa: E402
+    _UPSERT_COLUMNS,
     SCHEMA,
     TrainingTurn,
     connect,
+    store_prompts,
 )
 
 _CURATION_COLUMNS = (
@@ -139,14 +141,11 @@ def _insert_turn(dest: sqlite3.Connection, old: dict, idx: int,
         old.get("judge_confidence"),
         old.get("exclusion_reason"),
     )
+    columns = _UPSERT_COLUMNS + _CURATION_COLUMNS
+    store_prompts(dest, [turn])
     dest.execute(
-        "INSERT INTO training_turns ("
-        "session_id, turn_index, mind_id, harness, source_model, "
-        "harness_version, captured_at, system_prompt, user_content, "
-        "assistant_blocks, has_reasoning, tool_call_count, "
-        "length_tokens, quality_flag, judge_verdict, "
-        "judge_confidence, exclusion_reason"
-        ") VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?) "
+        f"INSERT INTO training_turns ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' for _ in columns)}) "
         "ON CONFLICT(session_id, turn_index) DO NOTHING",
         values,
     )
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Migration: move inline ``system_prompt`` text into the ``system_prompts`` table.
+
+Codex capture used to copy the session's full ``base_instructions`` onto
+every turn row, so ``training_turns.system_prompt`` held the same
+multi-kilobyte text thousands of times. The store now keeps each distinct
+prompt once in ``system_prompts`` (keyed by the sha256 of its text) and
+turn rows reference it by ``system_prompt_hash``. New captures are written
+that way already; this migration converts the rows captured before.
+
+Rows are converted in streaming batches in ``id`` order (keyset
+pagination). Each batch is one ``BEGIN IMMEDIATE`` transaction, so Stop
+hooks keep writing between batches and an interrupted run resumes where
+it stopped. ``content_hash`` is unchanged: it covers the prompt text, not
+where the text is stored. Readers join the prompt back in, and until a row
+is converted they still read its inline text, so the migration can run
+while the store is in use.
+
+Freed pages stay in the file until ``--vacuum`` rewrites it (this needs
+free disk about the size of the DB and an exclusive lock while it runs).
+
+The migration is idempotent: once no row carries inline text, it no-ops.
+
+Usage::
+
+    python scripts/migrations/2026-10-18-system-prompts-table.py \
+        --db data/training_turns.db --batch-rows 2000 --vacuum
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+_REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from core.training_capture import init_db, prompt_hash  # noqa: E402
+
+DEFAULT_BATCH_ROWS = 2000
+
+
+def _default_db() -> Path:
+    """The runtime's training DB path, honoring ``TRAINING_DB_PATH``."""
+    override = os.environ.get("TRAINING_DB_PATH")
+    return Path(override) if override else _REPO_ROOT / "data" / "training_turns.db"
+
+
+def _migrate_batch(conn: sqlite3.Connection, after_id: int, batch_rows: int) -> tuple[int, int]:
+    """Convert up to ``batch_rows`` rows after ``after_id``; return (count, last id)."""
+    rows = conn.execute(
+        "SELECT id, system_prompt FROM training_turns "
+        "WHERE id > ? AND system_prompt IS NOT NULL ORDER BY id LIMIT ?",
+        (after_id, batch_rows),
+    ).fetchall()
+    if not rows:
+        return 0, after_id
+    hashes: dict[str, str] = {}
+    updates = []
+    for row_id, text in rows:
+        digest = hashes.get(text)
+        if digest is None:
+            digest = hashes[text] = prompt_hash(text)
+        updates.append((digest, row_id))
+    conn.executemany(
+        "INSERT OR IGNORE INTO system_prompts (hash, text) VALUES (?, ?)",
+        [(digest, text) for text, digest in hashes.items()],
+    )
+    conn.executemany(
+        "UPDATE training_turns SET system_prompt_hash = ?, system_prompt = NULL WHERE id = ?",
+        updates,
+    )
+    return len(rows), rows[-1][0]
+
+
+def migrate(
+    db_path: str | Path | None = None,
+    *,
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+    vacuum: bool = False,
+) -> int:
+    """Move inline prompts into ``system_prompts``. Returns rows converted."""
+    db = Path(db_path) if db_path is not None else _default_db()
+    if not db.exists():
+        print(f"no DB at {db}; nothing to migrate")
+        return 0
+    init_db(db)  # adds the table and the hash column
+
+    conn = sqlite3.connect(str(db), timeout=30.0, isolation_level=None)
+    try:
+        conn.execute("PRAGMA journal_mode = WAL")
+        moved, cursor = 0, 0
+        while True:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                count, cursor = _migrate_batch(conn, cursor, batch_rows)
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            if not count:
+                break
+            moved += count
+        prompts = conn.execute("SELECT COUNT(*) FROM system_prompts").fetchone()[0]
+        if vacuum and moved:
+            before = db.stat().st_size
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            conn.execute("VACUUM")
+            print(f"vacuumed {db}: {before / 1e6:.1f} MB -> {db.stat().st_size / 1e6:.1f} MB")
+    finally:
+        conn.close()
+
+    if moved:
+        print(f"moved the system prompt of {moved} turn rows into {prompts} distinct system_prompts rows")
+    else:
+        print("no inline system prompts left; already migrated, no-op")
+    return moved
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--db",
+        default=None,
+        help="training DB (default: the runtime DB / $TRAINING_DB_PATH)",
+    )
+    parser.add_argument("--batch-rows", type=int, default=DEFAULT_BATCH_ROWS)
+    parser.add_argument("--vacuum", action="store_true", help="reclaim the freed pages afterwards")
+    args = parser.parse_args()
+    migrate(args.db, batch_rows=args.batch_rows, vacuum=args.vacuum)
+
+
+if __name__ == "__main__":
+    main()
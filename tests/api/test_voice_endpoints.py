@@ -2,10 +2,10 @@
 
 Verifies:
 - /health returns chatterbox engine info when model is loaded
-- /health reports loading when model not ready
+- /health reports per-model state; models are not loaded until first use
 - /tts returns OGG audio when model is ready
 - /tts accepts voice_id parameter
-- /tts returns 503 when not ready
+- /tts loads the model on demand, and returns 503 when it fails to load
 - /tts uses chunked synthesis for multi-sentence text
 - /tts handles long (200+ word) text and returns audio/ogg
 - /stt endpoint unchanged
@@ -33,8 +33,10 @@ _NEED_PYDANTIC_MOCK = not _can_import("pydantic")
 
 
 @pytest.fixture(autouse=True)
-def _mock_voice_deps(monkeypatch):
+def _mock_voice_deps(monkeypatch, tmp_path):
     """Mock all heavy deps before importing voice_server."""
+    monkeypatch.setenv("TTS_CACHE_DIR", str(tmp_path / "tts_cache"))
+
     # Mock numpy
     np_mock = MagicMock()
     np_mock.float32 = "float32"
@@ -111,6 +113,14 @@ pytestmark = pytest.mark.skipif(
 )
 
 
+@pytest.fixture
+def voice_ref(tmp_path) -> str:
+    """A real clip on disk -- speaker conditioning is keyed on its stat."""
+    path = tmp_path / "voice_ref.wav"
+    path.write_bytes(b"RIFF")
+    return str(path)
+
+
 def test_health_returns_chatterbox_engine(client) -> None:
     """GET /health must return tts_engine=chatterbox when model is loaded."""
     import voice.voice_server as vs
@@ -124,8 +134,8 @@ def test_health_returns_chatterbox_engine(client) -> None:
     assert data["tts"] == "ready"
 
 
-def test_health_reports_loading_when_not_ready(client) -> None:
-    """GET /health must report tts=loading when model is None."""
+def test_health_reports_unloaded_until_first_use(client) -> None:
+    """GET /health must report models as unloaded until something needs them."""
     import voice.voice_server as vs
     vs._chatterbox_model = None
     vs._whisper = None
@@ -133,10 +143,14 @@ def test_health_reports_loading_when_not_ready(client) -> None:
     resp = client.get("/health")
     assert resp.status_code == 200
     data = resp.json()
-    assert data["tts"] == "loading"
+    assert data["tts"] == "unloaded"
+    assert data["stt"] == "unloaded"
+    models = data["models"]["models"]
+    assert models["chatterbox"]["state"] == "unloaded"
+    assert models["chatterbox"]["load_s"] is None
 
 
-def test_tts_endpoint_returns_ogg(client, monkeypatch) -> None:
+def test_tts_endpoint_returns_ogg(client, monkeypatch, voice_ref) -> None:
     """POST /tts must return audio/ogg response when model is ready."""
     import voice.voice_server as vs
 
@@ -159,14 +173,14 @@ def test_tts_endpoint_returns_ogg(client, monkeypatch) -> None:
     monkeypatch.setattr(vs, "_wav_to_ogg", lambda wav_bytes, speed=1.0: fake_ogg)
 
     # Mock _resolve_voice_ref to return a path
-    monkeypatch.setattr(vs, "_resolve_voice_ref", lambda vid, vdir=None: "/fake/ref.wav")
+    monkeypatch.setattr(vs, "_resolve_voice_ref", lambda vid, vdir=None: voice_ref)
 
     resp = client.post("/tts", json={"text": "Hello Daniel"})
     assert resp.status_code == 200
     assert resp.headers["content-type"] == "audio/ogg"
 
 
-def test_tts_endpoint_accepts_voice_id(client, monkeypatch) -> None:
+def test_tts_endpoint_accepts_voice_id(client, monkeypatch, voice_ref) -> None:
     """POST /tts with voice_id parameter must return 200."""
     import voice.voice_server as vs
 
@@ -184,19 +198,72 @@ def test_tts_endpoint_accepts_voice_id(client, monkeypatch) -> None:
 
     fake_ogg = b"OggS" + b"\x00" * 100
     monkeypatch.setattr(vs, "_wav_to_ogg", lambda wav_bytes, speed=1.0: fake_ogg)
-    monkeypatch.setattr(vs, "_resolve_voice_ref", lambda vid, vdir=None: "/fake/ada.wav")
+    monkeypatch.setattr(vs, "_resolve_voice_ref", lambda vid, vdir=None: voice_ref)
 
     resp = client.post("/tts", json={"text": "Hello", "voice_id": "ada"})
     assert resp.status_code == 200
 
 
-def test_tts_endpoint_503_when_not_ready(client) -> None:
-    """POST /tts must return 503 when Chatterbox model is not loaded."""
+def test_tts_endpoint_503_when_model_fails_to_load(client, monkeypatch, voice_ref) -> None:
+    """POST /tts must return 503 when the Chatterbox model cannot be loaded."""
     import voice.voice_server as vs
     vs._chatterbox_model = None
+    monkeypatch.setattr(vs, "_resolve_voice_ref", lambda vid, vdir=None: voice_ref)
+    sys.modules["chatterbox.tts"].ChatterboxTTS.from_pretrained.side_effect = OSError("no weights")
 
-    resp = client.post("/tts", json={"text": "Hello"})
+    resp = client.post("/tts", json={"text": "Hello", "voice_id": "ada"})
     assert resp.status_code == 503
+    models = client.get("/health").json()["models"]["models"]
+    assert models["chatterbox"]["state"] == "failed"
+    assert "no weights" in models["chatterbox"]["error"]
+
+
+def test_tts_loads_model_on_first_use(client, monkeypatch, voice_ref) -> None:
+    """The first /tts request loads Chatterbox; /health then reports it ready."""
+    import voice.voice_server as vs
+    vs._chatterbox_model = None
+    loaded = MagicMock()
+    loaded.generate.return_value = MagicMock()
+    sys.modules["chatterbox.tts"].ChatterboxTTS.from_pretrained.return_value = loaded
+    monkeypatch.setattr(vs, "_resolve_voice_ref", lambda vid, vdir=None: voice_ref)
+    monkeypatch.setattr(vs, "_wav_to_ogg", lambda wav_bytes, speed=1.0: b"OggS")
+
+    resp = client.post("/tts", json={"text": "Hello", "voice_id": "ada"})
+
+    assert resp.status_code == 200
+    assert vs._chatterbox_model is loaded
+    data = client.get("/health").json()
+    assert data["tts"] == "ready"
+    assert data["models"]["models"]["chatterbox"]["loads"] == 1
+    assert data["models"]["models"]["chatterbox"]["load_s"] is not None
+
+
+def test_stt_picks_whisper_size_by_request_class(client, monkeypatch) -> None:
+    """Short commands go to WHISPER_MODEL_SHORT, longer notes to WHISPER_MODEL."""
+    import voice.voice_server as vs
+
+    sizes = []
+
+    def load(size):
+        whisper = MagicMock()
+        whisper.transcribe.return_value = ([MagicMock(text=size)], None)
+        sizes.append(size)
+        return whisper
+
+    monkeypatch.setattr(vs, "_STT_CLASSES", {"command": "tiny", "note": "medium"})
+    vs._MODELS.register("whisper:tiny", lambda: load("tiny"))
+    vs._MODELS.register("whisper:medium", lambda: load("medium"))
+
+    monkeypatch.setattr(vs, "_decode_audio", lambda audio: [0.0] * 16000 * len(audio))
+
+    def post(data: bytes):
+        return client.post("/stt", files={"file": ("n.ogg", io.BytesIO(data), "audio/ogg")}).json()
+
+    command, note = post(b"x" * 3), post(b"y" * 40)
+
+    assert (command["class"], command["whisper_model"], command["text"]) == ("command", "tiny", "tiny")
+    assert (note["class"], note["whisper_model"], note["text"]) == ("note", "medium", "medium")
+    assert sizes == ["tiny", "medium"]
 
 
 def test_stt_endpoint_unchanged(client, monkeypatch) -> None:
@@ -210,8 +277,8 @@ def test_stt_endpoint_unchanged(client, monkeypatch) -> None:
     mock_whisper.transcribe.return_value = ([mock_segment], None)
     vs._whisper = mock_whisper
 
-    # Mock _ogg_to_wav
-    monkeypatch.setattr(vs, "_ogg_to_wav", lambda x: b"RIFF" + b"\x00" * 100)
+    # Mock the in-memory decode (1 s of 16 kHz samples)
+    monkeypatch.setattr(vs, "_decode_audio", lambda audio: [0.0] * 16000)
 
     # Create a fake audio file upload
     fake_audio = io.BytesIO(b"fake audio data")
@@ -222,7 +289,11 @@ def test_stt_endpoint_unchanged(client, monkeypatch) -> None:
     )
     assert resp.status_code == 200
     data = resp.json()
-    assert "text" in data
+    assert data["text"] == "Hello world"
+    assert set(data["timings_ms"]) == {"decode", "vad", "inference"}
+    assert data["cached"] is False
+    # Whisper reads the decoded samples directly -- no temp file path.
+    assert mock_whisper.transcribe.call_args.args[0] == [0.0] * 16000
 
 
 def test_stt_falls_back_to_cpu_on_cublas_error(client, monkeypatch) -> None:
@@ -253,7 +324,7 @@ def test_stt_falls_back_to_cpu_on_cublas_error(client, monkeypatch) -> None:
     fake_fw.WhisperModel.return_value = cpu_whisper
     monkeypatch.setitem(sys.modules, "faster_whisper", fake_fw)
 
-    monkeypatch.setattr(vs, "_ogg_to_wav", lambda x: b"RIFF" + b"\x00" * 100)
+    monkeypatch.setattr(vs, "_decode_audio", lambda audio: [0.0] * 16000)
 
     resp = client.post(
         "/stt",
@@ -276,7 +347,7 @@ def test_stt_reraises_non_gpu_runtime_error(client, monkeypatch) -> None:
     whisper.transcribe.side_effect = RuntimeError("corrupt audio frame")
     vs._whisper = whisper
 
-    monkeypatch.setattr(vs, "_ogg_to_wav", lambda x: b"RIFF" + b"\x00" * 100)
+    monkeypatch.setattr(vs, "_decode_audio", lambda audio: [0.0] * 16000)
 
     resp = client.post(
         "/stt",
@@ -287,7 +358,7 @@ def test_stt_reraises_non_gpu_runtime_error(client, monkeypatch) -> None:
     assert resp.status_code == 500
 
 
-def test_tts_endpoint_uses_chunked_synthesis(client, monkeypatch) -> None:
+def test_tts_endpoint_uses_chunked_synthesis(client, monkeypatch, voice_ref) -> None:
     """POST /tts with multi-sentence text calls _synthesize_chunked and returns 200."""
     import voice.voice_server as vs
 
@@ -313,7 +384,7 @@ def test_tts_endpoint_uses_chunked_synthesis(client, monkeypatch) -> None:
 
     fake_ogg = b"OggS" + b"\x00" * 100
     monkeypatch.setattr(vs, "_wav_to_ogg", lambda wav_bytes, speed=1.0: fake_ogg)
-    monkeypatch.setattr(vs, "_resolve_voice_ref", lambda vid, vdir=None: "/fake/ref.wav")
+    monkeypatch.setattr(vs, "_resolve_voice_ref", lambda vid, vdir=None: voice_ref)
 
     resp = client.post("/tts", json={"text": "First sentence. Second sentence."})
     assert resp.status_code == 200
@@ -322,7 +393,7 @@ def test_tts_endpoint_uses_chunked_synthesis(client, monkeypatch) -> None:
     assert chunked_called[0] == "First sentence. Second sentence."
 
 
-def test_tts_endpoint_long_text_returns_ogg(client, monkeypatch) -> None:
+def test_tts_endpoint_long_text_returns_ogg(client, monkeypatch, voice_ref) -> None:
     """POST /tts with 200+ word text returns 200 and audio/ogg through chunked path."""
     import voice.voice_server as vs
 
@@ -343,7 +414,7 @@ def test_tts_endpoint_long_text_returns_ogg(client, monkeypatch) -> None:
 
     fake_ogg = b"OggS" + b"\x00" * 100
     monkeypatch.setattr(vs, "_wav_to_ogg", lambda wav_bytes, speed=1.0: fake_ogg)
-    monkeypatch.setattr(vs, "_resolve_voice_ref", lambda vid, vdir=None: "/fake/ref.wav")
+    monkeypatch.setattr(vs, "_resolve_voice_ref", lambda vid, vdir=None: voice_ref)
 
     # Generate a 200+ word text with multiple sentences
     long_text = " ".join(
@@ -353,3 +424,91 @@ def test_tts_endpoint_long_text_returns_ogg(client, monkeypatch) -> None:
     resp = client.post("/tts", json={"text": long_text})
     assert resp.status_code == 200
     assert resp.headers["content-type"] == "audio/ogg"
+
+
+def test_tts_repeat_request_is_served_from_cache(client, monkeypatch, voice_ref) -> None:
+    """An identical second POST /tts returns the cached OGG without synthesising."""
+    import voice.voice_server as vs
+
+    mock_model = MagicMock()
+    mock_model.sr = 24000
+    vs._chatterbox_model = mock_model
+    renders = []
+
+    def fake_synthesize_chunked(text, ref_path=None):
+        renders.append(text)
+        return MagicMock()
+
+    monkeypatch.setattr(vs, "_synthesize_chunked", fake_synthesize_chunked)
+    sys.modules["torchaudio"].save = lambda buf, wav, sr, format=None: buf.write(b"RIFF")
+    monkeypatch.setattr(vs, "_wav_to_ogg", lambda wav_bytes, speed=1.0: b"OggS-cached")
+    monkeypatch.setattr(vs, "_resolve_voice_ref", lambda vid, vdir=None: voice_ref)
+
+    first = client.post("/tts", json={"text": "**Good** morning."})
+    second = client.post("/tts", json={"text": "Good morning."})  # same after _strip_markdown
+    other_speed = client.post("/tts", json={"text": "Good morning.", "speed": 1.0})
+
+    assert first.content == second.content == b"OggS-cached"
+    assert second.headers["content-type"] == "audio/ogg"
+    assert other_speed.status_code == 200
+    assert len(renders) == 2
+    cache = client.get("/health").json()["cache"]
+    assert cache["ogg_hits"] == 1 and cache["ogg_misses"] == 2
+
+
+def test_stt_repeat_audio_is_served_from_cache(client, monkeypatch) -> None:
+    """Re-sent identical voice-note bytes skip decode and inference."""
+    import voice.voice_server as vs
+
+    segment = MagicMock()
+    segment.text = "same note"
+    whisper = MagicMock()
+    whisper.transcribe.return_value = ([segment], None)
+    vs._whisper = whisper
+    decodes = []
+    monkeypatch.setattr(vs, "_decode_audio", lambda audio: decodes.append(audio) or [0.0] * 16000)
+
+    def post(data: bytes):
+        return client.post("/stt", files={"file": ("n.ogg", io.BytesIO(data), "audio/ogg")}).json()
+
+    first, again, other = post(b"note-1"), post(b"note-1"), post(b"note-2")
+
+    assert first["cached"] is False and again["cached"] is True
+    assert again["text"] == first["text"] == "same note"
+    assert other["cached"] is False
+    assert len(decodes) == 2 and whisper.transcribe.call_count == 2
+
+
+def test_stt_silence_skips_inference(client, monkeypatch) -> None:
+    """When VAD finds no speech, Whisper is not run (it hallucinates on silence)."""
+    import voice.voice_server as vs
+
+    whisper = MagicMock()
+    vs._whisper = whisper
+    monkeypatch.setattr(vs, "_decode_audio", lambda audio: [0.0] * 16000)
+    monkeypatch.setattr(vs, "_trim_silence", lambda samples: samples[:0])
+
+    data = client.post("/stt", files={"file": ("s.ogg", io.BytesIO(b"hush"), "audio/ogg")}).json()
+
+    assert data["text"] == "" and data["speech_s"] == 0 and data["audio_s"] == 1.0
+    whisper.transcribe.assert_not_called()
+
+
+def test_trim_silence_keeps_padded_speech_span(monkeypatch) -> None:
+    """Leading/trailing silence outside the VAD speech span (plus padding) is cut."""
+    import types
+
+    import voice.voice_server as vs
+
+    vad = types.ModuleType("faster_whisper.vad")
+    vad.VadOptions = lambda **kw: kw
+    vad.get_speech_timestamps = lambda samples, opts: [
+        {"start": 16000, "end": 20000}, {"start": 30000, "end": 40000},
+    ]
+    monkeypatch.setitem(sys.modules, "faster_whisper.vad", vad)
+
+    samples = list(range(64000))  # 4 s
+    trimmed = vs._trim_silence(samples)
+
+    pad = int(vs._VAD_PAD_S * 16000)
+    assert trimmed[0] == 16000 - pad and trimmed[-1] == 40000 + pad - 1
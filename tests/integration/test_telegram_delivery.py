@@ -0,0 +1,157 @@
+"""Integration tests for the scheduler's Telegram delivery subsystem.
+
+Runs `TelegramDelivery` against a local stub of the Bot API (aiohttp.web on
+an ephemeral port) so the pooled client, pacing, retry/backoff and the
+on-disk outbox are exercised over real HTTP.
+"""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+from aiohttp import web
+
+from bots import telegram_delivery
+from bots.telegram_delivery import TelegramDelivery
+
+
+class _StubTelegram:
+    """Records every call; ``script`` supplies (status, body) per request."""
+
+    def __init__(self, script=None) -> None:
+        self.calls: list[tuple[float, str, dict]] = []
+        self.script = list(script or [])
+        self.runner: web.AppRunner | None = None
+        self.base = ""
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"]
+        if request.content_type == "application/json":
+            payload = await request.json()
+        else:
+            form = await request.post()
+            payload = {"chat_id": form["chat_id"], "voice": form["voice"].file.read()}
+        self.calls.append((time.monotonic(), method, payload))
+        status, body = self.script.pop(0) if self.script else (200, {"ok": True})
+        return web.json_response(body, status=status)
+
+    async def __aenter__(self) -> "_StubTelegram":
+        app = web.Application()
+        app.router.add_post("/bot{token}/{method}", self._handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base = f"http://127.0.0.1:{port}"
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.runner.cleanup()
+
+
+@pytest.fixture(autouse=True)
+def _fast_pacing(monkeypatch):
+    monkeypatch.setattr(telegram_delivery, "PRIVATE_CHAT_INTERVAL_S", 0.0)
+    monkeypatch.setattr(telegram_delivery, "GROUP_CHAT_INTERVAL_S", 0.05)
+    monkeypatch.setattr(telegram_delivery, "GLOBAL_INTERVAL_S", 0.0)
+    monkeypatch.setattr(telegram_delivery, "MAX_BACKOFF_S", 0.01)
+
+
+async def _deliver(stub, spool, fn, **kw) -> TelegramDelivery:
+    delivery = TelegramDelivery("tok", spool, api_base=stub.base, **kw)
+    await delivery.start()
+    fn(delivery)
+    await delivery.drain()
+    return delivery
+
+
+async def test_long_report_arrives_in_paragraph_chunks_in_order(tmp_path):
+    paras = [f"Paragraph {i}. " + "x" * 1500 for i in range(6)]
+    async with _StubTelegram() as stub:
+        d = await _deliver(stub, tmp_path, lambda d: d.send_text(42, "\n\n".join(paras), job="ada/brief"))
+        await d.close()
+
+    texts = [p["text"] for _, _, p in stub.calls]
+    assert len(texts) == 3
+    assert all(t.startswith("Paragraph") for t in texts)
+    assert "\n\n".join(texts) == "\n\n".join(paras)
+    stats = d.stats("ada/brief")
+    assert stats["sent"] == 3 and stats["failed"] == 0
+    assert stats["bytes_sent"] == sum(len(t) for t in texts)
+    assert "latency_p50_ms" in stats and "messages_per_s" in stats
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_429_honours_retry_after_then_delivers(tmp_path):
+    script = [(429, {"ok": False, "parameters": {"retry_after": 0.2}})]
+    async with _StubTelegram(script) as stub:
+        d = await _deliver(stub, tmp_path, lambda d: d.send_text(42, "hi", job="j"))
+        await d.close()
+
+    assert len(stub.calls) == 2
+    assert stub.calls[1][0] - stub.calls[0][0] >= 0.2
+    assert d.stats("j")["retries"] == 1
+    assert d.stats("j")["sent"] == 1
+
+
+async def test_text_and_voice_keep_order_behind_a_retry(tmp_path):
+    script = [(502, {"ok": False})]
+    async with _StubTelegram(script) as stub:
+        def send(d):
+            d.send_text(42, "report", job="j")
+            d.send_voice(42, b"OGGDATA", job="j")
+        d = await _deliver(stub, tmp_path, send)
+        await d.close()
+
+    methods = [m for _, m, _ in stub.calls]
+    assert methods == ["sendMessage", "sendMessage", "sendVoice"]
+    assert stub.calls[-1][2]["voice"] == b"OGGDATA"
+    assert d.stats("j")["bytes_sent"] == len("report") + len(b"OGGDATA")
+
+
+async def test_client_error_is_dropped_not_retried(tmp_path):
+    script = [(400, {"ok": False, "description": "chat not found"})]
+    async with _StubTelegram(script) as stub:
+        d = await _deliver(stub, tmp_path, lambda d: d.send_text(42, "hi", job="j"))
+        await d.close()
+
+    assert len(stub.calls) == 1
+    assert d.stats("j")["failed"] == 1
+    assert list(tmp_path.glob("*.json")) == []
+
+
+async def test_group_chats_are_paced(tmp_path):
+    async with _StubTelegram() as stub:
+        d = await _deliver(stub, tmp_path, lambda d: [d.send_text(-100, f"m{i}") for i in range(3)])
+        await d.close()
+
+    # Slots are spaced at send time; arrival stamps carry request jitter, so
+    # check the span over all gaps rather than each gap on its own.
+    stamps = [t for t, _, _ in stub.calls]
+    assert len(stamps) == 3
+    assert stamps[-1] - stamps[0] >= 0.09
+
+
+async def test_outbox_survives_restart(tmp_path):
+    async with _StubTelegram([(503, {"ok": False})] * 50) as down:
+        first = TelegramDelivery("tok", tmp_path, api_base=down.base, max_attempts=100)
+        await first.start()
+        first.send_text(42, "survives", job="j")
+        first.send_voice(42, b"OGG", job="j")
+        while not down.calls:
+            await telegram_delivery.asyncio.sleep(0.01)
+        await first.close()
+
+    assert len(list(tmp_path.glob("*.json"))) == 2
+
+    async with _StubTelegram() as up:
+        second = TelegramDelivery("tok", tmp_path, api_base=up.base)
+        await second.start()
+        await second.drain()
+        await second.close()
+
+    assert [m for _, m, _ in up.calls] == ["sendMessage", "sendVoice"]
+    assert up.calls[0][2]["text"] == "survives"
+    assert list(tmp_path.iterdir()) == []
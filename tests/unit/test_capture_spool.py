@@ -0,0 +1,152 @@
+"""Tests for the capture spool and ingest worker (core/capture_spool.py).
+
+Verifies that:
+- repeated fires for one transcript collapse to one capture, and every
+  session in a drain lands in a single committed batch
+- skills are bumped once per capture, after the commit
+- a failed commit leaves the records in the spool for the next poll
+- a capture that raises keeps its latest record (attempts bumped) while the
+  rest of the batch is consumed, and dead-letters it after max_attempts
+- a full spool refuses new records and the hook captures inline instead
+- stats report spool depth, lag and backpressure
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import sqlite3
+
+from core import stop_hook
+from core.capture_spool import IngestWorker, SpoolRecord, enqueue, pending_count
+from core.training_capture import TrainingStore, get_turns
+
+
+def _transcript(path, *prompts: str):
+    lines = []
+    for i, prompt in enumerate(prompts):
+        lines.append(json.dumps({"type": "user", "message": {"role": "user", "content": prompt}}))
+        lines.append(json.dumps({"type": "assistant", "message": {"role": "assistant", "content": [
+            {"type": "tool_use", "id": f"t{i}", "name": "Skill", "input": {"skill": "weather"}},
+        ]}}))
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+def _record(path, session_id, config_dir=None) -> SpoolRecord:
+    return SpoolRecord(
+        transcript_path=str(path), session_id=session_id, harness="claude_code",
+        config_dir=str(config_dir) if config_dir else None,
+    )
+
+
+def test_drain_dedupes_fires_and_commits_one_batch(tmp_path, monkeypatch):
+    spool, db = tmp_path / "spool", tmp_path / "turns.db"
+    config_dir = tmp_path / ".claude"
+    (config_dir / "skills").mkdir(parents=True)
+    a = _transcript(tmp_path / "a.jsonl", "first")
+    b = _transcript(tmp_path / "b.jsonl", "other")
+    for _ in range(3):
+        assert enqueue(spool, _record(a, "sa", config_dir))
+    assert enqueue(spool, _record(b, "sb"))
+
+    commits = []
+    real_commit = TrainingStore._commit
+    monkeypatch.setattr(TrainingStore, "_commit", lambda self, fns: (commits.append(len(fns)), real_commit(self, fns)))
+
+    worker = IngestWorker(spool, db)
+    assert worker.drain_once() == 4
+    assert commits == [2]
+    assert pending_count(spool) == 0
+    assert [t["user_content"] for t in get_turns(db, "sa")] == ["first"]
+    assert [t["user_content"] for t in get_turns(db, "sb")] == ["other"]
+    usage = stop_hook._load_telemetry().load_usage(config_dir)
+    assert usage["weather"]["use_count"] == 1
+
+    stats = worker.stats()
+    assert stats["consumed"] == 4 and stats["deduped"] == 2 and stats["batches"] == 1
+    assert stats["pending"] == 0 and "lag_p95_s" in stats
+
+
+def test_failed_commit_leaves_records_for_retry(tmp_path, monkeypatch):
+    spool, db = tmp_path / "spool", tmp_path / "turns.db"
+    a = _transcript(tmp_path / "a.jsonl", "first")
+    enqueue(spool, _record(a, "sa"))
+
+    def locked(self, fns):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(TrainingStore, "_commit", locked)
+    worker = IngestWorker(spool, db)
+    assert worker.drain_once() == 0
+    assert pending_count(spool) == 1 and worker.stats()["commit_errors"] == 1
+
+    monkeypatch.undo()
+    assert worker.drain_once() == 1
+    assert len(get_turns(db, "sa")) == 1
+
+
+def test_failed_capture_survives_the_drain_then_dead_letters(tmp_path, monkeypatch):
+    spool, db = tmp_path / "spool", tmp_path / "turns.db"
+    a = _transcript(tmp_path / "a.jsonl", "first")
+    b = _transcript(tmp_path / "b.jsonl", "other")
+    enqueue(spool, _record(a, "sa"))
+    enqueue(spool, _record(a, "sa"))
+    enqueue(spool, _record(b, "sb"))
+
+    real_capture = stop_hook.capture_transcript
+
+    def flaky(path, **kwargs):
+        if path == str(a):
+            raise sqlite3.OperationalError("database is locked")
+        return real_capture(path, **kwargs)
+
+    monkeypatch.setattr(stop_hook, "capture_transcript", flaky)
+    worker = IngestWorker(spool, db, max_attempts=2)
+    assert worker.drain_once() == 2  # b, plus a's folded duplicate
+    (left,) = [p for p in spool.iterdir() if p.is_file()]
+    assert json.loads(left.read_text())["attempts"] == 1
+    assert len(get_turns(db, "sb")) == 1 and get_turns(db, "sa") == []
+    assert worker.stats()["retried"] == 1 and worker.stats()["pending"] == 1
+
+    assert worker.drain_once() == 0
+    assert pending_count(spool) == 0 and worker.stats()["dead_lettered"] == 1
+    (dead,) = (spool / "dead").iterdir()
+    assert json.loads(dead.read_text())["attempts"] == 2
+
+    enqueue(spool, _record(a, "sa"))
+    monkeypatch.undo()
+    assert worker.drain_once() == 1
+    assert len(get_turns(db, "sa")) == 1
+
+
+def test_full_spool_refuses_and_hook_captures_inline(tmp_path, monkeypatch):
+    spool, db = tmp_path / "spool", tmp_path / "turns.db"
+    a = _transcript(tmp_path / "a.jsonl", "first")
+    assert enqueue(spool, _record(a, "x"), max_pending=1)
+    assert not enqueue(spool, _record(a, "x"), max_pending=1)
+    assert IngestWorker(spool, db, max_pending=1).stats()["backpressure"] is True
+
+    b = _transcript(tmp_path / "b.jsonl", "inline")
+    payload = {"session_id": "sb", "transcript_path": str(b)}
+    monkeypatch.setattr("sys.stdin", io.StringIO(json.dumps(payload)))
+    monkeypatch.delenv("MIND_ID", raising=False)
+    argv = ["--harness", "claude_code", "--db", str(db), "--spool", str(spool), "--max-pending", "1"]
+    assert stop_hook.main(argv) == 0
+    assert [t["user_content"] for t in get_turns(db, "sb")] == ["inline"]
+    assert pending_count(spool) == 1
+
+
+def test_hook_enqueues_without_touching_the_db(tmp_path, monkeypatch):
+    spool, db = tmp_path / "spool", tmp_path / "turns.db"
+    a = _transcript(tmp_path / "a.jsonl", "queued")
+    payload = {"session_id": "sa", "transcript_path": str(a)}
+    monkeypatch.setattr("sys.stdin", io.StringIO(json.dumps(payload)))
+    monkeypatch.delenv("MIND_ID", raising=False)
+
+    assert stop_hook.main(["--harness", "claude_code", "--db", str(db), "--spool", str(spool)]) == 0
+    assert not db.exists()
+    (name,) = spool.iterdir()
+    record = json.loads(name.read_text())
+    assert record["session_id"] == "sa" and record["harness"] == "claude_code"
+    assert record["enqueued_at"] > 0
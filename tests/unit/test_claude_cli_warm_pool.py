@@ -0,0 +1,197 @@
+"""Tests for the warm process pool in the claude_cli template.
+
+The template reads a `runtime.yaml` next to itself at import time (and
+instantiates a FastAPI app), so the pool helpers are loaded by extracting
+their definitions from the source via ast — no module import, no side
+effects. Spawn and kill are injected, so fake processes stand in for the
+real `claude` CLI.
+"""
+
+from __future__ import annotations
+
+import ast
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+TEMPLATE_PATH = (
+    Path(__file__).resolve().parents[2]
+    / "mind_templates"
+    / "claude_cli.py"
+)
+
+_WANTED = {"_LatencyStats", "_spawn_key", "_poolable", "_WarmPool"}
+
+
+def _load_helpers() -> dict:
+    tree = ast.parse(TEMPLATE_PATH.read_text())
+    nodes = [
+        node for node in tree.body
+        if isinstance(node, (ast.FunctionDef, ast.ClassDef)) and node.name in _WANTED
+    ]
+    assert {n.name for n in nodes} == _WANTED, "warm pool helpers missing from template"
+    namespace: dict = {
+        "asyncio": asyncio,
+        "hashlib": hashlib,
+        "time": time,
+        "OrderedDict": OrderedDict,
+        "deque": deque,
+        "Any": Any,
+        "Awaitable": Awaitable,
+        "Callable": Callable,
+        "log": logging.getLogger("test.warm_pool"),
+    }
+    module = ast.Module(body=nodes, type_ignores=[])
+    exec(compile(module, str(TEMPLATE_PATH), "exec"), namespace)
+    return namespace
+
+
+_helpers = _load_helpers()
+_LatencyStats = _helpers["_LatencyStats"]
+_spawn_key = _helpers["_spawn_key"]
+_WarmPool = _helpers["_WarmPool"]
+_poolable = _helpers["_poolable"]
+
+
+class _FakeProc:
+    def __init__(self, pid: int) -> None:
+        self.pid = pid
+        self.returncode: int | None = None
+
+
+class _Harness:
+    def __init__(self) -> None:
+        self.spawned: list[_FakeProc] = []
+        self.killed: list[_FakeProc] = []
+
+    async def spawn(self, cmd: list[str], env: dict[str, str]) -> _FakeProc:
+        proc = _FakeProc(len(self.spawned) + 1)
+        self.spawned.append(proc)
+        return proc
+
+    async def kill(self, proc: _FakeProc) -> None:
+        self.killed.append(proc)
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_spawn_key_depends_on_argv_and_env() -> None:
+    base = _spawn_key(["claude", "--model", "m"], {"A": "1"})
+    assert base == _spawn_key(["claude", "--model", "m"], {"A": "1"})
+    assert base != _spawn_key(["claude", "--model", "other"], {"A": "1"})
+    assert base != _spawn_key(["claude", "--model", "m"], {"A": "1", "HIVEMIND_CLIENT_REF": "x"})
+
+
+async def test_refill_then_adopt_hands_out_prebooted_process() -> None:
+    h = _Harness()
+    pool = _WarmPool(1, 4, 900, spawn=h.spawn, kill=h.kill)
+
+    assert pool.adopt("k") is None
+    pool.schedule_refill("k", ["claude"], {})
+    await _settle()
+
+    proc = pool.adopt("k")
+    assert proc is h.spawned[0]
+    assert pool.stats()["hits"] == 1
+    assert pool.stats()["misses"] == 1
+
+
+async def test_dead_or_stale_processes_are_discarded() -> None:
+    h = _Harness()
+    pool = _WarmPool(1, 4, 900, spawn=h.spawn, kill=h.kill)
+    pool.schedule_refill("k", ["claude"], {})
+    await _settle()
+    h.spawned[0].returncode = 1
+
+    assert pool.adopt("k") is None
+    assert pool.stats()["discarded"] == 1
+
+    stale_pool = _WarmPool(1, 4, 0.0, spawn=h.spawn, kill=h.kill)
+    stale_pool.schedule_refill("k", ["claude"], {})
+    await _settle()
+    time.sleep(0.001)
+    assert stale_pool.adopt("k") is None
+    await _settle()
+    assert h.spawned[-1] in h.killed
+
+
+async def test_least_recent_key_is_drained_past_max_keys() -> None:
+    h = _Harness()
+    pool = _WarmPool(1, 1, 900, spawn=h.spawn, kill=h.kill)
+    pool.schedule_refill("old", ["claude", "a"], {})
+    await _settle()
+    pool.schedule_refill("new", ["claude", "b"], {})
+    await _settle()
+
+    assert h.spawned[0] in h.killed
+    assert pool.adopt("old") is None
+    assert pool.adopt("new") is h.spawned[1]
+
+
+async def test_disabled_pool_never_spawns() -> None:
+    h = _Harness()
+    pool = _WarmPool(0, 4, 900, spawn=h.spawn, kill=h.kill)
+    pool.schedule_refill("k", ["claude"], {})
+    await _settle()
+    assert pool.adopt("k") is None
+    assert h.spawned == []
+
+
+def test_only_spawns_without_session_prompt_or_refs_are_poolable() -> None:
+    assert _poolable(None, "", "")
+    assert not _poolable("soul + recent memory", "", "")
+    assert not _poolable(None, "discord:123", "")
+    assert not _poolable(None, "", "job-7")
+
+
+async def test_stats_report_hit_rate_over_eligible_spawns() -> None:
+    h = _Harness()
+    pool = _WarmPool(1, 4, 900, spawn=h.spawn, kill=h.kill)
+    assert pool.stats()["hit_rate"] is None
+
+    pool.adopt("k")
+    pool.schedule_refill("k", ["claude"], {})
+    await _settle()
+    pool.adopt("k")
+    pool.bypass()
+    stats = pool.stats()
+    assert (stats["hits"], stats["misses"], stats["bypassed"]) == (1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+    await pool.close()
+
+
+async def test_reaper_kills_idle_processes_and_forgets_their_shape() -> None:
+    h = _Harness()
+    pool = _WarmPool(2, 4, 900, spawn=h.spawn, kill=h.kill)
+    pool.schedule_refill("k", ["claude"], {})
+    await _settle()
+    assert pool.reap() == 0
+    assert pool.stats()["idle"] == 2
+
+    pool.max_idle_s = 0.0
+    time.sleep(0.001)
+    assert pool.reap() == 2
+    await _settle()
+    assert h.killed == h.spawned
+    stats = pool.stats()
+    assert (stats["idle"], stats["keys"], stats["reaped"]) == (0, 0, 2)
+    await pool.close()
+
+
+def test_latency_stats_summary_percentiles() -> None:
+    stats = _LatencyStats()
+    assert stats.summary() == {"count": 0}
+    for ms in range(1, 101):
+        stats.record(float(ms))
+    summary = stats.summary()
+    assert summary["count"] == 100
+    assert summary["p50_ms"] == 50.0
+    assert summary["p95_ms"] == 95.0
+    assert summary["max_ms"] == 100.0
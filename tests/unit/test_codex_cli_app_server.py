@@ -0,0 +1,246 @@
+"""Tests for the persistent app-server mode in the codex_cli template.
+
+Like test_codex_cli_template.py, the helpers are extracted from the
+template source via ast so the module's import-time side effects
+(runtime.yaml read, FastAPI app) never run. A scripted fake process plays
+the app-server side of the newline-delimited JSON-RPC protocol.
+"""
+
+from __future__ import annotations
+
+import ast
+import asyncio
+import json
+import logging
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+TEMPLATE_PATH = (
+    Path(__file__).resolve().parents[2]
+    / "mind_templates"
+    / "codex_cli.py"
+)
+
+_WANTED = {
+    "_turn_input",
+    "_snake_case",
+    "_normalise_app_server_event",
+    "_AppServerDied",
+    "_CodexAppServer",
+    "_relay_turn",
+    "_run_codex_turn",
+}
+
+
+async def _noop_reap(proc: Any) -> None:
+    proc.returncode = -9
+
+
+def _load_helpers() -> dict:
+    tree = ast.parse(TEMPLATE_PATH.read_text())
+    nodes = [
+        node for node in tree.body
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
+        and node.name in _WANTED
+    ]
+    assert {n.name for n in nodes} == _WANTED, "app-server helpers missing from template"
+    namespace: dict = {
+        "asyncio": asyncio,
+        "json": json,
+        "Any": Any,
+        "log": logging.getLogger("test.codex_app_server"),
+        "NAME": "test",
+        "PROJECT_DIR": Path("/tmp"),
+        "_reap_proc": _noop_reap,
+        "compose_empty_turn_diagnostic": lambda reasoning, item_type: "(no reply)",
+        "SESSIONS": {},
+    }
+    exec(compile(ast.Module(body=nodes, type_ignores=[]), str(TEMPLATE_PATH), "exec"), namespace)
+    return namespace
+
+
+_h = _load_helpers()
+_normalise = _h["_normalise_app_server_event"]
+_CodexAppServer = _h["_CodexAppServer"]
+_AppServerDied = _h["_AppServerDied"]
+_run_codex_turn = _h["_run_codex_turn"]
+
+
+class _FakeStdin:
+    def __init__(self, server: "_FakeAppServerProc") -> None:
+        self._server = server
+
+    def write(self, data: bytes) -> None:
+        for line in data.decode().splitlines():
+            if line.strip():
+                self._server.handle(json.loads(line))
+
+    async def drain(self) -> None:
+        return None
+
+
+class _FakeStream:
+    def __init__(self) -> None:
+        self.queue: asyncio.Queue = asyncio.Queue()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> bytes:
+        line = await self.queue.get()
+        if line is None:
+            raise StopAsyncIteration
+        return line
+
+
+class _FakeAppServerProc:
+    """Answers initialize/thread/turn requests and plays a canned turn."""
+
+    def __init__(
+        self, reply: str = "hello", die_mid_turn: bool = False, die_before_turn: bool = False,
+    ) -> None:
+        self.pid = 4242
+        self.returncode: int | None = None
+        self.stdin = _FakeStdin(self)
+        self.stdout = _FakeStream()
+        self.stderr = _FakeStream()
+        self.requests: list[dict] = []
+        self._reply = reply
+        self._die_mid_turn = die_mid_turn
+        self._die_before_turn = die_before_turn
+        self._turns = 0
+
+    def _emit(self, msg: dict) -> None:
+        self.stdout.queue.put_nowait(json.dumps(msg).encode() + b"\n")
+
+    def handle(self, msg: dict) -> None:
+        self.requests.append(msg)
+        method, rid = msg.get("method"), msg.get("id")
+        if rid is None:
+            return
+        if method == "initialize":
+            self._emit({"id": rid, "result": {}})
+        elif method == "thread/start":
+            self._emit({"id": rid, "result": {"thread": {"id": "thr-1"}}})
+        elif method == "thread/resume":
+            self._emit({"id": rid, "result": {"thread": {"id": msg["params"]["threadId"]}}})
+        elif method == "turn/start":
+            if self._die_before_turn:
+                self.returncode = 1
+                self.stdout.queue.put_nowait(None)
+                return
+            self._turns += 1
+            turn_id = f"turn-{self._turns}"
+            self._emit({"id": rid, "result": {"turn": {"id": turn_id}}})
+            if self._die_mid_turn:
+                self.returncode = 1
+                self.stdout.queue.put_nowait(None)
+                return
+            self._emit({"method": "item/completed", "params": {
+                "turnId": turn_id,
+                "item": {"type": "agentMessage", "id": "i1", "text": self._reply},
+            }})
+            self._emit({"method": "turn/completed", "params": {
+                "turn": {"id": turn_id, "status": "completed"},
+            }})
+
+
+def test_normalise_maps_camel_case_items_to_exec_shape() -> None:
+    event = _normalise({
+        "method": "item/completed",
+        "params": {"item": {"type": "agentMessage", "text": "hi"}},
+    })
+    assert event == {"type": "item.completed", "item": {"type": "agent_message", "text": "hi"}}
+
+    cmd = _normalise({"method": "item/completed", "params": {"item": {"type": "commandExecution"}}})
+    assert cmd["item"]["type"] == "command_execution"
+
+
+def test_normalise_joins_reasoning_summary_into_text() -> None:
+    event = _normalise({
+        "method": "item/completed",
+        "params": {"item": {"type": "reasoning", "summary": ["a"], "content": ["b"]}},
+    })
+    assert event["item"]["text"] == "a\nb"
+
+
+def test_normalise_splits_turn_outcome() -> None:
+    ok = _normalise({"method": "turn/completed", "params": {"turn": {"status": "completed"}}})
+    assert ok == {"type": "turn.completed"}
+    failed = _normalise({"method": "turn/completed", "params": {
+        "turn": {"status": "failed", "error": {"message": "boom"}},
+    }})
+    assert failed == {"type": "turn.failed", "error": {"message": "boom"}}
+    assert _normalise({"method": "item/agentMessage/delta", "params": {}}) is None
+
+
+async def test_run_turn_starts_thread_then_resumes_it() -> None:
+    proc = _FakeAppServerProc()
+    server = _CodexAppServer(proc, "sess-1")
+    await server.initialize()
+    state: dict = {"thread_id": None, "system_prompt": "SYSTEM", "model": "m"}
+
+    events = [e async for e in server.run_turn(state, "first")]
+    assert events[0] == {"type": "thread.started", "thread_id": "thr-1"}
+    assert events[-1] == {"type": "turn.completed"}
+    first_turn = next(r for r in proc.requests if r.get("method") == "turn/start")
+    assert first_turn["params"]["input"][0]["text"].startswith("SYSTEM")
+
+    state["thread_id"] = "thr-1"
+    events = [e async for e in server.run_turn(state, "second")]
+    assert events[0]["type"] == "item.completed"
+    turn_starts = [r for r in proc.requests if r.get("method") == "turn/start"]
+    assert turn_starts[-1]["params"]["input"][0]["text"] == "second"
+    # The thread is already loaded in this process, so no resume round trip.
+    assert not any(r.get("method") == "thread/resume" for r in proc.requests)
+    assert not server.turn_active
+    await server.close()
+
+
+async def test_run_turn_raises_when_process_dies_mid_turn() -> None:
+    proc = _FakeAppServerProc(die_mid_turn=True)
+    server = _CodexAppServer(proc, "sess-1")
+    await server.initialize()
+    state: dict = {"thread_id": "thr-9", "system_prompt": "", "model": "m"}
+
+    with pytest.raises(_AppServerDied):
+        async for _ in server.run_turn(state, "hello"):
+            pass
+    assert not server.alive
+    await server.close()
+
+
+async def test_thread_started_before_server_died_is_not_resumed_by_exec() -> None:
+    proc = _FakeAppServerProc(die_before_turn=True)
+    server = _CodexAppServer(proc, "sess-1")
+    await server.initialize()
+    state: dict = {
+        "thread_id": None, "system_prompt": "SYSTEM", "model": "m", "mode": "app_server",
+    }
+    exec_inputs: list[tuple[str | None, str]] = []
+
+    async def ensure_app_server(sid: str, st: dict) -> Any:
+        return server
+
+    async def exec_turn_events(sid: str, st: dict, content: str) -> Any:
+        exec_inputs.append((st.get("thread_id"), _h["_turn_input"](st, content)))
+        yield {"type": "thread.started", "thread_id": "thr-exec"}
+        yield {"type": "item.completed", "item": {"type": "agent_message", "text": "hi"}}
+        yield {"type": "turn.completed"}
+
+    _h["SESSIONS"]["sess-1"] = state
+    _h["_ensure_app_server"] = ensure_app_server
+    _h["_exec_turn_events"] = exec_turn_events
+    try:
+        frames = [f async for f in _run_codex_turn("sess-1", "hello", None)]
+    finally:
+        _h["SESSIONS"].clear()
+
+    # thr-1 was created but never took a turn: exec starts a new thread and
+    # sends the system prompt with it.
+    assert exec_inputs == [(None, "SYSTEM\n\n---\n\nhello")]
+    assert state["mode"] == "exec" and state["thread_id"] == "thr-exec"
+    assert frames[-1] == {"type": "result", "session_id": "thr-exec", "stop_reason": "end_turn",
+                          "is_error": False}
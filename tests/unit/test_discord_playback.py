@@ -0,0 +1,156 @@
+"""Tests for the Discord per-guild playback engine (bots/discord_playback.py).
+
+Verifies that:
+- ByteStream hands bytes across threads and signals EOF on close
+- replies play in the order they were queued; a new reply does not stop
+  the one that is playing
+- playback starts before the voice server has finished streaming
+- frames that arrive later than 20 ms after playback started count as
+  underruns; queue depth is tracked
+- a full queue drops the reply; stop() clears the queue
+"""
+
+import asyncio
+import threading
+import time
+
+import discord
+
+from bots.discord_playback import ByteStream, GuildPlayer
+
+
+class _RawSource(discord.AudioSource):
+    """Stands in for FFmpegPCMAudio: each read() returns the next stream chunk."""
+
+    def __init__(self, stream: ByteStream):
+        self.stream = stream
+
+    def read(self) -> bytes:
+        return self.stream.read(4)
+
+
+class _FakeVoiceClient:
+    """Plays a source on a thread like discord.py's AudioPlayer."""
+
+    def __init__(self):
+        self.played: list[bytes] = []
+        self.stopped = 0
+        self._playing = False
+        self._stop = threading.Event()
+
+    def is_connected(self) -> bool:
+        return True
+
+    def is_playing(self) -> bool:
+        return self._playing
+
+    def stop(self) -> None:
+        self.stopped += 1
+        self._stop.set()
+
+    def play(self, source, after) -> None:
+        if self._playing:
+            raise discord.ClientException("Already playing audio.")
+        self._playing = True
+        self._stop.clear()
+
+        def run():
+            data = b""
+            while not self._stop.is_set():
+                frame = source.read()
+                if not frame:
+                    break
+                data += frame
+            self.played.append(data)
+            self._playing = False
+            after(None)
+
+        threading.Thread(target=run, daemon=True).start()
+
+
+def _player(vc, fetch, **kwargs) -> GuildPlayer:
+    return GuildPlayer(1, fetch=fetch, voice_client=lambda: vc, source_factory=_RawSource, **kwargs)
+
+
+async def _drain(player: GuildPlayer, timeout: float = 5) -> None:
+    deadline = time.monotonic() + timeout
+    while player.stats.queue_depth and time.monotonic() < deadline:
+        await asyncio.sleep(0.01)
+
+
+def test_byte_stream_crosses_threads_and_closes() -> None:
+    stream = ByteStream()
+    got = []
+    reader = threading.Thread(target=lambda: got.extend(iter(lambda: stream.read(3), b"")))
+    reader.start()
+    stream.write(b"abcd")
+    stream.write(b"ef")
+    stream.close()
+    reader.join(timeout=2)
+    assert b"".join(got) == b"abcdef"
+
+
+async def test_replies_play_in_order_without_cutting_off() -> None:
+    vc = _FakeVoiceClient()
+
+    async def fetch(text):
+        for word in text.split():
+            await asyncio.sleep(0.01)
+            yield word.encode()
+
+    player = _player(vc, fetch)
+    player.enqueue("aaaa bbbb")
+    player.enqueue("cccc")
+    assert player.stats.queue_depth == 2
+    await _drain(player)
+
+    assert vc.played == [b"aaaabbbb", b"cccc"]
+    assert vc.stopped == 0
+    assert player.snapshot()["played"] == 2 and player.snapshot()["max_queue_depth"] == 2
+
+
+async def test_playback_starts_before_synthesis_finishes() -> None:
+    vc = _FakeVoiceClient()
+    release = asyncio.Event()
+    playing_before_end = []
+
+    async def fetch(text):
+        yield b"one!"
+        await asyncio.sleep(0.05)
+        playing_before_end.append(vc.is_playing())
+        await release.wait()
+        yield b"two!"
+
+    player = _player(vc, fetch)
+    player.enqueue("hi")
+    await asyncio.sleep(0.1)
+    release.set()
+    await _drain(player)
+
+    assert playing_before_end == [True]
+    assert vc.played == [b"one!two!"]
+    assert player.stats.underruns == 1  # the second frame waited on synthesis
+    assert player.stats.last_first_audio_ms is not None
+
+
+async def test_full_queue_drops_and_stop_clears() -> None:
+    vc = _FakeVoiceClient()
+    hold = asyncio.Event()
+
+    async def fetch(text):
+        await hold.wait()
+        yield text.encode()
+
+    player = _player(vc, fetch, max_queue=1)
+    assert player.enqueue("aaaa")
+    await asyncio.sleep(0.01)  # first reply is now playing (waiting on audio)
+    assert player.enqueue("bbbb")
+    assert not player.enqueue("cccc")
+    assert player.stats.dropped == 1
+
+    player.stop()
+    await _drain(player)
+    hold.set()
+
+    assert player.stats.queue_depth == 0
+    assert vc.played == [b""]  # the playing reply was cut, the queued one never played
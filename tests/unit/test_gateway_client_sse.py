@@ -0,0 +1,149 @@
+"""Unit tests for the incremental SSE decoder and GatewayClient's session cache."""
+
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from core.gateway_client import GatewayClient, SSEDecoder
+
+
+def _feed_all(decoder: SSEDecoder, chunks: list[bytes]) -> list:
+    events = []
+    for chunk in chunks:
+        events.extend(decoder.feed(chunk))
+    events.extend(decoder.flush())
+    return events
+
+
+class TestSSEDecoder:
+    def test_events_dispatch_on_blank_line(self):
+        events = _feed_all(SSEDecoder(), [b'data: {"a": 1}\n\ndata: {"b": 2}\n\n'])
+        assert [json.loads(e.data) for e in events] == [{"a": 1}, {"b": 2}]
+
+    def test_multibyte_char_split_across_chunks_survives(self):
+        payload = 'data: {"text": "café ☕"}\n\n'.encode()
+        cut = payload.index("☕".encode()) + 1  # split inside the 3-byte char
+        events = _feed_all(SSEDecoder(), [payload[:cut], payload[cut:]])
+        assert json.loads(events[0].data) == {"text": "café ☕"}
+
+    def test_line_spanning_many_chunks_is_reassembled(self):
+        body = "x" * 10_000
+        raw = f"data: {body}\n\n".encode()
+        chunks = [raw[i:i + 7] for i in range(0, len(raw), 7)]
+        events = _feed_all(SSEDecoder(), chunks)
+        assert len(events) == 1
+        assert events[0].data == body
+
+    def test_tracks_ids_event_names_and_multiline_data(self):
+        decoder = SSEDecoder()
+        events = _feed_all(decoder, [
+            b": keepalive\r\n",
+            b"id: 7\r\nevent: queued\r\ndata: one\r\ndata: two\r\n\r\n",
+            b"data: three\n\n",
+        ])
+        assert (events[0].id, events[0].event, events[0].data) == ("7", "queued", "one\ntwo")
+        # id persists until changed, per the spec
+        assert (events[1].id, events[1].event) == ("7", "message")
+        assert decoder.last_event_id == "7"
+
+    def test_flush_dispatches_unterminated_tail(self):
+        events = _feed_all(SSEDecoder(), [b'data: {"type": "result"}'])
+        assert json.loads(events[0].data) == {"type": "result"}
+
+
+class _Resp:
+    def __init__(self, status: int, chunks: list[bytes] = (), payload=None):
+        self.status = status
+        self.json = AsyncMock(return_value=payload)
+        self.text = AsyncMock(return_value="")
+        self.content = MagicMock()
+
+        async def _iter():
+            for chunk in chunks:
+                yield chunk
+
+        self.content.iter_any = _iter
+
+
+class _Ctx:
+    def __init__(self, resp):
+        self._resp = resp
+
+    async def __aenter__(self):
+        return self._resp
+
+    async def __aexit__(self, *_):
+        return False
+
+
+@pytest.fixture()
+def gateway(monkeypatch):
+    monkeypatch.delenv("COMMS_BEARER_TOKEN", raising=False)
+    return GatewayClient(MagicMock(), "http://gw", "telegram:ada", mind_id="ada")
+
+
+_ASSISTANT = (
+    b'data: {"type": "assistant", "message": {"content": '
+    b'[{"type": "text", "text": "hi"}]}}\n\n'
+)
+_RESULT = b'data: {"type": "result", "result": "hi"}\n\n'
+
+
+class TestSessionCache:
+    @pytest.mark.asyncio
+    async def test_second_message_skips_session_lookup(self, gateway):
+        gateway.http.get = MagicMock(
+            return_value=_Ctx(_Resp(200, payload=[{"id": "s1", "is_active": True}]))
+        )
+        gateway.http.post = MagicMock(side_effect=lambda *a, **k: _Ctx(_Resp(200, [_ASSISTANT])))
+
+        assert [t async for t in gateway.query_stream(1, 42, "a")] == ["hi"]
+        assert [t async for t in gateway.query_stream(1, 42, "b")] == ["hi"]
+        assert gateway.http.get.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_404_invalidates_cache_and_retries_once(self, gateway):
+        gateway._cache_session(42, "stale")
+        gateway.http.get = MagicMock(
+            return_value=_Ctx(_Resp(200, payload=[{"id": "fresh", "is_active": True}]))
+        )
+        responses = iter([_Resp(404, payload={"error": "gone"}), _Resp(200, [_ASSISTANT])])
+        gateway.http.post = MagicMock(side_effect=lambda *a, **k: _Ctx(next(responses)))
+
+        assert [t async for t in gateway.query_stream(1, 42, "a")] == ["hi"]
+        urls = [c.args[0] for c in gateway.http.post.call_args_list]
+        assert urls == ["http://gw/sessions/stale/message", "http://gw/sessions/fresh/message"]
+
+    @pytest.mark.asyncio
+    async def test_finished_turn_drops_cache_so_a_rotation_is_seen(self, gateway):
+        # rotation_check runs from the Stop hook after the turn: it /clears
+        # the client's session while the old one is still alive.
+        sessions = iter([
+            [{"id": "s1", "is_active": True}],
+            [{"id": "s1", "is_active": False}, {"id": "s2", "is_active": True}],
+        ])
+        gateway.http.get = MagicMock(
+            side_effect=lambda *a, **k: _Ctx(_Resp(200, payload=next(sessions)))
+        )
+        gateway.http.post = MagicMock(
+            side_effect=lambda *a, **k: _Ctx(_Resp(200, [_ASSISTANT, _RESULT]))
+        )
+
+        assert [t async for t in gateway.query_stream(1, 42, "a")] == ["hi"]
+        assert gateway._cached_session(42) is None
+        assert [t async for t in gateway.query_stream(1, 42, "b")] == ["hi"]
+        urls = [c.args[0] for c in gateway.http.post.call_args_list]
+        assert urls == ["http://gw/sessions/s1/message", "http://gw/sessions/s2/message"]
+
+    @pytest.mark.asyncio
+    async def test_server_command_drops_cached_session(self, gateway):
+        gateway._cache_session(42, "old")
+        gateway.http.post = MagicMock(return_value=_Ctx(_Resp(200, payload={"ok": True})))
+        await gateway.server_command(1, 42, "/new")
+        assert gateway._cached_session(42) is None
+
+    def test_cache_entry_expires_after_ttl(self, gateway):
+        gateway.session_ttl = 0
+        gateway._cache_session(42, "s1")
+        assert gateway._cached_session(42) is None
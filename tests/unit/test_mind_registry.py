@@ -0,0 +1,88 @@
+"""Tests for the shared mind registry (core/mind_registry.py).
+
+Verifies that:
+- minds are indexed by UUID, short name and voice_id from runtime.yaml
+- only top-level scalars are read; nested keys don't leak in
+- an unchanged tree costs no re-reads; an edited runtime.yaml is re-read
+- a lookup miss refreshes at most once per miss_refresh_s, so unknown
+  voice_ids don't rescan minds/ per request, while a new mind is still found
+"""
+
+import os
+from pathlib import Path
+
+from core.mind_registry import MindRegistry, parse_runtime_scalars
+
+ADA = "565e5a66-d20c-4266-872a-3268c4c894fc"
+BOB = "11111111-2222-3333-4444-555555555555"
+
+
+def _mind(root: Path, name: str, body: str) -> Path:
+    path = root / name / "runtime.yaml"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(body)
+    return path
+
+
+def test_parse_runtime_scalars_skips_nested_keys() -> None:
+    text = (
+        "name: ada\n"
+        'mind_id: "abc"  # canonical\n'
+        "env:\n"
+        "  mind_id: nested\n"
+        "prompt_files:\n"
+        "  - prompts/common.md\n"
+        "# voice_id: commented\n"
+    )
+    assert parse_runtime_scalars(text) == {"name": "ada", "mind_id": "abc"}
+
+
+def test_lookups_by_id_name_and_voice(tmp_path: Path) -> None:
+    _mind(tmp_path, "ada", f"name: ada\nmind_id: {ADA}\nharness: claude_cli\n")
+    _mind(tmp_path, "bob", f"name: bob\nmind_id: {BOB}\nvoice_id: robert\n")
+    _mind(tmp_path, "nomind", "name: nomind\n")
+    (tmp_path / "empty").mkdir()
+    reg = MindRegistry(tmp_path)
+
+    assert reg.by_id(ADA).name == "ada"
+    assert reg.by_name("bob").mind_id == BOB
+    assert reg.by_voice("robert").name == "bob"
+    assert reg.by_voice(ADA).name == "ada"
+    assert reg.by_voice("nomind").mind_id is None
+    assert reg.canonical_id("ada") == ADA and reg.canonical_id(BOB) == BOB
+    assert reg.by_id(ADA).harness == "claude_cli"
+    assert [m.name for m in reg.minds()] == ["ada", "bob", "nomind"]
+
+
+def test_refresh_rereads_only_changed_files(tmp_path: Path) -> None:
+    ada = _mind(tmp_path, "ada", f"mind_id: {ADA}\n")
+    _mind(tmp_path, "bob", f"mind_id: {BOB}\n")
+    reg = MindRegistry(tmp_path)
+    assert reg.refresh() and reg.reads == 2
+    assert not reg.refresh() and reg.reads == 2
+
+    st = ada.stat()
+    ada.write_text("mind_id: 22222222-0000-0000-0000-000000000000\n")
+    os.utime(ada, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert reg.refresh() and reg.reads == 3
+    assert reg.by_id(ADA) is None
+    assert reg.by_name("ada").mind_id.startswith("22222222")
+
+    (tmp_path / "bob" / "runtime.yaml").unlink()
+    assert reg.refresh() and reg.by_name("bob") is None
+
+
+def test_misses_refresh_at_most_once_per_window(tmp_path: Path) -> None:
+    now = [0.0]
+    _mind(tmp_path, "ada", f"mind_id: {ADA}\n")
+    reg = MindRegistry(tmp_path, miss_refresh_s=5, clock=lambda: now[0])
+    reg.refresh()
+    _mind(tmp_path, "bob", f"mind_id: {BOB}\n")
+
+    assert reg.by_voice("nobody") is None
+    assert reg.by_id(BOB) is None  # still inside the window: no rescan
+    assert reg.reads == 1
+    now[0] += 6
+    assert reg.by_id(BOB).name == "bob"
+    assert reg.reads == 2
+
@@ -55,3 +55,21 @@ def test_logger_is_genericised_to_placeholder() -> None:
         assert 'logging.getLogger("hive-mind.minds.MIND_NAME")' in source, (
             f"{name} logger not genericised to MIND_NAME placeholder"
         )
+
+
+def test_turn_queue_is_identical_in_both_templates() -> None:
+    # Templates are self-contained, so the turn queue is carried by both;
+    # a fix made to one copy must be made to the other.
+    shared = ("_sse", "_QueuedTurn", "_TurnQueue")
+    copies = {}
+    for name in EXPECTED:
+        source = (TEMPLATES_DIR / name).read_text()
+        copies[name] = {
+            node.name: ast.get_source_segment(source, node)
+            for node in ast.parse(source).body
+            if isinstance(node, (ast.FunctionDef, ast.ClassDef)) and node.name in shared
+        }
+    claude, codex = copies["claude_cli.py"], copies["codex_cli.py"]
+    assert set(claude) == set(codex) == set(shared)
+    for name in shared:
+        assert claude[name] == codex[name], f"{name} differs between the templates"
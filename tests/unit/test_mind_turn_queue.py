@@ -0,0 +1,203 @@
+"""Tests for the per-session turn queue shared by both mind templates.
+
+Both `claude_cli` and `codex_cli` carry their own copy of `_TurnQueue`
+(templates are self-contained single files), so every test runs against
+both copies. The classes are extracted via ast to avoid the templates'
+import-time side effects.
+"""
+
+from __future__ import annotations
+
+import ast
+import asyncio
+import json
+import logging
+import signal
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+import pytest
+
+TEMPLATES_DIR = Path(__file__).resolve().parents[2] / "mind_templates"
+_WANTED = {"_sse", "_QueuedTurn", "_TurnQueue"}
+
+
+def _load(template: str) -> Any:
+    path = TEMPLATES_DIR / template
+    tree = ast.parse(path.read_text())
+    nodes = [
+        node for node in tree.body
+        if isinstance(node, (ast.FunctionDef, ast.ClassDef)) and node.name in _WANTED
+    ]
+    assert {n.name for n in nodes} == _WANTED, f"turn queue missing from {template}"
+    namespace: dict = {
+        "asyncio": asyncio,
+        "json": json,
+        "time": time,
+        "deque": deque,
+        "Any": Any,
+        "Awaitable": Awaitable,
+        "Callable": Callable,
+        "log": logging.getLogger("test.turn_queue"),
+        "NAME": "test",
+    }
+    exec(compile(ast.Module(body=nodes, type_ignores=[]), str(path), "exec"), namespace)
+    return namespace["_TurnQueue"]
+
+
+@pytest.fixture(params=["claude_cli.py", "codex_cli.py"])
+def TurnQueue(request):
+    return _load(request.param)
+
+
+class _Turns:
+    """Fake turn runner: each turn blocks until released, then echoes."""
+
+    def __init__(self) -> None:
+        self.contents: list[str] = []
+        self.release = asyncio.Event()
+        self.abandoned = 0
+
+    async def run(self, content: str, images: list[dict] | None):
+        self.contents.append(content)
+        await self.release.wait()
+        yield f"data: {json.dumps({'type': 'assistant', 'text': content})}\n\n"
+        yield f"data: {json.dumps({'type': 'result'})}\n\n"
+
+    async def abandon(self) -> None:
+        self.abandoned += 1
+
+
+async def _collect(stream) -> list[dict]:
+    return [json.loads(chunk.removeprefix("data: ")) async for chunk in stream]
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def test_second_message_waits_with_position_then_runs(TurnQueue) -> None:
+    turns = _Turns()
+    q = TurnQueue(turns.run, turns.abandon, 4, 60, False)
+    first = q.submit("one")
+    await _settle()
+    second = q.submit("two")
+
+    a = asyncio.create_task(_collect(q.stream(first)))
+    b = asyncio.create_task(_collect(q.stream(second)))
+    await _settle()
+    turns.release.set()
+    first_events, second_events = await asyncio.gather(a, b)
+
+    assert [e["type"] for e in first_events] == ["assistant", "result"]
+    assert second_events[0] == {"type": "queued", "position": 1}
+    assert second_events[-2:] == [
+        {"type": "assistant", "text": "two"},
+        {"type": "result"},
+    ]
+    assert turns.contents == ["one", "two"]
+
+
+async def test_full_queue_is_refused(TurnQueue) -> None:
+    turns = _Turns()
+    q = TurnQueue(turns.run, turns.abandon, 1, 60, False)
+    assert q.submit("running") is not None
+    await _settle()
+    assert q.submit("waits") is not None
+    assert q.submit("refused") is None
+    turns.release.set()
+
+
+async def test_waiting_turn_expires_at_its_deadline(TurnQueue) -> None:
+    turns = _Turns()
+    q = TurnQueue(turns.run, turns.abandon, 4, 0.05, False)
+    q.submit("blocks")
+    await _settle()
+    late = q.submit("late")
+
+    events = await _collect(q.stream(late))
+    assert events[-1]["is_error"] is True
+    assert "expired" in events[-1]["error"]
+    assert len(q) == 0
+    turns.release.set()
+
+
+async def test_coalesced_followups_share_one_turn(TurnQueue) -> None:
+    turns = _Turns()
+    q = TurnQueue(turns.run, turns.abandon, 4, 60, True)
+    q.submit("head")
+    await _settle()
+    b = q.submit("b")
+    c = q.submit("c")
+    tb = asyncio.create_task(_collect(q.stream(b)))
+    tc = asyncio.create_task(_collect(q.stream(c)))
+    await _settle()
+    turns.release.set()
+    b_events, c_events = await asyncio.gather(tb, tc)
+
+    assert turns.contents == ["head", "b\n\nc"]
+    assert b_events[-2] == c_events[-2] == {"type": "assistant", "text": "b\n\nc"}
+
+
+async def test_abandon_fires_when_last_listener_leaves(TurnQueue) -> None:
+    turns = _Turns()
+    q = TurnQueue(turns.run, turns.abandon, 4, 60, False)
+    item = q.submit("one")
+    stream = q.stream(item)
+    task = asyncio.create_task(stream.__anext__())
+    await _settle()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    await stream.aclose()
+    assert turns.abandoned == 1
+    turns.release.set()
+
+
+async def test_cancel_waiting_ends_queued_turns_but_not_the_running_one(TurnQueue) -> None:
+    turns = _Turns()
+    q = TurnQueue(turns.run, turns.abandon, 4, 60, False)
+    running = q.submit("running")
+    await _settle()
+    queued = [q.submit("a"), q.submit("b")]
+
+    assert q.cancel_waiting("Interrupted before it started") == 2
+    assert len(q) == 0
+    for item in queued:
+        events = await _collect(q.stream(item))
+        assert events[-1] == {"type": "result", "is_error": True, "error": "Interrupted before it started"}
+    turns.release.set()
+    assert [e["type"] for e in await _collect(q.stream(running))] == ["assistant", "result"]
+    assert turns.contents == ["running"]
+
+
+class _SignalledProc:
+    def __init__(self) -> None:
+        self.pid = 7
+        self.returncode: int | None = None
+        self.signals: list[int] = []
+
+    def send_signal(self, sig: int) -> None:
+        self.signals.append(sig)
+
+
+async def test_claude_abandon_interrupts_the_cli() -> None:
+    path = TEMPLATES_DIR / "claude_cli.py"
+    wanted = {"_interrupt_proc", "_abandon_claude_turn"}
+    nodes = [
+        node for node in ast.parse(path.read_text()).body
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name in wanted
+    ]
+    namespace: dict = {"asyncio": asyncio, "signal": signal, "log": logging.getLogger("test"), "NAME": "test"}
+    exec(compile(ast.Module(body=nodes, type_ignores=[]), str(path), "exec"), namespace)
+
+    proc = _SignalledProc()
+    await namespace["_abandon_claude_turn"]({"proc": proc})
+    assert proc.signals == [signal.SIGINT]
+
+    proc.returncode = 0
+    await namespace["_abandon_claude_turn"]({"proc": proc})
+    assert proc.signals == [signal.SIGINT]
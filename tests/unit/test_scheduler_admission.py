@@ -0,0 +1,131 @@
+"""Tests for the scheduler's admission controller and cron spreading."""
+
+import asyncio
+
+from bots.scheduler_admission import (
+    PRIORITY_COMMAND,
+    PRIORITY_NOTIFY,
+    PRIORITY_VOICE,
+    AdmissionController,
+    collide,
+    cron_offsets,
+    fire_pattern,
+    priority_for,
+)
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def _hold(ctl, mind, prio, job, gate, started):
+    async with ctl.slot(mind, prio, job):
+        started.append(job)
+        await gate.wait()
+
+
+def test_priority_classes():
+    assert priority_for(voice=True, notify=True, command=False) == PRIORITY_VOICE
+    assert priority_for(voice=False, notify=True, command=False) == PRIORITY_NOTIFY
+    assert priority_for(voice=True, notify=True, command=True) == PRIORITY_COMMAND
+
+
+async def test_global_cap_admits_voice_before_commands():
+    ctl = AdmissionController(global_slots=1, per_mind_slots=5)
+    gate, started = asyncio.Event(), []
+    tasks = [asyncio.create_task(_hold(ctl, "a", PRIORITY_COMMAND, "first", gate, started))]
+    await _settle()
+    tasks.append(asyncio.create_task(_hold(ctl, "b", PRIORITY_COMMAND, "cmd", gate, started)))
+    tasks.append(asyncio.create_task(_hold(ctl, "c", PRIORITY_VOICE, "brief", gate, started)))
+    await _settle()
+    assert started == ["first"]
+
+    gate.set()
+    await asyncio.gather(*tasks)
+    assert started == ["first", "brief", "cmd"]
+
+
+async def test_per_mind_cap_does_not_block_other_minds():
+    ctl = AdmissionController(global_slots=3, per_mind_slots=1)
+    gate, started = asyncio.Event(), []
+    tasks = [
+        asyncio.create_task(_hold(ctl, "ada", PRIORITY_VOICE, "ada-1", gate, started)),
+        asyncio.create_task(_hold(ctl, "ada", PRIORITY_VOICE, "ada-2", gate, started)),
+        asyncio.create_task(_hold(ctl, "bob", PRIORITY_COMMAND, "bob-1", gate, started)),
+    ]
+    await _settle()
+    assert started == ["ada-1", "bob-1"]
+    assert ctl.snapshot()["running_by_mind"] == {"ada": 1, "bob": 1}
+
+    gate.set()
+    await asyncio.gather(*tasks)
+    assert ctl.snapshot()["running"] == 0
+
+
+async def test_cancelled_waiter_leaves_queue():
+    ctl = AdmissionController(global_slots=1, per_mind_slots=1)
+    gate, started = asyncio.Event(), []
+    running = asyncio.create_task(_hold(ctl, "a", PRIORITY_VOICE, "run", gate, started))
+    await _settle()
+    waiting = asyncio.create_task(_hold(ctl, "a", PRIORITY_VOICE, "wait", gate, started))
+    await _settle()
+    waiting.cancel()
+    await _settle()
+    assert ctl.snapshot()["waiting"] == []
+    gate.set()
+    await running
+    assert ctl.snapshot()["running"] == 0
+
+
+async def test_histograms_record_wait_and_run_time():
+    ctl = AdmissionController(global_slots=1, per_mind_slots=1)
+    async with ctl.slot("a", PRIORITY_VOICE, "ada/brief"):
+        await asyncio.sleep(0.01)
+    job = ctl.snapshot()["jobs"]["ada/brief"]
+    assert job["queue_wait"]["count"] == 1
+    assert job["run_time"]["count"] == 1
+    assert job["run_time"]["max_s"] >= 0.01
+
+
+def test_cron_offsets_spread_shared_minute_by_priority():
+    offsets = cron_offsets(
+        [
+            ("cmd", "30 6 * * *", "UTC", PRIORITY_COMMAND),
+            ("brief", "30 6 * * 1-5", "UTC", PRIORITY_VOICE),
+            ("report", "30 06 1 * *", "Etc/UTC", PRIORITY_NOTIFY),
+            ("alone", "0 9 * * *", "UTC", PRIORITY_COMMAND),
+            ("other_tz", "30 6 * * *", "America/Chicago", PRIORITY_VOICE),
+        ],
+        spread_s=90,
+    )
+    assert offsets == {"brief": 0.0, "report": 30.0, "cmd": 60.0, "alone": 0.0, "other_tz": 0.0}
+
+
+def test_cron_offsets_spread_overlapping_schedules_and_skip_disjoint_days():
+    overlapping = cron_offsets(
+        [("every_half_hour", "*/30 * * * *", "UTC", PRIORITY_COMMAND),
+         ("brief", "30 6 * * *", "UTC", PRIORITY_VOICE)],
+        spread_s=90,
+    )
+    assert overlapping == {"brief": 0.0, "every_half_hour": 45.0}
+
+    disjoint = cron_offsets(
+        [("mon", "0 7 * * mon", "UTC", PRIORITY_VOICE), ("tue", "0 7 * * tue", "UTC", PRIORITY_VOICE)],
+        spread_s=90,
+    )
+    assert disjoint == {"mon": 0.0, "tue": 0.0}
+
+
+def test_fire_patterns_compare_in_utc():
+    def hits(a, b):
+        return collide(fire_pattern(*a, year=2026), fire_pattern(*b, year=2026))
+
+    assert hits(("0,30 6-7 * * *", "utc"), ("*/30 6,7 * * 1", "UTC"))
+    assert not hits(("15 6 * * *", "UTC"), ("30 6 * * *", "UTC"))
+    assert hits(("0 7 * * *", "Europe/London"), ("0 7 * * *", "GB"))
+    # 06:30 in Chicago is 11:30 UTC in summer (12:30 in winter).
+    assert hits(("30 6 * * *", "America/Chicago"), ("30 11 * * *", "UTC"))
+    assert not hits(("30 6 * * *", "America/Chicago"), ("30 6 * * *", "UTC"))
+    # The 1st of a month falls on a Monday within the horizon.
+    assert hits(("0 7 1 * *", "UTC"), ("0 7 * * mon", "UTC"))
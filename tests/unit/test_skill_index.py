@@ -0,0 +1,139 @@
+"""Tests for the shared SKILL.md index (core/skill_index.py).
+
+Verifies that:
+- each SKILL.md is parsed once; an unchanged tree costs no re-reads
+- an edited, added or removed skill is reported as a change (and pushed to
+  subscribers) and only that file is re-read
+- typed queries: user-invocable, scheduled, by mind, by harness
+- dot-directories and dirs without a SKILL.md are not indexed
+- refresh(max_age_s) skips a recent stat pass
+- the scheduler's reconcile check only fires when something changed
+"""
+
+import os
+from pathlib import Path
+
+from core.skill_index import SkillIndex, minds_index, skills_dir_index
+
+
+def _skill(skills_dir: Path, name: str, frontmatter: str) -> Path:
+    path = skills_dir / name / "SKILL.md"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"---\nname: {name}\n{frontmatter}\n---\n\nbody\n")
+    return path
+
+
+def _touch(path: Path, text: str) -> None:
+    st = path.stat()
+    path.write_text(text)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_parses_once_and_reports_only_real_changes(tmp_path: Path) -> None:
+    skills = tmp_path / ".claude" / "skills"
+    a = _skill(skills, "alpha", "user-invocable: true")
+    _skill(skills, "beta", "description: x")
+    index = skills_dir_index(skills)
+    events = []
+    index.subscribe(events.append)
+
+    first = index.refresh()
+    assert {r.dir_name for r in first.added} == {"alpha", "beta"}
+    assert index.parses == 2
+    assert not index.refresh()
+    assert index.parses == 2 and index.version == 1
+
+    _touch(a, "---\nname: alpha\nuser-invocable: false\n---\n")
+    _skill(skills, "gamma", "user-invocable: true")
+    (skills / "beta" / "SKILL.md").unlink()
+    changes = index.refresh()
+
+    assert [r.dir_name for r in changes.changed] == ["alpha"]
+    assert [r.dir_name for r in changes.added] == ["gamma"]
+    assert [r.dir_name for r in changes.removed] == ["beta"]
+    assert index.parses == 4
+    assert [r.dir_name for r in index.user_invocable()] == ["gamma"]
+    assert len(events) == 2 and events[-1] is changes
+
+
+def test_typed_queries_across_minds(tmp_path: Path) -> None:
+    _skill(tmp_path / "ada" / ".claude" / "skills", "brief", 'schedule: "0 7 * * *"')
+    _skill(tmp_path / "ada" / ".claude" / "skills", "off", "schedule: null")
+    _skill(tmp_path / "bob" / ".codex" / "skills", "ask", "user_invocable: true")
+    _skill(tmp_path / "bob" / ".codex" / "skills" / ".archive", "old", 'schedule: "0 1 * * *"')
+    (tmp_path / "bob" / ".codex" / "skills" / "empty").mkdir()
+    index = minds_index(tmp_path)
+
+    assert index.minds() == {"ada", "bob"}
+    assert [r.dir_name for r in index.scheduled()] == ["brief"]
+    assert [r.dir_name for r in index.user_invocable(mind="bob")] == ["ask"]
+    assert index.names(harness="claude") == {"brief", "off"}
+    assert [r.harness for r in index.by_mind("bob")] == ["codex"]
+    assert {r.mind for r in index.by_harness("codex")} == {"bob"}
+
+
+def test_symlinked_skill_dirs_are_flagged(tmp_path: Path) -> None:
+    skills = tmp_path / "skills"
+    _skill(tmp_path / "plugins", "plug", "")
+    skills.mkdir()
+    (skills / "plug").symlink_to(tmp_path / "plugins" / "plug")
+    _skill(skills, "own", "")
+    index = SkillIndex(lambda: [(str(skills), None, "claude")])
+    assert {r.dir_name: r.symlink for r in index.records()} == {"own": False, "plug": True}
+
+
+def test_undecodable_skill_md_is_kept_with_empty_frontmatter(tmp_path: Path) -> None:
+    skills = tmp_path / "skills"
+    _skill(skills, "good", "user-invocable: true")
+    bad = skills / "bad" / "SKILL.md"
+    bad.parent.mkdir()
+    bad.write_bytes(b"---\nname: bad\n---\n\xff\xfe\n")
+    index = SkillIndex(lambda: [(str(skills), None, "claude")])
+    records = {r.dir_name: r for r in index.records()}
+    assert set(records) == {"good", "bad"}
+    assert records["bad"].frontmatter == {}
+
+
+def test_max_age_skips_recent_refresh(tmp_path: Path) -> None:
+    now = [100.0]
+    skills = tmp_path / "skills"
+    _skill(skills, "one", "")
+    index = SkillIndex(lambda: [(str(skills), None, "claude")], clock=lambda: now[0])
+    assert index.refresh(max_age_s=5)
+    _skill(skills, "two", "")
+    assert not index.refresh(max_age_s=5)
+    now[0] += 6
+    assert [r.dir_name for r in index.refresh(max_age_s=5).added] == ["two"]
+
+
+def test_scheduler_reconciles_only_on_change(tmp_path: Path, monkeypatch) -> None:
+    from bots import scheduler
+
+    monkeypatch.setattr(scheduler, "MINDS_ROOT", tmp_path)
+    monkeypatch.setattr(scheduler, "SCHEDULER_TASKS_YAML", tmp_path / "tasks.yaml")
+    (tmp_path / "ada").mkdir()
+    (tmp_path / "ada" / "runtime.yaml").write_text("mind_id: ada-uuid\n")
+    _skill(tmp_path / "ada" / ".claude" / "skills", "brief", 'schedule: "0 7 * * *"')
+
+    class _Scheduler:
+        def __init__(self):
+            self.jobs = {}
+
+        def get_jobs(self):
+            return [type("Job", (), {"id": jid}) for jid in self.jobs]
+
+        def add_job(self, *args, id, **kwargs):
+            self.jobs[id] = args
+
+        def remove_job(self, jid):
+            del self.jobs[jid]
+
+    sched = _Scheduler()
+    assert scheduler._reconcile_skill_jobs(sched)[0] == 1
+    assert not scheduler._inputs_changed()
+
+    (tmp_path / "tasks.yaml").write_text("tasks: []\n")
+    assert scheduler._inputs_changed()
+    scheduler._reconcile_skill_jobs(sched)
+    _skill(tmp_path / "ada" / ".claude" / "skills", "late", 'schedule: "0 9 * * *"')
+    assert scheduler._inputs_changed()
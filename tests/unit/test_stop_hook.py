@@ -0,0 +1,109 @@
+"""Tests for the single Stop-hook entry point (core/stop_hook.py).
+
+Verifies that:
+- one Claude fire captures the turns and bumps the skills that fired
+- a later fire bumps only skills from the newly appended lines; a fire
+  with nothing new bumps nothing
+- a Codex fire finds skill paths nested anywhere in a call's input and
+  stamps session metadata from the same pass
+- the CLI reads transcript_path / session_id from the Stop payload on stdin
+"""
+
+from __future__ import annotations
+
+import io
+import json
+
+from core import stop_hook
+from core.training_capture import get_turns
+
+
+def _claude_user(text: str) -> str:
+    return json.dumps({"type": "user", "message": {"role": "user", "content": text}})
+
+
+def _claude_skill(skill: str, tid: str) -> str:
+    return json.dumps({
+        "type": "assistant", "version": "2.1.179",
+        "message": {"role": "assistant", "model": "claude-opus-4-8", "content": [
+            {"type": "tool_use", "id": tid, "name": "Skill", "input": {"skill": skill}},
+        ]},
+    })
+
+
+def _usage(config_dir) -> dict:
+    return stop_hook._load_telemetry().load_usage(config_dir)
+
+
+def test_claude_fire_captures_and_bumps_only_new_skills(tmp_path):
+    db = tmp_path / "turns.db"
+    config_dir = tmp_path / ".claude"
+    (config_dir / "skills").mkdir(parents=True)
+    transcript = tmp_path / "s.jsonl"
+    transcript.write_text("\n".join([
+        _claude_user("/planka add a card"),
+        _claude_skill("hivemind:weather", "t1"),
+    ]) + "\n")
+
+    first = stop_hook.run_stop_hook(
+        transcript, harness="claude_code", session_id="s1", config_dir=config_dir, db_path=db,
+    )
+    assert first["turns_written"] is True
+    assert first["skills"] == ["planka", "weather"]
+    assert len(get_turns(db, session_id="s1")) == 1
+
+    with transcript.open("a") as fh:
+        fh.write(_claude_user("again") + "\n" + _claude_skill("weather", "t2") + "\n")
+    second = stop_hook.run_stop_hook(
+        transcript, harness="claude_code", session_id="s1", config_dir=config_dir, db_path=db,
+    )
+    assert second["skills"] == ["weather"]
+    assert stop_hook.run_stop_hook(
+        transcript, harness="claude_code", session_id="s1", config_dir=config_dir, db_path=db,
+    )["skills"] == []
+
+    usage = _usage(config_dir)
+    assert usage["planka"]["use_count"] == 1
+    assert usage["weather"]["use_count"] == 2
+
+
+def test_codex_fire_detects_nested_skill_paths_and_metadata(tmp_path):
+    db = tmp_path / "turns.db"
+    rollout = tmp_path / "r.jsonl"
+    lines = [
+        {"type": "session_meta", "payload": {"cli_version": "0.9.0", "base_instructions": {"text": "SYS"}}},
+        {"type": "turn_context", "payload": {"model": "gpt-5-codex"}},
+        {"type": "response_item", "payload": {
+            "type": "message", "role": "user", "content": [{"type": "input_text", "text": "brief me"}]}},
+        {"type": "response_item", "payload": {
+            "type": "function_call", "name": "exec_command", "call_id": "c1",
+            "arguments": json.dumps({"cmd": ["bash", "-lc", "cat /m/.codex/skills/morning-brief/SKILL.md"]})}},
+        {"type": "response_item", "payload": {
+            "type": "function_call", "name": "exec_command", "call_id": "c2",
+            "arguments": json.dumps({"cmd": "cat /etc/hosts"})}},
+    ]
+    rollout.write_text("\n".join(json.dumps(x) for x in lines) + "\n")
+
+    result = stop_hook.run_stop_hook(rollout, harness="codex", session_id="r1", db_path=db)
+
+    assert result["turns_written"] is True
+    assert result["skills"] == []  # no config_dir: telemetry skipped
+    (turn,) = get_turns(db, session_id="r1")
+    assert turn["source_model"] == "gpt-5-codex" and turn["system_prompt"] == "SYS"
+
+    config_dir = tmp_path / ".codex"
+    (config_dir / "skills").mkdir(parents=True)
+    again = stop_hook.run_stop_hook(rollout, harness="codex", session_id="r1", config_dir=config_dir, db_path=db)
+    assert again["skills"] == ["morning-brief"]
+
+
+def test_cli_reads_stop_payload_from_stdin(tmp_path, monkeypatch):
+    db = tmp_path / "turns.db"
+    transcript = tmp_path / "s.jsonl"
+    transcript.write_text(_claude_user("hello") + "\n")
+    payload = {"session_id": "cli-1", "transcript_path": str(transcript), "hook_event_name": "Stop"}
+    monkeypatch.setattr("sys.stdin", io.StringIO(json.dumps(payload)))
+    monkeypatch.delenv("MIND_ID", raising=False)
+
+    assert stop_hook.main(["--harness", "claude_code", "--db", str(db)]) == 0
+    assert [t["user_content"] for t in get_turns(db, session_id="cli-1")] == ["hello"]
@@ -0,0 +1,31 @@
+"""Unit tests for the scheduler's Telegram message splitter."""
+
+from bots.telegram_delivery import split_message
+
+
+def test_short_text_is_one_chunk():
+    assert split_message("hello") == ["hello"]
+
+
+def test_paragraphs_are_kept_whole():
+    paras = ["a" * 60, "b" * 60, "c" * 60]
+    chunks = split_message("\n\n".join(paras), limit=130)
+    assert chunks == ["a" * 60 + "\n\n" + "b" * 60, "c" * 60]
+
+
+def test_oversized_paragraph_falls_back_to_sentences():
+    para = "First sentence here. Second sentence here. Third one."
+    chunks = split_message(para, limit=25)
+    assert chunks == ["First sentence here.", "Second sentence here.", "Third one."]
+
+
+def test_unbroken_run_is_hard_cut():
+    chunks = split_message("x" * 25, limit=10)
+    assert chunks == ["x" * 10, "x" * 10, "x" * 5]
+
+
+def test_no_chunk_exceeds_limit_and_no_text_is_lost():
+    text = "\n\n".join(f"Paragraph {i}. " + "word " * (i * 40) for i in range(30))
+    chunks = split_message(text)
+    assert all(len(c) <= 4096 for c in chunks)
+    assert "".join(chunks).replace("\n", "").replace(" ", "") == text.replace("\n", "").replace(" ", "")
@@ -15,6 +15,8 @@ import pytest
 from core.training_capture import (
     HARNESS_CLAUDE_CODE,
     HARNESS_CODEX,
+    SCHEMA,
+    TrainingStore,
     TrainingTurn,
     connect,
     count_turns,
@@ -258,3 +260,80 @@ def test_blocks_stored_as_json_text_and_has_reasoning_as_int(db_path):
     assert isinstance(raw, str)
     assert json.loads(raw) == _blocks()
     assert hr == 1
+
+
+# ---------------------------------------------------------------------------
+# TrainingStore
+# ---------------------------------------------------------------------------
+
+def test_store_connection_uses_wal_and_busy_timeout(db_path):
+    with TrainingStore(db_path) as store:
+        conn = store.conn
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] > 0
+
+
+def test_store_skips_rows_whose_content_is_unchanged(db_path):
+    with TrainingStore(db_path) as store:
+        assert store.upsert_turns([_turn(captured_at=100), _turn(turn_index=1)]) == 2
+        # Same content, new capture stamp: nothing rewritten.
+        assert store.upsert_turns([_turn(captured_at=200), _turn(turn_index=1)]) == 0
+        assert get_turns(db_path, "s1")[0]["captured_at"] == 100
+        changed = _turn(captured_at=300, source_model="other-model")
+        assert store.upsert_turns([changed, _turn(turn_index=1)]) == 1
+
+
+def test_schema_script_runs_once_per_process(db_path, monkeypatch):
+    import core.training_capture as tc
+
+    calls = []
+    real_init = tc.init_db
+    monkeypatch.setattr(tc, "init_db", lambda p: (calls.append(p), real_init(p)))
+    for i in range(5):
+        upsert_turn(db_path, _turn(turn_index=i))
+    assert len(calls) == 1
+    assert count_turns(db_path) == 5
+
+
+def test_store_reopens_when_db_file_is_replaced(db_path):
+    upsert_turn(db_path, _turn())
+    db_path.unlink()
+    for suffix in ("-wal", "-shm"):
+        db_path.with_name(db_path.name + suffix).unlink(missing_ok=True)
+    upsert_turn(db_path, _turn(turn_index=3))
+    assert [r["turn_index"] for r in get_turns(db_path, "s1")] == [3]
+
+
+def test_legacy_db_gains_content_hash_column(db_path):
+    db_path.parent.mkdir(parents=True)
+    legacy_schema = SCHEMA.replace("    content_hash      TEXT,\n", "")
+    with connect(db_path) as conn:
+        conn.executescript(legacy_schema)
+    with TrainingStore(db_path) as store:
+        store.upsert_turns([_turn()])
+    assert get_turns(db_path, "s1")[0]["content_hash"]
+
+
+# ---------------------------------------------------------------------------
+# system prompts
+# ---------------------------------------------------------------------------
+
+def test_system_prompt_is_stored_once_and_rehydrated(db_path):
+    prompt = "You are Codex. " * 200
+    upsert_turns(db_path, [
+        _turn(harness=HARNESS_CODEX, turn_index=i, system_prompt=prompt) for i in range(3)
+    ] + [_turn(session_id="s2", harness=HARNESS_CODEX, system_prompt=prompt)])
+    with connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM system_prompts").fetchone()[0] == 1
+        inline = conn.execute("SELECT system_prompt FROM training_turns").fetchall()
+    assert all(row[0] is None for row in inline)
+    assert [r["system_prompt"] for r in get_turns(db_path, "s1")] == [prompt] * 3
+    assert get_turns(db_path, "s2")[0]["system_prompt_hash"] == _turn(system_prompt=prompt).system_prompt_hash
+
+
+def test_legacy_inline_system_prompt_is_still_read(db_path):
+    upsert_turn(db_path, _turn())
+    with connect(db_path) as conn:
+        conn.execute("UPDATE training_turns SET system_prompt = 'inline', system_prompt_hash = NULL")
+    assert get_turns(db_path, "s1")[0]["system_prompt"] == "inline"
@@ -13,7 +13,7 @@ import json
 
 import pytest
 
-from core.training_capture import HARNESS_CLAUDE_CODE, count_turns, get_turns
+from core.training_capture import HARNESS_CLAUDE_CODE, connect, count_turns, get_turns
 from core.training_capture_claude import (
     build_turns,
     capture_session,
@@ -233,3 +233,80 @@ def test_capture_session_noop_on_empty(tmp_path):
     # A no-op capture writes nothing — not even an empty DB file.
     assert capture_session(p, session_id="x", db_path=db) is False
     assert not db.exists()
+
+
+# ---------------------------------------------------------------------------
+# incremental capture
+# ---------------------------------------------------------------------------
+
+def _append(p, *lines, newline=True):
+    with p.open("a") as fh:
+        fh.write("\n".join(lines) + ("\n" if newline else ""))
+
+
+def _snapshot(db, session_id):
+    return [
+        (r["turn_index"], r["user_content"], r["assistant_blocks"], r["source_model"])
+        for r in get_turns(db, session_id)
+    ]
+
+
+def test_incremental_matches_full_capture_as_transcript_grows(transcript, tmp_path):
+    inc_db, full_db = tmp_path / "inc.db", tmp_path / "full.db"
+    capture_session(transcript, session_id="abc", db_path=inc_db)
+    _append(transcript, _assistant([{"type": "text", "text": "more for turn two"}]))
+    capture_session(transcript, session_id="abc", db_path=inc_db)
+    _append(transcript, _user("third"), _assistant([{"type": "text", "text": "done"}]))
+    capture_session(transcript, session_id="abc", db_path=inc_db)
+
+    capture_session(transcript, session_id="abc", db_path=full_db, incremental=False)
+    assert _snapshot(inc_db, "abc") == _snapshot(full_db, "abc")
+    assert count_turns(inc_db) == 3
+
+
+def test_incremental_fire_only_rewrites_open_and_new_turns(transcript, tmp_path):
+    db = tmp_path / "training_turns.db"
+    capture_session(transcript, session_id="abc", db_path=db)
+    first_stamp = get_turns(db, "abc")[0]["captured_at"]
+    with connect(db) as conn:
+        conn.execute("UPDATE training_turns SET captured_at = 1 WHERE turn_index = 0")
+
+    _append(transcript, _user("third"))
+    assert capture_session(transcript, session_id="abc", db_path=db) is True
+    rows = get_turns(db, "abc")
+    assert rows[0]["captured_at"] == 1  # closed turn untouched
+    assert rows[2]["user_content"] == "third"
+    assert first_stamp is not None
+
+
+def test_incremental_noop_when_nothing_appended(transcript, tmp_path):
+    db = tmp_path / "training_turns.db"
+    assert capture_session(transcript, session_id="abc", db_path=db) is True
+    assert capture_session(transcript, session_id="abc", db_path=db) is False
+
+
+def test_incremental_waits_for_partial_line(transcript, tmp_path):
+    db = tmp_path / "training_turns.db"
+    capture_session(transcript, session_id="abc", db_path=db)
+    line = _user("half written")
+    _append(transcript, line[:10], newline=False)
+    assert capture_session(transcript, session_id="abc", db_path=db) is False
+    _append(transcript, line[10:])
+    assert capture_session(transcript, session_id="abc", db_path=db) is True
+    assert get_turns(db, "abc")[-1]["user_content"] == "half written"
+
+
+def test_incremental_model_swap_restamps_earlier_rows(transcript, tmp_path):
+    db = tmp_path / "training_turns.db"
+    capture_session(transcript, session_id="abc", db_path=db)
+    _append(transcript, _assistant([{"type": "text", "text": "x"}], model="claude-sonnet-9"))
+    capture_session(transcript, session_id="abc", db_path=db)
+    assert {r["source_model"] for r in get_turns(db, "abc")} == {"claude-sonnet-9"}
+
+
+def test_incremental_truncated_transcript_reparses_from_start(transcript, tmp_path):
+    db = tmp_path / "training_turns.db"
+    capture_session(transcript, session_id="abc", db_path=db)
+    transcript.write_text(_user("fresh start") + "\n")
+    capture_session(transcript, session_id="abc", db_path=db)
+    assert get_turns(db, "abc")[0]["user_content"] == "fresh start"
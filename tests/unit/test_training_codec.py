@@ -0,0 +1,102 @@
+"""Tests for compressed ``assistant_blocks`` storage (core/training_codec.py).
+
+Verifies that:
+- compression is opt-in and waits for a trained dictionary
+- compressed rows decode transparently in get_turns, the export, and the
+  skill proposer's reader
+- reencode streams rows to zstd and back without touching content_hash
+- rows keep decoding with their own dictionary after a retrain
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from core import training_capture as tc
+from core import training_codec
+from core.training_export import export
+
+pytest.importorskip("zstandard")
+
+_PROJECT_ROOT = Path(__file__).resolve().parents[2]
+_PROPOSER = _PROJECT_ROOT / "tools/stateless/skill_proposer/skill_proposer.py"
+
+
+def _turn(i: int, session: str = "s1") -> tc.TrainingTurn:
+    return tc.TrainingTurn.from_blocks(
+        session_id=session, turn_index=i, harness=tc.HARNESS_CODEX, mind_id="ada",
+        user_content=f"request {i}", captured_at=100 + i,
+        assistant_blocks=[
+            {"type": "text", "text": f"Looking into item {i}. " * 5},
+            {"type": "tool_use", "id": f"c{i}", "name": "exec_command", "input": {"cmd": f"rg pattern{i % 7} src/"}},
+            {"type": "tool_result", "tool_call_id": f"c{i}", "content": f"src/mod{i % 13}.py:{i}: match\n" * 20},
+        ],
+    )
+
+
+def _raw(db, session="s1"):
+    with tc.connect(db) as conn:
+        return conn.execute(
+            "SELECT turn_index, assistant_blocks, blocks_codec, content_hash FROM training_turns "
+            "WHERE session_id = ? ORDER BY turn_index", (session,),
+        ).fetchall()
+
+
+def test_store_compresses_once_a_dictionary_exists_and_readers_decode(tmp_path):
+    db = tmp_path / "turns.db"
+    with tc.TrainingStore(db, compress_blocks=True) as store:
+        store.upsert_turns([_turn(i) for i in range(100)])
+        assert {r["blocks_codec"] for r in _raw(db)} == {0}  # no dictionary yet
+
+        dict_id = training_codec.train_dictionary(db, dict_bytes=4096)
+        store.upsert_turns([_turn(i, "s2") for i in range(5)])
+    (row,) = [r for r in _raw(db, "s2") if r["turn_index"] == 0]
+    assert row["blocks_codec"] == dict_id and isinstance(row["assistant_blocks"], bytes)
+
+    assert tc.get_turns(db, "s2")[3]["assistant_blocks"] == _turn(3, "s2").assistant_blocks
+
+    spec = importlib.util.spec_from_file_location("skill_proposer_codec_test", _PROPOSER)
+    proposer = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = proposer
+    spec.loader.exec_module(proposer)
+    records = proposer.read_recent_turn_records(str(db), "ada", lookback_turns=500)
+    assert len(records) == 105
+
+    export(db, tmp_path / "out", fmt="jsonl")
+    lines = [json.loads(x) for f in sorted((tmp_path / "out").glob("part-*")) for x in f.read_text().splitlines()]
+    assert [line["assistant_blocks"] for line in lines if line["session_id"] == "s2"][1] == _turn(1, "s2").assistant_blocks
+
+
+def test_reencode_round_trip_keeps_content_hash(tmp_path):
+    db = tmp_path / "turns.db"
+    tc.upsert_turns(db, [_turn(i) for i in range(100)])
+    before = _raw(db)
+    training_codec.train_dictionary(db, dict_bytes=4096)
+
+    stats = training_codec.reencode(db, to="zstd", batch_rows=7)
+    assert stats["rows"] == 100 and stats["bytes_before"] > 3 * stats["bytes_after"]
+    assert training_codec.reencode(db, to="zstd")["rows"] == 0
+    assert [r["content_hash"] for r in _raw(db)] == [r["content_hash"] for r in before]
+    assert training_codec.codec_stats(db)["codecs"].keys() == {"1"}
+
+    assert training_codec.reencode(db, to="json")["rows"] == 100
+    assert [r["assistant_blocks"] for r in _raw(db)] == [r["assistant_blocks"] for r in before]
+
+
+def test_rows_keep_their_dictionary_after_a_retrain(tmp_path):
+    db = tmp_path / "turns.db"
+    tc.upsert_turns(db, [_turn(i) for i in range(100)])
+    first = training_codec.train_dictionary(db, dict_bytes=4096)
+    training_codec.reencode(db, to="zstd")
+    second = training_codec.train_dictionary(db, dict_bytes=4096)
+    assert second > first
+
+    with tc.TrainingStore(db, compress_blocks=True) as store:
+        store.upsert_turns([_turn(0, "s3")])
+    assert _raw(db, "s3")[0]["blocks_codec"] == second
+    assert tc.get_turns(db, "s1")[42]["assistant_blocks"] == _turn(42).assistant_blocks
@@ -0,0 +1,204 @@
+"""Unit tests for the sharded training-turn exporter.
+
+Covers filter selection, the shard size bound, the manifest, resume from
+the last exported id (including discarding uncommitted shards, re-exporting
+re-captured rows, and refusing curation filters), the read-only open of a
+pre-prompt-table DB, parallel slice workers, and the optional jsonl.zst /
+parquet writers.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+
+import pytest
+
+from core.training_capture import (
+    HARNESS_CLAUDE_CODE,
+    HARNESS_CODEX,
+    TrainingTurn,
+    connect,
+    upsert_turns,
+)
+from core.training_export import ExportFilter, export, main
+
+
+def _turns(session, n, *, harness=HARNESS_CLAUDE_CODE, thinking=False, text="reply"):
+    blocks = [{"type": "text", "text": text}]
+    if thinking:
+        blocks.insert(0, {"type": "thinking", "text": "hmm"})
+    return [
+        TrainingTurn.from_blocks(
+            session_id=session,
+            turn_index=i,
+            harness=harness,
+            user_content=f"prompt {i}",
+            assistant_blocks=blocks,
+            source_model="m1" if harness == HARNESS_CLAUDE_CODE else "m2",
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = tmp_path / "training_turns.db"
+    upsert_turns(path, _turns("c", 30, thinking=True))
+    upsert_turns(path, _turns("x", 20, harness=HARNESS_CODEX))
+    return path
+
+
+def _read_jsonl(out_dir):
+    manifest = json.loads((out_dir / "manifest.json").read_text())
+    rows = []
+    for shard in manifest["shards"]:
+        rows += [json.loads(line) for line in (out_dir / shard["file"]).read_text().splitlines()]
+    return manifest, rows
+
+
+def test_filters_select_matching_rows(db, tmp_path):
+    out = tmp_path / "out"
+    export(db, out, ExportFilter(harness=HARNESS_CLAUDE_CODE, has_reasoning=True), fmt="jsonl")
+    manifest, rows = _read_jsonl(out)
+    assert len(rows) == 30 == manifest["total_rows"]
+    assert {r["harness"] for r in rows} == {HARNESS_CLAUDE_CODE}
+    assert rows[0]["assistant_blocks"][0] == {"type": "thinking", "text": "hmm"}
+    assert rows[0]["has_reasoning"] is True
+
+
+def test_length_and_quality_filters(db, tmp_path):
+    with connect(db) as conn:
+        conn.execute("UPDATE training_turns SET quality_flag = 'clean' WHERE turn_index < 5")
+        conn.execute("UPDATE training_turns SET length_tokens = 100 WHERE turn_index < 2")
+    export(db, tmp_path / "out", ExportFilter(quality_flag="clean", min_tokens=50), fmt="jsonl")
+    _, rows = _read_jsonl(tmp_path / "out")
+    assert sorted((r["session_id"], r["turn_index"]) for r in rows) == [
+        ("c", 0), ("c", 1), ("x", 0), ("x", 1),
+    ]
+
+
+def test_shards_respect_size_bound_and_ids_are_ordered(db, tmp_path):
+    out = tmp_path / "out"
+    manifest = export(db, out, fmt="jsonl", max_shard_bytes=2000, batch_rows=5)
+    assert len(manifest["shards"]) > 1
+    _, rows = _read_jsonl(out)
+    ids = [r["id"] for r in rows]
+    assert ids == sorted(ids) and len(ids) == 50
+    for shard in manifest["shards"]:
+        assert shard["raw_bytes"] < 2000 + 5 * 400  # at most one batch over
+        assert shard["first_id"] <= shard["last_id"]
+    assert manifest["last_id"] == max(ids)
+
+
+def test_resume_exports_only_new_rows(db, tmp_path):
+    out = tmp_path / "out"
+    first = export(db, out, fmt="jsonl")
+    upsert_turns(db, _turns("late", 4))
+    second = export(db, out, fmt="jsonl")
+    assert second["total_rows"] == first["total_rows"] + 4
+    _, rows = _read_jsonl(out)
+    assert [r["session_id"] for r in rows[-4:]] == ["late"] * 4
+    assert len({r["id"] for r in rows}) == len(rows)
+
+
+def test_resume_discards_uncommitted_shards(db, tmp_path):
+    out = tmp_path / "out"
+    export(db, out, fmt="jsonl")
+    stray = out / "part-000000009999-0000.jsonl"
+    stray.write_text("partial\n")
+    export(db, out, fmt="jsonl")
+    assert not stray.exists()
+
+
+def test_resume_refuses_a_different_filter(db, tmp_path):
+    out = tmp_path / "out"
+    export(db, out, fmt="jsonl")
+    with pytest.raises(ValueError):
+        export(db, out, ExportFilter(harness=HARNESS_CODEX), fmt="jsonl")
+
+
+def test_resume_reexports_rows_recaptured_in_place(db, tmp_path):
+    out = tmp_path / "out"
+    first = export(db, out, fmt="jsonl")
+    recaptured = _turns("c", 2, thinking=True, text="longer reply")
+    for turn in recaptured:
+        turn.captured_at = int(time.time()) + 1
+    upsert_turns(db, recaptured)
+
+    second = export(db, out, fmt="jsonl")
+    assert second["total_rows"] == first["total_rows"] + 2
+    assert second["shards"][-1]["file"].startswith("part-recaptured-")
+    _, rows = _read_jsonl(out)
+    latest = {r["id"]: r for r in rows}  # the shard listed last wins
+    assert len(latest) == 50
+    assert [r["assistant_blocks"][-1]["text"] for r in rows[-2:]] == ["longer reply"] * 2
+    assert sum(r["assistant_blocks"][-1]["text"] == "longer reply" for r in latest.values()) == 2
+
+
+def test_resume_refuses_a_curation_filter(db, tmp_path):
+    out = tmp_path / "out"
+    with connect(db) as conn:
+        conn.execute("UPDATE training_turns SET quality_flag = 'clean' WHERE turn_index < 5")
+    assert export(db, out, ExportFilter(quality_flag="clean"), fmt="jsonl")["total_rows"] == 10
+    with pytest.raises(ValueError, match="quality_flag"):
+        export(db, out, ExportFilter(quality_flag="clean"), fmt="jsonl")
+
+
+def test_export_reads_a_pre_prompt_table_db_without_writing(tmp_path):
+    db = tmp_path / "old.db"
+    with sqlite3.connect(db) as conn:  # the first-release schema
+        conn.execute(
+            "CREATE TABLE training_turns (id INTEGER PRIMARY KEY, session_id TEXT NOT NULL, "
+            "turn_index INTEGER NOT NULL, mind_id TEXT, harness TEXT NOT NULL, source_model TEXT, "
+            "harness_version TEXT, captured_at INTEGER, system_prompt TEXT, user_content TEXT, "
+            "assistant_blocks TEXT, has_reasoning INTEGER NOT NULL DEFAULT 0, tool_call_count INTEGER, "
+            "length_tokens INTEGER, quality_flag TEXT NOT NULL DEFAULT 'pending', judge_verdict TEXT, "
+            "judge_confidence REAL, exclusion_reason TEXT, UNIQUE(session_id, turn_index))"
+        )
+        conn.execute(
+            "INSERT INTO training_turns (session_id, turn_index, harness, system_prompt, "
+            "user_content, assistant_blocks) VALUES ('s', 0, 'codex', 'SOUL', 'hi', "
+            "'[{\"type\": \"text\", \"text\": \"yo\"}]')"
+        )
+        schema = conn.execute("SELECT sql FROM sqlite_master").fetchall()
+
+    export(db, tmp_path / "out", fmt="jsonl")
+    _, rows = _read_jsonl(tmp_path / "out")
+    assert rows[0]["system_prompt"] == "SOUL" and rows[0]["assistant_blocks"][0]["text"] == "yo"
+    with sqlite3.connect(db) as conn:
+        assert conn.execute("SELECT sql FROM sqlite_master").fetchall() == schema
+    with pytest.raises(ValueError):
+        export(tmp_path / "missing.db", tmp_path / "out2", fmt="jsonl")
+
+
+def test_parallel_workers_match_serial_export(db, tmp_path):
+    export(db, tmp_path / "serial", fmt="jsonl")
+    export(db, tmp_path / "parallel", fmt="jsonl", workers=3)
+    _, serial = _read_jsonl(tmp_path / "serial")
+    _, parallel = _read_jsonl(tmp_path / "parallel")
+    assert serial == parallel
+
+
+def test_cli_reports_summary(db, tmp_path, capsys):
+    assert main([str(tmp_path / "out"), "--db", str(db), "--format", "jsonl", "--no-reasoning"]) == 0
+    summary = json.loads(capsys.readouterr().out)
+    assert summary["total_rows"] == 20
+
+
+def test_zstd_shards_roundtrip(db, tmp_path):
+    zstandard = pytest.importorskip("zstandard")
+    manifest = export(db, tmp_path / "out", fmt="jsonl.zst")
+    shard = tmp_path / "out" / manifest["shards"][0]["file"]
+    with shard.open("rb") as fh:
+        text = zstandard.ZstdDecompressor().stream_reader(fh).read().decode()
+    assert len(text.splitlines()) == 50
+
+
+def test_parquet_shards_roundtrip(db, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    manifest = export(db, tmp_path / "out", fmt="parquet")
+    table = pq.read_table(tmp_path / "out" / manifest["shards"][0]["file"])
+    assert table.num_rows == 50
+    assert json.loads(table.column("assistant_blocks")[0].as_py())[0]["type"] == "thinking"
@@ -15,6 +15,8 @@ from pathlib import Path
 
 import pytest
 
+from core.training_capture import get_turns
+
 _REPO_ROOT = Path(__file__).resolve().parent.parent.parent
 _MIGRATION = (
     _REPO_ROOT / "scripts" / "migrations"
@@ -141,7 +143,9 @@ def test_migration_carries_curation_and_metadata(src_db, tmp_path):
     assert row["source_model"] == "claude-opus-4-7"
     assert row["harness_version"] == "2.0.0"
     assert row["captured_at"] == 1781649576
-    assert row["system_prompt"] == "you are skippy"
+    assert row["system_prompt"] is None  # moved out to system_prompts
+    (turn,) = [t for t in get_turns(dest, row["session_id"]) if t["turn_index"] == 0]
+    assert turn["system_prompt"] == "you are skippy"
     assert row["quality_flag"] == "clean"
     assert row["judge_verdict"] == "keep"
     assert row["judge_confidence"] == 0.87
@@ -0,0 +1,83 @@
+"""Tests for scripts/migrations/2026-10-18-system-prompts-table.py.
+
+Verifies that inline ``system_prompt`` text is moved into ``system_prompts``
+in batches, that readers and exports see the same prompts afterwards, that
+``content_hash`` is unchanged, and that a re-run no-ops.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+from pathlib import Path
+
+from core.training_capture import (
+    HARNESS_CODEX,
+    TrainingTurn,
+    _UPSERT_COLUMNS,
+    connect,
+    get_turns,
+    init_db,
+)
+from core.training_export import export
+
+_REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+_MIGRATION = _REPO_ROOT / "scripts" / "migrations" / "2026-10-18-system-prompts-table.py"
+
+
+def _load_migration():
+    spec = importlib.util.spec_from_file_location("_mig_system_prompts", _MIGRATION)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _write_legacy_rows(db: Path) -> None:
+    """Rows as captured before the prompt table: text inline, no hash."""
+    init_db(db)
+    columns = ", ".join(_UPSERT_COLUMNS)
+    placeholders = ", ".join("?" for _ in _UPSERT_COLUMNS)
+    with connect(db) as conn:
+        for session, prompt in (("a", "PROMPT A " * 100), ("b", "PROMPT B " * 100)):
+            for i in range(3):
+                turn = TrainingTurn.from_blocks(
+                    session_id=session, turn_index=i, harness=HARNESS_CODEX,
+                    user_content=f"q{i}", assistant_blocks=[{"type": "text", "text": "ok"}],
+                    system_prompt=prompt,
+                )
+                values = list(turn._row_values())
+                values[7], values[8] = prompt, None
+                conn.execute(f"INSERT INTO training_turns ({columns}) VALUES ({placeholders})", values)
+
+
+def test_migration_moves_prompts_and_readers_see_no_change(tmp_path):
+    db = tmp_path / "turns.db"
+    _write_legacy_rows(db)
+    before = {s: get_turns(db, s) for s in ("a", "b")}
+
+    assert _load_migration().migrate(db, batch_rows=2) == 6
+
+    with connect(db) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM system_prompts").fetchone()[0] == 2
+        assert conn.execute(
+            "SELECT COUNT(*) FROM training_turns WHERE system_prompt IS NOT NULL"
+        ).fetchone()[0] == 0
+    for session, rows in before.items():
+        after = get_turns(db, session)
+        assert [r["system_prompt"] for r in after] == [r["system_prompt"] for r in rows]
+        assert [r["content_hash"] for r in after] == [r["content_hash"] for r in rows]
+
+    export(db, tmp_path / "out", fmt="jsonl")
+    (shard,) = (tmp_path / "out").glob("part-*")
+    prompts = {json.loads(line)["system_prompt"][:8] for line in shard.read_text().splitlines()}
+    assert prompts == {"PROMPT A", "PROMPT B"}
+
+
+def test_migration_is_idempotent(tmp_path):
+    db = tmp_path / "turns.db"
+    _write_legacy_rows(db)
+    mig = _load_migration()
+    assert mig.migrate(db, vacuum=True) == 6
+    assert mig.migrate(db) == 0
+    assert mig.migrate(tmp_path / "missing.db") == 0
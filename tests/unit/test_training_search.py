@@ -0,0 +1,131 @@
+"""Tests for the full-text turn index (core/training_search.py).
+
+Verifies that:
+- the store indexes the rows it writes and re-indexes changed ones
+- query filters, tool restriction, snippets, and pagination
+- the tool filter matches whole names only, and an index built before
+  ``turn_tools`` is dropped for a rebuild
+- ``build_index`` backfills rows written outside the store, and a deleted
+  row leaves the index
+- bad query syntax surfaces as ``ValueError``; ``literal`` avoids it
+"""
+
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from core import training_capture as tc
+from core import training_search as ts
+
+
+def _turn(i: int, session: str = "s1", *, mind: str = "ada", harness: str = tc.HARNESS_CODEX,
+          text: str = "All done.", tool: str = "exec_command", cmd: str = "ls") -> tc.TrainingTurn:
+    return tc.TrainingTurn.from_blocks(
+        session_id=session, turn_index=i, harness=harness, mind_id=mind,
+        source_model="gpt-5", user_content=f"request number {i}", captured_at=100 + i,
+        assistant_blocks=[
+            {"type": "tool_use", "id": f"c{i}", "name": tool, "input": {"cmd": cmd}},
+            {"type": "tool_result", "tool_call_id": f"c{i}", "content": "needle in a result"},
+            {"type": "text", "text": text},
+        ],
+    )
+
+
+def _ids(page: ts.SearchPage) -> list[tuple[str, int]]:
+    return [(h.session_id, h.turn_index) for h in page.hits]
+
+
+def test_store_indexes_written_rows_and_reindexes_changes(tmp_path):
+    db = tmp_path / "turns.db"
+    with tc.TrainingStore(db) as store:
+        assert store.upsert_turns([_turn(0), _turn(1, text="KeyError: 'mind_id' raised")]) == 2
+        assert store.upsert_turns([_turn(0), _turn(1, text="KeyError: 'mind_id' raised")]) == 0
+        assert _ids(ts.search(db, "KeyError")) == [("s1", 1)]
+
+        store.upsert_turns([_turn(1, text="fixed it")])
+    assert ts.search(db, "KeyError").hits == []
+    assert _ids(ts.search(db, "fixed")) == [("s1", 1)]
+    assert ts.search(db, "needle").hits == []  # tool results are not indexed
+    with sqlite3.connect(db) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM turns_fts").fetchone()[0] == 2
+
+
+def test_query_filters_tool_snippet_and_pagination(tmp_path):
+    db = tmp_path / "turns.db"
+    tc.upsert_turns(db, [_turn(i, cmd=f"rg TODO src/{i}") for i in range(5)])
+    tc.upsert_turns(db, [_turn(0, "s2", mind="nagatha", tool="Grep", cmd="TODO")])
+    tc.upsert_turns(db, [_turn(0, "s3", harness=tc.HARNESS_CLAUDE_CODE, tool="Bash", cmd="rg TODO")])
+
+    assert len(ts.search(db, "TODO").hits) == 7
+    assert _ids(ts.search(db, "TODO", mind_id="nagatha")) == [("s2", 0)]
+    assert _ids(ts.search(db, "TODO", harness=tc.HARNESS_CLAUDE_CODE)) == [("s3", 0)]
+    assert len(ts.search(db, tool="exec_command").hits) == 5
+    assert _ids(ts.search(db, "TODO", tool="Bash")) == [("s3", 0)]
+
+    hit = ts.search(db, "src", mind_id="ada", highlight=("<b>", "</b>")).hits[0]
+    assert "<b>src</b>" in hit.snippet and hit.source_model == "gpt-5"
+
+    pages, offset = [], 0
+    while offset is not None:
+        page = ts.search(db, tool="exec_command", order="recent", limit=2, offset=offset)
+        pages.append(_ids(page))
+        offset = page.next_offset
+    assert pages == [[("s1", 4), ("s1", 3)], [("s1", 2), ("s1", 1)], [("s1", 0)]]
+
+
+def test_tool_filter_matches_exact_names_only(tmp_path):
+    db = tmp_path / "turns.db"
+    names = ["read", "mcp__fs__read_file", "exec_command", "exec_command_v2"]
+    tc.upsert_turns(db, [_turn(i, tool=name) for i, name in enumerate(names)])
+
+    assert _ids(ts.search(db, tool="read")) == [("s1", 0)]
+    assert _ids(ts.search(db, tool="exec_command")) == [("s1", 2)]
+    assert _ids(ts.search(db, tool="mcp__fs__read_file")) == [("s1", 1)]
+    assert ts.search(db, tool="fs").hits == []
+    assert len(ts.search(db, "tool_names: read").hits) == 2  # free text still tokenizes
+
+    with sqlite3.connect(db) as conn:  # as an index from before turn_tools
+        conn.executescript("DROP TRIGGER training_turns_tools_delete; DROP TABLE turn_tools;")
+    tc.init_db(db)
+    assert ts.build_index(db) == 4
+    assert _ids(ts.search(db, tool="exec_command")) == [("s1", 2)]
+    with sqlite3.connect(db) as conn:
+        conn.execute("DELETE FROM training_turns WHERE turn_index = 2")
+        assert conn.execute("SELECT COUNT(*) FROM turn_tools").fetchone()[0] == 3
+
+
+def test_build_index_backfills_and_delete_trigger_unindexes(tmp_path):
+    db = tmp_path / "turns.db"
+    tc.init_db(db)
+    columns = ", ".join(tc._UPSERT_COLUMNS)
+    with sqlite3.connect(db) as conn:  # as the migration writes: behind the store's back
+        conn.executemany(
+            f"INSERT INTO training_turns ({columns}) VALUES ({', '.join('?' for _ in tc._UPSERT_COLUMNS)})",
+            [_turn(i, text=f"migrated row {i}")._row_values() for i in range(3)],
+        )
+    assert ts.search(db, "migrated").hits == []
+    assert ts.build_index(db, batch_rows=2) == 3
+    assert ts.build_index(db) == 0
+    assert len(ts.search(db, "migrated").hits) == 3
+    assert ts.build_index(db, rebuild=True) == 3
+
+    with sqlite3.connect(db) as conn:
+        conn.execute("DELETE FROM training_turns WHERE turn_index = 1")
+    assert _ids(ts.search(db, "migrated", order="recent")) == [("s1", 2), ("s1", 0)]
+
+
+def test_bad_query_syntax_and_literal(tmp_path, capsys):
+    db = tmp_path / "turns.db"
+    tc.upsert_turns(db, [_turn(0, text='failed: "KeyError: x" (exit 1)')])
+    with pytest.raises(ValueError):
+        ts.search(db, 'KeyError: x" (')
+    assert len(ts.search(db, "KeyError: x", literal=True).hits) == 1
+    with pytest.raises(ValueError):
+        ts.search(db)
+
+    assert ts.main(["--db", str(db), "query", "exit", "--mind", "ada"]) == 0
+    out = capsys.readouterr().out
+    assert "s1#0  codex  ada  gpt-5" in out and "[exit]" in out
+    assert ts.main(["--db", str(db), "query", "KeyError:"]) == 2
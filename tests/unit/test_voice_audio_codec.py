@@ -0,0 +1,135 @@
+"""Tests for the voice server's audio codec layer (voice/audio_codec.py).
+
+Verifies that:
+- native Opus encode -> decode round-trips at the requested rate
+- atempo stretches the duration by 1/speed
+- ogg_to_wav yields 16 kHz mono 16-bit WAV for Whisper
+- to_samples decodes straight to float32 (natively or via the pool's WAV)
+- wav_to_ogg / pcm16_to_ogg produce Ogg/Opus
+- the stream encoder emits pages per write and its output decodes to the
+  whole (tempo-adjusted) stream
+- without the native codec, conversions go through the ffmpeg pool, and
+  the pool reuses pre-spawned processes
+"""
+
+import io
+import shutil
+import time
+import wave
+
+import pytest
+
+from voice import audio_codec
+
+np = pytest.importorskip("numpy")
+
+
+def _tone(seconds: float, rate: int = 24000):
+    t = np.arange(int(seconds * rate)) / rate
+    return (0.3 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+
+
+@pytest.fixture
+def native():
+    pytest.importorskip("av")
+    if not audio_codec.native_available():
+        pytest.skip("PyAV built without libopus")
+
+
+def test_opus_roundtrip_keeps_duration(native) -> None:
+    ogg = audio_codec.encode_ogg(_tone(2.0), 24000)
+    samples, rate = audio_codec.decode(ogg, 16000)
+
+    assert ogg[:4] == b"OggS"
+    assert rate == 16000
+    assert abs(len(samples) / rate - 2.0) < 0.05
+    assert samples.dtype == np.float32
+
+
+def test_atempo_changes_duration(native) -> None:
+    ogg = audio_codec.encode_ogg(_tone(3.0), 24000, speed=0.9)
+    samples, rate = audio_codec.decode(ogg)
+    assert abs(len(samples) / rate - 3.0 / 0.9) < 0.05
+
+
+def test_ogg_to_wav_is_16k_mono_pcm16(native) -> None:
+    ogg = audio_codec.encode_ogg(_tone(1.0), 24000)
+    with wave.open(io.BytesIO(audio_codec.ogg_to_wav(ogg))) as w:
+        assert (w.getframerate(), w.getnchannels(), w.getsampwidth()) == (16000, 1, 2)
+        assert abs(w.getnframes() / 16000 - 1.0) < 0.05
+
+
+def test_wav_and_pcm_encode_to_ogg(native) -> None:
+    tone = _tone(1.0)
+    assert audio_codec.wav_to_ogg(audio_codec.encode_wav(tone, 24000), speed=0.9)[:4] == b"OggS"
+    pcm = (tone * 32767).astype("<i2").tobytes()
+    assert audio_codec.pcm16_to_ogg(pcm, 24000)[:4] == b"OggS"
+
+
+@pytest.mark.parametrize("fmt", ["ogg", "wav"])
+def test_stream_encoder_is_incremental_and_continuous(native, fmt) -> None:
+    pcm = (_tone(1.0) * 32767).astype("<i2").tobytes()
+    encoder = audio_codec.stream_encoder(24000, speed=0.9, fmt=fmt)
+
+    parts = [encoder.write(pcm) for _ in range(3)]
+    parts.append(encoder.close())
+
+    assert all(parts[:3]) and encoder.close() == b""
+    data = b"".join(parts)
+    if fmt == "ogg":
+        assert data[:4] == b"OggS"
+        samples, rate = audio_codec.decode(data)
+        seconds = len(samples) / rate
+    else:
+        assert data[:4] == b"RIFF"
+        seconds = (len(data) - 44) / 2 / 24000
+    assert abs(seconds - 3.0 / 0.9) < 0.05
+
+
+def test_falls_back_to_ffmpeg_pool_without_native(monkeypatch) -> None:
+    monkeypatch.setattr(audio_codec, "av", None)
+    calls = []
+    monkeypatch.setattr(audio_codec._POOL, "run", lambda cmd, data: calls.append(cmd) or b"OggS")
+
+    assert audio_codec.backend() == "ffmpeg-pool"
+    assert audio_codec.stream_encoder(24000) is None
+    assert audio_codec.wav_to_ogg(b"RIFF", speed=0.9) == b"OggS"
+    assert audio_codec.ogg_to_wav(b"OggS") == b"OggS"
+
+    assert "atempo=0.900" in calls[0] and "libopus" in calls[0]
+    assert calls[1][-5:] == ["-ar", "16000", "-ac", "1", "pipe:1"]
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+def test_pool_reuses_prespawned_processes() -> None:
+    pool = audio_codec.FFmpegPool(per_command=1)
+    cmd = ["ffmpeg", "-hide_banner", "-loglevel", "error",
+           "-f", "s16le", "-ar", "16000", "-ac", "1", "-i", "pipe:0", "-f", "s16le", "pipe:1"]
+    pcm = b"\x00\x01" * 1600
+    try:
+        assert pool.run(cmd, pcm) == pcm
+        for _ in range(50):  # let the background refill land
+            if pool._idle.get(tuple(cmd)):
+                break
+            time.sleep(0.02)
+        assert pool.run(cmd, pcm) == pcm
+        assert pool.warm_hits == 1
+    finally:
+        pool.close()
+
+
+def test_to_samples_decodes_straight_to_float32(native) -> None:
+    ogg = audio_codec.encode_ogg(_tone(1.0), 24000)
+    samples = audio_codec.to_samples(ogg)
+    assert samples.dtype == np.float32
+    assert abs(len(samples) / audio_codec.STT_RATE - 1.0) < 0.05
+
+
+def test_to_samples_falls_back_to_pool_wav(monkeypatch) -> None:
+    monkeypatch.setattr(audio_codec, "av", None)
+    wav = audio_codec.encode_wav(np.array([0.0, 0.5, -0.5], dtype=np.float32), 16000)
+    monkeypatch.setattr(audio_codec._POOL, "run", lambda cmd, data: wav)
+
+    samples = audio_codec.to_samples(b"OggS")
+
+    assert np.allclose(samples, [0.0, 0.5, -0.5], atol=1e-3)
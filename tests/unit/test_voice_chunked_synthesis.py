@@ -3,7 +3,7 @@
 Verifies:
 - Single sentence delegates to _synthesize directly (no concatenation)
 - Multiple sentences calls _synthesize per chunk, concatenates with torch.cat
-- ref_path is forwarded to each _synthesize call
+- ref_path's speaker conditioning is computed once and reused by every chunk
 - torch.cat is called with dim=-1 (time axis)
 - Fallback to single-call _synthesize on chunk error
 - Fallback to single-call _synthesize on concat error
@@ -68,6 +68,13 @@ def _mock_voice_server_deps(monkeypatch):
     monkeypatch.setenv("CUDA_VISIBLE_DEVICES", "")
 
 
+@pytest.fixture
+def ref(tmp_path) -> str:
+    path = tmp_path / "voice_ref.wav"
+    path.write_bytes(b"RIFF")
+    return str(path)
+
+
 def _import_voice_server():
     """Import voice_server with GPU check bypassed."""
     with patch("ctypes.CDLL", side_effect=OSError("no GPU")):
@@ -78,7 +85,7 @@ def _import_voice_server():
         return vs
 
 
-def test_synthesize_chunked_single_sentence() -> None:
+def test_synthesize_chunked_single_sentence(ref) -> None:
     """Single sentence calls _synthesize once and returns its result directly."""
     vs = _import_voice_server()
 
@@ -87,15 +94,13 @@ def test_synthesize_chunked_single_sentence() -> None:
     mock_model.generate.return_value = single_tensor
     vs._chatterbox_model = mock_model
 
-    result = vs._synthesize_chunked("Hello world.", "/fake/ref.wav")
+    result = vs._synthesize_chunked("Hello world.", ref)
 
-    mock_model.generate.assert_called_once_with(
-        "Hello world.", audio_prompt_path="/fake/ref.wav"
-    )
+    mock_model.generate.assert_called_once_with("Hello world.")
     assert result is single_tensor
 
 
-def test_synthesize_chunked_multiple_sentences() -> None:
+def test_synthesize_chunked_multiple_sentences(ref) -> None:
     """Multi-sentence text calls _synthesize per sentence, returns torch.cat result."""
     vs = _import_voice_server()
     torch_mod = sys.modules["torch"]
@@ -109,14 +114,14 @@ def test_synthesize_chunked_multiple_sentences() -> None:
     concat_result = MagicMock()
     torch_mod.cat.return_value = concat_result
 
-    result = vs._synthesize_chunked("First sentence. Second sentence.", "/fake/ref.wav")
+    result = vs._synthesize_chunked("First sentence. Second sentence.", ref)
 
     assert mock_model.generate.call_count == 2
     assert result is concat_result
 
 
-def test_synthesize_chunked_passes_ref_path() -> None:
-    """ref_path is forwarded to each _synthesize call."""
+def test_synthesize_chunked_conditions_once_per_ref(ref) -> None:
+    """Every chunk speaks with ref_path's conditioning, computed only once."""
     vs = _import_voice_server()
     torch_mod = sys.modules["torch"]
     torch_mod.cat.return_value = MagicMock()
@@ -125,14 +130,15 @@ def test_synthesize_chunked_passes_ref_path() -> None:
     mock_model.generate.return_value = MagicMock()
     vs._chatterbox_model = mock_model
 
-    ref = str(_PROJECT_ROOT / "voice_ref/ada.wav")
     vs._synthesize_chunked("One. Two. Three.", ref)
 
+    mock_model.prepare_conditionals.assert_called_once_with(str(_Path(ref).resolve()))
+    assert mock_model.generate.call_count == 3
     for c in mock_model.generate.call_args_list:
-        assert c == call(c[0][0], audio_prompt_path=ref)
+        assert c == call(c[0][0])
 
 
-def test_synthesize_chunked_concatenates_along_time_axis() -> None:
+def test_synthesize_chunked_concatenates_along_time_axis(ref) -> None:
     """torch.cat must be called with dim=-1 (time axis)."""
     vs = _import_voice_server()
     torch_mod = sys.modules["torch"]
@@ -145,14 +151,14 @@ def test_synthesize_chunked_concatenates_along_time_axis() -> None:
     concat_result = MagicMock()
     torch_mod.cat.return_value = concat_result
 
-    vs._synthesize_chunked("Hello world. Goodbye world.", "/fake/ref.wav")
+    vs._synthesize_chunked("Hello world. Goodbye world.", ref)
 
     torch_mod.cat.assert_called_once()
     _, kwargs = torch_mod.cat.call_args
     assert kwargs.get("dim") == -1
 
 
-def test_synthesize_chunked_fallback_on_chunk_error() -> None:
+def test_synthesize_chunked_fallback_on_chunk_error(ref) -> None:
     """If a chunk's _synthesize raises, falls back to single-call _synthesize."""
     vs = _import_voice_server()
 
@@ -166,16 +172,16 @@ def test_synthesize_chunked_fallback_on_chunk_error() -> None:
     ]
     vs._chatterbox_model = mock_model
 
-    result = vs._synthesize_chunked("First ok. Second fails.", "/fake/ref.wav")
+    result = vs._synthesize_chunked("First ok. Second fails.", ref)
 
     # The fallback should call _synthesize with the full text
     assert result is fallback_tensor
     # Last call should be the full text (fallback)
     last_call = mock_model.generate.call_args_list[-1]
-    assert last_call == call("First ok. Second fails.", audio_prompt_path="/fake/ref.wav")
+    assert last_call == call("First ok. Second fails.")
 
 
-def test_synthesize_chunked_fallback_on_concat_error() -> None:
+def test_synthesize_chunked_fallback_on_concat_error(ref) -> None:
     """If torch.cat raises, falls back to single-call _synthesize."""
     vs = _import_voice_server()
     torch_mod = sys.modules["torch"]
@@ -187,11 +193,11 @@ def test_synthesize_chunked_fallback_on_concat_error() -> None:
 
     torch_mod.cat.side_effect = RuntimeError("concat failed")
 
-    result = vs._synthesize_chunked("Sentence one. Sentence two.", "/fake/ref.wav")
+    result = vs._synthesize_chunked("Sentence one. Sentence two.", ref)
 
     assert result is fallback_tensor
     last_call = mock_model.generate.call_args_list[-1]
-    assert last_call == call("Sentence one. Sentence two.", audio_prompt_path="/fake/ref.wav")
+    assert last_call == call("Sentence one. Sentence two.")
 
 
 def test_synthesize_chunked_raises_when_model_not_loaded() -> None:
@@ -0,0 +1,160 @@
+"""Tests for the voice server's inference lanes (voice/inference_queue.py).
+
+Verifies that:
+- jobs run off the event loop and their results reach the awaiting caller
+- interactive jobs are served before queued background jobs
+- a full lane evicts background work for interactive work, else rejects
+- a cancelled / disconnected caller's queued job never runs
+- two lanes (STT and TTS) run their jobs concurrently
+- snapshot() reports depth, counters and latency percentiles
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from voice.inference_queue import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    InferenceLane,
+    QueueFull,
+    parse_priority,
+)
+
+
+def _blocker():
+    """A job that holds the lane's only worker until released."""
+    started, release = threading.Event(), threading.Event()
+
+    def job():
+        started.set()
+        release.wait(5)
+        return "blocker"
+
+    return job, started, release
+
+
+async def _wait_started(started: threading.Event) -> None:
+    assert await asyncio.to_thread(started.wait, 5)
+
+
+def test_parse_priority() -> None:
+    assert parse_priority("background") == PRIORITY_BACKGROUND
+    assert parse_priority(" Interactive ") == PRIORITY_INTERACTIVE
+    assert parse_priority(None) == PRIORITY_INTERACTIVE
+    assert parse_priority("bogus") == PRIORITY_INTERACTIVE
+
+
+async def test_run_returns_result_and_propagates_errors() -> None:
+    lane = InferenceLane("t")
+    assert await lane.run(lambda a, b: a + b, 2, 3) == 5
+
+    def boom():
+        raise RuntimeError("model exploded")
+
+    with pytest.raises(RuntimeError, match="model exploded"):
+        await lane.run(boom)
+    snap = lane.snapshot()
+    assert snap["completed"] == 1 and snap["failed"] == 1
+
+
+async def test_interactive_jumps_queued_background() -> None:
+    lane = InferenceLane("t")
+    job, started, release = _blocker()
+    order: list[str] = []
+    blocker = lane.submit(job)
+    await _wait_started(started)
+
+    bg = lane.submit(order.append, "briefing", priority=PRIORITY_BACKGROUND)
+    fg = lane.submit(order.append, "reply", priority=PRIORITY_INTERACTIVE)
+    release.set()
+    await asyncio.gather(blocker, bg, fg)
+
+    assert order == ["reply", "briefing"]
+
+
+async def test_full_lane_evicts_background_for_interactive() -> None:
+    lane = InferenceLane("t", max_queue=1)
+    job, started, release = _blocker()
+    blocker = lane.submit(job)
+    await _wait_started(started)
+
+    bg = lane.submit(lambda: "briefing", priority=PRIORITY_BACKGROUND)
+    fg = lane.submit(lambda: "reply", priority=PRIORITY_INTERACTIVE)
+    with pytest.raises(QueueFull):
+        lane.submit(lambda: "another reply", priority=PRIORITY_INTERACTIVE)
+    release.set()
+
+    assert await fg == "reply"
+    with pytest.raises(QueueFull):
+        await bg
+    await blocker
+    snap = lane.snapshot()
+    assert snap["evicted"] == 1 and snap["rejected"] == 1
+
+
+async def test_cancelled_job_never_runs() -> None:
+    lane = InferenceLane("t")
+    job, started, release = _blocker()
+    blocker = lane.submit(job)
+    await _wait_started(started)
+
+    ran: list[str] = []
+    queued = lane.submit(ran.append, "late")
+    queued.cancel()
+    release.set()
+    await blocker
+    await lane.run(lambda: None)  # drain past the cancelled job
+
+    assert ran == []
+    assert lane.snapshot()["cancelled"] == 1
+
+
+async def test_disconnected_client_cancels_queued_job(monkeypatch) -> None:
+    monkeypatch.setattr("voice.inference_queue._DISCONNECT_POLL_S", 0.01)
+    lane = InferenceLane("t")
+    job, started, release = _blocker()
+    blocker = lane.submit(job)
+    await _wait_started(started)
+
+    async def gone() -> bool:
+        return True
+
+    ran: list[str] = []
+    with pytest.raises(asyncio.CancelledError):
+        await lane.run(ran.append, "orphan", is_disconnected=gone)
+    release.set()
+    await blocker
+    await lane.run(lambda: None)
+
+    assert ran == []
+
+
+async def test_stt_and_tts_lanes_run_concurrently() -> None:
+    stt, tts = InferenceLane("stt"), InferenceLane("tts")
+    both_in = threading.Barrier(2, timeout=5)
+
+    def meet():
+        both_in.wait()  # deadlocks (BrokenBarrierError) if lanes serialise
+        return True
+
+    assert await asyncio.gather(stt.run(meet), tts.run(meet)) == [True, True]
+
+
+async def test_snapshot_reports_depth_and_latency() -> None:
+    lane = InferenceLane("t", workers=1, max_queue=8)
+    job, started, release = _blocker()
+    blocker = lane.submit(job)
+    await _wait_started(started)
+    queued = [lane.submit(lambda: None, priority=PRIORITY_BACKGROUND) for _ in range(3)]
+
+    snap = lane.snapshot()
+    assert snap["depth"] == 3 and snap["running"] == 1
+    assert snap["depth_by_priority"] == {"interactive": 0, "background": 3}
+
+    release.set()
+    await asyncio.gather(blocker, *queued)
+    snap = lane.snapshot()
+    assert snap["depth"] == 0 and snap["completed"] == 4
+    assert snap["wait_ms_p95"] is not None and snap["run_ms_p50"] is not None
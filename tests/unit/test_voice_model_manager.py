@@ -0,0 +1,175 @@
+"""Tests for the voice model manager (voice/model_manager.py).
+
+Verifies that:
+- nothing loads until first use, and a model loads once however many use it
+- each load's time and resident size (memory delta) are recorded
+- models idle past the TTL are unloaded, but never while pinned
+- a load that would exceed the memory budget evicts the least recently
+  used idle model first
+- a failed load raises ModelLoadError, is reported, and is retried
+- prewarm loads models in the background
+"""
+
+import threading
+
+import pytest
+
+from voice.model_manager import FAILED, READY, UNLOADED, ModelLoadError, ModelManager
+
+MB = 1024 * 1024
+
+
+class _Memory:
+    """Fake memory probe: each load adds its model's size."""
+
+    def __init__(self):
+        self.used = 0
+
+    def __call__(self) -> int:
+        return self.used
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _manager(memory, clock=None, **kwargs) -> ModelManager:
+    return ModelManager(memory_probe=memory, clock=clock or _Clock(), **kwargs)
+
+
+def _register(manager, memory, name, size_mb, unloaded=None):
+    def load():
+        memory.used += size_mb * MB
+        return f"{name}-instance"
+
+    def unload(instance):
+        memory.used -= size_mb * MB
+        if unloaded is not None:
+            unloaded.append(name)
+
+    manager.register(name, load, unload)
+
+
+def test_loads_lazily_once_and_measures_memory() -> None:
+    memory = _Memory()
+    manager = _manager(memory)
+    _register(manager, memory, "whisper:tiny", 75)
+
+    assert manager.state("whisper:tiny") == UNLOADED
+    assert manager.get("whisper:tiny") == "whisper:tiny-instance"
+    assert manager.get("whisper:tiny") == "whisper:tiny-instance"
+
+    model = manager.snapshot()["models"]["whisper:tiny"]
+    assert model["state"] == READY and model["loads"] == 1
+    assert model["resident_mb"] == 75.0 and model["load_s"] is not None
+
+
+def test_concurrent_first_use_loads_once() -> None:
+    loads = []
+    gate = threading.Event()
+    manager = ModelManager()
+
+    def load():
+        gate.wait(timeout=5)
+        loads.append(1)
+        return object()
+
+    manager.register("m", load)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(manager.get("m"))) for _ in range(4)]
+    for t in threads:
+        t.start()
+    gate.set()
+    for t in threads:
+        t.join(timeout=5)
+
+    assert len(loads) == 1 and len(set(map(id, results))) == 1
+
+
+def test_idle_ttl_unloads_but_not_while_pinned() -> None:
+    memory, clock, unloaded = _Memory(), _Clock(), []
+    manager = _manager(memory, clock, idle_ttl_s=60)
+    _register(manager, memory, "a", 10, unloaded)
+    _register(manager, memory, "b", 10, unloaded)
+
+    manager.get("a")
+    with manager.use("b"):
+        clock.now = 120
+        assert manager.reap() == ["a"]
+    assert manager.state("b") == READY  # was pinned during the reap
+
+    clock.now = 200
+    assert manager.reap() == ["b"]
+    assert unloaded == ["a", "b"] and memory.used == 0
+    assert manager.snapshot()["expirations"] == 2
+
+
+def test_budget_evicts_least_recently_used_idle_model() -> None:
+    memory, clock, unloaded = _Memory(), _Clock(), []
+    manager = _manager(memory, clock, budget_bytes=250 * MB)
+    for name in ("a", "b", "c"):
+        _register(manager, memory, name, 100, unloaded)
+
+    manager.get("a")
+    clock.now = 1
+    manager.get("b")
+    clock.now = 2
+    manager.get("a")  # a is now more recent than b
+    clock.now = 3
+    manager.get("c")
+
+    assert unloaded == ["b"]
+    assert manager.state("a") == READY and manager.state("c") == READY
+    assert manager.snapshot()["evictions"] == 1
+    assert manager.resident_bytes() <= 250 * MB
+
+
+def test_budget_never_evicts_a_pinned_model() -> None:
+    memory, unloaded = _Memory(), []
+    manager = _manager(memory, budget_bytes=150 * MB)
+    _register(manager, memory, "a", 100, unloaded)
+    _register(manager, memory, "b", 100, unloaded)
+
+    manager.get("b")  # measure b first so its size is known
+    manager.unload("b")
+    with manager.use("a"):
+        manager.get("b")  # over budget, but a is in use
+
+    assert manager.state("a") == READY and manager.state("b") == READY
+    assert unloaded == ["b"]  # only the explicit unload
+
+
+def test_failed_load_is_reported_and_retried() -> None:
+    attempts = []
+    manager = ModelManager()
+
+    def load():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise OSError("weights missing")
+        return "ok"
+
+    manager.register("m", load)
+
+    with pytest.raises(ModelLoadError):
+        manager.get("m")
+    snap = manager.snapshot()["models"]["m"]
+    assert snap["state"] == FAILED and "weights missing" in snap["error"]
+
+    assert manager.get("m") == "ok"
+    assert manager.snapshot()["models"]["m"]["error"] is None
+
+
+def test_prewarm_loads_in_background() -> None:
+    manager = ModelManager()
+    manager.register("a", lambda: "A")
+    manager.register("broken", lambda: 1 / 0)
+
+    manager.prewarm(["broken", "a"]).join(timeout=5)
+
+    assert manager.state("a") == READY
+    assert manager.state("broken") == FAILED
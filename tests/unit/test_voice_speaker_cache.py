@@ -0,0 +1,150 @@
+"""Tests for the speaker-conditioning cache (voice/speaker_cache.py).
+
+Verifies that:
+- conditioning is computed once per clip and reused
+- editing or replacing a voice_ref.wav recomputes on the next lookup
+- each clip keeps its own conditioning (no cross-mind bleed)
+- a deleted clip raises and drops its entry
+- concurrent misses on one clip compute it once
+- warm() skips clips that fail without stopping the rest
+"""
+
+import os
+import threading
+import time
+
+import pytest
+
+from voice.speaker_cache import SpeakerCache
+
+
+def _counting_compute():
+    calls: list[str] = []
+
+    def compute(path: str):
+        calls.append(path)
+        with open(path, "rb") as f:
+            return ("conds", f.read())
+
+    return compute, calls
+
+
+def _write(path, data: bytes, bump_ns: int = 0) -> None:
+    path.write_bytes(data)
+    if bump_ns:
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + bump_ns))
+
+
+def test_computes_once_and_reuses(tmp_path) -> None:
+    compute, calls = _counting_compute()
+    cache = SpeakerCache(compute)
+    ref = tmp_path / "voice_ref.wav"
+    _write(ref, b"ada")
+
+    assert cache.get(str(ref)) == ("conds", b"ada")
+    assert cache.get(str(ref)) == ("conds", b"ada")
+
+    assert len(calls) == 1
+    assert cache.snapshot() == {"entries": 1, "hits": 1, "misses": 1, "invalidations": 0, "errors": 0}
+
+
+def test_changed_clip_is_recomputed(tmp_path) -> None:
+    compute, calls = _counting_compute()
+    cache = SpeakerCache(compute)
+    ref = tmp_path / "voice_ref.wav"
+    _write(ref, b"old voice")
+    cache.get(str(ref))
+
+    _write(ref, b"new voice", bump_ns=1_000_000)
+
+    assert cache.get(str(ref)) == ("conds", b"new voice")
+    assert len(calls) == 2
+    assert cache.snapshot()["invalidations"] == 1
+
+
+def test_replaced_clip_is_recomputed(tmp_path) -> None:
+    compute, calls = _counting_compute()
+    cache = SpeakerCache(compute)
+    ref = tmp_path / "voice_ref.wav"
+    _write(ref, b"same")
+    cache.get(str(ref))
+
+    tmp = tmp_path / "voice_ref.wav.tmp"
+    _write(tmp, b"same")
+    os.replace(tmp, ref)  # new inode, possibly identical size/mtime
+
+    cache.get(str(ref))
+    assert len(calls) == 2
+
+
+def test_each_mind_keeps_its_own_conditioning(tmp_path) -> None:
+    compute, _ = _counting_compute()
+    cache = SpeakerCache(compute)
+    (tmp_path / "ada").mkdir()
+    (tmp_path / "bob").mkdir()
+    ada, bob = tmp_path / "ada" / "voice_ref.wav", tmp_path / "bob" / "voice_ref.wav"
+    _write(ada, b"ada")
+    _write(bob, b"bob")
+
+    assert cache.get(str(ada)) == ("conds", b"ada")
+    assert cache.get(str(bob)) == ("conds", b"bob")
+    assert cache.get(str(ada)) == ("conds", b"ada")
+
+
+def test_deleted_clip_raises_and_is_dropped(tmp_path) -> None:
+    compute, _ = _counting_compute()
+    cache = SpeakerCache(compute)
+    ref = tmp_path / "voice_ref.wav"
+    _write(ref, b"ada")
+    cache.get(str(ref))
+    ref.unlink()
+
+    with pytest.raises(FileNotFoundError):
+        cache.get(str(ref))
+    assert cache.snapshot()["entries"] == 0
+
+
+def test_concurrent_misses_compute_once(tmp_path) -> None:
+    calls: list[str] = []
+
+    def slow_compute(path: str):
+        calls.append(path)
+        time.sleep(0.05)
+        return "conds"
+
+    cache = SpeakerCache(slow_compute)
+    ref = tmp_path / "voice_ref.wav"
+    _write(ref, b"ada")
+    threads = [threading.Thread(target=cache.get, args=(str(ref),)) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+
+
+def test_warm_skips_failures(tmp_path) -> None:
+    compute, calls = _counting_compute()
+    cache = SpeakerCache(compute)
+    good = tmp_path / "good.wav"
+    _write(good, b"ok")
+
+    assert cache.warm([str(tmp_path / "missing.wav"), str(good)]) == 1
+    assert calls == [str(good.resolve())]
+
+
+def test_clear_drops_every_entry(tmp_path) -> None:
+    compute, calls = _counting_compute()
+    cache = SpeakerCache(compute)
+    refs = [tmp_path / "ada.wav", tmp_path / "bob.wav"]
+    for ref in refs:
+        _write(ref, ref.name.encode())
+    assert cache.warm(str(r) for r in refs) == 2
+
+    cache.clear()
+    assert cache.snapshot()["entries"] == 0
+    assert cache.snapshot()["invalidations"] == 2
+    cache.get(str(refs[0]))
+    assert len(calls) == 3
@@ -0,0 +1,122 @@
+"""Tests for sentence-pipelined voice replies (bots/voice_stream.py).
+
+Verifies that:
+- SentenceCutter emits the first sentence as soon as it is complete
+- later sentences are batched up to segment_chars; flush returns the rest
+- abbreviations ("Dr.") and decimals are not sentence ends
+- VoiceReplyPipeline delivers segments in reply order even when a later
+  segment finishes synthesising first, and records time to first audio
+- a failed segment is skipped, not fatal
+- _stream_to_message(voice=True) sends the first voice note while the
+  gateway is still streaming
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from bots.voice_stream import SentenceCutter, VoiceReplyPipeline
+
+
+def test_cutter_emits_first_sentence_immediately() -> None:
+    cutter = SentenceCutter(segment_chars=100)
+    assert cutter.feed("Hello there") == []
+    assert cutter.feed(".") == []  # a boundary needs the following whitespace
+    assert cutter.feed(" How are you? Fine") == ["Hello there."]
+
+
+def test_cutter_batches_later_sentences_and_flushes() -> None:
+    cutter = SentenceCutter(segment_chars=30)
+    out = cutter.feed("One. ")
+    out += cutter.feed("Two is here. Three. ")
+    out += cutter.feed("Four is longer than that! Five")
+    out += cutter.flush()
+    assert out == ["One.", "Two is here. Three.", "Four is longer than that! Five"]
+
+
+def test_cutter_ignores_abbreviations_and_decimals() -> None:
+    cutter = SentenceCutter()
+    out = cutter.feed("Dr. Smith paid 3.50 dollars, e.g. cash. Then left. ")
+    assert out == ["Dr. Smith paid 3.50 dollars, e.g. cash."]
+
+
+def test_cutter_treats_line_breaks_as_boundaries() -> None:
+    cutter = SentenceCutter()
+    assert cutter.feed("A heading\n") == ["A heading"]
+
+
+async def test_pipeline_delivers_in_order_and_times_first_audio() -> None:
+    first_may_finish = asyncio.Event()
+    delivered = []
+
+    async def synth(text: str) -> bytes:
+        if text.startswith("First"):
+            await first_may_finish.wait()
+        return text.encode()
+
+    async def deliver(audio: bytes) -> None:
+        delivered.append(audio)
+
+    pipeline = VoiceReplyPipeline(synth, deliver, segment_chars=1)
+    pipeline.feed("First sentence. Second sentence. ")
+    pipeline.feed("Third")
+    sender = pipeline.finish()
+    await asyncio.sleep(0.01)
+    assert delivered == []  # Second is ready, but First goes out first
+    first_may_finish.set()
+    await sender
+
+    assert delivered == [b"First sentence.", b"Second sentence.", b"Third"]
+    stats = pipeline.stats()
+    assert stats["segments"] == stats["delivered"] == 3
+    assert stats["first_audio_s"] is not None
+
+
+async def test_pipeline_skips_failed_segment() -> None:
+    delivered = []
+
+    async def synth(text: str) -> bytes:
+        if "bad" in text:
+            raise RuntimeError("TTS error 503")
+        return text.encode()
+
+    async def deliver(audio: bytes) -> None:
+        delivered.append(audio)
+
+    pipeline = VoiceReplyPipeline(synth, deliver, segment_chars=1)
+    pipeline.feed("Good one. A bad one. Good two.")
+    await pipeline.finish()
+
+    assert delivered == [b"Good one.", b"Good two."]
+    assert pipeline.stats()["failed"] == 1
+
+
+async def test_stream_to_message_speaks_before_stream_ends() -> None:
+    import bots.telegram_bot as tb
+
+    chat = MagicMock()
+    voice_sent = asyncio.Event()
+    chat.send_voice = AsyncMock(side_effect=lambda voice: voice_sent.set())
+    spoken_before_end = []
+
+    async def query_stream(*args, **kwargs):
+        yield "The first sentence. "
+        await asyncio.wait_for(voice_sent.wait(), timeout=2)
+        spoken_before_end.append(True)
+        yield "And the rest."
+
+    gateway = MagicMock()
+    gateway.query_stream = query_stream
+    tts = AsyncMock(side_effect=lambda text: f"ogg:{text}".encode())
+
+    with (
+        patch.object(tb, "gateway", gateway),
+        patch.object(tb, "_tts", tts),
+        patch.object(tb, "VOICE_MODE", "sentences"),
+    ):
+        chunks = await tb._stream_to_message(AsyncMock(), 1, 2, "hi", voice=True, chat=chat)
+        await asyncio.gather(*tb._voice_tasks)
+
+    assert chunks == ["The first sentence. And the rest."]
+    assert spoken_before_end == [True]
+    assert [c.args[0] for c in tts.call_args_list] == ["The first sentence.", "And the rest."]
+    assert chat.send_voice.await_count == 2
@@ -0,0 +1,74 @@
+"""Tests for the content-addressed TTS output cache (voice/tts_cache.py).
+
+Verifies that:
+- keys are stable and sensitive to every part
+- put/path/read round-trip and count hits and misses per kind
+- the byte budget evicts least-recently-used entries first
+- LRU order survives a restart (rebuilt from file mtimes)
+- a disabled (0-byte) cache never stores or hits
+"""
+
+import os
+
+from voice.tts_cache import KIND_OGG, KIND_PCM, TTSCache
+
+
+def test_key_is_stable_and_covers_every_part() -> None:
+    k = TTSCache.key("ogg", "chatterbox", "ada", 0.9, "Hello.")
+    assert k == TTSCache.key("ogg", "chatterbox", "ada", 0.9, "Hello.")
+    assert k != TTSCache.key("ogg", "chatterbox", "ada", 1.0, "Hello.")
+    assert k != TTSCache.key("ogg", "kokoro", "ada", 0.9, "Hello.")
+    assert k != TTSCache.key("ogg", "chatterbox", "bob", 0.9, "Hello.")
+    assert len(k) == 64
+
+
+def test_put_then_hit_and_miss_counters(tmp_path) -> None:
+    cache = TTSCache(str(tmp_path), max_bytes=1 << 20)
+    key = TTSCache.key("x")
+
+    assert cache.path(KIND_OGG, key) is None
+    cache.put(KIND_OGG, key, b"OggS")
+    path = cache.path(KIND_OGG, key)
+
+    assert path is not None and open(path, "rb").read() == b"OggS"
+    assert cache.read(KIND_PCM, key) is None  # kinds are separate namespaces
+    snap = cache.snapshot()
+    assert snap["ogg_hits"] == 1 and snap["ogg_misses"] == 1 and snap["pcm_misses"] == 1
+    assert snap["entries"] == 1 and snap["bytes"] == 4
+
+
+def test_evicts_least_recently_used(tmp_path) -> None:
+    cache = TTSCache(str(tmp_path), max_bytes=10)
+    a, b, c = (TTSCache.key(n) for n in "abc")
+    cache.put(KIND_OGG, a, b"aaaa")
+    cache.put(KIND_OGG, b, b"bbbb")
+    cache.path(KIND_OGG, a)  # a is now most recent
+    cache.put(KIND_OGG, c, b"cccc")
+
+    assert cache.read(KIND_OGG, b) is None
+    assert cache.read(KIND_OGG, a) == b"aaaa"
+    assert cache.read(KIND_OGG, c) == b"cccc"
+    assert cache.snapshot()["evictions"] == 1
+    assert cache.snapshot()["bytes"] <= 10
+
+
+def test_lru_order_survives_restart(tmp_path) -> None:
+    first = TTSCache(str(tmp_path), max_bytes=10)
+    old, new = TTSCache.key("old"), TTSCache.key("new")
+    first.put(KIND_PCM, old, b"oooo")
+    first.put(KIND_PCM, new, b"nnnn")
+    old_path = first.path(KIND_PCM, old)
+    os.utime(old_path, ns=(1, 1))  # long unused
+
+    second = TTSCache(str(tmp_path), max_bytes=10)
+    second.put(KIND_PCM, TTSCache.key("next"), b"xxxx")
+
+    assert second.read(KIND_PCM, old) is None
+    assert second.read(KIND_PCM, new) == b"nnnn"
+
+
+def test_disabled_cache_is_inert(tmp_path) -> None:
+    cache = TTSCache(str(tmp_path / "off"), max_bytes=0)
+    cache.put(KIND_OGG, TTSCache.key("x"), b"data")
+    assert cache.path(KIND_OGG, TTSCache.key("x")) is None
+    assert not (tmp_path / "off").exists()
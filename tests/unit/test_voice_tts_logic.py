@@ -1,9 +1,9 @@
 """Tests for Chatterbox TTS synthesis logic.
 
 Verifies that:
-- _synthesize calls model.generate with correct args when model is loaded
+- _synthesize installs the cached speaker conditioning and calls model.generate
 - _synthesize raises RuntimeError when model is not loaded
-- _synthesize works with and without a reference audio path
+- _synthesize refuses to run without a reference audio path (no voice bleed)
 - tts() endpoint handler calls _synthesize_chunked (not _synthesize directly)
 """
 
@@ -86,20 +86,22 @@ def _import_voice_server():
         return vs
 
 
-def test_synthesize_calls_chatterbox_generate() -> None:
-    """When model is loaded and ref audio path is given, _synthesize calls model.generate."""
+def test_synthesize_installs_cached_conditioning_then_generates(tmp_path) -> None:
+    """_synthesize conditions on the ref clip once, then generates with it installed."""
     vs = _import_voice_server()
 
     mock_model = MagicMock()
     mock_model.generate.return_value = MagicMock()  # tensor
     vs._chatterbox_model = mock_model
 
-    ref_path = str(_PROJECT_ROOT / "voice_ref/ada.wav")
-    vs._synthesize("Hello Daniel", ref_path)
+    ref = tmp_path / "voice_ref.wav"
+    ref.write_bytes(b"RIFF")
+    vs._synthesize("Hello Daniel", str(ref))
+    vs._synthesize("Second sentence", str(ref))
 
-    mock_model.generate.assert_called_once_with(
-        "Hello Daniel", audio_prompt_path=ref_path
-    )
+    mock_model.prepare_conditionals.assert_called_once_with(str(ref.resolve()))
+    assert mock_model.generate.call_args_list[-1].args == ("Second sentence",)
+    assert "audio_prompt_path" not in mock_model.generate.call_args.kwargs
 
 
 def test_synthesize_raises_when_model_not_loaded() -> None:
@@ -111,19 +113,16 @@ def test_synthesize_raises_when_model_not_loaded() -> None:
         vs._synthesize("test text")
 
 
-def test_synthesize_without_ref_path() -> None:
-    """When ref_path is None, model.generate is called with audio_prompt_path=None."""
+def test_synthesize_refuses_without_ref_path() -> None:
+    """With no ref_path Chatterbox would reuse the last speaker -- refuse instead."""
     vs = _import_voice_server()
 
     mock_model = MagicMock()
-    mock_model.generate.return_value = MagicMock()
     vs._chatterbox_model = mock_model
 
-    vs._synthesize("Hello world", None)
-
-    mock_model.generate.assert_called_once_with(
-        "Hello world", audio_prompt_path=None
-    )
+    with pytest.raises(ValueError, match="voice_ref"):
+        vs._synthesize("Hello world", None)
+    mock_model.generate.assert_not_called()
 
 
 def test_tts_endpoint_handler_calls_synthesize_chunked() -> None:
@@ -0,0 +1,282 @@
+"""Tests for the sentence-streaming TTS endpoint (/tts/stream).
+
+Verifies that:
+- _sentence_engine resolves the per-engine synth and sample rate
+- a Chatterbox stream with no voice_ref is refused up front (no voice bleed)
+- Chatterbox's sample rate survives the model being unloaded between the
+  stream's load and the engine resolution
+- _stream_sentences feeds every sentence, in order, into one in-process
+  stream encoder and yields each sentence's bytes, with no ffmpeg spawned
+- without the native codec it streams through a pooled ffmpeg pipe instead
+- closing the stream early (client disconnect) kills ffmpeg
+- the sentence cache synthesises a repeated sentence only once
+- voice_ref.wav resolves by short name or mind UUID through the mind registry
+- /tts serves a cache hit from bytes read off the loop, and an entry evicted
+  between lookup and read falls through to synthesis
+"""
+
+import asyncio
+import queue
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _mock_voice_server_deps(monkeypatch):
+    """Mock heavy deps so voice_server can be imported without GPU libs."""
+    monkeypatch.setitem(sys.modules, "numpy", MagicMock())
+    torch_mock = MagicMock()
+    torch_mock.cuda.is_available.return_value = False
+    monkeypatch.setitem(sys.modules, "torch", torch_mock)
+    monkeypatch.setitem(sys.modules, "torchaudio", MagicMock())
+    monkeypatch.setitem(sys.modules, "faster_whisper", MagicMock())
+    monkeypatch.setitem(sys.modules, "soundfile", MagicMock())
+    chatterbox_mod = MagicMock()
+    monkeypatch.setitem(sys.modules, "chatterbox", chatterbox_mod)
+    monkeypatch.setitem(sys.modules, "chatterbox.tts", chatterbox_mod.tts)
+    for mod_name in list(sys.modules.keys()):
+        if "voice_server" in mod_name:
+            del sys.modules[mod_name]
+    monkeypatch.setenv("CUDA_VISIBLE_DEVICES", "")
+
+
+def _import_voice_server():
+    with patch("ctypes.CDLL", side_effect=OSError("no GPU")):
+        import voice.voice_server as vs
+        return vs
+
+
+class _FakeStdin:
+    def __init__(self, proc):
+        self._proc = proc
+
+    def write(self, data: bytes) -> None:
+        self._proc.fed.append(data)
+        self._proc.out.put(b"enc:" + data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self._proc.out.put(b"")
+        self._proc.returncode = 0
+
+
+class _FakeStdout:
+    def __init__(self, proc):
+        self._proc = proc
+
+    def read1(self, _n: int) -> bytes:
+        return self._proc.out.get(timeout=5)
+
+
+class _FakePopen:
+    """Stands in for a pooled ffmpeg: echoes each PCM write back as an 'encoded' chunk."""
+
+    def __init__(self, cmd):
+        self.cmd = cmd
+        self.fed: list[bytes] = []
+        self.killed = False
+        self.returncode = None
+        self.out: queue.Queue = queue.Queue()
+        self.stdin = _FakeStdin(self)
+        self.stdout = _FakeStdout(self)
+
+    def poll(self):
+        return self.returncode
+
+    def kill(self) -> None:
+        self.killed = True
+        self.returncode = -9
+        self.out.put(b"")
+
+    def wait(self) -> int:
+        return self.returncode
+
+
+class _FakeEncoder:
+    def __init__(self, rate, speed, fmt):
+        self.args = (rate, speed, fmt)
+        self.closed = 0
+
+    def write(self, pcm: bytes) -> bytes:
+        return b"enc:" + pcm
+
+    def close(self) -> bytes:
+        self.closed += 1
+        return b"<eos>" if self.closed == 1 else b""
+
+
+def _ffmpeg_only(monkeypatch, vs) -> list[_FakePopen]:
+    procs: list[_FakePopen] = []
+    monkeypatch.setattr(vs.audio_codec, "stream_encoder", lambda *args: None)
+    monkeypatch.setattr(vs.audio_codec, "open_ffmpeg", lambda cmd: procs.append(_FakePopen(cmd)) or procs[-1])
+    return procs
+
+
+def test_sentence_engine_kokoro_uses_kokoro_rate(monkeypatch) -> None:
+    vs = _import_voice_server()
+    monkeypatch.setattr(vs, "_TTS_ENGINE", "kokoro")
+    monkeypatch.setattr(vs, "_KOKORO_VOICE_MAP", {"ada": "af_bella"})
+    monkeypatch.setattr(vs, "_kokoro_pipeline", MagicMock())
+    monkeypatch.setattr(vs, "_synthesize_kokoro", MagicMock(return_value=[0.0]))
+    monkeypatch.setattr(vs, "_pcm16", lambda wave: b"pcm")
+
+    synth, sr = vs._sentence_engine("ada")
+
+    assert sr == vs._KOKORO_SR
+    assert synth("Hi.") == b"pcm"
+    vs._synthesize_kokoro.assert_called_once_with("Hi.", "af_bella")
+
+
+def test_sentence_engine_chatterbox_refuses_missing_voice_ref(monkeypatch) -> None:
+    vs = _import_voice_server()
+    monkeypatch.setattr(vs, "_TTS_ENGINE", "chatterbox")
+    monkeypatch.setattr(vs, "_resolve_voice_ref", lambda voice_id: None)
+
+    with pytest.raises(vs.HTTPException) as exc:
+        vs._sentence_engine("nobody")
+    assert exc.value.status_code == 400
+
+
+def test_sentence_engine_survives_chatterbox_unload_after_load(monkeypatch) -> None:
+    vs = _import_voice_server()
+    monkeypatch.setattr(vs, "_TTS_ENGINE", "chatterbox")
+    monkeypatch.setattr(vs, "_resolve_voice_ref", lambda voice_id: "/minds/ada/voice_ref.wav")
+    monkeypatch.setattr(vs, "_MODELS", vs.ModelManager())
+    vs._MODELS.register("chatterbox", vs._load_chatterbox, vs._unload_chatterbox)
+    sys.modules["chatterbox.tts"].ChatterboxTTS.from_pretrained.return_value = MagicMock(sr=24000)
+
+    vs._MODELS.get("chatterbox")      # tts_stream's load, pin released at once
+    vs._MODELS.unload("chatterbox")   # budget eviction / idle reaper
+    assert vs._chatterbox_model is None
+
+    synth, sr = vs._sentence_engine("ada")
+    assert sr == 24000
+
+
+async def test_stream_sentences_encodes_in_process(monkeypatch) -> None:
+    vs = _import_voice_server()
+    encoders: list[_FakeEncoder] = []
+    monkeypatch.setattr(vs.audio_codec, "stream_encoder", lambda *a: encoders.append(_FakeEncoder(*a)) or encoders[-1])
+    monkeypatch.setattr(vs.audio_codec, "open_ffmpeg", MagicMock(side_effect=AssertionError("spawned ffmpeg")))
+
+    chunks = [
+        chunk async for chunk in vs._stream_sentences(
+            ["One.", "Two.", "Three."], lambda s: s.encode(), 24000, 0.9, "ogg",
+        )
+    ]
+
+    assert chunks == [b"enc:One.", b"enc:Two.", b"enc:Three.", b"<eos>"]
+    (encoder,) = encoders
+    assert encoder.args == (24000, 0.9, "ogg")
+
+
+async def test_stream_sentences_falls_back_to_pooled_ffmpeg(monkeypatch) -> None:
+    vs = _import_voice_server()
+    procs = _ffmpeg_only(monkeypatch, vs)
+
+    sentences = ["One.", "Two.", "Three."]
+    out = b"".join([
+        chunk async for chunk in vs._stream_sentences(
+            sentences, lambda s: s.encode(), 24000, 0.9, "ogg",
+        )
+    ])
+
+    assert out == b"enc:One.enc:Two.enc:Three."
+    (proc,) = procs
+    assert proc.fed == [b"One.", b"Two.", b"Three."]
+    assert "atempo=0.900" in proc.cmd
+    assert proc.cmd[proc.cmd.index("-ar") + 1] == "24000"
+    assert "libopus" in proc.cmd
+
+
+async def test_stream_sentences_wav_skips_atempo_at_unit_speed(monkeypatch) -> None:
+    vs = _import_voice_server()
+    procs = _ffmpeg_only(monkeypatch, vs)
+
+    async for _ in vs._stream_sentences(["Hi."], lambda s: b"x", 24000, 1.0, "wav"):
+        pass
+
+    assert "-af" not in procs[0].cmd
+    assert "pcm_s16le" in procs[0].cmd
+
+
+async def test_client_disconnect_kills_ffmpeg(monkeypatch) -> None:
+    vs = _import_voice_server()
+    procs = _ffmpeg_only(monkeypatch, vs)
+    release = asyncio.Event()
+
+    def slow_synth(sentence: str) -> bytes:
+        if sentence != "First.":
+            asyncio.run_coroutine_threadsafe(release.wait(), loop).result(timeout=5)
+        return sentence.encode()
+
+    loop = asyncio.get_running_loop()
+    stream = vs._stream_sentences(["First.", "Second."], slow_synth, 24000, 1.0, "ogg")
+    assert await stream.__anext__() == b"enc:First."
+    await stream.aclose()
+    release.set()
+
+    assert procs[0].killed
+
+
+def test_sentence_cache_reuses_repeated_sentences(monkeypatch, tmp_path) -> None:
+    vs = _import_voice_server()
+    monkeypatch.setattr(vs, "_TTS_ENGINE", "kokoro")
+    monkeypatch.setattr(vs, "_TTS_SENTENCE_CACHE", True)
+    monkeypatch.setattr(vs, "_kokoro_pipeline", MagicMock())
+    monkeypatch.setattr(vs, "_TTS_CACHE", vs.TTSCache(str(tmp_path), max_bytes=1 << 20))
+    monkeypatch.setattr(vs, "_synthesize_kokoro", MagicMock(return_value=[0.0]))
+    monkeypatch.setattr(vs, "_pcm16", lambda wave: b"pcm")
+
+    synth, _ = vs._sentence_engine("ada")
+    assert [synth(s) for s in ("Hello.", "New.", "Hello.")] == [b"pcm"] * 3
+
+    assert vs._synthesize_kokoro.call_count == 2
+    assert vs._TTS_CACHE.snapshot()["pcm_hits"] == 1
+
+
+async def test_tts_cache_hit_is_read_off_loop_and_eviction_is_a_miss(monkeypatch, tmp_path) -> None:
+    vs = _import_voice_server()
+    monkeypatch.setattr(vs, "_TTS_ENGINE", "kokoro")
+    monkeypatch.setattr(vs, "_TTS_CACHE", vs.TTSCache(str(tmp_path), max_bytes=1 << 20))
+    rendered = []
+
+    async def run_on_lane(lane, request, fn, *args):
+        rendered.append(fn)
+        return b"fresh-ogg"
+
+    monkeypatch.setattr(vs, "_run_on_lane", run_on_lane)
+    req = vs.TTSRequest(text="Hello there.", voice_id="ada")
+    key = vs._TTS_CACHE.key(vs.KIND_OGG, "kokoro", vs._voice_key(vs._resolve_kokoro_voice("ada")), 0.9, "Hello there.")
+    vs._TTS_CACHE.put(vs.KIND_OGG, key, b"cached-ogg")
+
+    hit = await vs.tts(req, MagicMock())
+    assert hit.body == b"cached-ogg" and not rendered
+
+    real_path = vs._TTS_CACHE.path
+    monkeypatch.setattr(vs._TTS_CACHE, "path", lambda kind, k: real_path(kind, k) and str(tmp_path / "evicted"))
+    miss = await vs.tts(req, MagicMock())
+    assert miss.body == b"fresh-ogg" and len(rendered) == 1
+
+
+def test_voice_server_resolves_uuid_through_registry(tmp_path, monkeypatch) -> None:
+    from core.mind_registry import MindRegistry
+
+    vs = _import_voice_server()
+    (tmp_path / "ada").mkdir()
+    (tmp_path / "ada" / "runtime.yaml").write_text("name: ada\nmind_id: ada-uuid\n")
+    (tmp_path / "ada" / "voice_ref.wav").write_bytes(b"RIFF")
+    (tmp_path / "legacy").mkdir()
+    (tmp_path / "legacy" / "voice_ref.wav").write_bytes(b"RIFF")
+    monkeypatch.setattr(vs, "_MINDS_DIR", str(tmp_path))
+    monkeypatch.setattr(vs, "_MINDS", MindRegistry(tmp_path))
+
+    assert vs._resolve_voice_ref("ada-uuid") == str(tmp_path / "ada" / "voice_ref.wav")
+    assert vs._resolve_voice_ref("ada") == str(tmp_path / "ada" / "voice_ref.wav")
+    assert vs._resolve_voice_ref("legacy") == str(tmp_path / "legacy" / "voice_ref.wav")
+    assert vs._resolve_voice_ref("unknown") is None
+    assert vs._mind_voice_refs() == [str(tmp_path / "ada" / "voice_ref.wav")]
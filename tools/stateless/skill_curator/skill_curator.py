@@ -82,6 +82,38 @@ def _load_telemetry():
 
 telemetry = _load_telemetry()
 
+
+def _load_core_module(name: str):
+    """Import ``core.<name>`` from the repo.
+
+    Ensures the repo root is on sys.path so the normal package import works
+    whether running under pytest or as a standalone CLI script. Falls back to
+    loading by file path (bypassing builtins.__import__) when tests mock the
+    import machinery.
+    """
+    repo_root = _THIS_DIR.parents[2]
+    repo_root_str = str(repo_root)
+    if repo_root_str not in sys.path:
+        sys.path.insert(0, repo_root_str)
+
+    try:
+        return getattr(__import__("core", fromlist=[name]), name)
+    except Exception as exc:
+        path = repo_root / "core" / f"{name}.py"
+        spec = importlib.util.spec_from_file_location(f"core.{name}", str(path))
+        if spec is None or spec.loader is None:
+            raise ImportError(f"cannot load {name} from {path}") from exc
+        mod = importlib.util.module_from_spec(spec)
+        sys.modules[f"core.{name}"] = mod
+        spec.loader.exec_module(mod)
+        return mod
+
+
+def _load_skill_index():
+    """Import ``core.skill_index`` — the shared parse-once SKILL.md index."""
+    return _load_core_module("skill_index")
+
+
 # Re-use the canonical state constants so curator + telemetry never drift.
 STATE_ACTIVE = telemetry.STATE_ACTIVE
 STATE_STALE = telemetry.STATE_STALE
@@ -144,18 +176,14 @@ def eligible_skill_rows(config_dir: Path) -> List[Dict[str, Any]]:
     if not skills_root.is_dir():
         return []
 
+    index = _load_skill_index().skills_dir_index(skills_root)
+    index.refresh()
     data = telemetry.load_usage(config_dir)
     rows: List[Dict[str, Any]] = []
-    for entry in sorted(skills_root.iterdir()):
-        name = entry.name
-        if name.startswith("."):
-            continue
+    for skill in sorted(index.records(), key=lambda r: r.dir_name):
+        name = skill.dir_name
         # A symlinked skill dir is an externally-owned plugin skill (D2).
-        if os.path.islink(str(entry)):
-            continue
-        if not entry.is_dir():
-            continue
-        if not (entry / "SKILL.md").is_file():
+        if skill.symlink:
             continue
 
         raw = data.get(name)
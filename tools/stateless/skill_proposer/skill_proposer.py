@@ -69,8 +69,8 @@ def _load_skill_manage():
     return mod
 
 
-def _load_training_capture():
-    """Import ``core.training_capture`` — the authoritative DB layer.
+def _load_core_module(name: str):
+    """Import ``core.<name>`` from the repo.
 
     Ensures the repo root is on sys.path so the normal package import works
     whether running under pytest or as a standalone CLI script. Falls back to
@@ -83,19 +83,28 @@ def _load_training_capture():
         sys.path.insert(0, repo_root_str)
 
     try:
-        from core import training_capture as tc  # type: ignore
-        return tc
-    except Exception:
-        path = repo_root / "core" / "training_capture.py"
-        spec = importlib.util.spec_from_file_location("core.training_capture", str(path))
+        return getattr(__import__("core", fromlist=[name]), name)
+    except Exception as exc:
+        path = repo_root / "core" / f"{name}.py"
+        spec = importlib.util.spec_from_file_location(f"core.{name}", str(path))
         if spec is None or spec.loader is None:
-            raise ImportError(f"cannot load training_capture from {path}")
+            raise ImportError(f"cannot load {name} from {path}") from exc
         mod = importlib.util.module_from_spec(spec)
-        sys.modules["core.training_capture"] = mod
+        sys.modules[f"core.{name}"] = mod
         spec.loader.exec_module(mod)
         return mod
 
 
+def _load_training_capture():
+    """Import ``core.training_capture`` — the authoritative DB layer."""
+    return _load_core_module("training_capture")
+
+
+def _load_skill_index():
+    """Import ``core.skill_index`` — the shared parse-once SKILL.md index."""
+    return _load_core_module("skill_index")
+
+
 # ---------------------------------------------------------------------------
 # Cluster record
 # ---------------------------------------------------------------------------
@@ -316,9 +325,11 @@ def read_recent_turn_records(
     the parallel concrete-invocation details, and the success verdict. Rows are
     ordered ``captured_at DESC, id DESC`` and limited to ``lookback_turns``;
     optionally filtered by ``harness``. Turns with no tool_use blocks are
-    skipped. Uses ``core.training_capture.connect`` for schema fidelity."""
+    skipped. Uses ``core.training_capture.connect`` for schema fidelity and
+    ``core.training_codec`` to decode compressed ``assistant_blocks``."""
     tc = _load_training_capture()
-    sql = "SELECT assistant_blocks FROM training_turns WHERE mind_id = ?"
+    codec = _load_core_module("training_codec").codec_for(db_path)
+    sql = "SELECT assistant_blocks, blocks_codec FROM training_turns WHERE mind_id = ?"
     params: List[Any] = [mind_id]
     if harness is not None:
         sql += " AND harness = ?"
@@ -329,10 +340,12 @@ def read_recent_turn_records(
     records: List[TurnRecord] = []
     with tc.connect(db_path) as conn:
         rows = conn.execute(sql, params).fetchall()
-    for row in rows:
-        raw = row["assistant_blocks"]
-        if not raw:
-            continue
+        texts = [
+            codec.decode(conn, row["assistant_blocks"], row["blocks_codec"])
+            for row in rows
+            if row["assistant_blocks"]
+        ]
+    for raw in texts:
         try:
             blocks = json.loads(raw)
         except (TypeError, ValueError):
@@ -550,20 +563,13 @@ def existing_skill_names(config_dir: Path) -> set:
     symlinks; skip dotdirs). A plugin skill (symlink) counts as covering work,
     so symlinks are included — mirrors the curator's one-level dir scan but
     without the symlink exclusion (coverage is broader than curation).
+
+    Read from the shared ``SkillIndex``, which only re-reads changed SKILL.md
+    files.
     """
-    skills_root = _skills_root(config_dir)
-    names: set = set()
-    if not skills_root.is_dir():
-        return names
-    for entry in skills_root.iterdir():
-        if entry.name.startswith("."):
-            continue
-        # Real dir or symlink-to-dir, with a SKILL.md.
-        if not entry.is_dir():
-            continue
-        if (entry / "SKILL.md").is_file():
-            names.add(entry.name)
-    return names
+    index = _load_skill_index().skills_dir_index(_skills_root(config_dir))
+    index.refresh()
+    return index.names()
 
 
 def is_covered(cluster: SequenceCluster, existing_names: set) -> bool:
@@ -0,0 +1,411 @@
+"""
+Hive Mind -- Voice audio codec.
+
+In-process audio conversion for the voice server: decode any container the
+STT path receives (OGG/Opus voice notes, WAV), resample to mono at a target
+rate, apply a tempo change and encode Ogg/Opus -- all on NumPy buffers, with
+no temp files and no process spawn per request. The native path uses PyAV
+(libav* with libopus and the same ``atempo`` filter ffmpeg would run).
+
+When PyAV (or its libopus) is unavailable, or fails on an input, the
+module falls back to :class:`FFmpegPool`: ffmpeg processes spawned ahead of
+time per command line, so a request only pays for piping its buffer through
+an already-started encoder.
+
+The ``ogg_to_wav`` / ``wav_to_ogg`` / ``pcm16_to_ogg`` helpers keep the
+byte-in, byte-out contract the server's callers already use.
+:func:`stream_encoder` is the incremental form for ``/tts/stream``. It
+returns one continuous Ogg/Opus (or WAV) stream, fed sentence by sentence,
+or ``None`` when the caller should stream through a pooled ffmpeg
+(:func:`open_ffmpeg`) instead.
+"""
+
+import io
+import logging
+import subprocess
+import threading
+import wave
+from collections import OrderedDict
+
+try:
+    import av
+    import av.filter
+except ImportError:
+    av = None
+
+log = logging.getLogger("hive-mind.voice")
+
+OPUS_RATE = 48000  # libopus' native rate; the encoder resamples to it
+OPUS_BITRATE = 64000
+STT_RATE = 16000  # what Whisper expects
+_FRAME_SAMPLES = 4096
+
+
+def native_available() -> bool:
+    """Whether PyAV with a libopus encoder is importable."""
+    return av is not None and "libopus" in av.codecs_available
+
+
+# ---------------------------------------------------------------------------
+# Native (PyAV) codec
+# ---------------------------------------------------------------------------
+def decode(data: bytes, rate: int | None = None):
+    """Decode any audio container to mono float32 samples.
+
+    Returns ``(samples, rate)``; *rate* defaults to the stream's own rate.
+    """
+    import numpy as np
+
+    chunks = []
+    with av.open(io.BytesIO(data)) as container:
+        stream = container.streams.audio[0]
+        rate = rate or stream.rate
+        resampler = av.AudioResampler(format="flt", layout="mono", rate=rate)
+        for frame in container.decode(stream):
+            chunks.extend(f.to_ndarray().reshape(-1) for f in resampler.resample(frame))
+        chunks.extend(f.to_ndarray().reshape(-1) for f in resampler.resample(None))
+    samples = np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.float32)
+    return samples, rate
+
+
+def _float_frames(samples):
+    """Mono float32 (or int16) samples as a contiguous (1, n) float32 array."""
+    import numpy as np
+
+    x = np.asarray(samples)
+    if x.dtype == np.int16:
+        x = x.astype(np.float32) / 32768.0
+    return np.ascontiguousarray(x, dtype=np.float32).reshape(1, -1)
+
+
+def _tempo_graph(rate: int, speed: float, out_rate: int, sample_fmt: str):
+    """abuffer -> [atempo] -> aresample -> aformat -> abuffersink."""
+    graph = av.filter.Graph()
+    chain = [graph.add_abuffer(format="flt", sample_rate=rate, layout="mono")]
+    if speed != 1.0:
+        chain.append(graph.add("atempo", f"{speed:.3f}"))
+    chain.append(graph.add("aresample", str(out_rate)))
+    chain.append(graph.add("aformat", f"sample_fmts={sample_fmt}:channel_layouts=mono"))
+    chain.append(graph.add("abuffersink"))
+    graph.link_nodes(*chain).configure()
+    return graph
+
+
+def _push(graph, x, rate: int, pts: int, emit) -> int:
+    """Push (1, n) float32 samples through *graph*; ``emit`` each output frame."""
+    for start in range(0, x.shape[1], _FRAME_SAMPLES):
+        frame = av.AudioFrame.from_ndarray(x[:, start:start + _FRAME_SAMPLES], format="flt", layout="mono")
+        frame.sample_rate = rate
+        frame.pts = pts + start
+        graph.push(frame)
+        _pull(graph, emit)
+    return pts + x.shape[1]
+
+
+def _pull(graph, emit) -> None:
+    while True:
+        try:
+            frame = graph.pull()
+        except (av.error.BlockingIOError, av.error.EOFError):
+            return
+        frame.pts = None
+        emit(frame)
+
+
+def encode_ogg(samples, rate: int, speed: float = 1.0) -> bytes:
+    """Encode mono float32 (or int16) samples to Ogg/Opus, applying atempo."""
+    x = _float_frames(samples)
+    out = io.BytesIO()
+    with av.open(out, "w", format="ogg") as container:
+        stream = container.add_stream("libopus", rate=OPUS_RATE)
+        stream.bit_rate = OPUS_BITRATE
+        stream.layout = "mono"
+
+        graph = _tempo_graph(rate, speed, OPUS_RATE, "flt")
+
+        def emit(frame) -> None:
+            container.mux(stream.encode(frame))
+
+        _push(graph, x, rate, 0, emit)
+        graph.push(None)
+        _pull(graph, emit)
+        container.mux(stream.encode(None))
+    return out.getvalue()
+
+
+class _Sink:
+    """Write-only file object collecting what the muxer has flushed."""
+
+    def __init__(self) -> None:
+        self._buf = bytearray()
+
+    def write(self, data) -> int:
+        self._buf += data
+        return len(data)
+
+    def take(self) -> bytes:
+        out = bytes(self._buf)
+        self._buf.clear()
+        return out
+
+
+class StreamEncoder:
+    """Incremental mono int16 PCM -> one Ogg/Opus (or WAV) stream.
+
+    :meth:`write` takes the PCM of one sentence. It returns the encoded
+    bytes completed so far: Ogg pages are flushed at least every
+    ``page_duration`` (200 ms). :meth:`close` drains the filter and the
+    encoder and returns the rest. ``atempo`` runs in one filter graph for the
+    whole stream, so sentence joins are seamless. WAV output has the
+    streaming header ffmpeg writes to a pipe (unknown sizes) followed by
+    int16 PCM at the input rate.
+    """
+
+    def __init__(self, rate: int, speed: float = 1.0, fmt: str = "ogg") -> None:
+        if fmt not in ("ogg", "wav"):
+            raise ValueError(f"unknown stream format {fmt!r}")
+        self.rate = rate
+        self.fmt = fmt
+        self._pts = 0
+        self._closed = False
+        self._sink = _Sink()
+        if fmt == "ogg":
+            self._graph = _tempo_graph(rate, speed, OPUS_RATE, "flt")
+            self._container = av.open(
+                self._sink, "w", format="ogg",
+                options={"page_duration": "200000", "flush_packets": "1"},
+            )
+            self._stream = self._container.add_stream("libopus", rate=OPUS_RATE)
+            self._stream.bit_rate = OPUS_BITRATE
+            self._stream.layout = "mono"
+        else:
+            self._graph = _tempo_graph(rate, speed, rate, "s16")
+            self._container = self._stream = None
+            self._sink.write(_wav_stream_header(rate))
+
+    def _emit(self, frame) -> None:
+        if self._container is not None:
+            self._container.mux(self._stream.encode(frame))
+        else:
+            self._sink.write(frame.to_ndarray().astype("<i2").tobytes())
+
+    def write(self, pcm: bytes) -> bytes:
+        import numpy as np
+
+        if self._closed:
+            raise ValueError("stream encoder is closed")
+        self._pts = _push(self._graph, _float_frames(np.frombuffer(pcm, dtype="<i2")), self.rate, self._pts, self._emit)
+        return self._sink.take()
+
+    def close(self) -> bytes:
+        """Flush and finish the stream; a second call returns ``b""``."""
+        if self._closed:
+            return b""
+        self._closed = True
+        try:
+            self._graph.push(None)
+            _pull(self._graph, self._emit)
+            if self._container is not None:
+                self._container.mux(self._stream.encode(None))
+        finally:
+            if self._container is not None:
+                self._container.close()
+        return self._sink.take()
+
+
+def _wav_stream_header(rate: int) -> bytes:
+    """A 16-bit mono WAV header with unknown (0xFFFFFFFF) sizes."""
+    import struct
+
+    unknown = 0xFFFFFFFF
+    return (
+        b"RIFF" + struct.pack("<I", unknown) + b"WAVE"
+        + b"fmt " + struct.pack("<IHHIIHH", 16, 1, 1, rate, rate * 2, 2, 16)
+        + b"data" + struct.pack("<I", unknown)
+    )
+
+
+def wav_samples(data: bytes):
+    """Parse a 16-bit PCM WAV into mono float32 samples."""
+    import numpy as np
+
+    with wave.open(io.BytesIO(data)) as w:
+        channels = w.getnchannels()
+        pcm = np.frombuffer(w.readframes(w.getnframes()), dtype="<i2")
+    if channels > 1:
+        pcm = pcm.reshape(-1, channels).mean(axis=1)
+    return pcm.astype(np.float32) / 32768.0
+
+
+def encode_wav(samples, rate: int) -> bytes:
+    """Encode mono float32 samples as a 16-bit PCM WAV."""
+    import numpy as np
+
+    pcm = (np.clip(np.asarray(samples, dtype=np.float32), -1.0, 1.0) * 32767.0).astype("<i2")
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(pcm.tobytes())
+    return buf.getvalue()
+
+
+# ---------------------------------------------------------------------------
+# ffmpeg fallback
+# ---------------------------------------------------------------------------
+class FFmpegPool:
+    """Pre-spawned ffmpeg processes, kept warm per command line.
+
+    An ffmpeg process converts exactly one input, so "persistent" means the
+    pool keeps ``per_command`` idle processes already started (binary
+    loaded, codecs initialised, blocked on stdin) for the ``max_commands``
+    most recently used command lines, and replaces each one as it is used.
+    """
+
+    def __init__(self, per_command: int = 2, max_commands: int = 4):
+        self.per_command = per_command
+        self.max_commands = max_commands
+        self._idle: OrderedDict[tuple, list[subprocess.Popen]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.spawned = 0
+        self.warm_hits = 0
+
+    def _spawn(self, cmd: tuple) -> subprocess.Popen:
+        self.spawned += 1
+        return subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+    def _take(self, cmd: tuple) -> subprocess.Popen | None:
+        with self._lock:
+            idle = self._idle.get(cmd, [])
+            self._idle[cmd] = idle
+            self._idle.move_to_end(cmd)
+            while idle:
+                proc = idle.pop()
+                if proc.poll() is None:
+                    self.warm_hits += 1
+                    return proc
+            return None
+
+    def _refill(self, cmd: tuple) -> None:
+        try:
+            with self._lock:
+                missing = self.per_command - len(self._idle.get(cmd, []))
+            fresh = [self._spawn(cmd) for _ in range(max(0, missing))]
+        except OSError:
+            return
+        with self._lock:
+            self._idle.setdefault(cmd, []).extend(fresh)
+            while len(self._idle) > self.max_commands:
+                _, stale = self._idle.popitem(last=False)
+                for proc in stale:
+                    proc.kill()
+
+    def open(self, cmd: list[str]) -> subprocess.Popen:
+        """A started process for ``cmd``, owned (and reaped) by the caller.
+
+        For streaming use: the caller writes stdin and reads stdout
+        incrementally instead of handing over one buffer.
+        """
+        key = tuple(cmd)
+        proc = self._take(key) or self._spawn(key)
+        threading.Thread(target=self._refill, args=(key,), daemon=True).start()
+        return proc
+
+    def run(self, cmd: list[str], data: bytes) -> bytes:
+        """Pipe *data* through ``cmd`` (reading pipe:0, writing pipe:1)."""
+        proc = self.open(cmd)
+        stdout, stderr = proc.communicate(data)
+        if proc.returncode != 0:
+            raise RuntimeError(f"ffmpeg {' '.join(cmd[1:])}: {stderr.decode(errors='replace')}")
+        return stdout
+
+    def close(self) -> None:
+        with self._lock:
+            for procs in self._idle.values():
+                for proc in procs:
+                    proc.kill()
+            self._idle.clear()
+
+
+_POOL = FFmpegPool()
+_native_broken = False
+
+
+def _opus_args(speed: float) -> list[str]:
+    args = ["-af", f"atempo={speed:.3f}"] if speed != 1.0 else []
+    return args + ["-c:a", "libopus", "-b:a", "64k", "-f", "ogg", "pipe:1"]
+
+
+def _native(label: str, fn, *args):
+    """Run a native conversion; None means "use ffmpeg instead"."""
+    global _native_broken
+    if _native_broken or not native_available():
+        return None
+    try:
+        return fn(*args)
+    except (av.error.FFmpegError, ValueError) as exc:
+        log.warning("Native %s failed, using ffmpeg: %s", label, exc)
+        return None
+    except (AttributeError, TypeError):
+        # PyAV API mismatch (e.g. an old wheel) -- don't retry every request.
+        log.warning("Native codec unusable with this PyAV; falling back to ffmpeg", exc_info=True)
+        _native_broken = True
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Byte-level helpers used by the server
+# ---------------------------------------------------------------------------
+def ogg_to_wav(data: bytes) -> bytes:
+    """Any container (OGG/Opus voice note) -> 16 kHz mono 16-bit WAV."""
+    out = _native("decode", lambda: encode_wav(decode(data, STT_RATE)[0], STT_RATE))
+    if out is not None:
+        return out
+    return _POOL.run(["ffmpeg", "-i", "pipe:0", "-f", "wav", "-ar", str(STT_RATE), "-ac", "1", "pipe:1"], data)
+
+
+def to_samples(data: bytes, rate: int = STT_RATE):
+    """Any container -> mono float32 samples at *rate*, with no WAV round-trip."""
+    out = _native("decode", lambda: decode(data, rate)[0])
+    if out is not None:
+        return out
+    wav = _POOL.run(["ffmpeg", "-i", "pipe:0", "-f", "wav", "-ar", str(rate), "-ac", "1", "pipe:1"], data)
+    return wav_samples(wav)
+
+
+def wav_to_ogg(data: bytes, speed: float = 1.0) -> bytes:
+    """WAV (any sample format) -> Ogg/Opus, applying atempo if speed != 1.0."""
+    out = _native("encode", lambda: encode_ogg(*decode(data), speed=speed))
+    if out is not None:
+        return out
+    return _POOL.run(["ffmpeg", "-i", "pipe:0", *_opus_args(speed)], data)
+
+
+def pcm16_to_ogg(pcm: bytes, rate: int, speed: float = 1.0) -> bytes:
+    """Raw mono int16 PCM -> Ogg/Opus, applying atempo if speed != 1.0."""
+    def native():
+        import numpy as np
+        return encode_ogg(np.frombuffer(pcm, dtype="<i2"), rate, speed=speed)
+
+    out = _native("encode", native)
+    if out is not None:
+        return out
+    return _POOL.run(
+        ["ffmpeg", "-f", "s16le", "-ar", str(rate), "-ac", "1", "-i", "pipe:0", *_opus_args(speed)], pcm,
+    )
+
+
+def stream_encoder(rate: int, speed: float = 1.0, fmt: str = "ogg") -> StreamEncoder | None:
+    """A native :class:`StreamEncoder`, or None: stream through :func:`open_ffmpeg`."""
+    return _native("stream encode", StreamEncoder, rate, speed, fmt)
+
+
+def open_ffmpeg(cmd: list[str]) -> subprocess.Popen:
+    """A warm ffmpeg process for ``cmd`` from the pool, for streaming."""
+    return _POOL.open(cmd)
+
+
+def backend() -> str:
+    """Which converter requests are using right now, for /health."""
+    return "pyav" if native_available() and not _native_broken else "ffmpeg-pool"
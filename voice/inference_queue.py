@@ -0,0 +1,223 @@
+"""
+Hive Mind -- Voice inference lanes.
+
+Model calls (Whisper, Chatterbox, Kokoro) and the ffmpeg conversions around
+them are blocking. Running them inline in an ``async def`` handler freezes
+the event loop: ``/health`` and every other caller stall behind one long
+synthesis. Each :class:`InferenceLane` owns its own worker threads and a
+bounded priority queue, so the server keeps one lane for STT and one for
+TTS and both run concurrently, even on a CPU-only box (torch, ctranslate2
+and ffmpeg all release the GIL while they work).
+
+Priorities: ``interactive`` (a user is waiting on a reply, e.g. Telegram
+voice) is served before ``background`` (scheduler briefings). When a lane
+is full, an interactive job evicts the newest background job rather than
+being turned away.
+
+A job whose caller has gone away (client disconnect, cancelled await) is
+dropped before it starts. A job that is already running finishes its
+current model call; nothing can interrupt a thread mid-inference.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+log = logging.getLogger("hive-mind.voice")
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+PRIORITIES = {"interactive": PRIORITY_INTERACTIVE, "background": PRIORITY_BACKGROUND}
+
+_SAMPLE_WINDOW = 256  # recent jobs kept for latency percentiles
+_DISCONNECT_POLL_S = 0.5
+
+
+class QueueFull(Exception):
+    """The lane is at capacity and the job could not be admitted."""
+
+
+def parse_priority(value: str | None) -> int:
+    """Map a priority name (header value) to its class; unknown -> interactive."""
+    return PRIORITIES.get((value or "").strip().lower(), PRIORITY_INTERACTIVE)
+
+
+@dataclass(order=True)
+class _Job:
+    priority: int
+    seq: int
+    fn: Callable[..., Any] = field(compare=False)
+    args: tuple = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    loop: asyncio.AbstractEventLoop = field(compare=False)
+    enqueued_at: float = field(compare=False)
+
+
+def _percentile(samples: deque, q: float) -> float | None:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 1)
+
+
+class InferenceLane:
+    """A fixed pool of worker threads fed by a bounded priority queue."""
+
+    def __init__(self, name: str, workers: int = 1, max_queue: int = 32):
+        self.name = name
+        self.workers = max(1, workers)
+        self.max_queue = max(1, max_queue)
+        self._heap: list[_Job] = []
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._threads: list[threading.Thread] = []
+        self._running = 0
+        self._counts = {
+            "submitted": 0, "completed": 0, "failed": 0,
+            "cancelled": 0, "rejected": 0, "evicted": 0,
+        }
+        self._wait_ms: deque[float] = deque(maxlen=_SAMPLE_WINDOW)
+        self._run_ms: deque[float] = deque(maxlen=_SAMPLE_WINDOW)
+
+    # -- submission ---------------------------------------------------------
+
+    def submit(self, fn: Callable[..., Any], *args: Any, priority: int = PRIORITY_INTERACTIVE) -> asyncio.Future:
+        """Queue ``fn(*args)``; return a future resolved on the caller's loop.
+
+        Cancelling the future drops the job if it has not started yet.
+        Raises :class:`QueueFull` when the lane is at capacity and nothing
+        of lower priority can be evicted.
+        """
+        loop = asyncio.get_running_loop()
+        job = _Job(priority, next(self._seq), fn, args, loop.create_future(), loop, time.monotonic())
+        evicted = None
+        with self._cond:
+            self._start_workers()
+            self._discard_cancelled()
+            if len(self._heap) >= self.max_queue:
+                victim = max(self._heap)  # lowest priority, newest
+                if victim.priority <= priority:
+                    self._counts["rejected"] += 1
+                    raise QueueFull(f"{self.name} queue full ({self.max_queue})")
+                self._heap.remove(victim)
+                heapq.heapify(self._heap)
+                self._counts["evicted"] += 1
+                evicted = victim
+            heapq.heappush(self._heap, job)
+            self._counts["submitted"] += 1
+            self._cond.notify()
+        if evicted is not None:
+            log.warning("%s lane full: evicted a priority-%d job for a priority-%d one",
+                        self.name, evicted.priority, priority)
+            evicted.loop.call_soon_threadsafe(
+                _settle, evicted.future, None, QueueFull(f"{self.name} queue full; evicted"),
+            )
+        return job.future
+
+    async def run(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        priority: int = PRIORITY_INTERACTIVE,
+        is_disconnected: Callable[[], Awaitable[bool]] | None = None,
+    ) -> Any:
+        """Submit and await ``fn(*args)``.
+
+        If ``is_disconnected`` is given (e.g. ``request.is_disconnected``) it
+        is polled while waiting; a disconnected client cancels the job.
+        """
+        future = self.submit(fn, *args, priority=priority)
+        try:
+            if is_disconnected is None:
+                return await future
+            while True:
+                done, _ = await asyncio.wait({future}, timeout=_DISCONNECT_POLL_S)
+                if done:
+                    return future.result()
+                if await is_disconnected():
+                    log.info("%s: client disconnected; cancelling job", self.name)
+                    future.cancel()
+                    raise asyncio.CancelledError()
+        finally:
+            if not future.done():
+                future.cancel()
+
+    # -- workers ------------------------------------------------------------
+
+    def _start_workers(self) -> None:
+        while len(self._threads) < self.workers:
+            t = threading.Thread(
+                target=self._worker, name=f"voice-{self.name}-{len(self._threads)}", daemon=True,
+            )
+            self._threads.append(t)
+            t.start()
+
+    def _discard_cancelled(self) -> None:
+        live = [j for j in self._heap if not j.future.cancelled()]
+        if len(live) != len(self._heap):
+            self._counts["cancelled"] += len(self._heap) - len(live)
+            self._heap = live
+            heapq.heapify(self._heap)
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                while not self._heap:
+                    self._cond.wait()
+                job = heapq.heappop(self._heap)
+                if job.future.cancelled():
+                    self._counts["cancelled"] += 1
+                    continue
+                self._running += 1
+            started = time.monotonic()
+            result, error = None, None
+            try:
+                result = job.fn(*job.args)
+            except BaseException as exc:  # noqa: BLE001 -- surfaced to the awaiting caller
+                error = exc
+            finished = time.monotonic()
+            with self._cond:
+                self._running -= 1
+                self._wait_ms.append((started - job.enqueued_at) * 1000)
+                self._run_ms.append((finished - started) * 1000)
+                self._counts["failed" if error else "completed"] += 1
+            try:
+                job.loop.call_soon_threadsafe(_settle, job.future, result, error)
+            except RuntimeError:
+                pass  # caller's loop is gone
+
+    # -- metrics ------------------------------------------------------------
+
+    def snapshot(self) -> dict:
+        with self._cond:
+            self._discard_cancelled()
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "depth": len(self._heap),
+                "depth_by_priority": {
+                    name: sum(1 for j in self._heap if j.priority == p)
+                    for name, p in PRIORITIES.items()
+                },
+                "running": self._running,
+                **self._counts,
+                "wait_ms_p50": _percentile(self._wait_ms, 0.5),
+                "wait_ms_p95": _percentile(self._wait_ms, 0.95),
+                "run_ms_p50": _percentile(self._run_ms, 0.5),
+                "run_ms_p95": _percentile(self._run_ms, 0.95),
+            }
+
+
+def _settle(future: asyncio.Future, result: Any, error: BaseException | None) -> None:
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
@@ -0,0 +1,306 @@
+"""
+Hive Mind -- Voice model manager.
+
+Owns the lifecycle of the voice server's models (Whisper sizes, the TTS
+engine). Nothing is loaded at import or startup: a model is loaded the first
+time a request needs it, or ahead of time by an optional background prewarm.
+Each load is timed and its resident cost measured (the growth of the
+process' memory across the load), so the manager knows what every model
+actually costs on this host.
+
+Models are unloaded again when they have been idle longer than
+``idle_ttl_s``, and -- when a memory budget is set -- before a load that
+would not fit, least recently used first. A model that is in use (pinned
+with :meth:`ModelManager.use`) is never unloaded underneath its caller.
+"""
+
+import gc
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable
+
+log = logging.getLogger("hive-mind.voice")
+
+UNLOADED = "unloaded"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+_MB = 1024 * 1024
+
+
+class ModelLoadError(RuntimeError):
+    """A model could not be loaded; the request that needed it cannot run."""
+
+
+def rss_bytes() -> int:
+    """Resident set size of this process (0 where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+@dataclass
+class _Model:
+    name: str
+    load: Callable[[], Any]
+    unload: Callable[[Any], None] | None
+    estimate_bytes: int
+    state: str = UNLOADED
+    instance: Any = None
+    resident_bytes: int = 0  # measured on the last load; kept after unload
+    load_s: float | None = None
+    last_used: float = 0.0
+    in_use: int = 0
+    loads: int = 0
+    unloads: int = 0
+    error: str | None = None
+
+
+class ModelManager:
+    """Lazy loading, idle unloading and a memory budget for named models.
+
+    ``budget_bytes <= 0`` means no budget; ``idle_ttl_s <= 0`` keeps models
+    resident once loaded. ``memory_probe`` returns the process' current
+    memory use in bytes and is sampled around each load.
+    """
+
+    def __init__(
+        self,
+        budget_bytes: int = 0,
+        idle_ttl_s: float = 0.0,
+        memory_probe: Callable[[], int] = rss_bytes,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.budget_bytes = budget_bytes
+        self.idle_ttl_s = idle_ttl_s
+        self._probe = memory_probe
+        self._clock = clock
+        self._models: dict[str, _Model] = {}
+        self._lock = threading.Lock()
+        # Loads are serialised: concurrent loads would each see the other's
+        # allocations in their memory delta, and contend for the same disk.
+        self._load_lock = threading.Lock()
+        self._reaper: threading.Thread | None = None
+        self.evictions = 0
+        self.expirations = 0
+
+    def register(
+        self,
+        name: str,
+        load: Callable[[], Any],
+        unload: Callable[[Any], None] | None = None,
+        estimate_bytes: int = 0,
+    ) -> None:
+        """Declare a model. ``estimate_bytes`` stands in until it is measured."""
+        with self._lock:
+            self._models[name] = _Model(name, load, unload, estimate_bytes)
+
+    def names(self) -> list[str]:
+        return list(self._models)
+
+    def state(self, name: str) -> str:
+        return self._models[name].state
+
+    # -- use -----------------------------------------------------------------
+    def get(self, name: str) -> Any:
+        """Return the loaded model, loading it first if needed."""
+        with self.use(name) as instance:
+            return instance
+
+    @contextmanager
+    def use(self, name: str):
+        """Pin *name* for the duration of the block and yield the instance.
+
+        Loads the model if it is not resident. Raises KeyError for an
+        unknown name and ModelLoadError if loading fails.
+        """
+        model = self._models[name]
+        while True:
+            with self._lock:
+                if model.state == READY:
+                    model.in_use += 1
+                    model.last_used = self._clock()
+                    instance = model.instance
+                    break
+            self._load(model)
+        try:
+            yield instance
+        finally:
+            with self._lock:
+                model.in_use -= 1
+                model.last_used = self._clock()
+
+    def replace(self, name: str, instance: Any) -> None:
+        """Swap a resident model's instance (e.g. a CPU re-initialisation)."""
+        with self._lock:
+            model = self._models[name]
+            if model.state == READY:
+                model.instance = instance
+
+    def _load(self, model: _Model) -> None:
+        with self._load_lock:
+            with self._lock:
+                if model.state == READY:
+                    return
+                model.state = LOADING
+                need = model.resident_bytes or model.estimate_bytes
+            self._make_room(need, keep=model.name)
+
+            before = self._probe()
+            start = time.perf_counter()
+            try:
+                instance = model.load()
+            except Exception as exc:
+                with self._lock:
+                    model.state = FAILED
+                    model.error = f"{type(exc).__name__}: {exc}"
+                log.exception("Loading model %s failed", model.name)
+                raise ModelLoadError(f"model {model.name} failed to load") from exc
+            elapsed = time.perf_counter() - start
+            measured = self._probe() - before
+
+            with self._lock:
+                model.instance = instance
+                model.state = READY
+                model.error = None
+                model.load_s = elapsed
+                model.loads += 1
+                model.last_used = self._clock()
+                # A load that frees as much as it allocates (GC, mocks) says
+                # nothing about the model; keep the best figure we have.
+                if measured > 0:
+                    model.resident_bytes = measured
+                elif not model.resident_bytes:
+                    model.resident_bytes = model.estimate_bytes
+            log.info(
+                "Model %s loaded in %.1fs (~%d MB resident)",
+                model.name, elapsed, model.resident_bytes // _MB,
+            )
+            # The estimate may have been low; settle up with what was measured.
+            self._make_room(0, keep=model.name)
+
+    # -- unload --------------------------------------------------------------
+    def unload(self, name: str) -> bool:
+        """Unload *name* if it is resident and idle. Returns True if it was."""
+        model = self._models[name]
+        with self._lock:
+            if model.state != READY or model.in_use:
+                return False
+            instance, model.instance = model.instance, None
+            model.state = UNLOADED
+            model.unloads += 1
+        if model.unload is not None:
+            try:
+                model.unload(instance)
+            except Exception:
+                log.warning("Unload hook for %s failed", name, exc_info=True)
+        del instance
+        gc.collect()
+        log.info("Model %s unloaded (~%d MB released)", name, model.resident_bytes // _MB)
+        return True
+
+    def resident_bytes(self) -> int:
+        with self._lock:
+            return sum(m.resident_bytes for m in self._models.values() if m.state == READY)
+
+    def _make_room(self, need: int, keep: str) -> None:
+        """Evict idle models, least recently used first, until *need* fits."""
+        if self.budget_bytes <= 0:
+            return
+        while self.resident_bytes() + need > self.budget_bytes:
+            with self._lock:
+                idle = [
+                    m for m in self._models.values()
+                    if m.state == READY and not m.in_use and m.name != keep
+                ]
+            if not idle:
+                log.warning(
+                    "Loading %s exceeds the %d MB model budget; nothing idle to evict",
+                    keep, self.budget_bytes // _MB,
+                )
+                return
+            victim = min(idle, key=lambda m: m.last_used)
+            if self.unload(victim.name):
+                self.evictions += 1
+
+    def reap(self) -> list[str]:
+        """Unload every model idle for longer than the TTL."""
+        if self.idle_ttl_s <= 0:
+            return []
+        now = self._clock()
+        with self._lock:
+            stale = [
+                m.name for m in self._models.values()
+                if m.state == READY and not m.in_use and now - m.last_used > self.idle_ttl_s
+            ]
+        expired = [name for name in stale if self.unload(name)]
+        self.expirations += len(expired)
+        return expired
+
+    # -- background ----------------------------------------------------------
+    def start_reaper(self) -> None:
+        """Start the idle-unload thread (no-op without a TTL)."""
+        if self.idle_ttl_s <= 0 or self._reaper is not None:
+            return
+        interval = max(1.0, min(30.0, self.idle_ttl_s / 4))
+
+        def loop() -> None:
+            while True:
+                time.sleep(interval)
+                try:
+                    self.reap()
+                except Exception:
+                    log.exception("Model reaper failed")
+
+        self._reaper = threading.Thread(target=loop, name="voice-model-reaper", daemon=True)
+        self._reaper.start()
+
+    def prewarm(self, names: Iterable[str]) -> threading.Thread:
+        """Load *names* in the background, in order; requests need not wait."""
+        names = list(names)
+
+        def warm() -> None:
+            for name in names:
+                try:
+                    self.get(name)
+                except ModelLoadError:
+                    pass  # logged by _load; the next request retries
+
+        thread = threading.Thread(target=warm, name="voice-model-prewarm", daemon=True)
+        thread.start()
+        return thread
+
+    def snapshot(self) -> dict:
+        """Per-model state, load time and resident size for /health."""
+        now = self._clock()
+        with self._lock:
+            models = {
+                m.name: {
+                    "state": m.state,
+                    "resident_mb": round(m.resident_bytes / _MB, 1) if m.state == READY else 0.0,
+                    "measured_mb": round(m.resident_bytes / _MB, 1),
+                    "load_s": round(m.load_s, 2) if m.load_s is not None else None,
+                    "idle_s": round(now - m.last_used, 1) if m.state == READY else None,
+                    "in_use": m.in_use,
+                    "loads": m.loads,
+                    "unloads": m.unloads,
+                    "error": m.error,
+                }
+                for m in self._models.values()
+            }
+            resident = sum(m.resident_bytes for m in self._models.values() if m.state == READY)
+        return {
+            "budget_mb": round(self.budget_bytes / _MB) if self.budget_bytes > 0 else None,
+            "idle_ttl_s": self.idle_ttl_s if self.idle_ttl_s > 0 else None,
+            "resident_mb": round(resident / _MB, 1),
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "models": models,
+        }
@@ -0,0 +1,112 @@
+"""
+Hive Mind -- Speaker-conditioning cache.
+
+Chatterbox clones a voice from a reference clip by turning it into speaker
+conditionals (voice-encoder embedding, S3 prompt tokens, S3Gen reference
+features). Handing ``audio_prompt_path`` to ``generate`` recomputes all of
+that on every call -- for every sentence of every reply. This cache computes
+a mind's conditionals once per version of its ``voice_ref.wav`` and reuses
+them across chunks and requests.
+
+Entries are keyed by the reference path and validated on every lookup
+against the file's stat signature (inode, size, mtime_ns), so replacing or
+editing a ``voice_ref.wav`` invalidates its entry on the next request, no
+restart needed.
+"""
+
+import logging
+import os
+import threading
+from typing import Any, Callable, Iterable
+
+log = logging.getLogger("hive-mind.voice")
+
+
+def clip_signature(path: str) -> tuple[int, int, int]:
+    """(inode, size, mtime_ns) of a reference clip; changes on any edit or swap."""
+    st = os.stat(path)
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+class SpeakerCache:
+    """Per-reference-clip memo of an engine's speaker conditioning.
+
+    ``compute(path)`` builds the conditioning for one clip; it is called at
+    most once per clip version, even when several threads miss at once.
+    """
+
+    def __init__(self, compute: Callable[[str], Any]):
+        self._compute = compute
+        self._entries: dict[str, tuple[tuple[int, int, int], Any]] = {}
+        self._lock = threading.Lock()
+        self._key_locks: dict[str, threading.Lock] = {}
+        self._counts = {"hits": 0, "misses": 0, "invalidations": 0, "errors": 0}
+
+    def get(self, ref_path: str) -> Any:
+        """Return the conditioning for *ref_path*, computing it if stale.
+
+        Raises FileNotFoundError if the clip has gone away; its entry is
+        dropped so a deleted voice never keeps speaking.
+        """
+        path = os.path.realpath(ref_path)
+        try:
+            sig = clip_signature(path)
+        except FileNotFoundError:
+            self.invalidate(path)
+            raise
+        with self._lock:
+            cached = self._entries.get(path)
+            if cached is not None and cached[0] == sig:
+                self._counts["hits"] += 1
+                return cached[1]
+            key_lock = self._key_locks.setdefault(path, threading.Lock())
+        with key_lock:
+            # Another thread may have filled it while we waited.
+            with self._lock:
+                cached = self._entries.get(path)
+                if cached is not None and cached[0] == sig:
+                    self._counts["hits"] += 1
+                    return cached[1]
+                self._counts["misses"] += 1
+                if cached is not None:
+                    self._counts["invalidations"] += 1
+                    log.info("voice_ref changed, recomputing speaker conditioning: %s", path)
+            try:
+                conds = self._compute(path)
+            except Exception:
+                with self._lock:
+                    self._counts["errors"] += 1
+                raise
+            with self._lock:
+                self._entries[path] = (sig, conds)
+        return conds
+
+    def invalidate(self, ref_path: str) -> None:
+        with self._lock:
+            if self._entries.pop(os.path.realpath(ref_path), None) is not None:
+                self._counts["invalidations"] += 1
+
+    def clear(self) -> None:
+        """Drop every entry, e.g. when the engine that computed them unloads."""
+        with self._lock:
+            self._counts["invalidations"] += len(self._entries)
+            self._entries.clear()
+
+    def warm(self, ref_paths: Iterable[str]) -> int:
+        """Compute conditioning for every existing clip; return how many are ready.
+
+        Failures are logged and skipped -- a bad clip surfaces on its own
+        request, it must not stop the others from warming.
+        """
+        ready = 0
+        for ref_path in ref_paths:
+            try:
+                self.get(ref_path)
+                ready += 1
+            except Exception:
+                log.warning("Speaker warm-up failed for %s", ref_path, exc_info=True)
+        return ready
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), **self._counts}
@@ -0,0 +1,160 @@
+"""
+Hive Mind -- Content-addressed TTS output cache.
+
+Scheduled briefings, HITL prompts and canned bot replies keep asking for the
+same words in the same voice. This cache stores the finished artefact on
+disk under the sha256 of everything that determines it, so a repeat request
+skips inference and both ffmpeg passes and is served straight from the file.
+
+Two kinds of entry share one directory and one byte budget:
+
+- ``ogg`` -- a whole reply, exactly as ``/tts`` returned it;
+- ``pcm`` -- one sentence of raw int16 mono PCM at the engine's sample rate,
+  before ``atempo``. Long replies that repeat a sentence reuse the fragment
+  and only pay for the new sentences plus one encode.
+
+Files live at ``<root>/<kind>/<aa>/<sha256>``. Eviction is least recently
+used, by file mtime (touched on every hit), so the order survives restarts
+and a second server process sharing the directory evicts sensibly too.
+Cache I/O errors are logged and treated as a miss -- the cache must never
+fail a synthesis.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+log = logging.getLogger("hive-mind.voice")
+
+KIND_OGG = "ogg"
+KIND_PCM = "pcm"
+_KEY_VERSION = 1  # bump when the encoding pipeline changes output bytes
+
+
+class TTSCache:
+    """Size-bounded, content-addressed file cache with LRU eviction."""
+
+    def __init__(self, root: str, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index: OrderedDict[str, int] | None = None  # path -> size, oldest first
+        self._bytes = 0
+        self._counts = {f"{kind}_{event}": 0 for kind in (KIND_OGG, KIND_PCM) for event in ("hits", "misses")}
+        self._counts.update(stores=0, evictions=0, errors=0)
+
+    @staticmethod
+    def key(*parts) -> str:
+        """sha256 over the canonical JSON of *parts* (plus the key version)."""
+        blob = json.dumps([_KEY_VERSION, *parts], separators=(",", ":"), ensure_ascii=False)
+        return hashlib.sha256(blob.encode()).hexdigest()
+
+    def _path(self, kind: str, key: str) -> str:
+        return os.path.join(self.root, kind, key[:2], key)
+
+    def _load_index(self) -> None:
+        """Scan the directory once, oldest mtime first. Caller holds the lock."""
+        if self._index is not None:
+            return
+        entries = []
+        for kind in (KIND_OGG, KIND_PCM):
+            base = os.path.join(self.root, kind)
+            if not os.path.isdir(base):
+                continue
+            for shard in os.scandir(base):
+                if not shard.is_dir():
+                    continue
+                for f in os.scandir(shard.path):
+                    if f.name.startswith("."):
+                        continue  # in-flight temp file
+                    try:
+                        st = f.stat()
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime_ns, f.path, st.st_size))
+        entries.sort()
+        self._index = OrderedDict((path, size) for _, path, size in entries)
+        self._bytes = sum(self._index.values())
+
+    # -- lookups ------------------------------------------------------------
+
+    def path(self, kind: str, key: str) -> str | None:
+        """Return the cached file for *key* if present (and mark it used)."""
+        if self.max_bytes <= 0:
+            return None
+        path = self._path(kind, key)
+        with self._lock:
+            try:
+                self._load_index()
+                os.utime(path)
+            except OSError:
+                self._counts[f"{kind}_misses"] += 1
+                if self._index and path in self._index:
+                    self._bytes -= self._index.pop(path)
+                return None
+            size = self._index.pop(path, None)
+            if size is None:  # written by another process
+                size = os.path.getsize(path)
+                self._bytes += size
+            self._index[path] = size
+            self._counts[f"{kind}_hits"] += 1
+        return path
+
+    def read(self, kind: str, key: str) -> bytes | None:
+        path = self.path(kind, key)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except OSError:
+            return None  # evicted between lookup and read
+
+    # -- stores -------------------------------------------------------------
+
+    def put(self, kind: str, key: str, data: bytes) -> None:
+        """Store *data* atomically, then evict least-recently-used entries."""
+        if self.max_bytes <= 0 or len(data) > self.max_bytes:
+            return
+        path = self._path(kind, key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError:
+            log.warning("TTS cache write failed for %s", path, exc_info=True)
+            with self._lock:
+                self._counts["errors"] += 1
+            return
+        with self._lock:
+            self._load_index()
+            self._bytes -= self._index.pop(path, 0)
+            self._index[path] = len(data)
+            self._bytes += len(data)
+            self._counts["stores"] += 1
+            self._evict()
+
+    def _evict(self) -> None:
+        while self._bytes > self.max_bytes and self._index:
+            victim, size = self._index.popitem(last=False)
+            self._bytes -= size
+            self._counts["evictions"] += 1
+            try:
+                os.unlink(victim)
+            except OSError:
+                pass
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "max_bytes": self.max_bytes,
+                "bytes": self._bytes if self._index is not None else None,
+                "entries": len(self._index) if self._index is not None else None,
+                **self._counts,
+            }
@@ -10,19 +10,29 @@ startup via the ``TTS_ENGINE`` env var:
   voice. ``voice_id`` maps to a Kokoro voice name via ``KOKORO_VOICE_MAP``,
   falling back to ``KOKORO_DEFAULT_VOICE``.
 
+``POST /tts`` returns the whole reply as one OGG; ``POST /tts/stream``
+synthesises sentence by sentence and streams Ogg/Opus (or WAV) as each
+sentence is encoded, for either engine.
+
 The STT half (faster-whisper) is shared by both engines. The two engines ship
 in separate images (Dockerfile.voice / Dockerfile.voice.kokoro) so their model
 stacks never collide; this single module serves both via the toggle.
 Auto-detects CUDA; falls back to CPU gracefully.
+
+Models are loaded on first use (optionally prewarmed in the background) and
+unloaded when idle or over the memory budget -- see voice/model_manager.py.
 """
 
+import asyncio
+import hashlib
 import io
 import json
 import logging
 import os
 import re
-import subprocess
-import tempfile
+import threading
+import time
+from collections import OrderedDict
 
 # Check GPU compatibility BEFORE importing torch -- once torch initializes
 # CUDA, it's too late to hide the device from downstream libraries.
@@ -55,10 +65,22 @@ _GPU_OK = _check_gpu_early()
 
 import torch  # noqa: E402
 import torchaudio  # noqa: E402
-from fastapi import FastAPI, HTTPException, UploadFile  # noqa: E402
-from fastapi.responses import Response  # noqa: E402
+from fastapi import FastAPI, HTTPException, Request, UploadFile  # noqa: E402
+from fastapi.responses import Response, StreamingResponse  # noqa: E402
 from pydantic import BaseModel  # noqa: E402
 
+from core.mind_registry import mind_registry  # noqa: E402
+from voice import audio_codec  # noqa: E402
+from voice.inference_queue import (  # noqa: E402
+    PRIORITY_INTERACTIVE,
+    InferenceLane,
+    QueueFull,
+    parse_priority,
+)
+from voice.model_manager import ModelLoadError, ModelManager, rss_bytes  # noqa: E402
+from voice.speaker_cache import SpeakerCache, clip_signature  # noqa: E402
+from voice.tts_cache import KIND_OGG, KIND_PCM, TTSCache  # noqa: E402
+
 log = logging.getLogger("hive-mind.voice")
 
 app = FastAPI(title="Hive Mind Voice Server")
@@ -72,64 +94,63 @@ _KOKORO_LANG = os.getenv("KOKORO_LANG", "a")  # 'a' = American English
 _KOKORO_DEFAULT_VOICE = os.getenv("KOKORO_DEFAULT_VOICE", "af_heart")
 _KOKORO_SR = 24000  # Kokoro's native output sample rate
 
+# STT request classes -> Whisper size. Short clips (voice commands) can use a
+# smaller, faster model; anything longer than WHISPER_SHORT_MAX_S of speech
+# is a note and gets WHISPER_MODEL. By default both classes use WHISPER_MODEL.
+_WHISPER_SHORT_MAX_S = float(os.getenv("WHISPER_SHORT_MAX_S", "15"))
+_STT_CLASSES = {
+    "command": os.getenv("WHISPER_MODEL_SHORT", _WHISPER_MODEL),
+    "note": _WHISPER_MODEL,
+}
+
+# Resident model handles. The model manager (below) loads and unloads them;
+# None means "not resident", not "unavailable".
 _whisper = None
 _chatterbox_model = None
 _kokoro_pipeline = None
+# Chatterbox's output rate, recorded at load and kept across unloads: the
+# stream path needs it outside a model pin, when the handle may be None.
+_chatterbox_sr: int | None = None
+
+# Inference lanes -- blocking model + ffmpeg work runs on these worker threads,
+# never on the event loop. Separate lanes let STT and TTS run concurrently.
+# Callers pick a priority with the X-Voice-Priority header
+# ("interactive" default, or "background" for scheduler briefings).
+_STT_LANE = InferenceLane(
+    "stt",
+    workers=int(os.getenv("VOICE_STT_WORKERS", "1")),
+    max_queue=int(os.getenv("VOICE_QUEUE_MAX", "32")),
+)
+_TTS_LANE = InferenceLane(
+    "tts",
+    workers=int(os.getenv("VOICE_TTS_WORKERS", "1")),
+    max_queue=int(os.getenv("VOICE_QUEUE_MAX", "32")),
+)
 
 
 # ---------------------------------------------------------------------------
 # Voice reference resolution
 # ---------------------------------------------------------------------------
 _MINDS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "minds")
-_MIND_ID_TO_NAME: dict[str, str] = {}
-
-
-def _load_mind_id_map() -> dict[str, str]:
-    """Build {mind_id (UUID) -> short_name} by scanning minds/*/runtime.yaml.
-    Lets the voice server resolve a UUID voice_id back to the on-disk folder
-    name when callers (post agent_id→mind_id rename) pass the UUID.
-    """
-    mapping: dict[str, str] = {}
-    if not os.path.isdir(_MINDS_DIR):
-        return mapping
-    for short_name in os.listdir(_MINDS_DIR):
-        rt = os.path.join(_MINDS_DIR, short_name, "runtime.yaml")
-        if not os.path.isfile(rt):
-            continue
-        try:
-            with open(rt) as f:
-                for line in f:
-                    line = line.strip()
-                    if line.startswith("mind_id:"):
-                        mid = line.split(":", 1)[1].strip().strip('"').strip("'")
-                        if mid:
-                            mapping[mid] = short_name
-                        break
-        except OSError:
-            continue
-    return mapping
+# Indexed minds/*/runtime.yaml: O(1) name / UUID / voice_id lookups. A miss
+# re-stats runtime.yaml at most every few seconds (a mind added after
+# startup), never a full rescan per request.
+_MINDS = mind_registry(_MINDS_DIR)
 
 
 def _resolve_voice_ref(voice_id: str) -> str | None:
     """Resolve a voice_id to minds/{short_name}/voice_ref.wav.
 
-    Accepts either the short name ("ada") or the canonical mind_id (UUID).
-    Short-name lookup is tried first; if that misses, we fall through to a
-    UUID→short-name map built from each mind's runtime.yaml.
+    Accepts the short name ("ada"), the canonical mind_id (UUID), or a
+    `voice_id:` alias from a mind's runtime.yaml, via the mind registry.
+    A folder with a voice_ref.wav but no runtime.yaml still resolves by
+    short name.
     """
-    direct = os.path.join(_MINDS_DIR, voice_id, "voice_ref.wav")
-    if os.path.exists(direct):
-        return direct
-
-    short = _MIND_ID_TO_NAME.get(voice_id)
-    if short is None:
-        # Lazy refresh: a mind may have been added since startup.
-        _MIND_ID_TO_NAME.update(_load_mind_id_map())
-        short = _MIND_ID_TO_NAME.get(voice_id)
-    if short:
-        by_id = os.path.join(_MINDS_DIR, short, "voice_ref.wav")
-        if os.path.exists(by_id):
-            return by_id
+    mind = _MINDS.by_voice(voice_id)
+    short = mind.name if mind else voice_id
+    ref = os.path.join(_MINDS_DIR, short, "voice_ref.wav")
+    if os.path.exists(ref):
+        return ref
     return None
 
 
@@ -171,38 +192,167 @@ def _resolve_kokoro_voice(voice_id: str) -> str:
 
 
 # ---------------------------------------------------------------------------
-# Startup -- load all models once
+# Models -- loaded on first use, unloaded when idle or over budget
 # ---------------------------------------------------------------------------
-@app.on_event("startup")
-async def startup():
-    global _whisper, _chatterbox_model, _kokoro_pipeline
+# Rough resident sizes, used to plan evictions until a load has been measured.
+_MODEL_ESTIMATES_MB = {
+    "tiny": 75, "base": 150, "small": 500, "medium": 1500,
+    "large-v2": 3100, "large-v3": 3100, "chatterbox": 3000, "kokoro": 400,
+}
+
+
+def _memory_in_use() -> int:
+    """Process RSS, plus torch's CUDA allocations when on GPU."""
+    used = rss_bytes()
+    if _DEVICE == "cuda":
+        used += torch.cuda.memory_allocated()
+    return used
+
+
+_MODELS = ModelManager(
+    budget_bytes=int(float(os.getenv("VOICE_MEMORY_BUDGET_MB", "0")) * 1024 * 1024),
+    idle_ttl_s=float(os.getenv("VOICE_MODEL_IDLE_TTL_S", "0")),
+    memory_probe=_memory_in_use,
+)
+
+
+def _release_device_memory() -> None:
+    """Hand cached CUDA blocks back to the driver after an unload."""
+    if _DEVICE == "cuda":
+        torch.cuda.empty_cache()
 
-    log.info("Voice server starting on device: %s | TTS engine: %s", _DEVICE, _TTS_ENGINE)
 
+def _whisper_name(size: str) -> str:
+    return f"whisper:{size}"
+
+
+def _load_whisper(size: str):
+    """Load one faster-whisper size; the default size is also ``_whisper``.
+
+    Each loader adopts a handle that is already set rather than loading a
+    second copy of the same weights.
+    """
+    global _whisper
+    if size == _WHISPER_MODEL and _whisper is not None:
+        return _whisper
     from faster_whisper import WhisperModel
     compute_type = "float16" if _DEVICE == "cuda" else "int8"
-    log.info("Loading faster-whisper %s (%s)...", _WHISPER_MODEL, compute_type)
-    _whisper = WhisperModel(_WHISPER_MODEL, device=_DEVICE, compute_type=compute_type)
+    log.info("Loading faster-whisper %s (%s)...", size, compute_type)
+    model = WhisperModel(size, device=_DEVICE, compute_type=compute_type)
+    if size == _WHISPER_MODEL:
+        _whisper = model
+    return model
 
-    if _TTS_ENGINE == "kokoro":
+
+def _unload_whisper(size: str):
+    def unload(_instance) -> None:
+        global _whisper
+        if size == _WHISPER_MODEL:
+            _whisper = None
+        _release_device_memory()
+    return unload
+
+
+def _load_chatterbox():
+    global _chatterbox_model, _chatterbox_sr
+    if _chatterbox_model is None:
+        from chatterbox.tts import ChatterboxTTS
+        log.info("Loading Chatterbox TTS...")
+        _chatterbox_model = ChatterboxTTS.from_pretrained(device=_DEVICE)
+        _chatterbox_sr = _chatterbox_model.sr
+    return _chatterbox_model
+
+
+def _unload_chatterbox(_instance) -> None:
+    global _chatterbox_model
+    _chatterbox_model = None
+    # The conditionals are tensors on the model's device; keeping them
+    # would pin that memory after the model itself is gone.
+    _SPEAKERS.clear()
+    _release_device_memory()
+
+
+def _load_kokoro():
+    global _kokoro_pipeline
+    if _kokoro_pipeline is None:
         from kokoro import KPipeline
         log.info("Loading Kokoro TTS (lang=%s)...", _KOKORO_LANG)
         _kokoro_pipeline = KPipeline(lang_code=_KOKORO_LANG)
+    return _kokoro_pipeline
+
+
+def _unload_kokoro(_instance) -> None:
+    global _kokoro_pipeline
+    _kokoro_pipeline = None
+    _release_device_memory()
+
+
+for _size in dict.fromkeys(_STT_CLASSES.values()):
+    _MODELS.register(
+        _whisper_name(_size),
+        load=lambda size=_size: _load_whisper(size),
+        unload=_unload_whisper(_size),
+        estimate_bytes=_MODEL_ESTIMATES_MB.get(_size, 1500) * 1024 * 1024,
+    )
+_MODELS.register("chatterbox", _load_chatterbox, _unload_chatterbox,
+                 estimate_bytes=_MODEL_ESTIMATES_MB["chatterbox"] * 1024 * 1024)
+_MODELS.register("kokoro", _load_kokoro, _unload_kokoro,
+                 estimate_bytes=_MODEL_ESTIMATES_MB["kokoro"] * 1024 * 1024)
+
+
+def _tts_model() -> str:
+    """Manager name of the active TTS engine's model."""
+    return "kokoro" if _TTS_ENGINE == "kokoro" else "chatterbox"
+
+
+def _prewarm_names() -> list[str]:
+    """Resolve VOICE_PREWARM ("stt", "tts", an STT class or a model name)."""
+    aliases = {"stt": _whisper_name(_WHISPER_MODEL), "tts": _tts_model()}
+    aliases.update({cls: _whisper_name(size) for cls, size in _STT_CLASSES.items()})
+    names = []
+    for token in os.getenv("VOICE_PREWARM", "stt,tts").split(","):
+        token = token.strip()
+        if not token:
+            continue
+        name = aliases.get(token, token)
+        if name not in _MODELS.names():
+            log.warning("VOICE_PREWARM: unknown model %r; ignoring", token)
+        elif name not in names:
+            names.append(name)
+    return names
+
+
+@app.on_event("startup")
+async def startup():
+    log.info("Voice server starting on device: %s | TTS engine: %s", _DEVICE, _TTS_ENGINE)
+
+    if _TTS_ENGINE == "kokoro":
         _KOKORO_VOICE_MAP.update(_load_kokoro_voice_map())
         log.info(
             "Voice server ready. TTS: Kokoro | default voice: %s | voice map entries: %d",
             _KOKORO_DEFAULT_VOICE, len(_KOKORO_VOICE_MAP),
         )
     else:
-        from chatterbox.tts import ChatterboxTTS
-        log.info("Loading Chatterbox TTS...")
-        _chatterbox_model = ChatterboxTTS.from_pretrained(device=_DEVICE)
-        _MIND_ID_TO_NAME.update(_load_mind_id_map())
-        log.info("Voice server ready. TTS: Chatterbox | known mind_ids: %d", len(_MIND_ID_TO_NAME))
+        _MINDS.refresh()
+        log.info("Voice server ready. TTS: Chatterbox | known minds: %d", len(_MINDS.minds()))
+
+    # Models load lazily; prewarm only moves the first load off the request path.
+    prewarm = _prewarm_names()
+    if prewarm:
+        warming = _MODELS.prewarm(prewarm)
+        if "chatterbox" in prewarm:
+            threading.Thread(
+                target=_warm_speakers, args=(warming,), name="voice-speaker-warm", daemon=True,
+            ).start()
+    _MODELS.start_reaper()
+    log.info("Model prewarm: %s | memory budget: %s MB | idle TTL: %s s",
+             ", ".join(prewarm) or "none",
+             _MODELS.budget_bytes // (1024 * 1024) or "unlimited",
+             _MODELS.idle_ttl_s or "off")
 
 
 def _tts_ready() -> bool:
-    """Whether the active TTS engine's model is loaded."""
+    """Whether the active TTS engine's model is resident."""
     if _TTS_ENGINE == "kokoro":
         return _kokoro_pipeline is not None
     return _chatterbox_model is not None
@@ -301,19 +451,75 @@ def _split_sentences(text: str) -> list[str]:
 # ---------------------------------------------------------------------------
 # TTS synthesis helper
 # ---------------------------------------------------------------------------
+# Chatterbox keeps its speaker conditioning on the model (``model.conds``) and
+# ``generate`` reads it from there, so setting conds + generating must be one
+# atomic step when more than one TTS worker is running.
+_CHATTERBOX_LOCK = threading.RLock()
+
+
+def _compute_conditionals(ref_path: str):
+    """Encode one reference clip into Chatterbox speaker conditionals."""
+    with _CHATTERBOX_LOCK:
+        _chatterbox_model.prepare_conditionals(ref_path)
+        return _chatterbox_model.conds
+
+
+_SPEAKERS = SpeakerCache(_compute_conditionals)
+
+
+def _mind_voice_refs() -> list[str]:
+    """Every minds/<name>/voice_ref.wav for the minds in runtime.yaml."""
+    paths = []
+    for mind in _MINDS.minds():
+        if not mind.mind_id:
+            continue
+        ref = os.path.join(mind.path, "voice_ref.wav")
+        if os.path.exists(ref):
+            paths.append(ref)
+    return paths
+
+
+def _warm_speakers(after: threading.Thread | None = None) -> None:
+    """Background startup task: precompute conditioning for every mind.
+
+    Runs once the model prewarm (*after*) finishes, and only if Chatterbox
+    was loaded by it -- warming speakers must not force a lazy model in.
+    """
+    if after is not None:
+        after.join()
+    if _chatterbox_model is None:
+        return
+    refs = _mind_voice_refs()
+    try:
+        with _MODELS.use("chatterbox"):
+            ready = _SPEAKERS.warm(refs)
+    except ModelLoadError:
+        return
+    log.info("Speaker conditioning warm: %d/%d minds", ready, len(refs))
+
+
 def _synthesize(text: str, ref_path: str | None = None):
     """Synthesize text to a WAV tensor using Chatterbox.
 
     Args:
         text: The text to synthesize.
-        ref_path: Optional path to a reference WAV for voice cloning.
+        ref_path: Path to the speaker's reference WAV. Required -- the
+            speaker's cached conditioning is installed on the model for
+            this call, so no request can inherit the previous caller's voice.
 
     Returns:
         A torch tensor containing the audio waveform.
     """
     if _chatterbox_model is None:
         raise RuntimeError("TTS model not loaded")
-    return _chatterbox_model.generate(text, audio_prompt_path=ref_path)
+    if ref_path is None:
+        # Chatterbox would silently reuse whichever speaker it conditioned
+        # on last -- another mind's voice. Never synthesise without one.
+        raise ValueError("Chatterbox synthesis requires a voice_ref")
+    conds = _SPEAKERS.get(ref_path)
+    with _CHATTERBOX_LOCK:
+        _chatterbox_model.conds = conds
+        return _chatterbox_model.generate(text)
 
 
 def _synthesize_kokoro(text: str, voice: str):
@@ -378,57 +584,82 @@ def _synthesize_chunked(text: str, ref_path: str | None = None):
 # ---------------------------------------------------------------------------
 # Audio conversion helpers
 # ---------------------------------------------------------------------------
-def _ogg_to_wav(ogg_bytes: bytes) -> bytes:
-    """Convert OGG/Opus -> 16kHz mono WAV (Whisper expects this)."""
-    result = subprocess.run(
-        ["ffmpeg", "-i", "pipe:0", "-f", "wav", "-ar", "16000", "-ac", "1", "pipe:1"],
-        input=ogg_bytes,
-        capture_output=True,
-    )
-    if result.returncode != 0:
-        raise RuntimeError(f"ffmpeg OGG->WAV: {result.stderr.decode()}")
-    return result.stdout
-
-
 def _wav_to_ogg(wav_bytes: bytes, speed: float = 1.0) -> bytes:
     """Convert WAV -> OGG/Opus (Telegram voice note format). Applies atempo if speed != 1.0."""
-    cmd = ["ffmpeg", "-i", "pipe:0"]
-    if speed != 1.0:
-        cmd += ["-af", f"atempo={speed:.3f}"]
-    cmd += ["-c:a", "libopus", "-b:a", "64k", "-f", "ogg", "pipe:1"]
-    result = subprocess.run(cmd, input=wav_bytes, capture_output=True)
-    if result.returncode != 0:
-        raise RuntimeError(f"ffmpeg WAV->OGG: {result.stderr.decode()}")
-    return result.stdout
+    return audio_codec.wav_to_ogg(wav_bytes, speed=speed)
 
 
 # ---------------------------------------------------------------------------
 # STT endpoint
 # ---------------------------------------------------------------------------
-@app.post("/stt")
-async def stt(file: UploadFile):
-    """Transcribe uploaded audio (OGG or WAV) to text."""
-    global _whisper
-    if _whisper is None:
-        raise HTTPException(status_code=503, detail="STT model not ready")
+_STT_CACHE_SIZE = int(os.getenv("STT_CACHE_SIZE", "256"))
+_STT_CACHE: "OrderedDict[str, dict]" = OrderedDict()  # sha256(audio) -> result
+_STT_CACHE_LOCK = threading.Lock()
+_VAD_PAD_S = 0.2  # keep a little audio either side of detected speech
 
-    audio_bytes = await file.read()
 
-    fname = file.filename or ""
-    ctype = file.content_type or ""
-    if "ogg" in ctype or fname.endswith(".ogg") or fname.endswith(".oga"):
-        wav_bytes = _ogg_to_wav(audio_bytes)
-    else:
-        wav_bytes = audio_bytes
+def _stt_cache_get(key: str) -> dict | None:
+    with _STT_CACHE_LOCK:
+        hit = _STT_CACHE.get(key)
+        if hit is not None:
+            _STT_CACHE.move_to_end(key)
+        return hit
+
+
+def _stt_cache_put(key: str, result: dict) -> None:
+    if _STT_CACHE_SIZE <= 0:
+        return
+    with _STT_CACHE_LOCK:
+        _STT_CACHE[key] = result
+        _STT_CACHE.move_to_end(key)
+        while len(_STT_CACHE) > _STT_CACHE_SIZE:
+            _STT_CACHE.popitem(last=False)
 
-    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-        f.write(wav_bytes)
-        tmp_path = f.name
 
+def _decode_audio(audio_bytes: bytes):
+    """Any uploaded container (OGG voice note, WAV) -> 16 kHz mono float32."""
+    return audio_codec.to_samples(audio_bytes, audio_codec.STT_RATE)
+
+
+def _trim_silence(samples):
+    """Cut leading and trailing silence using faster-whisper's Silero VAD.
+
+    Only the ends are trimmed -- pauses inside speech stay, so Whisper sees
+    the utterance as spoken. Returns an empty slice when no speech is found.
+    If the VAD is unavailable the samples pass through untouched.
+    """
+    try:
+        from faster_whisper.vad import VadOptions, get_speech_timestamps
+    except ImportError:
+        return samples
     try:
+        spans = get_speech_timestamps(samples, VadOptions(min_silence_duration_ms=500))
+    except Exception:
+        log.debug("VAD failed; transcribing the untrimmed clip", exc_info=True)
+        return samples
+    if not spans:
+        return samples[:0]
+    pad = int(_VAD_PAD_S * audio_codec.STT_RATE)
+    return samples[max(0, spans[0]["start"] - pad): spans[-1]["end"] + pad]
+
+
+def _stt_class(speech_s: float) -> str:
+    """Request class of a clip: a short voice command or a longer note."""
+    return "command" if speech_s <= _WHISPER_SHORT_MAX_S else "note"
+
+
+def _whisper_text(samples, size: str | None = None) -> str:
+    """Run Whisper on 16 kHz float32 samples, degrading to CPU on GPU faults.
+
+    *size* picks the Whisper model (default ``WHISPER_MODEL``); it is
+    loaded on first use and pinned while it transcribes.
+    """
+    global _whisper
+    size = size or _WHISPER_MODEL
+    with _MODELS.use(_whisper_name(size)) as model:
         try:
-            segments, _ = _whisper.transcribe(tmp_path, language="en")
-            text = " ".join(s.text for s in segments).strip()
+            segments, _ = model.transcribe(samples, language="en")
+            return " ".join(s.text for s in segments).strip()
         except RuntimeError as exc:
             # Whisper's GPU backend (ctranslate2) fails when a CUDA support
             # library is missing or unloadable. The message varies: a bare
@@ -439,16 +670,130 @@ async def stt(file: UploadFile):
             msg = str(exc).lower()
             if not any(tok in msg for tok in ("cuda", "cublas", "cudnn", "libcu")):
                 raise
-            log.warning("GPU error in STT — reinitialising whisper on CPU: %s", exc)
+            log.warning("GPU error in STT — reinitialising whisper %s on CPU: %s", size, exc)
             from faster_whisper import WhisperModel
-            _whisper = WhisperModel(_WHISPER_MODEL, device="cpu", compute_type="int8")
-            segments, _ = _whisper.transcribe(tmp_path, language="en")
-            text = " ".join(s.text for s in segments).strip()
-    finally:
-        os.unlink(tmp_path)
+            model = WhisperModel(size, device="cpu", compute_type="int8")
+            _MODELS.replace(_whisper_name(size), model)
+            if size == _WHISPER_MODEL:
+                _whisper = model
+            segments, _ = model.transcribe(samples, language="en")
+            return " ".join(s.text for s in segments).strip()
+
+
+def _transcribe(audio_bytes: bytes, cache_key: str) -> dict:
+    """Blocking STT: decode -> VAD trim -> Whisper, all in memory. Runs on the STT lane."""
+    t0 = time.perf_counter()
+    samples = _decode_audio(audio_bytes)
+    t1 = time.perf_counter()
+    speech = _trim_silence(samples)
+    t2 = time.perf_counter()
+    speech_s = len(speech) / audio_codec.STT_RATE
+    stt_class = _stt_class(speech_s)
+    # Whisper invents text ("Thank you.") on pure silence; skip it entirely.
+    text = _whisper_text(speech, _STT_CLASSES[stt_class]) if len(speech) else ""
+    t3 = time.perf_counter()
+
+    result = {
+        "text": text,
+        "audio_s": round(len(samples) / audio_codec.STT_RATE, 2),
+        "speech_s": round(speech_s, 2),
+        "class": stt_class,
+        "whisper_model": _STT_CLASSES[stt_class],
+        "timings_ms": {
+            "decode": round((t1 - t0) * 1000, 1),
+            "vad": round((t2 - t1) * 1000, 1),
+            "inference": round((t3 - t2) * 1000, 1),
+        },
+    }
+    _stt_cache_put(cache_key, result)
+    return result
+
+
+async def _run_on_lane(lane: InferenceLane, request: Request, fn, *args):
+    """Run blocking ``fn(*args)`` on *lane* at the request's priority.
+
+    A full lane -- or a model that failed to load -- is a 503 (the caller
+    may retry); a client that disconnects while its job is still queued has
+    the job dropped.
+    """
+    try:
+        return await lane.run(
+            fn, *args,
+            priority=parse_priority(request.headers.get("x-voice-priority")),
+            is_disconnected=request.is_disconnected,
+        )
+    except QueueFull as exc:
+        raise HTTPException(
+            status_code=503, detail=str(exc), headers={"Retry-After": "5"},
+        ) from exc
+    except ModelLoadError as exc:
+        raise HTTPException(
+            status_code=503, detail=str(exc), headers={"Retry-After": "30"},
+        ) from exc
+
+
+@app.post("/stt")
+async def stt(file: UploadFile, request: Request):
+    """Transcribe uploaded audio (OGG or WAV) to text.
+
+    The response carries per-stage ``timings_ms`` (decode, vad, inference),
+    the request ``class`` and the ``whisper_model`` that served it, and
+    ``cached: true`` when the same audio bytes were transcribed before (e.g.
+    a retried or forwarded voice note).
+    """
+    audio_bytes = await file.read()
+    cache_key = hashlib.sha256(audio_bytes).hexdigest()
+
+    cached = _stt_cache_get(cache_key)
+    if cached is not None:
+        log.info("STT (cached): %r", cached["text"][:80])
+        return {**cached, "cached": True}
+
+    result = await _run_on_lane(_STT_LANE, request, _transcribe, audio_bytes, cache_key)
+
+    log.info("STT: %r (%s)", result["text"][:80], result["timings_ms"])
+    return {**result, "cached": False}
+
+
+# ---------------------------------------------------------------------------
+# TTS output cache
+# ---------------------------------------------------------------------------
+# Finished OGG replies (and, with TTS_SENTENCE_CACHE=1, per-sentence PCM) are
+# cached on disk by content; TTS_CACHE_MAX_MB=0 turns caching off.
+_TTS_CACHE = TTSCache(
+    os.getenv("TTS_CACHE_DIR", "/usr/src/app/data/tts_cache"),
+    max_bytes=int(float(os.getenv("TTS_CACHE_MAX_MB", "512")) * 1024 * 1024),
+)
+_TTS_SENTENCE_CACHE = os.getenv("TTS_SENTENCE_CACHE", "0") == "1"
+
+
+def _voice_key(voice: str) -> str:
+    """Cache identity of a resolved voice.
+
+    Kokoro voices are named; a Chatterbox voice is its reference clip, so
+    the key carries the clip's signature and a new voice_ref.wav never
+    serves audio cloned from the old one.
+    """
+    if _TTS_ENGINE == "kokoro":
+        return voice
+    return f"{os.path.realpath(voice)}:{clip_signature(voice)}"
+
+
+def _cached_sentences(synth, voice_key: str, sample_rate: int):
+    """Wrap a per-sentence PCM synth with the sentence-level cache."""
+    def cached(sentence: str) -> bytes:
+        key = _TTS_CACHE.key(KIND_PCM, _TTS_ENGINE, voice_key, sample_rate, sentence)
+        pcm = _TTS_CACHE.read(KIND_PCM, key)
+        if pcm is None:
+            pcm = synth(sentence)
+            _TTS_CACHE.put(KIND_PCM, key, pcm)
+        return pcm
+    return cached
+
 
-    log.info("STT: %r", text[:80])
-    return {"text": text}
+def _pcm_to_ogg(pcm: bytes, sample_rate: int, speed: float = 1.0) -> bytes:
+    """Encode mono int16 PCM -> OGG/Opus, applying atempo if speed != 1.0."""
+    return audio_codec.pcm16_to_ogg(pcm, sample_rate, speed=speed)
 
 
 # ---------------------------------------------------------------------------
@@ -461,17 +806,15 @@ class TTSRequest(BaseModel):
 
 
 @app.post("/tts")
-async def tts(req: TTSRequest):
-    """Synthesise text to OGG/Opus audio."""
-    if not _tts_ready():
-        raise HTTPException(status_code=503, detail="TTS not ready")
+async def tts(req: TTSRequest, request: Request):
+    """Synthesise text to OGG/Opus audio.
 
+    The TTS model is loaded on the first request that misses the cache.
+    """
     text = _strip_markdown(req.text)
 
     if _TTS_ENGINE == "kokoro":
         voice = _resolve_kokoro_voice(req.voice_id)
-        wav = _synthesize_kokoro(text, voice)
-        sample_rate = _KOKORO_SR
         engine_label = "Kokoro"
     else:
         ref_path = _resolve_voice_ref(req.voice_id)
@@ -484,35 +827,260 @@ async def tts(req: TTSRequest):
                 status_code=400,
                 detail=f"voice_ref not found for voice_id={req.voice_id!r}",
             )
-        wav = _synthesize_chunked(text, ref_path)
-        sample_rate = _chatterbox_model.sr
         engine_label = "Chatterbox"
 
-    wav_buf = io.BytesIO()
-    if _TTS_ENGINE == "kokoro":
-        # Kokoro returns a 1-D float array; soundfile avoids torchaudio's
-        # torchcodec dependency for WAV encoding.
-        import soundfile as sf
-        sf.write(wav_buf, wav, sample_rate, format="WAV")
-    else:
-        torchaudio.save(wav_buf, wav, sample_rate, format="WAV")
-    ogg_bytes = _wav_to_ogg(wav_buf.getvalue(), speed=req.speed)
+    voice_key = _voice_key(voice if _TTS_ENGINE == "kokoro" else ref_path)
+    cache_key = _TTS_CACHE.key(KIND_OGG, _TTS_ENGINE, voice_key, round(req.speed, 3), text)
+    # Off the loop: the first lookup scans the cache dir, every hit touches
+    # the file. None also covers an entry evicted (by another process sharing
+    # the dir) between lookup and read -- that is a miss, not a 500.
+    cached = await asyncio.to_thread(_TTS_CACHE.read, KIND_OGG, cache_key)
+    if cached is not None:
+        log.info("TTS (%s): %d chars -> cache hit", engine_label, len(req.text))
+        return Response(content=cached, media_type="audio/ogg")
+
+    def _render() -> bytes:
+        # Blocking synthesis + encode; runs on the TTS lane with the model pinned.
+        with _MODELS.use(_tts_model()):
+            if _TTS_SENTENCE_CACHE and text.strip():
+                synth, sample_rate = _sentence_engine(req.voice_id)
+                pcm = b"".join(synth(s) for s in _split_sentences(text) if s.strip())
+                ogg = _pcm_to_ogg(pcm, sample_rate, speed=req.speed)
+            else:
+                wav_buf = io.BytesIO()
+                if _TTS_ENGINE == "kokoro":
+                    # Kokoro returns a 1-D float array; soundfile avoids torchaudio's
+                    # torchcodec dependency for WAV encoding.
+                    import soundfile as sf
+                    wav = _synthesize_kokoro(text, voice)
+                    sf.write(wav_buf, wav, _KOKORO_SR, format="WAV")
+                else:
+                    wav = _synthesize_chunked(text, ref_path)
+                    torchaudio.save(wav_buf, wav, _chatterbox_model.sr, format="WAV")
+                ogg = _wav_to_ogg(wav_buf.getvalue(), speed=req.speed)
+        _TTS_CACHE.put(KIND_OGG, cache_key, ogg)
+        return ogg
+
+    ogg_bytes = await _run_on_lane(_TTS_LANE, request, _render)
 
     log.info("TTS (%s): %d chars -> %d bytes OGG", engine_label, len(req.text), len(ogg_bytes))
     return Response(content=ogg_bytes, media_type="audio/ogg")
 
 
+# ---------------------------------------------------------------------------
+# Streaming TTS endpoint
+# ---------------------------------------------------------------------------
+_STREAM_FORMATS = {
+    # format -> (ffmpeg fallback output args, media type)
+    "ogg": (["-c:a", "libopus", "-b:a", "64k", "-f", "ogg", "-page_duration", "200000"], "audio/ogg"),
+    "wav": (["-c:a", "pcm_s16le", "-f", "wav"], "audio/wav"),
+}
+_STREAM_READ_BYTES = 4096
+
+
+class TTSStreamRequest(TTSRequest):
+    format: str = "ogg"  # "ogg" (Ogg/Opus) or "wav" (chunked PCM WAV)
+
+
+def _pcm16(wave) -> bytes:
+    """Mono float waveform (torch tensor or array) -> little-endian int16 PCM."""
+    import numpy as np
+
+    if torch.is_tensor(wave):
+        wave = wave.detach().cpu().numpy()
+    samples = np.clip(np.asarray(wave, dtype=np.float32).reshape(-1), -1.0, 1.0)
+    return (samples * 32767.0).astype("<i2").tobytes()
+
+
+def _sentence_engine(voice_id: str):
+    """Resolve the active engine for sentence-at-a-time synthesis.
+
+    Returns ``(synth, sample_rate)`` where ``synth(sentence)`` returns int16
+    PCM for one sentence, through the sentence cache when it is enabled.
+    Each uncached sentence pins the engine's model while it synthesises.
+    Chatterbox's sample rate is the one recorded when it was first loaded,
+    so the model may be evicted or reaped again before this runs; the first
+    sentence's pin reloads it. Raises HTTPException(400) for an unknown Chatterbox voice -- the
+    same cross-mind bleed guard as ``/tts``.
+    """
+    if _TTS_ENGINE == "kokoro":
+        voice = _resolve_kokoro_voice(voice_id)
+        engine, sample_rate = (lambda sentence: _pcm16(_synthesize_kokoro(sentence, voice))), _KOKORO_SR
+    else:
+        voice = _resolve_voice_ref(voice_id)
+        if voice is None:
+            log.warning("TTS stream voice_ref not found for voice_id=%r", voice_id)
+            raise HTTPException(
+                status_code=400,
+                detail=f"voice_ref not found for voice_id={voice_id!r}",
+            )
+        if _chatterbox_sr is None:
+            raise RuntimeError("TTS model not loaded")
+        engine, sample_rate = (lambda sentence: _pcm16(_synthesize(sentence, voice))), _chatterbox_sr
+
+    def synth(sentence: str) -> bytes:
+        with _MODELS.use(_tts_model()):
+            return engine(sentence)
+
+    if _TTS_SENTENCE_CACHE:
+        synth = _cached_sentences(synth, _voice_key(voice), sample_rate)
+    return synth, sample_rate
+
+
+async def _stream_sentences(
+    sentences: list[str], synth, sample_rate: int, speed: float, fmt: str,
+    priority: int = PRIORITY_INTERACTIVE,
+):
+    """Synthesise sentence by sentence into one encoded stream; yield its bytes.
+
+    Each sentence's PCM goes into one in-process
+    :class:`voice.audio_codec.StreamEncoder`. The output is a single
+    continuous Ogg (or WAV) stream with ``atempo`` applied across sentence
+    joins, and each sentence's pages are yielded as soon as it is encoded.
+    Synthesis runs on the TTS lane, and encoding runs on a worker thread.
+    When the native codec is unavailable, the stream goes through a
+    pre-spawned ffmpeg from the pool instead (:func:`_stream_sentences_ffmpeg`).
+    A synthesis failure or a full lane ends the stream early with what was
+    already sent.
+    """
+    encoder = audio_codec.stream_encoder(sample_rate, speed, fmt)
+    if encoder is None:
+        fallback = _stream_sentences_ffmpeg(sentences, synth, sample_rate, speed, fmt, priority)
+        try:
+            async for chunk in fallback:
+                yield chunk
+        finally:
+            await fallback.aclose()  # tear ffmpeg down now on a disconnect, not at GC
+        return
+    try:
+        for i, sentence in enumerate(sentences):
+            try:
+                pcm = await _TTS_LANE.run(synth, sentence, priority=priority)
+                chunk = await asyncio.to_thread(encoder.write, pcm)
+            except QueueFull:
+                log.warning("TTS stream: lane full; ending stream early")
+                break
+            except Exception:
+                log.exception("TTS stream synthesis failed; ending stream early")
+                break
+            log.debug("TTS stream: sentence %d/%d encoded (%d bytes)", i + 1, len(sentences), len(chunk))
+            if chunk:
+                yield chunk
+        tail = await asyncio.to_thread(encoder.close)
+        if tail:
+            yield tail
+    finally:
+        encoder.close()  # no-op once finished; frees the muxer on disconnect
+
+
+async def _stream_sentences_ffmpeg(
+    sentences: list[str], synth, sample_rate: int, speed: float, fmt: str,
+    priority: int = PRIORITY_INTERACTIVE,
+):
+    """Fallback for :func:`_stream_sentences`: pipe the PCM through a pooled ffmpeg.
+
+    While sentence N is being synthesised, ffmpeg is already encoding (and
+    the client receiving) sentence N-1. If the client disconnects, the
+    generator is closed and both the feeder and ffmpeg are torn down.
+    """
+    out_args, _ = _STREAM_FORMATS[fmt]
+    cmd = ["ffmpeg", "-hide_banner", "-loglevel", "error",
+           "-f", "s16le", "-ar", str(sample_rate), "-ac", "1", "-i", "pipe:0"]
+    if speed != 1.0:
+        cmd += ["-af", f"atempo={speed:.3f}"]
+    cmd += out_args + ["-flush_packets", "1", "pipe:1"]
+    proc = await asyncio.to_thread(audio_codec.open_ffmpeg, cmd)
+
+    def _write(pcm: bytes) -> None:
+        proc.stdin.write(pcm)
+        proc.stdin.flush()
+
+    async def _feed() -> None:
+        try:
+            for i, sentence in enumerate(sentences):
+                pcm = await _TTS_LANE.run(synth, sentence, priority=priority)
+                await asyncio.to_thread(_write, pcm)
+                log.debug("TTS stream: sentence %d/%d fed (%d bytes PCM)", i + 1, len(sentences), len(pcm))
+        except (BrokenPipeError, ConnectionResetError, ValueError):
+            pass
+        except QueueFull:
+            log.warning("TTS stream: lane full; ending stream early")
+        except Exception:
+            log.exception("TTS stream synthesis failed; ending stream early")
+        finally:
+            try:
+                proc.stdin.close()
+            except OSError:
+                pass
+
+    feeder = asyncio.create_task(_feed())
+    try:
+        while True:
+            chunk = await asyncio.to_thread(proc.stdout.read1, _STREAM_READ_BYTES)
+            if not chunk:
+                break
+            yield chunk
+        await feeder
+    finally:
+        if not feeder.done():
+            feeder.cancel()
+        if proc.poll() is None:
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass
+        await asyncio.to_thread(proc.wait)
+
+
+@app.post("/tts/stream")
+async def tts_stream(req: TTSStreamRequest, request: Request):
+    """Synthesise text sentence by sentence, streaming audio as it is encoded.
+
+    Time-to-first-byte is one sentence of synthesis, not the whole reply.
+    ``format`` selects Ogg/Opus (default) or WAV, sent with chunked
+    transfer encoding.
+    """
+    if req.format not in _STREAM_FORMATS:
+        raise HTTPException(status_code=400, detail=f"unknown format {req.format!r}")
+
+    text = _strip_markdown(req.text)
+    sentences = [s for s in _split_sentences(text) if s.strip()]
+    if not sentences:
+        raise HTTPException(status_code=400, detail="nothing to synthesise")
+    if not _tts_ready():
+        # Load on the lane (not the event loop) before the stream starts.
+        await _run_on_lane(_TTS_LANE, request, _MODELS.get, _tts_model())
+    synth, sample_rate = _sentence_engine(req.voice_id)
+
+    log.info("TTS stream (%s): %d chars in %d sentences -> %s",
+             _TTS_ENGINE, len(text), len(sentences), req.format)
+    return StreamingResponse(
+        _stream_sentences(
+            sentences, synth, sample_rate, req.speed, req.format,
+            priority=parse_priority(request.headers.get("x-voice-priority")),
+        ),
+        media_type=_STREAM_FORMATS[req.format][1],
+    )
+
+
 # ---------------------------------------------------------------------------
 # Health check
 # ---------------------------------------------------------------------------
 @app.get("/health")
 async def health():
     return {
-        "stt": "ready" if _whisper else "loading",
-        "tts": "ready" if _tts_ready() else "loading",
+        "stt": "ready" if _whisper else _MODELS.state(_whisper_name(_WHISPER_MODEL)),
+        "tts": "ready" if _tts_ready() else _MODELS.state(_tts_model()),
         "tts_engine": _TTS_ENGINE,
         "device": _DEVICE,
         "whisper_model": _WHISPER_MODEL,
+        "stt_classes": {**_STT_CLASSES, "command_max_s": _WHISPER_SHORT_MAX_S},
+        "models": _MODELS.snapshot(),
+        "codec": audio_codec.backend(),
+        "queues": {"stt": _STT_LANE.snapshot(), "tts": _TTS_LANE.snapshot()},
+        "speakers": _SPEAKERS.snapshot(),
+        "cache": {**_TTS_CACHE.snapshot(), "sentence_cache": _TTS_SENTENCE_CACHE},
+        "stt_cache": {"entries": len(_STT_CACHE), "max_entries": _STT_CACHE_SIZE},
     }
 
 